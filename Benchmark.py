@@ -0,0 +1,183 @@
+"""
+Python class for performance benchmarks of the MULTI-F regression cases
+(regression.py -b REPEAT)
+
+Each test case is run REPEAT times in the same environment (OMP_NUM_THREADS
+set to the cpus per task, fixed PYTHONHASHSEED) with the stage profiler
+enabled (see multif/profiler.py). The wall time, CPU time and peak memory of
+MULTI-F and its child processes, and the wall time and peak memory of each
+stage, are recorded for every run.
+
+One JSON record per test case and benchmark session is appended to the
+history file (one record per line), together with the host, the git commit
+and the date. The medians are compared with the baseline file (written with
+--save-baseline); a case is flagged when its median wall time (overall or of a
+stage) exceeds the baseline by more than the relative tolerance tol and by more
+than min_wall seconds, or when its median peak memory (overall or of a stage)
+exceeds the baseline by more than the relative tolerance rss_tol and by more
+than min_rss MB.
+"""
+
+import os, sys, json, time, socket, platform, subprocess
+import numpy as np
+
+class Benchmark:
+
+    def __init__(self, history_file, baseline_file, tol=0.1, rss_tol=0.1):
+
+        self.history_file = os.path.abspath(history_file);
+        self.baseline_file = os.path.abspath(baseline_file);
+
+        self.tol = tol;         # relative tolerance for wall time regressions
+        self.min_wall = 1.;     # s, smaller wall time increases are noise
+        self.rss_tol = rss_tol; # relative tolerance for memory regressions
+        self.min_rss = 1.;      # MB, smaller memory increases are noise
+
+        self.session = session_info();
+
+        self.baseline = {};
+        if os.path.isfile(self.baseline_file):
+            f = open(self.baseline_file,'r');
+            self.baseline = json.load(f);
+            f.close();
+
+    def run(self, test, repeat):
+
+        # Run the test case repeat times, return its record
+
+        test.benchmark = 1;
+
+        runs = [];
+        for i in range(repeat):
+            sys.stdout.write('\nBenchmark %s: run %d/%d\n' % (test.name, i+1, repeat));
+            passed = test.run_test();
+            runs.append({'passed': passed,
+                         'wall': test.wall_time,
+                         'cpu': test.cpu_time,
+                         'peak_rss': test.peak_rss,
+                         'stages': dict([(s[0], s[1]) for s in test.stages]),
+                         'stage_rss': dict([(s[0], s[3]) for s in test.stages])});
+
+        record = dict(self.session);
+        record['case'] = test.name;
+        record['fidelity'] = test.fidelity;
+        record['ntasks'] = test.ntasks;
+        record['cpus_per_task'] = test.cpus_per_task;
+        record['runs'] = runs;
+        record['median'] = medians(runs);
+
+        f = open(self.history_file,'a');
+        f.write(json.dumps(record, sort_keys=True) + '\n');
+        f.close();
+
+        return record;
+
+    def compare(self, record):
+
+        # Messages of the regressions of a record w.r.t. the baseline
+        # (None if the case has no baseline)
+
+        if record['case'] not in self.baseline:
+            return None;
+
+        base = self.baseline[record['case']];
+        cur = record['median'];
+
+        messages = [];
+
+        if cur['wall'] > (1.+self.tol)*base['wall'] and                       \
+          cur['wall'] - base['wall'] > self.min_wall:
+            messages.append('wall time %.2f s (baseline %.2f s)' % (cur['wall'], base['wall']));
+
+        if cur['peak_rss'] > (1.+self.rss_tol)*base['peak_rss'] and           \
+          cur['peak_rss'] - base['peak_rss'] > self.min_rss:
+            messages.append('peak memory %.1f MB (baseline %.1f MB)' % (cur['peak_rss'], base['peak_rss']));
+
+        for k in sorted(cur['stages']):
+            if k not in base['stages']:
+                continue;
+            if cur['stages'][k] > (1.+self.tol)*base['stages'][k] and         \
+              cur['stages'][k] - base['stages'][k] > self.min_wall:
+                messages.append('stage %s %.2f s (baseline %.2f s)' % (k, cur['stages'][k], base['stages'][k]));
+
+        # Baselines saved before stage memory was recorded have none
+        for k in sorted(cur['stage_rss']):
+            if k not in base.get('stage_rss',{}):
+                continue;
+            if cur['stage_rss'][k] > (1.+self.rss_tol)*base['stage_rss'][k] and \
+              cur['stage_rss'][k] - base['stage_rss'][k] > self.min_rss:
+                messages.append('stage %s peak memory %.1f MB (baseline %.1f MB)' % (k, cur['stage_rss'][k], base['stage_rss'][k]));
+
+        return messages;
+
+    def save_baseline(self, records):
+
+        # Medians of the records become the baseline of their cases
+
+        for r in records:
+            base = dict(r['median']);
+            base['commit'] = r['commit'];
+            base['date'] = r['date'];
+            base['host'] = r['host'];
+            self.baseline[r['case']] = base;
+
+        f = open(self.baseline_file,'w');
+        json.dump(self.baseline, f, indent=2, sort_keys=True);
+        f.write('\n');
+        f.close();
+
+
+def medians(runs):
+
+    # Median wall time, CPU time, peak memory, and stage wall times and peak
+    # memory of runs
+
+    med = {};
+    for k in ['wall', 'cpu', 'peak_rss']:
+        med[k] = float(np.median([r[k] for r in runs]));
+
+    for s in ['stages', 'stage_rss']:
+        med[s] = {};
+        for r in runs:
+            for k in r[s]:
+                med[s][k] = 0.;
+        for k in med[s]:
+            med[s][k] = float(np.median([r[s].get(k,0.) for r in runs]));
+
+    return med;
+
+def session_info():
+
+    # Environment of the benchmark session
+
+    info = {};
+    info['date'] = time.strftime('%Y-%m-%d %H:%M:%S');
+    info['host'] = socket.gethostname();
+    info['platform'] = platform.platform();
+    info['python'] = platform.python_version();
+
+    try:
+        import multiprocessing
+        info['ncpus'] = multiprocessing.cpu_count();
+    except NotImplementedError:
+        info['ncpus'] = 0;
+
+    try:
+        info['loadavg'] = os.getloadavg()[0];
+    except OSError:
+        info['loadavg'] = -1.;
+
+    # git commit (and local changes) of the MULTI-F tree
+    rootdir = os.path.dirname(os.path.abspath(__file__));
+    try:
+        commit = subprocess.check_output(['git','rev-parse','--short','HEAD'],
+            cwd=rootdir, stderr=subprocess.STDOUT).strip();
+        status = subprocess.check_output(['git','status','--porcelain','-uno'],
+            cwd=rootdir, stderr=subprocess.STDOUT).strip();
+        if status:
+            commit = commit + '+local';
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown';
+    info['commit'] = commit;
+
+    return info;
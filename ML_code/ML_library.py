@@ -23,14 +23,18 @@ import cPickle
 # 2. prepTest
 # 3. trainAdaboost
 # 4. testEnsemble
+# 5. normalizeFeature
+# 6. normalizeStatistics
 
-def prepTrain(feature, target, config):
+def prepTrain(feature, target, config, normalize_dict=None):
 
 # input list
 #
 # ----------
 # 
 # feature, target, config
+# normalize_dict (optional): statistics computed beforehand, e.g. streamed
+#   from the training file by normalizeStatistics
 
 # output list
 # 
@@ -43,16 +47,20 @@ def prepTrain(feature, target, config):
     normalize_scheme = config.get('normalize_scheme',None)
 
 # 1. preprocessing on target
-    df_beta = pd.DataFrame(target, columns=['beta'])
-    df_beta_new = pd.DataFrame()
-    mean_beta = df_beta['beta'].mean()
-    std_beta = df_beta['beta'].std()
+    target = np.asarray(target, dtype=float).ravel()
+    if normalize_dict is None:
+        mean_beta = target.mean()
+        std_beta = target.std(ddof=1)
+    else:
+        mean_beta = normalize_dict['target']['mean']
+        std_beta = normalize_dict['target']['std']
     
     ## show target distribution before normal    
-    if config['verbose'] == True: df_beta.hist(column='beta', xlabelsize=12, xrot = 45, figsize=(14,8),bins = 1000) 
+    if config['verbose'] == True: pd.DataFrame(target, columns=['beta']).hist(column='beta', xlabelsize=12, xrot = 45, figsize=(14,8),bins = 1000) 
 
     # centralize target
-    df_beta_new['beta'] = df_beta['beta'].apply(lambda x: (x - mean_beta)/std_beta)
+    beta_new = (target - mean_beta)/std_beta
+    df_beta_new = pd.DataFrame(beta_new, columns=['beta'])
     print 'std of target', std_beta
     print 'mean of target', mean_beta
 
@@ -66,7 +74,7 @@ def prepTrain(feature, target, config):
 
 # 3. preprocessing on features
     X = feature
-    Y = np.vstack((df_beta_new['beta'].values))
+    Y = beta_new.reshape(-1,1)
 # X = np.vstack((p1,p2,p3))
 # X = X.T
 # Y = np.vstack((df_beta_new['beta'].values))
@@ -92,25 +100,25 @@ def prepTrain(feature, target, config):
 # # 3.1.3 show the statistics of feature space
     print df.describe()
 
-# # 3.2 normalize on feature space
-    df_new = pd.DataFrame()
-    normalize_dict = {}
+# # 3.2 normalize on feature space (column-wise)
+    if normalize_dict is None:
+        normalize_dict = {}
+    X_new = np.empty(X.shape)
     for i in range(nfeature):
         featureName = col_names[i]
-        featureNormalizeScheme = normalize_scheme[i]
-
-        if featureNormalizeScheme == 'normal':
-            df_new[featureName] = df[featureName]
-        elif featureNormalizeScheme == 'log-normal':
-            df_new[featureName] = df[featureName].apply(lambda x: np.log10(x+eps))
-        elif featureNormalizeScheme == 'sqrt-normal':
-            df_new[featureName] = df[featureName].apply(lambda x: np.sqrt(x+eps))
-        
-        mean_p = df_new[featureName].mean()
-        std_p  = df_new[featureName].std()
-        normalize_dict[featureName] = {'mean':mean_p, 'std':std_p }
 
-        df_new[featureName] = df_new[featureName].apply(lambda x: (x-mean_p)/std_p)
+        X_new[:,i] = normalizeFeature(X[:,i], normalize_scheme[i], eps)
+
+        if featureName not in normalize_dict:
+            mean_p = X_new[:,i].mean()
+            std_p  = X_new[:,i].std(ddof=1)
+            normalize_dict[featureName] = {'mean':mean_p, 'std':std_p }
+        mean_p = normalize_dict[featureName]['mean']
+        std_p  = normalize_dict[featureName]['std']
+
+        X_new[:,i] -= mean_p
+        X_new[:,i] /= std_p
+    df_new = pd.DataFrame(X_new, columns=col_names)
 
 # # 3.3 display the normalized feature space for scatter matrix
     if config['verbose'] == True: scatter_matrix(df_new,alpha=0.05, figsize=(16,8),diagonal='kde')
@@ -205,28 +213,22 @@ def prepTest(featureTest, config, normalize_dict):
     # normalize testing data
     # test features need to be numpy ndarray
 
-    df_test = pd.DataFrame()
-    df_test_new = pd.DataFrame()
-
     col_names = config['col_names'];
     nfeature = featureTest.shape[1]
 
+    X_test = np.empty(featureTest.shape)
     for i in range(nfeature): 
         featureName = col_names[i]
-        featureNormalizeScheme = normalize_scheme[i]
- 
-        df_test[featureName] = featureTest[:,i]
 
-        if featureNormalizeScheme == 'normal':
-            df_test_new[featureName] = df_test[featureName]
-        elif featureNormalizeScheme == 'log-normal':
-            df_test_new[featureName] = df_test[featureName].apply(lambda x: np.log10(x+eps))
-        elif featureNormalizeScheme == 'sqrt-normal':
-            df_test_new[featureName] = df_test[featureName].apply(lambda x: np.sqrt(x+eps))
+        X_test[:,i] = normalizeFeature(featureTest[:,i], normalize_scheme[i], eps)
 
         mean_p = normalize_dict[featureName]['mean']
         std_p  = normalize_dict[featureName]['std']
-        df_test_new[featureName] = df_test_new[featureName].apply(lambda x: (x-mean_p)/std_p)
+        X_test[:,i] -= mean_p
+        X_test[:,i] /= std_p
+
+    df_test = pd.DataFrame(featureTest, columns=col_names[:nfeature])
+    df_test_new = pd.DataFrame(X_test, columns=col_names[:nfeature])
 
     # # 1. report statistical information for testing features
     if False:
@@ -320,14 +322,63 @@ def testEnsemble(ensemble_model, df_test_new, config):
 
 
 
+def normalizeFeature(x, featureNormalizeScheme, eps):
+
+    # transform of a feature column (numpy array) before it is centered and
+    # scaled: 'normal', 'log-normal' or 'sqrt-normal'
+
+    if featureNormalizeScheme == 'normal':
+        return np.asarray(x, dtype=float)
+    elif featureNormalizeScheme == 'log-normal':
+        return np.log10(x+eps)
+    elif featureNormalizeScheme == 'sqrt-normal':
+        return np.sqrt(x+eps)
+
+    raise ValueError('unknown normalize scheme %s' % featureNormalizeScheme)
 
 
 
 
+def normalizeStatistics(chunks, config):
 
+    # normalize_dict (mean and std of the transformed features and of the
+    # target) computed in one pass over chunks of (feature, target) arrays,
+    # so that the training set does not have to fit in memory. The
+    # statistics of the chunks are merged with the pairwise formulas of
+    # Chan et al., and std uses ddof=1 as prepTrain
 
+    eps = config.get('eps',1e-6)
+    normalize_scheme = config['normalize_scheme']
 
+    n = 0
+    mean = None
+    M2 = None
 
+    for feature, target in chunks:
+        Z = np.empty((feature.shape[0], feature.shape[1]+1))
+        for i in range(feature.shape[1]):
+            Z[:,i] = normalizeFeature(feature[:,i], normalize_scheme[i], eps)
+        Z[:,-1] = np.ravel(target)
 
+        nb = Z.shape[0]
+        if nb == 0:
+            continue
+        mean_b = Z.mean(0)
+        M2_b = ((Z-mean_b)**2).sum(0)
 
+        if n == 0:
+            mean, M2 = mean_b, M2_b
+        else:
+            delta = mean_b - mean
+            mean = mean + delta*nb/float(n+nb)
+            M2 = M2 + M2_b + delta**2*n*nb/float(n+nb)
+        n += nb
+
+    std = np.sqrt(M2/(n-1))
+
+    normalize_dict = {}
+    for i in range(len(mean)-1):
+        normalize_dict['p'+str(i+1)] = {'mean':mean[i], 'std':std[i] }
+    normalize_dict['target'] = { 'mean':mean[-1], 'std':std[-1] }
 
+    return normalize_dict
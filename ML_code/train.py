@@ -1,51 +1,73 @@
 from pylab import *
 import cPickle
 import sys
-from ML_library import prepTrain, prepTest, trainAdaboost, testEnsemble
+from itertools import islice
+from ML_library import prepTrain, prepTest, trainAdaboost, testEnsemble, normalizeStatistics
 
-def read_fann_format(filename):
+def read_fann_chunks(filename, chunk=1000000):
+    # generator of (feature, target) arrays of at most chunk samples read
+    # from a FANN training file: a header line "n nfeature ntarget", then
+    # for each sample a line of features and a line of targets
     with open(filename, "r") as f:
-        content = f.readlines()
-    header = content[0]
-    features = content[1::2]
-    beta = content[2::2]
-    assert(len(beta) == len(features))
-    n = len(beta)
-    
-    beta_array = np.zeros(n)
-    p1 = np.zeros_like(beta_array)
-    p2 = np.zeros_like(beta_array)
-    p3 = np.zeros_like(beta_array)
-    
-    for i in range(n):
-        beta_array[i] = float(beta[i])
-        fl = features[i].replace("\n", "").split(",")
-        p1[i] = float(fl[0])
-        p2[i] = float(fl[1])
-        p3[i] = float(fl[2])
-    return p1, p2, p3, beta_array
+        header = f.readline().split()
+        nin = int(header[1])
+        nout = int(header[2])
+        while True:
+            lines = list(islice(f, 2*chunk))
+            if len(lines) == 0:
+                break
+            values = np.fromstring("".join(lines).replace(",", " "), sep=" ")
+            values = values.reshape(-1, nin+nout)
+            yield values[:,:nin], values[:,nin:]
+
+def read_fann_format(filename, chunk=1000000):
+    # features (n x nfeature) and target (n, or n x ntarget) of a FANN
+    # training file, parsed by chunks into preallocated arrays
+    with open(filename, "r") as f:
+        header = f.readline().split()
+    n, nin, nout = [int(v) for v in header[:3]]
+
+    feature = np.empty((n, nin))
+    target = np.empty((n, nout))
+    i = 0
+    for p, b in read_fann_chunks(filename, chunk):
+        feature[i:i+len(p)] = p
+        target[i:i+len(b)] = b
+        i += len(p)
+    assert(i == n)
+
+    if nout == 1:
+        target = target[:,0]
+    return feature, target
 
 # read training data
-p1, p2, p3, beta = read_fann_format("train.dat")
+train_feature, beta = read_fann_format("train.dat")
 
 # read features file
-pid, p1_t, p2_t, p3_t = np.loadtxt("sample_features.dat", unpack=True)
+sample_features = np.loadtxt("sample_features.dat")
+pid = sample_features[:,0]
+test_feature = sample_features[:,1:]
 
 config = {}
 config['eps'] = 1e-6
 config['verbose'] = False
 config['cv_folds'] = 2
 config['normalize_scheme'] = ['log-normal', 'log-normal','sqrt-normal']
+config['stream_statistics'] = False
 
 config['adaboost'] = {'max_depth':16, 'loss':'square', 'lr':0.05, 'n_est':1500 }
 
 ##################### prepare data #####################################
-train_feature = np.array([p1,p2,p3]).T
-train_target = np.array(beta)
-test_feature = np.array([p1_t, p2_t, p3_t]).T
+train_target = beta
+
+# normalization statistics: computed by prepTrain from the arrays, or in
+# one pass over the file by chunks when it does not fit in memory
+normalize_dict = None
+if config['stream_statistics']:
+    normalize_dict = normalizeStatistics(read_fann_chunks("train.dat"), config)
 
 ##################### training & testing data ##########################
-df_train_feature, normalize_dict, config, Y_train = prepTrain(train_feature, train_target, config)
+df_train_feature, normalize_dict, config, Y_train = prepTrain(train_feature, train_target, config, normalize_dict)
 
 ensemble_model = trainAdaboost( df_train_feature, Y_train, config )
 del ensemble_model
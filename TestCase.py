@@ -36,6 +36,17 @@ class TestCase:
         
         # Comparison information
         self.compare_file = 'results_general.out';
+        
+        # Benchmark information (see Benchmark.py): when benchmark is set, the
+        # stage profile of the run is written (PROFILE= YES) and the
+        # environment is fixed. Measurements of the last run: wall and CPU
+        # time (s), peak memory (MB) of MULTI-F and its child processes, and
+        # (stage, wall, cpu, peak_rss, calls) of each stage
+        self.benchmark = 0;
+        self.wall_time = 0.;
+        self.cpu_time = 0.;
+        self.peak_rss = 0.;
+        self.stages = [];
      
     # return -1 for failure tolerance exceeded
     # return -2 for difference tolerance exceeded
@@ -160,12 +171,13 @@ class TestCase:
         # Go to MULTI-F directory and run all tests from here
         #os.chdir(self.multif_dir);
         
-        # Create directory to run test in 
-        if not os.path.isdir('local'):
+        # Create directory to run test in (tests may run concurrently)
+        try:
             os.mkdir('local');
-            os.chdir('local');
-        else:
-            os.chdir('local');
+        except OSError:
+            if not os.path.isdir('local'):
+                raise;
+        os.chdir('local');
             
         if os.path.isdir(self.name):
             shutil.rmtree(self.name);
@@ -187,6 +199,18 @@ class TestCase:
         shutil.copyfile(os.path.join(self.multif_dir,'runModel.py'),'runModel.py');
         for f in self.dependencies:
             shutil.copyfile(os.path.join(self.multif_dir,self.cfg_dir,f),f);
+        
+        # Enable the stage profiler
+        if self.benchmark:
+            f = open(self.cfg_file,'a');
+            f.write('\nPROFILE= YES\nPROFILE_NAME= profile.dat\n');
+            f.close();
+        
+        # Environment of the run (fixed for benchmarks)
+        env = dict(os.environ);
+        if self.benchmark:
+            env['OMP_NUM_THREADS'] = str(self.cpus_per_task);
+            env['PYTHONHASHSEED'] = '0';
             
         # Build shell command to run MULTI-F
         command = ['python','%s/runModel.py'%self.multif_dir,'-f',self.cfg_file,'-l',str(self.fidelity),'-n',str(self.ntasks),'-c',str(self.cpus_per_task)];
@@ -206,7 +230,14 @@ class TestCase:
             sys.stdout.write('\nRunning test case %s\n' % self.name);
             sys.stdout.write('Working directory: %s\n' % os.getcwd());
             sys.stdout.write('Comparison data file: %s\n' % os.path.join(self.multif_dir,self.compare_file));
-            subprocess.call(command,stdout=so,stderr=se);
+            t0 = time.time();
+            process = subprocess.Popen(command,stdout=so,stderr=se,env=env);
+            # Resource usage of MULTI-F and all its child processes
+            pid, status, usage = os.wait4(process.pid,0);
+            process.returncode = status;
+            self.wall_time = time.time() - t0;
+            self.cpu_time = usage.ru_utime + usage.ru_stime;
+            self.peak_rss = usage.ru_maxrss/1024.;
             so.close();
             se.close();
         except:
@@ -239,6 +270,14 @@ class TestCase:
 #                timed_out = 1;
 #                passed = 0;
         
+        # Read the stage profile
+        self.stages = [];
+        if self.benchmark and os.path.isfile('profile.dat'):
+            for line in open('profile.dat','r'):
+                linelist = line.split();
+                if( len(linelist) == 5 and not line.startswith('#') ):
+                    self.stages.append((linelist[0], float(linelist[1]), float(linelist[2]), float(linelist[3]), int(linelist[4])));
+        
         # Examine and compare output
         
         return_flag = self.compare_responses();        
@@ -278,6 +317,10 @@ class TestCase:
         # Closing remarks
         f = open(self.log_file,'a');
         f.write('Test duration: %.2f min\n' % (running_time/60.) );
+        if self.benchmark:
+            f.write('Wall time %.2f s, CPU time %.2f s, peak memory %.1f MB\n' % (self.wall_time, self.cpu_time, self.peak_rss));
+            for stage in self.stages:
+                f.write('  %-14s %10.2f s\n' % (stage[0], stage[1]));
         f.write('===================== End Test: %s =====================\n\n' % self.name);
         f.close();
 
@@ -286,3 +329,82 @@ class TestCase:
         os.chdir(self.working_dir);
         
         return passed;
+
+
+def cores(test):
+    
+    # Number of cores used by a test case
+    return max(1, int(test.ntasks)*int(test.cpus_per_task));
+
+def run_test_process(index, test, queue):
+    
+    # Run a test case in a child process and send its pass flag
+    try:
+        passed = test.run_test();
+    except BaseException:
+        passed = 0;
+    queue.put((index, passed));
+
+def run_tests(test_list, ncores, log_file):
+    
+    # Run test cases concurrently, each in its own process and directory, so
+    # that the cores they use (ntasks x cpus_per_task) do not exceed ncores.
+    # A case using more than ncores cores runs alone. The largest pending case
+    # which fits in the free cores is started first.
+    # Returns the pass flags in the order of test_list; the logs of the test
+    # cases are appended to log_file in the same order
+    
+    import multiprocessing, Queue
+    
+    log_file = os.path.abspath(log_file);
+    for test in test_list:
+        test.log_file = '%s.%s' % (log_file, test.name);
+        if os.path.isfile(test.log_file):
+            os.remove(test.log_file);
+    
+    queue = multiprocessing.Queue();
+    
+    pending = sorted(range(len(test_list)), key=lambda i: -cores(test_list[i]));
+    running = {}; # index: (process, cores)
+    passed = [0]*len(test_list);
+    
+    while len(pending) > 0 or len(running) > 0:
+        
+        # Start the pending cases which fit in the free cores
+        free = ncores - sum([running[i][1] for i in running]);
+        for i in list(pending):
+            need = min(cores(test_list[i]), ncores);
+            if need <= free:
+                p = multiprocessing.Process(target=run_test_process,
+                    args=(i, test_list[i], queue));
+                p.start();
+                running[i] = (p, need);
+                pending.remove(i);
+                free = free - need;
+        
+        # Wait for a case to finish
+        try:
+            i, flag = queue.get(True, 1.);
+            passed[i] = flag;
+            running.pop(i)[0].join();
+        except Queue.Empty:
+            # Cases whose process died without sending a flag
+            for i in list(running):
+                p = running[i][0];
+                if not p.is_alive() and p.exitcode != 0:
+                    sys.stdout.write('\nTest case %s: process died (exit code %s)\n' % (test_list[i].name, p.exitcode));
+                    passed[i] = 0;
+                    running.pop(i);
+    
+    # Combined log, in the order of test_list
+    f = open(log_file,'a');
+    for test in test_list:
+        if os.path.isfile(test.log_file):
+            g = open(test.log_file,'r');
+            f.write(g.read());
+            g.close();
+            os.remove(test.log_file);
+        test.log_file = log_file;
+    f.close();
+    
+    return passed;
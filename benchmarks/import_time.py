@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Import-time benchmark for MULTI-F.
+
+Imports the multif package (or a given submodule) in fresh interpreters, as
+happens for every DAKOTA fork-per-evaluation run, and reports the wall time
+taken. The set of modules loaded as a side effect is also checked: plotting,
+scipy, the fidelity-specific subpackages and the SU2 optimization tools must
+not be loaded by a plain `import multif`.
+
+Returns exit code 1 if a forbidden module is loaded or if the median import
+time exceeds the limit given with --max-time.
+
+Usage: python benchmarks/import_time.py [-r REPEAT] [-t MAX_TIME] [-m MODULE]
+"""
+
+import os, sys, subprocess
+
+from optparse import OptionParser
+
+# Modules which should only be imported when actually used
+HEAVY_MODULES = ['matplotlib',
+                 'scipy',
+                 'multif.LOWF',
+                 'multif.MEDIUMF',
+                 'multif.HIGHF',
+                 'multif.gradients',
+                 'multif.samples',
+                 'multif.visu',
+                 'multif._mshint_module',
+                 'multif._nozzle_module',
+                 'multif.SU2.run',
+                 'multif.SU2.mesh',
+                 'multif.SU2.eval',
+                 'multif.SU2.opt',
+                 'multif.SU2.amginria'];
+
+# Executed in a fresh interpreter; prints import time and heavy modules loaded
+SNIPPET = """
+import sys, time
+t0 = time.time()
+import %s
+t1 = time.time()
+heavy = %r
+loaded = [m for m in heavy if m in sys.modules]
+sys.stdout.write('%%0.6f %%s\\n' %% (t1-t0, ','.join(loaded)))
+"""
+
+def importTime(module, rootdir):
+
+    env = dict(os.environ);
+    if 'PYTHONPATH' in env and env['PYTHONPATH']:
+        env['PYTHONPATH'] = rootdir + os.pathsep + env['PYTHONPATH'];
+    else:
+        env['PYTHONPATH'] = rootdir;
+
+    out = subprocess.check_output([sys.executable, '-c',
+        SNIPPET % (module, HEAVY_MODULES)], env=env);
+    line = out.strip().splitlines()[-1].split(' ');
+
+    t = float(line[0]);
+    loaded = [m for m in line[1].split(',') if m] if len(line) > 1 else [];
+
+    return t, loaded;
+
+
+def main():
+
+    parser = OptionParser();
+    parser.add_option("-r", "--repeat", dest="repeat", default=10,
+                      help="number of fresh interpreters to time",
+                      metavar="REPEAT");
+    parser.add_option("-t", "--max-time", dest="maxTime", default=None,
+                      help="fail if median import time (s) exceeds MAX_TIME",
+                      metavar="MAX_TIME");
+    parser.add_option("-m", "--module", dest="module", default="multif",
+                      help="module to import", metavar="MODULE");
+    (options, args) = parser.parse_args();
+
+    repeat = int(options.repeat);
+    rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)));
+
+    times = [];
+    loaded = [];
+    for i in range(repeat):
+        t, loaded = importTime(options.module, rootdir);
+        times.append(t);
+    times.sort();
+    median = times[len(times)/2];
+
+    sys.stdout.write('import %s: min %.1f ms, median %.1f ms, max %.1f ms '
+        '(%i runs)\n' % (options.module, 1e3*times[0], 1e3*median,
+        1e3*times[-1], repeat));
+
+    status = 0;
+
+    if options.module == 'multif' and len(loaded) > 0:
+        sys.stdout.write('  ## ERROR : the following modules are imported '
+            'eagerly: %s\n' % ', '.join(loaded));
+        status = 1;
+    elif len(loaded) > 0:
+        sys.stdout.write('Modules loaded: %s\n' % ', '.join(loaded));
+
+    if options.maxTime is not None and median > float(options.maxTime):
+        sys.stdout.write('  ## ERROR : median import time exceeds %s s\n'
+            % options.maxTime);
+        status = 1;
+
+    sys.exit(status);
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""
+Microbenchmarks of the geometry, mass and low-fidelity kernels of MULTI-F.
+
+The nozzles of example/general.cfg (2D parameterization, low-fidelity) and
+example/general-3d.cfg (3D parameterization, high-fidelity) are set up once,
+then each kernel is timed at several problem sizes (number of evaluation
+points, of calls, or of geometry breakpoints):
+
+  bspline_radius       Bspline.radius (inner wall)
+  bspline_area_grad    Bspline.areaGradient (inner wall)
+  bspline_geometry_c   bSplineGeometryC (inner wall)
+  piecewise_linear     PiecewiseLinear.radius (layer thickness, 2D)
+  piecewise_bilinear   PiecewiseBilinear.height (layer thickness, 3D)
+  radial_coordinates   radialCoordinatesInGlobalFrame (3D), theta points
+  thermal_conductivity Material.getThermalConductivity of all layers, calls
+  volume_mass_2d       calcVolumeAndMass, 2D (fixed size)
+  volume_mass_3d       calcVolumeAndMass, 3D (fixed size)
+  quasi1d_analyze      quasi1dnozzle.analyze, wall geometry breakpoints
+
+For each kernel and size, the best time per call of REPEAT measurements is
+reported with the throughput (size/s) and the scaling exponent w.r.t. the
+previous size (1: linear). Results can be written to a JSON file (-o) to
+compare the kernels before and after a change.
+
+Usage: python benchmarks/kernels.py [-r REPEAT] [-k KERNEL] [-s SIZES] [-o FILE]
+"""
+
+import os, sys, time, json, math
+
+from optparse import OptionParser
+
+import numpy as np
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)));
+sys.path.insert(0, rootdir);
+
+import multif
+
+# Minimum duration of a measurement (s): fast kernels are called in a loop
+MIN_TIME = 0.05;
+
+def timeKernel(fun, repeat):
+
+    # Best time (s) per call of fun()
+
+    fun(); # warm up (caches, lazy imports)
+
+    number = 1;
+    while True:
+        t0 = time.time();
+        for i in range(number):
+            fun();
+        t = time.time() - t0;
+        if t >= MIN_TIME or number >= 1e6:
+            break;
+        number = number*10;
+
+    best = t/number;
+    for r in range(repeat-1):
+        t0 = time.time();
+        for i in range(number):
+            fun();
+        best = min(best, (time.time() - t0)/number);
+
+    return best;
+
+def setupNozzle(cfg_file, flevel):
+
+    # Nozzle of an example configuration (run from its directory, so that
+    # its DV file is found)
+
+    curdir = os.getcwd();
+    os.chdir(os.path.join(rootdir, 'example'));
+
+    os.environ.setdefault('SU2_RUN', '');
+
+    stdout = sys.stdout;
+    sys.stdout = open(os.devnull, 'w');
+    try:
+        config = multif.SU2.io.Config(cfg_file);
+        nozzle = multif.nozzle.NozzleSetup(config, flevel, output='quiet');
+    finally:
+        sys.stdout.close();
+        sys.stdout = stdout;
+        os.chdir(curdir);
+
+    return nozzle;
+
+#==============================================================================
+# Kernels: name: function(nozzle2d, nozzle3d, size) returning the callable
+# to time. None as size list: fixed size
+#==============================================================================
+
+def _wallPoints(nozzle, n):
+    geo = nozzle.wall.geometry;
+    return np.linspace(geo.xstart, geo.xend, n);
+
+def _bsplineRadius(n2d, n3d, n):
+    x = _wallPoints(n2d, n);
+    return lambda: n2d.wall.geometry.radius(x);
+
+def _bsplineAreaGradient(n2d, n3d, n):
+    x = _wallPoints(n2d, n);
+    return lambda: n2d.wall.geometry.areaGradient(x);
+
+def _bsplineGeometryC(n2d, n3d, n):
+    x = _wallPoints(n2d, n);
+    return lambda: multif.nozzle.geometry.bSplineGeometryC(x, n2d.wall.geometry);
+
+def _piecewiseLinear(n2d, n3d, n):
+    thk = [l.thickness for l in n2d.wall.layer if l.thickness.type == 'piecewise-linear'][0];
+    x = np.linspace(thk.xstart, thk.xend, n);
+    return lambda: thk.radius(x);
+
+def _piecewiseBilinear(n2d, n3d, n):
+    thk = [l.thickness for l in n3d.wall.layer if l.thickness.type == 'piecewise-bilinear'][0];
+    rng = np.random.RandomState(0);
+    x = rng.uniform(thk.xaxis[0], thk.xaxis[-1], n);
+    y = rng.uniform(thk.yaxis[0], thk.yaxis[-1], n);
+    return lambda: thk.height(x, y);
+
+def _radialCoordinates(n2d, n3d, n):
+    theta = np.linspace(0., np.pi, n);
+    geo = n3d.wall.centerline.geometry;
+    xc = 0.5*(geo.xstart + geo.xend);
+    return lambda: multif.nozzle.geometry.radialCoordinatesInGlobalFrame(n3d, xc, theta);
+
+def _thermalConductivity(n2d, n3d, n):
+    materials = [l.material for l in n2d.wall.layer + n3d.wall.layer];
+    def fun():
+        for i in range(n):
+            for m in materials:
+                m.getThermalConductivity(3);
+    return fun;
+
+def _volumeMass2d(n2d, n3d, n):
+    return lambda: multif.nozzle.geometry.calcVolumeAndMass(n2d);
+
+def _volumeMass3d(n2d, n3d, n):
+    return lambda: multif.nozzle.geometry.calcVolumeAndMass(n3d);
+
+def _quasi1dAnalyze(n2d, n3d, n):
+    from multif.LOWF import runlowf, quasi1dnozzle
+    inp = runlowf.Quasi1DInputs(n2d);
+    x = _wallPoints(n2d, n);
+    inp['xgeo'] = list(x);
+    inp['rgeo'] = list(n2d.wall.geometry.radius(x));
+    def fun():
+        out = [[] for i in range(9)];
+        quasi1dnozzle.analyze(*([inp[k] for k in runlowf.Q1D_ARGS] + out));
+    return fun;
+
+KERNELS = [
+    ('bspline_radius',       _bsplineRadius,       [100, 1000, 10000, 100000]),
+    ('bspline_area_grad',    _bsplineAreaGradient, [100, 1000, 10000, 100000]),
+    ('bspline_geometry_c',   _bsplineGeometryC,    [100, 1000, 10000, 100000]),
+    ('piecewise_linear',     _piecewiseLinear,     [100, 1000, 10000, 100000]),
+    ('piecewise_bilinear',   _piecewiseBilinear,   [100, 1000, 10000, 100000]),
+    ('radial_coordinates',   _radialCoordinates,   [50, 100, 200, 400]),
+    ('thermal_conductivity', _thermalConductivity, [1, 10, 100, 1000]),
+    ('volume_mass_2d',       _volumeMass2d,        None),
+    ('volume_mass_3d',       _volumeMass3d,        None),
+    ('quasi1d_analyze',      _quasi1dAnalyze,      [1000, 2000, 4000, 8000]),
+];
+
+
+def main():
+
+    parser = OptionParser();
+    parser.add_option("-r", "--repeat", dest="repeat", default=5,
+                      help="number of measurements of each kernel and size",
+                      metavar="REPEAT");
+    parser.add_option("-k", "--kernel", dest="kernel", default=None,
+                      help="only run the kernels whose name contains KERNEL",
+                      metavar="KERNEL");
+    parser.add_option("-s", "--sizes", dest="sizes", default=None,
+                      help="comma-separated problem sizes (default: per kernel)",
+                      metavar="SIZES");
+    parser.add_option("-o", "--output", dest="output", default=None,
+                      help="write the results to a JSON file", metavar="FILE");
+    (options, args) = parser.parse_args();
+
+    repeat = int(options.repeat);
+
+    n2d = setupNozzle('general.cfg', 0);
+    n3d = setupNozzle('general-3d.cfg', 5);
+
+    sys.stdout.write('%-22s %10s %14s %14s %8s\n' % ('kernel', 'size',
+        'time/call (s)', 'throughput/s', 'scaling'));
+
+    results = [];
+
+    for name, setup, sizes in KERNELS:
+
+        if options.kernel is not None and options.kernel not in name:
+            continue;
+
+        if sizes is not None and options.sizes is not None:
+            sizes = [int(s) for s in options.sizes.split(',')];
+
+        prev = None;
+        for n in (sizes or [1]):
+
+            try:
+                t = timeKernel(setup(n2d, n3d, n), repeat);
+            except Exception as e:
+                sys.stdout.write('%-22s %10d  ## ERROR : %s\n' % (name, n, e));
+                break;
+
+            scaling = '';
+            if prev is not None and t > 0 and prev[1] > 0:
+                scaling = '%8.2f' % (math.log(t/prev[1])/math.log(float(n)/prev[0]));
+            prev = (n, t);
+
+            sys.stdout.write('%-22s %10s %14.4e %14.4e %8s\n' % (name,
+                n if sizes is not None else '-', t, n/t if t > 0 else 0.,
+                scaling));
+
+            results.append({'kernel': name, 'size': n, 'time': t});
+
+    if options.output is not None:
+        f = open(options.output, 'w');
+        json.dump(results, f, indent=1);
+        f.close();
+        sys.stdout.write('Results written to %s\n' % options.output);
+
+
+if __name__ == '__main__':
+    main()
@@ -7,10 +7,26 @@ from copy import deepcopy
 from scipy.optimize import nnls
 from scipy.linalg import orth
 
-from util import linprog
+from util import linprog, LinearProgram
 
 __all__ = ['Domain', 'ComboDomain', 'BoxDomain', 'UniformDomain', 'NormalDomain', 'LogNormalDomain', 'LinIneqDomain', 'ConvexDomain'] 
 
+def box_extent(x, p, lb, ub):
+	""" Distance along p to the boundary of the box lb <= x <= ub, for one or
+	several points x and directions p (rows of 2-D arrays, broadcast against
+	each other). Returns 0 when p points outside from the boundary.
+	"""
+	X, P = np.broadcast_arrays(np.atleast_2d(x), np.atleast_2d(p))
+	with np.errstate(divide = 'ignore', invalid = 'ignore'):
+		Y = np.hstack([(ub - X)/P, (lb - X)/P])
+	Y[~(Y > 0)] = np.inf
+	alpha = np.min(Y, axis = 1)
+	
+	# If on the boundary, the direction needs to point inside the domain
+	alpha[np.any((lb == X) & (P < 0), axis = 1)] = 0
+	alpha[np.any((ub == X) & (P > 0), axis = 1)] = 0
+	return alpha
+
 def auto_root(dist): 
 	# construct initial bracket
 	a = 0.0
@@ -46,6 +62,7 @@ class Domain(object):
 	def isinside(self, x):
 		"""Determines if a point is inside the domain
 
+		For an np.ndarray(N, m) of points, returns an np.ndarray(N) of booleans
 		"""
 		raise NotImplementedError
 
@@ -55,19 +72,26 @@ class Domain(object):
 
 		Parameters
 		----------
-		x : np.ndarray(m)
-			Starting point in the domain
+		x : np.ndarray(m) or np.ndarray(N, m)
+			Starting point(s) in the domain
 
-		p : np.ndarray(m)
-			Direction from p in which to head towards the boundary
+		p : np.ndarray(m) or np.ndarray(N, m)
+			Direction(s) from x in which to head towards the boundary
 
 		Returns
 		-------
-		alpha: float
-			Distance to boundary along direction p
+		alpha: float or np.ndarray(N)
+			Distance to boundary along direction p, for each row of x and p 
+			if either is 2-D (a single point or direction is used for all rows)
 		"""
 		raise NotImplementedError
 
+	def _extent_rows(self, x, p):
+		""" Extent for several points/directions, one at a time
+		"""
+		X, P = np.broadcast_arrays(np.atleast_2d(x), np.atleast_2d(p))
+		return np.array([self.extent(xx, pp) for xx, pp in zip(X, P)])
+
 	def normalize(self, x):
 		""" Given a point in the application space, convert it to normalized units
 		"""
@@ -106,27 +130,36 @@ class Domain(object):
 		return np.linalg.norm(x - y)**2
 
 
+	def _range(self, U, A, b, lb, ub):
+		""" Range of U^T x over {x: A x <= b and lb <= x <= ub} for each column of U.
+		All the linear programs share the same constraints (see LinearProgram).
+		"""
+		U = np.array(U)
+		single = len(U.shape) == 1 or U.shape[1] == 1
+		U = U.reshape(U.shape[0], -1)
+		assert U.shape[0] == self.center.shape[0], "U has wrong dimensions"
+		lp = LinearProgram(A_ub = A, b_ub = b, lb = lb, ub = ub)
+		ranges = np.zeros((U.shape[1], 2))
+		for j in range(U.shape[1]):
+			xp = lp.solve(-U[:,j])
+			xn = lp.solve(U[:,j])
+			ranges[j] = np.sort([np.dot(U[:,j], xn), np.dot(U[:,j], xp)])
+		if single:
+			return ranges[0]
+		return ranges
+
 	def range_norm(self, U_norm):
 		""" Compute range along U_norm in the normalized space 
+
+		U_norm : np.ndarray(m) for one direction, or np.ndarray(m, k) for k 
+			directions, in which case an np.ndarray(k, 2) of ranges is returned
 		"""
-		U_norm = U_norm.flatten()
-		assert U_norm.shape[0] == self.center.shape[0], "U has wrong dimensions"
-		xp = linprog(-U_norm, A_ub = self.A_norm, b_ub = self.b_norm, lb = self.lb_norm, ub = self.ub_norm)
-		xn = linprog(U_norm, A_ub = self.A_norm, b_ub = self.b_norm, lb = self.lb_norm, ub = self.ub_norm)
-		min_range = np.dot(U_norm.T, xn)
-		max_range = np.dot(U_norm.T, xp)
-		return np.sort([min_range, max_range])
+		return self._range(U_norm, self.A_norm, self.b_norm, self.lb_norm, self.ub_norm)
 	
 	def range(self, U):
-		""" Compute range along U_norm in the normalized space 
+		""" Compute range along U in the application space (see range_norm)
 		"""
-		U = U.flatten()
-		assert U.shape[0] == self.center.shape[0], "U has wrong dimensions"
-		xp = linprog(-U, A_ub = self.A, b_ub = self.b, lb = self.lb, ub = self.ub)
-		xn = linprog(U, A_ub = self.A, b_ub = self.b, lb = self.lb, ub = self.ub)
-		min_range = np.dot(U.T, xn)
-		max_range = np.dot(U.T, xp)
-		return np.sort([min_range, max_range])
+		return self._range(U, self.A, self.b, self.lb, self.ub)
 
 
 	def build_equality_domain_norm(self, U_norm, y_norm):
@@ -192,10 +225,14 @@ class ComboDomain(Domain):
 		state = [dom.isinside(x_vec) for x_vec, dom in zip(self._split(x), self.domains)]
 		if verbose:
 			print state
+		if len(x.shape) == 2:
+			return np.all(state, axis = 0)
 		return all(state)
 
 	def extent(self, x, p):
 		alpha = [dom.extent(xx, pp) for dom, xx, pp in zip(self.domains, self._split(x), self._split(p))]
+		if len(x.shape) == 2 or len(p.shape) == 2:
+			return np.min(np.broadcast_arrays(*alpha), axis = 0)
 		return min(alpha)
 
 	def normalize(self, X):
@@ -331,7 +368,7 @@ class BoxDomain(Domain):
 				return False
 			return True
 		elif len(x.shape) == 2:
-			raise NotImplementedError
+			return np.all(x >= self.lb, axis = 1) & np.all(x <= self.ub, axis = 1)
 
 	#@doc_inherit	
 	def normalize(self, X):
@@ -378,22 +415,9 @@ class BoxDomain(Domain):
 			return app
 
 	def extent(self, x, p):
-		alpha = float('inf')
-		# Now check box constraints
-		I = np.nonzero(p)
-		y = (self.ub - x)[I]/p[I]
-		if np.sum(y>0) > 0:
-			alpha = min(alpha, np.min(y[y>0]))	
-	
-		y = (self.lb - x)[I]/p[I]
-		if np.sum(y>0) > 0:
-			alpha = min(alpha, np.min(y[y>0]))
-
-		# If on the boundary, the direction needs to point inside the domain
-		if np.any(p[self.lb == x] < 0):
-			alpha = 0
-		if np.any(p[self.ub == x] > 0):
-			alpha = 0	
+		alpha = box_extent(x, p, self.lb, self.ub)
+		if len(x.shape) == 1 and len(p.shape) == 1:
+			return alpha[0]
 		return alpha
 
 	def normalized_domain(self):
@@ -443,6 +467,8 @@ class NormalDomain(Domain):
 	def extent(self, x, p):
 		if self.clip is None:
 			return float('inf')
+		elif len(x.shape) == 2 or len(p.shape) == 2:
+			return self._extent_rows(x, p)
 		else:
 			assert self.isinside(x), "Starting point is not inside the domain"
 			def dist(alpha):
@@ -586,6 +612,8 @@ class LogNormalDomain(Domain):
 				return np.array([ x_ < self.clip for x_ in xx], dtype = np.bool)
 
 	def extent(self, x, p):
+		if len(x.shape) == 2 or len(p.shape) == 2:
+			return self._extent_rows(x, p)
 		assert self.isinside(x), "Starting point is not inside the domain"
 		# Check that the value doesn't go negative
 		alpha = float('inf')
@@ -826,30 +854,22 @@ class LinIneqDomain(BoxDomain, Domain):
 		if len(x.shape) == 1:
 			#print np.all(np.dot(self.A, x) <= self.b), np.all(self.lb <= x), np.all(x <= self.ub)
 			return np.all(np.dot(self.A, x) <= self.b + 1e-7) and np.all(self.lb - 1e-7 <= x) and np.all(x <= self.ub + 1e-7)	
+		elif len(x.shape) == 2:
+			return np.all(np.dot(x, self.A.T) <= self.b + 1e-7, axis = 1) & \
+				np.all(self.lb - 1e-7 <= x, axis = 1) & np.all(x <= self.ub + 1e-7, axis = 1)
 
 
 	def extent(self, x, p):
-		alpha = np.inf
+		X, P = np.atleast_2d(x), np.atleast_2d(p)
 		# positive extent
-		y = (self.b - np.dot(self.A, x)	)/np.dot(self.A, p)
-		if np.sum(y>0) > 0:
-			alpha = min(alpha, np.min(y[y>0]))
-		# Now check box constraints
-		I = np.nonzero(p)
-		y = (self.ub - x)[I]/p[I]
-		if np.sum(y>0) > 0:
-			alpha = min(alpha, np.min(y[y>0]))	
-	
-		y = (self.lb - x)[I]/p[I]
-		if np.sum(y>0) > 0:
-			alpha = min(alpha, np.min(y[y>0]))
-
-
-		# If on the boundary, the direction needs to point inside the domain
-		if np.any(p[self.lb == x] < 0):
-			alpha = 0
-		if np.any(p[self.ub == x] > 0):
-			alpha = 0	
+		with np.errstate(divide = 'ignore', invalid = 'ignore'):
+			Y = (self.b - np.dot(X, self.A.T))/np.dot(P, self.A.T)
+		Y[~(Y > 0)] = np.inf
+		alpha = np.min(Y, axis = 1) if Y.shape[1] > 0 else np.inf
+		# Now check box constraints (0 if p points outside from the boundary)
+		alpha = np.minimum(alpha, box_extent(X, P, self.lb, self.ub))
+		if len(x.shape) == 1 and len(p.shape) == 1:
+			return alpha[0]
 		return alpha
 
 
@@ -959,6 +979,8 @@ class ConvexDomain(BoxDomain):
 		return self.X.shape[1]
 
 	def isinside(self, x, tol = 1e-8):
+		if len(x.shape) == 2:
+			return np.array([self.isinside(xx, tol) for xx in x], dtype = bool)
 		A = np.vstack((self.X.T, np.ones(self.X.shape[0])))
 		y = np.hstack((x, np.array([1])))
 		c, rnorm = nnls(A, y)	
@@ -980,6 +1002,8 @@ class ConvexDomain(BoxDomain):
 
 
 	def extent(self, x, p):
+		if len(x.shape) == 2 or len(p.shape) == 2:
+			return self._extent_rows(x, p)
 		c = np.zeros(self.X.shape[0]+1)
 		c[-1] = -1.
 		A_eq = np.zeros((self.X.shape[1]+1,self.X.shape[0]+1))
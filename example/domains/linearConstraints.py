@@ -5,6 +5,10 @@ parameterization.
 Rick Fenrich 9/19/17
 """
 
+import os
+import shutil
+import multiprocessing
+
 import numpy as np
 from scipy import optimize
 
@@ -367,70 +371,257 @@ def cleanupConstraintMatrix(Alist=[],blist=[]):
     return A, b;
 
 
-# A hit and run method for sampling from a polytope.    
-def hitAndRun(N, A, b, lb, ub):
+# Chebyshev center of the polytope Az <= b (center of the largest inscribed
+# ball), used as a starting point for hit and run
+def chebyshevCenter(A, b):
 
     m, n = A.shape
-        
-    # Attempt to find initial feasible point at Chebyshev center
+    
     normA = np.sqrt( np.sum( np.power(A, 2), axis=1 ) ).reshape((m, 1))
     AA = np.hstack(( A, normA ))
     c = np.zeros((n+1,))
     c[-1] = -1.0
-    if lb.size < 1: # do not use bounds
-        result = optimize.linprog(c,A_ub=AA,b_ub=b)
-        #print result
-        z0 = result.x[0:-1].reshape((n,1))   
-    else:
-        raise NotImplementedError('Bounds are not currently implemented.');
-        bounds_list = []
-        for i in range(x.n):
-            bounds_list.append((lb[i],ub[i]))
-        bounds_list.append((None,None))
-        result = optimize.linprog(c,A_ub=AA,b_ub=b,bounds=tuple(bounds_list))
-        z0 = result.x[0:-1].reshape((n,1))
-    
-    # Reshape necessary arrays
-    b = b.reshape((m,1))
-
-    # tolerance
-    ztol = 1e-6
-    eps0 = ztol/4.0
-
-    Z = np.zeros((N, n))
-    for i in range(N):
-
-        # random direction
-        bad_dir = True
-        count, maxcount = 0, int(1e6)
-        while bad_dir:
-            d = np.random.normal(size=(n, 1))
-            bad_dir = np.any(np.dot(A, z0 + eps0*z0*d/np.linalg.norm(d)) > b)
-            count += 1
-            if count >= maxcount:
-                print 'hitAndRun error: reached max bad direction count'
-                Z[i:,:] = np.tile(z0, (1,N-i)).transpose()
-                return -1
-
-        # find constraints that impose lower and upper bounds on eps
-        f, g = b - np.dot(A,z0), np.dot(A, d)
-
-        # find an upper bound on the step
-        min_ind = np.logical_and(g>=0, f > np.sqrt(np.finfo(np.float).eps))
-        eps_max = np.amin(f[min_ind]/g[min_ind])
-
-        # find a lower bound on the step
-        max_ind = np.logical_and(g<0, f > np.sqrt(np.finfo(np.float).eps))
-        eps_min = np.amax(f[max_ind]/g[max_ind])
-
-        # randomly sample eps
-        eps1 = np.random.uniform(eps_min, eps_max)
-
-        # take a step along d
-        z1 = z0 + eps1*d
-        Z[i,:] = z1.reshape((n, ))
-
-        # update temp var
-        z0 = z1.copy()
+    result = optimize.linprog(c,A_ub=AA,b_ub=b,bounds=(None,None))
+    
+    return result.x[0:-1]
+
+
+# Range [epsMin, epsMax] of the steps eps such that eps*g <= s (s >= 0)
+def _stepRange(s, g):
+
+    epsMin, epsMax = -np.inf, np.inf
+    
+    pos = g > 0
+    if np.any(pos):
+        epsMax = np.min(s[pos]/g[pos])
+    neg = g < 0
+    if np.any(neg):
+        epsMin = np.max(s[neg]/g[neg])
+        
+    return epsMin, epsMax
+
+
+# Center c and half-width d of the range of each variable: its bounds lb, ub
+# if finite, else its range over the polytope Az <= b (bounds included in A)
+# from a pair of linear programs. Variables whose range is empty (fixed) get
+# d = 0 and c = z0, and unbounded ones d = 1 and c = z0.
+# Returns c, d and whether each variable is bounded
+def _variableRanges(A, b, z0, lb, ub):
 
+    m, n = A.shape
+    c = np.array(z0, dtype=float).reshape((n,))
+    d = np.ones((n,))
+    bounded = np.zeros((n,), dtype=bool)
+    
+    for i in range(n):
+        if np.isfinite(lb[i]) and np.isfinite(ub[i]):
+            zmin, zmax = lb[i], ub[i]
+        else:
+            e = np.zeros((n,))
+            e[i] = 1.
+            lo = optimize.linprog(e, A_ub=A, b_ub=b, bounds=(None,None))
+            hi = optimize.linprog(-e, A_ub=A, b_ub=b, bounds=(None,None))
+            if lo.status != 0 or hi.status != 0:
+                continue
+            zmin, zmax = lo.x[i], hi.x[i]
+        bounded[i] = True
+        if zmax - zmin <= 1e-12*max(1., abs(zmin), abs(zmax)):
+            d[i] = 0.
+        else:
+            c[i] = (zmin + zmax)/2.
+            d[i] = (zmax - zmin)/2.
+    
+    return c, d, bounded
+
+
+# Blocks of variables coupled by the constraints Az <= b (connected components
+# of the variables sharing a row), as arrays of indices. Variables in no row
+# belong to no block.
+def _coupledBlocks(A):
+
+    m, n = A.shape
+    label = np.arange(n)
+    for row in A != 0:
+        ind = np.nonzero(row)[0]
+        if ind.size > 1:
+            old = np.unique(label[ind])
+            label[np.in1d(label, old)] = old[0]
+    
+    coupled = np.any(A != 0, axis=0)
+    return [np.nonzero(coupled & (label == l))[0] for l in np.unique(label[coupled])]
+
+
+# One hit and run chain in the polytope Az <= b (bounds included in A), in
+# coordinates scaled by _variableRanges: samples are shift + scale*z. Each
+# step moves every block of coupled variables along its own random direction.
+# The free variables, only bounded by -1 <= z <= 1, are drawn uniformly for
+# each sample.
+# task = (N, A, b, z0, burn, thin, seed, filename, block, shift, scale, free,
+#         blocks)
+# Returns the N samples (the number of samples written if filename is given),
+# or None if no feasible direction could be found
+def _hitAndRunChain(task):
+
+    N, A, b, z0, burn, thin, seed, filename, block, shift, scale, free, blocks = task
+
+    rng = np.random.RandomState(seed)
+    m, n = A.shape
+    
+    maxcount = 1000 # maximum number of directions tried at each step
+    nreset = 100 # the slack is recomputed every nreset steps (round-off)
+    tol = np.sqrt(np.finfo(float).eps)
+    
+    z = np.array(z0, dtype=float).reshape((n,))
+    f = b - np.dot(A, z) # slack, updated along each move
+    
+    if filename is not None:
+        out = open(filename, 'w')
+        Z = np.zeros((min(block, N), n))
+    else:
+        Z = np.zeros((N, n))
+    k = 0 # number of samples in Z
+    
+    for i in range(burn + N*thin):
+    
+        # one move of each block of variables
+        for blk in blocks:
+        
+            # random direction giving a non-degenerate chord
+            d = np.zeros((n,))
+            for count in range(maxcount):
+                d[blk] = rng.normal(size=blk.size)
+                g = np.dot(A, d)
+                eps_min, eps_max = _stepRange(np.maximum(f, 0.), g)
+                if np.isfinite(eps_min) and np.isfinite(eps_max) and eps_max - eps_min > tol:
+                    break
+            else:
+                if filename is not None:
+                    out.close()
+                return None
+            
+            # randomly sample eps and take a step along d
+            eps = rng.uniform(eps_min, eps_max)
+            z += eps*d
+            f -= eps*g
+        
+        if (i+1) % nreset == 0:
+            f = b - np.dot(A, z)
+        
+        if i < burn or (i-burn+1) % thin != 0:
+            continue
+        
+        Z[k,:] = shift + scale*z
+        Z[k,free] = shift[free] + scale[free]*rng.uniform(-1., 1., size=np.sum(free))
+        k += 1
+        
+        if filename is not None and k == Z.shape[0]:
+            np.savetxt(out, Z[:k,:])
+            k = 0
+    
+    if filename is not None:
+        np.savetxt(out, Z[:k,:])
+        out.close()
+        return N
+    
     return Z
+
+
+# A hit and run method for sampling from the polytope
+# {z : Az <= b and lb <= z <= ub}
+# The chains run in coordinates where each variable spans [-1,1] (between its
+# bounds, or over the polytope if it has none), so that isotropic directions
+# mix variables of different scales. Blocks of variables coupled by the
+# constraints move independently, variables in no constraint are drawn
+# uniformly between their bounds, and variables fixed by their bounds
+# (lb == ub) keep their value.
+# N = number of samples
+# lb, ub = bounds on z (None, empty arrays or infinite entries for no bounds)
+# z0 = feasible starting point (default: Chebyshev center of the polytope)
+# burn = number of steps discarded at the start of each chain
+# thin = number of steps per retained sample
+# chains = number of independent chains, each drawing about N/chains samples
+#          from z0; they run in parallel in processes processes (default: one
+#          per chain, up to the number of cpus)
+# filename = if given, the samples are written to this file in blocks of
+#            block samples while they are drawn, and N is returned
+# seed = seed of the chains (default: drawn from numpy.random)
+# Returns the N x n array of samples, or -1 if no feasible direction could
+# be found
+def hitAndRun(N, A, b, lb, ub, z0=None, burn=0, thin=1, chains=1, 
+              processes=None, filename=None, block=1000, seed=None):
+
+    m, n = A.shape
+    b = np.asarray(b, dtype=float).reshape((m,))
+    coupled = np.any(A != 0, axis=0) # variables in a constraint
+    blocks = _coupledBlocks(A)
+    
+    # Bounds are added to the constraints
+    if lb is None or np.size(lb) == 0:
+        lb = -np.inf*np.ones((n,))
+    if ub is None or np.size(ub) == 0:
+        ub = np.inf*np.ones((n,))
+    lb = np.asarray(lb, dtype=float).reshape((n,))
+    ub = np.asarray(ub, dtype=float).reshape((n,))
+    A = np.vstack([A, -np.eye(n)[np.isfinite(lb)], np.eye(n)[np.isfinite(ub)]])
+    b = np.hstack([b, -lb[np.isfinite(lb)], ub[np.isfinite(ub)]])
+    
+    if z0 is None:
+        z0 = chebyshevCenter(A, b)
+    
+    # Scaled coordinates z' with z = shift + scale*z', -1 <= z' <= 1 for
+    # the bounded variables
+    shift, scale, bounded = _variableRanges(A, b, z0, lb, ub)
+    ind = scale > 0
+    z0 = np.asarray(z0, dtype=float).reshape((n,))
+    z0 = np.where(ind, (z0 - shift)/np.where(ind, scale, 1.), 0.)
+    b = b - np.dot(A, shift)
+    A = A*scale
+    A = np.vstack([A, np.eye(n)[bounded], -np.eye(n)[bounded]])
+    b = np.hstack([b, np.ones((2*np.sum(bounded),))])
+    
+    # Bounded variables in no constraint are independent and uniform: they
+    # are drawn directly rather than moved by the chains
+    free = bounded & ~coupled
+    
+    # Samples drawn by each chain, and their seeds
+    chains = max(1, min(chains, N))
+    counts = [N//chains + (1 if i < N%chains else 0) for i in range(chains)]
+    if seed is None:
+        seeds = np.random.randint(0, 2**31-1, size=chains)
+    else:
+        seeds = seed + np.arange(chains)
+    
+    if filename is not None:
+        parts = ['%s.%d' % (filename, i) for i in range(chains)]
+    else:
+        parts = [None]*chains
+    
+    tasks = [(counts[i], A, b, z0, burn, thin, seeds[i], parts[i], block, shift, scale, free, blocks) 
+             for i in range(chains)]
+    
+    if processes is None:
+        processes = min(chains, multiprocessing.cpu_count())
+    
+    if chains > 1 and processes > 1:
+        pool = multiprocessing.Pool(processes)
+        results = pool.map(_hitAndRunChain, tasks)
+        pool.close()
+        pool.join()
+    else:
+        results = [_hitAndRunChain(t) for t in tasks]
+    
+    if any([r is None for r in results]):
+        print 'hitAndRun error: reached max bad direction count'
+        return -1
+    
+    if filename is not None:
+        out = open(filename, 'w')
+        for part in parts:
+            hdl = open(part)
+            shutil.copyfileobj(hdl, out)
+            hdl.close()
+            os.remove(part)
+        out.close()
+        return N
+    
+    return np.vstack(results)
@@ -15,6 +15,9 @@ samplefilename = '3d_samples.dat'; # filename to save samples in
 sweepfilenameprefix = '3d_sweep'; # prefix of filename to save sweep points in
 dN = 1000; # save every dN samples to the above samples file
 dNplot = 10000; # plot every dNplot sampled geometries (avoid plot clutter)
+nchains = 4; # number of hit-and-run chains for the design variables
+burn = 1000; # hit-and-run steps discarded at the start of each chain
+thin = 4; # hit-and-run steps per design sample
 output = 'verbose'; # print notifications to screen
 plot = 'yes'; # plot a selection of sampled nozzle geometries
 
@@ -35,6 +38,7 @@ import multifDomains2D
 
 from domains import ComboDomain
 from util import find_feasible_boundary
+from linearConstraints import hitAndRun
 
 # ============================================================================
 # Controls for sampling and sweeps
@@ -47,6 +51,9 @@ samplefilename = '3d_samples.dat'; # filename to save samples in
 sweepfilenameprefix = '3d_sweep'; # prefix of filename to save sweep points in
 dN = 1000; # save every dN samples to the above samples file
 dNplot = 1000; # plot every dNplot sampled geometries (avoid plot clutter)
+nchains = 4; # number of hit-and-run chains for the design variables (run in parallel)
+burn = 1000; # hit-and-run steps discarded at the start of each chain
+thin = 4; # hit-and-run steps per design sample
 output = 'quiet'; # 'verbose' prints notifications to screen
 plot = 'yes'; # plot sampled nozzle geometries
 
@@ -78,8 +85,13 @@ print;
 # Randomly sample from constraints and bounds
 # ============================================================================
 
-# Sample directly from constraints in design domain
-Z1 = designDomain.sample(draw=N);
+# Sample directly from constraints and bounds in design domain, starting from
+# the baseline design
+Z1 = hitAndRun(N, designDomain.A, designDomain.b, designDomain.lb, 
+               designDomain.ub, z0=designDomain.center, burn=burn, thin=thin, 
+               chains=nchains);
+if( np.size(Z1) == 1 ):
+    sys.exit(1);
 Z2 = randomDomain.sample(draw=N);
 Z = np.hstack((Z1,Z2));
 print('Constraint matrix sampled %i times.' % N);
@@ -43,115 +43,146 @@ def gauss_hermite(n):
 
 
 
-def gurobi_linear_program(c, A_ub = None, b_ub = None, lb = None, ub = None, A_eq = None, b_eq = None):
-	model = gpy.Model()
-	model.setParam('OutputFlag', 0)
-	model.setParam('NumericFocus', 3)	# improve handeling of numerical instabilities
-	
-	n = c.shape[0]	
-
-	# Add variables to model
-	vars_ = []
-	if lb is None:
-		lb = -np.inf * np.ones(n)
-	if ub is None:
-		ub = np.inf * np.ones(n)
-
-	for j in range(n):
-		if np.isfinite(lb[j]):
-			lb_ = lb[j]
-		else:
-			lb_ = -gpy.GRB.INFINITY
-
-		if np.isfinite(ub[j]):
-			ub_ = ub[j]
-		else:
-			ub_ = gpy.GRB.INFINITY
-		vars_.append(model.addVar(lb=lb_, ub=ub_, vtype=gpy.GRB.CONTINUOUS))
-
-	model.update()
+class LinearProgram(object):
+	""" Linear programs min c^T x subject to the same constraints
 
-	# Populate linear constraints
-	if A_ub is not None and A_ub.shape[0] > 0:
-		for i in range(A_ub.shape[0]):
-			expr = gpy.LinExpr()
-			for j in range(n):
-				expr += A_ub[i,j]*vars_[j]
-			model.addConstr(expr, gpy.GRB.LESS_EQUAL, b_ub[i])
-	
-	# Add inequality constraints
-	if A_eq is not None and A_eq.shape[0] > 0:
-		m_eq, n_eq = A_eq.shape
-		for i in range(m_eq):
-			expr = gpy.LinExpr()
-			for j in range(n_eq):
-				expr += A_eq[i,j]*vars_[j]
-			model.addConstr(expr, gpy.GRB.EQUAL, b_eq[i])
-
-	# Populate objective
-	obj = gpy.LinExpr()
-	for j in range(n):
-		obj += c[j]*vars_[j]
-	model.setObjective(obj)
-	model.update()
-
-	# Solve
-	model.optimize()
-
-	if model.status == gpy.GRB.OPTIMAL:
-		return np.array(model.getAttr('x', vars_)).reshape((n,))
-	else:
-		raise Exception('Gurobi did not solve the LP. Blame Gurobi.')
+		A_ub x <= b_ub, A_eq x = b_eq, lb <= x <= ub
 
-def linprog(c, A_ub = None, b_ub = None, A_eq = None, b_eq = None,  lb = None, ub = None, **kwargs):
-	if HAS_GUROBI:
-		return gurobi_linear_program(c, A_ub, b_ub, lb = lb, ub = ub, A_eq = A_eq, b_eq = b_eq)
-	else:
+	solved for several objectives c. With Gurobi the model is built once, and
+	each solve only changes the objective, so that it is warm-started from
+	the basis of the previous solve. With scipy the constraints and bounds
+	are only converted once (scipy's solvers are not warm-started).
+	"""
+	def __init__(self, A_ub = None, b_ub = None, A_eq = None, b_eq = None, lb = None, ub = None, **kwargs):
+		self.A_ub = A_ub
+		self.b_ub = b_ub
+		self.A_eq = A_eq
+		self.b_eq = b_eq
+		self.lb = lb
+		self.ub = ub
+		self.kwargs = kwargs
+		self.model = None
+		
+		if HAS_GUROBI:
+			return
+		
 		if lb is not None and ub is not None:
-			bounds = [(lb_, ub_) for lb_, ub_ in zip(lb, ub)]
+			self.bounds = [(lb_, ub_) for lb_, ub_ in zip(lb, ub)]
 		elif ub is not None:
-			bounds = [(None, ub_) for ub_ in ub]
+			self.bounds = [(None, ub_) for ub_ in ub]
 		elif lb is not None:
-			bounds = [(lb_, None) for lb_ in lb]
+			self.bounds = [(lb_, None) for lb_ in lb]
 		else:
-			bounds = None
-		res = sp_linprog(c, A_ub = A_ub, b_ub = b_ub, A_eq = A_eq, b_eq = b_eq, bounds = bounds, **kwargs)
-		if res.success:
-			return res.x
+			self.bounds = None
+
+	def _gurobi_model(self, n):
+		model = gpy.Model()
+		model.setParam('OutputFlag', 0)
+		model.setParam('NumericFocus', 3)	# improve handeling of numerical instabilities
+		
+		A_ub, b_ub, A_eq, b_eq = self.A_ub, self.b_ub, self.A_eq, self.b_eq
+		
+		# Add variables to model
+		vars_ = []
+		lb = self.lb
+		ub = self.ub
+		if lb is None:
+			lb = -np.inf * np.ones(n)
+		if ub is None:
+			ub = np.inf * np.ones(n)
+
+		for j in range(n):
+			if np.isfinite(lb[j]):
+				lb_ = lb[j]
+			else:
+				lb_ = -gpy.GRB.INFINITY
+
+			if np.isfinite(ub[j]):
+				ub_ = ub[j]
+			else:
+				ub_ = gpy.GRB.INFINITY
+			vars_.append(model.addVar(lb=lb_, ub=ub_, vtype=gpy.GRB.CONTINUOUS))
+
+		model.update()
+
+		# Populate linear constraints
+		if A_ub is not None and A_ub.shape[0] > 0:
+			for i in range(A_ub.shape[0]):
+				expr = gpy.LinExpr()
+				for j in range(n):
+					expr += A_ub[i,j]*vars_[j]
+				model.addConstr(expr, gpy.GRB.LESS_EQUAL, b_ub[i])
+		
+		# Add inequality constraints
+		if A_eq is not None and A_eq.shape[0] > 0:
+			m_eq, n_eq = A_eq.shape
+			for i in range(m_eq):
+				expr = gpy.LinExpr()
+				for j in range(n_eq):
+					expr += A_eq[i,j]*vars_[j]
+				model.addConstr(expr, gpy.GRB.EQUAL, b_eq[i])
+
+		self.model = model
+		self.vars_ = vars_
+
+	def solve(self, c):
+		if HAS_GUROBI:
+			n = c.shape[0]
+			if self.model is None:
+				self._gurobi_model(n)
+			model, vars_ = self.model, self.vars_
+			
+			# Populate objective
+			obj = gpy.LinExpr()
+			for j in range(n):
+				obj += c[j]*vars_[j]
+			model.setObjective(obj)
+			model.update()
+
+			# Solve
+			model.optimize()
+
+			if model.status == gpy.GRB.OPTIMAL:
+				return np.array(model.getAttr('x', vars_)).reshape((n,))
+			else:
+				raise Exception('Gurobi did not solve the LP. Blame Gurobi.')
 		else:
-			raise Exception("Could not find feasible starting point: " + res.message)
+			res = sp_linprog(c, A_ub = self.A_ub, b_ub = self.b_ub, A_eq = self.A_eq, b_eq = self.b_eq, bounds = self.bounds, **self.kwargs)
+			if res.success:
+				return res.x
+			else:
+				raise Exception("Could not find feasible starting point: " + res.message)
+
+
+def gurobi_linear_program(c, A_ub = None, b_ub = None, lb = None, ub = None, A_eq = None, b_eq = None):
+	return LinearProgram(A_ub, b_ub, A_eq = A_eq, b_eq = b_eq, lb = lb, ub = ub).solve(c)
+
+def linprog(c, A_ub = None, b_ub = None, A_eq = None, b_eq = None,  lb = None, ub = None, **kwargs):
+	return LinearProgram(A_ub, b_ub, A_eq = A_eq, b_eq = b_eq, lb = lb, ub = ub, **kwargs).solve(c)
 
 
 def find_feasible_boundary(p, v, eps, alphaleft, alpharight, A, b):
     
-    # Find ends of feasible range
-    err = eps*2.;
-    count = 0;
-    # First, bracket the boundary
-    while(1):
-        xtmp = p + alpharight*v;
-        err = np.max(A.dot(xtmp)-np.squeeze(b));
-        if( err < 0. ):
-            alpharight = alpharight*2.;
-        else:
-            break;
-        if( count > 100 ):
-            print('Maximum number of iterations reached for bracketing.');
-            break;
-        count = count + 1;
-    # Next, perform bisection until boundary is within tolerance eps    
-    count = 0;
-    while(np.abs(err) > eps):
-        alpha = (alphaleft + alpharight)/2.;
-        xtmp = p + alpha*v;
-        err = np.max(A.dot(xtmp)-np.squeeze(b));
-        if( err < 0. ):
-            alphaleft = alpha;
-        else:
-            alpharight = alpha;
-        if( count > 100 ):
-            print('Maximum number of iterations reached for bisection.');
-            break;
-        count = count + 1;
-        
-    return p + alpha*v/2.;
\ No newline at end of file
+    # Point halfway from p to the boundary of {x: Ax <= b} along v, for one
+    # point p and direction v, or for each row of p and v (2-D arrays).
+    # The step to the boundary is computed directly from the slack of the
+    # constraints (to within round-off, instead of eps by bisection); it is at
+    # least alphaleft, and bracketed by alpharight*2^100 if the feasible range
+    # is unbounded.
+    P, V = np.broadcast_arrays(np.atleast_2d(p), np.atleast_2d(v));
+    
+    AV = V.dot(A.T);
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Y = (np.squeeze(b) - P.dot(A.T))/AV;
+    Y[~(AV > 0.)] = np.inf;
+    alpha = np.min(Y, axis=1) if Y.shape[1] > 0 else np.inf*np.ones(Y.shape[0]);
+    
+    if( np.any(~np.isfinite(alpha)) ):
+        print('Maximum number of iterations reached for bracketing.');
+        alpha[~np.isfinite(alpha)] = alpharight*2.**100;
+    alpha = np.maximum(alpha, alphaleft);
+    
+    x = P + (alpha/2.).reshape(-1,1)*V;
+    if( np.ndim(p) == 1 and np.ndim(v) == 1 ):
+        return x[0];
+    return x;
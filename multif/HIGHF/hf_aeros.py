@@ -4,73 +4,50 @@ import numpy as np
 from scipy.interpolate import splev, splrep
 from scipy import interpolate as itp
 import subprocess
-from multif import _meshutils_module
-from multif import _mshint_module
+from multif.meshdata import MeshData, ExtractSurfacePatches
+from multif.interpolation import SolutionInterpolator
 
 
 # --- hf_SurfaceFluidMeshFull:
 #   Extracts nozzle wall surface mesh
 #   Doubles the mesh (not just one symmetric part)
-#   Writes the full surface mesh
-def hf_SurfaceFluidMeshFull (MshNam, SolNam, BasNamOut):
+#   Returns the full surface mesh and solution (MeshData),
+#   and writes them out if BasNamOut is given
+
+def hf_SurfaceFluidMeshFull (MshNam, SolNam, BasNamOut=None):
     
     #--- Extract surface patches from fluid mesh
     
-    pyVer = [];
-    pyTri = [];
-    pySol = [];
     Ref = [9,10];
     
-    _meshutils_module.py_ExtractSurfacePatches (MshNam, SolNam, pyVer, pyTri, pySol, Ref);
+    wall = ExtractSurfacePatches(MshNam, SolNam, Ref);
     
-    pyVer = map(float, pyVer);
-    pyTri = map(int, pyTri);
-    pySol = map(float, pySol);
+    #--- Double the mesh for interpolation: mirror the vertices with y > 0
     
-    NbrVer = len(pyVer)/3;
-    Ver = np.array(pyVer).reshape(NbrVer,3).tolist();
+    Ver = wall.Ver;
+    NbrVer = len(Ver);
     
-    NbrTri = len(pyTri)/4;
-    Tri = np.array(pyTri).reshape(NbrTri,4).tolist();
+    up = np.where(Ver[:,1] > 1e-12)[0];
     
-    SolSiz = len(pySol)/NbrVer;
-    Sol = np.array(pySol).reshape(NbrVer,SolSiz).tolist();
+    tag = np.arange(NbrVer);
+    tag[up] = NbrVer + np.arange(len(up));
     
-    #--- Double the mesh for interpolation
+    VerSym = Ver[up].copy();
+    VerSym[:,1] = -VerSym[:,1];
     
-    tag = np.zeros(NbrVer);
+    TriSym = wall.Tri.copy();
+    TriSym[:,:3] = tag[wall.Tri[:,:3]-1]+1;
     
-    for i in range(NbrVer):
-        
-        y = Ver[i][1];
-        
-        if y > 1e-12:
-            # Create a new vertex
-            Ver.append([Ver[i][0],-Ver[i][1],Ver[i][2]])
-            Sol.append(Sol[i]);
-            tag[i] = len(Ver)-1;
-        else:
-            tag[i] = i;
-        
-    for i in range(NbrTri):
-        Tri.append([tag[Tri[i][0]-1]+1,tag[Tri[i][1]-1]+1,tag[Tri[i][2]-1]+1,Tri[i][3]]);
+    full = MeshData(3, np.vstack((Ver,VerSym)), 
+        Tri=np.vstack((wall.Tri,TriSym)), 
+        Sol=np.vstack((wall.Sol,wall.Sol[up])));
     
     #--- Write out mesh
-        
-    Ver = np.array(Ver).reshape(3*len(Ver)).tolist();
-    Tri = np.array(Tri).reshape(4*len(Tri)).tolist();
-    Sol = np.array(Sol).reshape(SolSiz*len(Sol)).tolist();
-    
-    for i in range(len(Tri)-10,len(Tri)):
-        print Tri[i]
     
-    Ver = map(float, Ver);
-    Tri = map(int,   Tri);
-    Sol = map(float, Sol);
-    Tet = [];
-    Edg = [];
+    if BasNamOut is not None:
+        full.write(BasNamOut);
     
-    _meshutils_module.py_WriteMesh("%s"%BasNamOut, Ver, Tri, Tet, Edg, Sol);
+    return full;
     
 
 def hf_FluidStructureInterpolation(MshNam_str, MshNam_cfd, SolNam_cfd):
@@ -79,12 +56,11 @@ def hf_FluidStructureInterpolation(MshNam_str, MshNam_cfd, SolNam_cfd):
     
     #MshNam_cfd = "nozzle.su2";
     #SolNam_cfd = "nozzle.dat";
-    BasNamOut  = "nozzle_cfd_full"
     
     #--- Extract nozzle wall surface mesh + solution
     #    and double the mesh along the y direction (i.e. no symmetry)
     
-    hf_SurfaceFluidMeshFull (MshNam_cfd, SolNam_cfd, BasNamOut);
+    full = hf_SurfaceFluidMeshFull (MshNam_cfd, SolNam_cfd);
     
     #--- Interpolate solution
     
@@ -95,8 +71,9 @@ def hf_FluidStructureInterpolation(MshNam_str, MshNam_cfd, SolNam_cfd):
     Sol    = [];
     Header = [];
     
-    out = _mshint_module.py_Interpolation (MshNam_str, "%s.meshb"%BasNamOut, "%s.solb"%BasNamOut,\
-        info, Crd, Tri, Tet, Sol, Header);
+    interp = SolutionInterpolator(data=full);
+    out = interp.interpolate(MshNam_str, info, Crd, Tri, Tet, Sol, Header);
+    interp.free();
         
     #--- Get Pres and Temp indices
     
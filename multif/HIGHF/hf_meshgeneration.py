@@ -156,16 +156,16 @@ def WriteGeo(FilNam, Ver, Spl, Lin, Loo, Phy, Siz, Bak, dim):
 # 3D nonaxisymmetric nozzle.
 def MF_GetRadius (x, nozzle):
     
-    if ( isinstance(x, (list, tuple, np.ndarray)) ):
-        rad = np.zeros(len(x));
-        for i in range(0,len(x)):
-        	rad[i] = MF_GetRadius (x[i],nozzle);
-        return rad;
+    # Equivalent-area radius of the 3D cross-section at x (scalar, or list or
+    # array evaluated at once)
     
     from .. import nozzle as noz
     
     geometry = noz.geometry;
     
+    scalar = not isinstance(x, (list, tuple, np.ndarray));
+    x = np.array(x, dtype=float, ndmin=1);
+    
     majoraxisTmp = geometry.Bspline(nozzle.wall.majoraxis.coefs);
     minoraxisTmp = geometry.Bspline(nozzle.wall.minoraxis.coefs);
     
@@ -182,8 +182,9 @@ def MF_GetRadius (x, nozzle):
     
     #--- Get x, r1, r2, zcenter
     
-    r1 = fr1(x);
-    r2 = fr2(x);
+    # x is clipped to the extent of each B-spline, as for scalar evaluations
+    r1 = fr1(np.clip(x, majoraxisTmp.coefs[0][0], majoraxisTmp.coefs[0][-1]));
+    r2 = fr2(np.clip(x, minoraxisTmp.coefs[0][0], minoraxisTmp.coefs[0][-1]));
     
     alp = (x-x_in)/(x_out-x_in);
     
@@ -192,22 +193,15 @@ def MF_GetRadius (x, nozzle):
     #--- Compute area
     
     area_A = 0.5*theta*r1*r2; 
-    area_B = 0.5*(r1*r2*math.fabs(math.cos(theta)*math.sin(theta))); # area of triangle (orig,P(theta),orig-zcut)
+    area_B = 0.5*(r1*r2*np.abs(np.cos(theta)*np.sin(theta))); # area of triangle (orig,P(theta),orig-zcut)
     area_C = 0.5*(math.pi-theta)*r1*r2 - area_B; # area below zcut
-        
-    area_tot = area_A+area_B + (1.0-alp) * area_C;
-    
-    #--- Verif area_C
-    x0 = r1*math.sin(theta);
-    y0 = r2*math.cos(theta);
-    #area_C_int = 0.5*r1*r2*((1.0-2*y0)*x0 - 0.5*math.sin(2*x0));
-    
-    #print "area_C %lf area_C_int %lf " % (area_C, area_C_int)
-    #sys.exit(1);
     
     area_tot = area_A+area_B + (1.0-alp) * area_C 
     
-    rad = math.sqrt(2*area_tot/math.pi);
+    rad = np.sqrt(2*area_tot/math.pi);
+    
+    if scalar:
+        return float(rad[0]);
     
     return rad;    
 #
@@ -335,31 +329,15 @@ def MF_GetRadius (x, nozzle):
 
 def WriteInriaMesh(mshNam, Ver, Tri, Edg):
     
-    hdl = open(mshNam, "w");
+    # Binary if mshNam is a .meshb (see multif.gmf)
     
-    sys.stdout.write(" -- %s OPENED.\n" % mshNam);
-    
-    NbrVer = len(Ver);
-    NbrEdg = len(Edg);
-    NbrTri = len(Tri);
-    
-    hdl.write("MeshVersionFormatted\n2\nDimension\n3\nVertices\n%d\n" % NbrVer);
-    
-    for i in range(NbrVer):
-        hdl.write("%lf %lf %lf 1\n" % (Ver[i][0],Ver[i][1],Ver[i][2]));
-    
-    hdl.write("\nEdges\n%d\n"%NbrEdg);
-    for i in range(NbrEdg):
-        hdl.write("%d %d 1\n" % (Edg[i][0],Edg[i][1]));
-    
-    hdl.write("\nTriangles\n%d\n"%NbrTri);
-    for i in range(NbrTri):
-        hdl.write("%d %d %d %d\n" % (Tri[i][0],Tri[i][1],Tri[i][2],Tri[i][3]));
+    from multif import gmf
     
+    sys.stdout.write(" -- %s OPENED.\n" % mshNam);
     
-    hdl.write("\nEnd\n");
+    Edg = [[e[0],e[1],1] for e in Edg];
     
-    hdl.close();
+    gmf.WriteMesh(mshNam, 3, Ver, Edg=Edg, Tri=Tri);
     
     
 def GetLayer(x, r1, r2, zcen, alp, theta, NbrLnk):
@@ -397,7 +375,8 @@ def HF_GenerateExitMesh_Direct(nozzle, xloc=-1):
     
     #--- Output mesh without call to gmsh
     
-    mshNam = "nozzle_exit_hin.mesh";
+    from multif import gmf
+    mshNam = gmf.meshName("nozzle_exit_hin");
     
     Ver = [];
     Tri = [];
@@ -1970,7 +1949,7 @@ def HF_GenerateMesh_Deform(nozzle):
     Knots_center, Coefs_center,
     Knots_r1, Coefs_r1  ,
     Knots_r2, Coefs_r2  ,
-     "mesh_motion.dat");
+     "mesh_motion.dat", nozzle.cpusPerTask);
     
     
     _meshutils_module.py_ConvertGMFToSU2(basNamGMF,"",basNamSU2);
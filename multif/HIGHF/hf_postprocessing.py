@@ -1,4 +1,4 @@
-from multif import _mshint_module
+from multif.interpolation import getInterpolator
 from multif import _meshutils_module
 import numpy as np
 import sys, math
@@ -9,6 +9,11 @@ from .. import SU2
 
 def PostProcess ( nozzle, output ):
     
+    # --- Solution interpolations use the cores allocated to the analysis
+    
+    from multif import interpolation
+    interpolation.setNumThreads(nozzle.cpusPerTask);
+    
     # --- Check residual convergence
     
     from multif import MEDIUMF
@@ -180,8 +185,8 @@ def HF_InterpolateToStructural (options):
         # ---
         sys.stdout.write("%s already exists\n" % exitNamLoc);
     
-    out = _mshint_module.py_Interpolation (structNamLoc, options["mesh_name"], options["restart_name"],\
-    info, Crd, Tri, Tet, Sol, Header);
+    itp = getInterpolator(options["mesh_name"], options["restart_name"]);
+    out = itp.interpolate(structNamLoc, info, Crd, Tri, Tet, Sol, Header);
     
     dim    = info[0];
     NbrVer = info[1]; 
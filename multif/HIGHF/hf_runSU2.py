@@ -329,6 +329,11 @@ def checkResidual(config=[]):
 
 def HF_runSU2 ( nozzle ):
     
+    # --- The mesh and solution files are rewritten: drop the cached
+    #     interpolators of previous runs
+    from multif.interpolation import clearInterpolators
+    clearInterpolators();
+    
     convergenceCheck = False;
     
     # --- Setup solver options
@@ -433,7 +438,8 @@ def HF_runSU2 ( nozzle ):
     
     #HF_GenerateExitMesh(nozzle); # SKIP. generate that one in postprocessing
     
-    HF_GenerateMesh_Deform(nozzle);
+    with nozzle.profiler.Stage('meshing'):
+        HF_GenerateMesh_Deform(nozzle);
     
     
     #if ( nozzle.meshDeformationFlag ):
@@ -1270,6 +1276,26 @@ def Compute_Thrust_Gradients_FD (nozzle):
         config_DOT = setupConfig_DOT (solver_options);
         info = SU2.run.DOT(config_DOT);
     
+    # --- Concurrent, warm-started perturbed cases
+    
+    if nozzle.cfd.fd_concurrent_cases > 1:
+        
+        from multif.MEDIUMF.runSU2 import Run_Thrust_FD_Cases
+        
+        config_CFD = SetupConfig(solver_options);
+        
+        config_CFD.OBJECTIVE_FUNCTION= 'THRUST_NOZZLE'
+        config_CFD.MARKER_THRUST= '( PhysicalLine9 ) '
+        
+        thrust = Run_Thrust_FD_Cases(nozzle, config_DEF, config_CFD, nbr_dv, 'thrust_nodef.dat');
+        
+        for idv in range(nbr_dv):
+            if thrust[idv] is None:
+                return thrust_grad;
+            thrust_grad[idv] = thrust[idv]-thrust_nodef;
+        
+        return thrust_grad;
+    
     for idv in range(nbr_dv):
     
         # --- Call def
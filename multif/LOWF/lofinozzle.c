@@ -2,13 +2,14 @@
 #include <stdlib.h>
 #include <math.h>
 #include "../meshutils/piecewise.h"
+#include "lofinozzle.h"
 #include "odeint.h"
 
 #define PI 3.14159265358979323846
 
 
-double *allocateDoubleVector(int n) {
-    double *vector = (double*) malloc((n+1)*sizeof(double));
+real_t *allocateDoubleVector(int n) {
+    real_t *vector = (real_t*) malloc((n+1)*sizeof(real_t));
     if( vector == NULL ) {
         perror("malloc failed");
     }
@@ -17,22 +18,22 @@ double *allocateDoubleVector(int n) {
 
 
 // Sutherland's Law of dynamic viscosity for air
-double dynamicViscosity(double T) {
-    return 1.716e-5*pow((T/273.15),1.5)*(273.15 + 110.4)/(T + 110.4);
+real_t dynamicViscosity(real_t T) {
+    return 1.716e-5*rt_pow((T/273.15),1.5)*(273.15 + 110.4)/(T + 110.4);
 }
 
 
 // Prandtl number for air
-double prair(double T) {
-    static double prval[31] = {0.744, 0.736, 0.728, 0.72, 0.713, 0.707, 0.701,
+real_t prair(real_t T) {
+    static real_t prval[31] = {0.744, 0.736, 0.728, 0.72, 0.713, 0.707, 0.701,
         0.697, 0.692, 0.688, 0.684, 0.68, 0.68, 0.68, 0.682, 0.684, 0.687,
         0.69, 0.693, 0.696, 0.699, 0.702, 0.704, 0.707, 0.709, 0.711,
         0.713, 0.715, 0.717, 0.719, 0.722};
-    static double temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
+    static real_t temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
         375., 400., 450., 500., 550., 600., 650., 700., 750., 800., 850., 
         900., 950., 1000., 1050., 1100., 1150., 1200., 1250., 1300., 1350., 
         1400., 1500.};
-    double pr;
+    real_t pr;
 
     interp1(temp, prval, 31, &T, &pr, 1, 0);
 
@@ -42,17 +43,17 @@ double prair(double T) {
 
 
 // Thermal conductivity for air
-double kair(double T) {
-    static double kval[31] = {0.01593, 0.01809, 0.0202, 0.02227, 0.02428, 
+real_t kair(real_t T) {
+    static real_t kval[31] = {0.01593, 0.01809, 0.0202, 0.02227, 0.02428, 
         0.02624, 0.02816, 0.03003, 0.03186, 0.03365, 0.0371, 0.04041, 0.04357,
         0.04661, 0.04954, 0.05236, 0.05509, 0.05774, 0.0603, 0.06276, 0.0652, 
         0.06754, 0.06985, 0.07209, 0.07427, 0.0764, 0.07849, 0.08054, 0.08253, 
         0.0845, 0.08831};
-    static double temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
+    static real_t temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
         375., 400., 450., 500., 550., 600., 650., 700., 750., 800., 850., 
         900., 950., 1000., 1050., 1100., 1150., 1200., 1250., 1300., 1350., 
         1400., 1500.};
-    double k;
+    real_t k;
 
     interp1(temp, kval, 31, &T, &k, 1, 0);
 
@@ -62,17 +63,17 @@ double kair(double T) {
 
 
 // Specific heat at constant pressure for air
-double cpair(double T) {
-    static double cpval[31] = {1002.3, 1002.5, 1002.7, 1003.1, 1003.8,
+real_t cpair(real_t T) {
+    static real_t cpval[31] = {1002.3, 1002.5, 1002.7, 1003.1, 1003.8,
         1004.9, 1006.3, 1008.2, 1010.6, 1013.5, 1020.6, 1029.5, 1039.8,
         1051.1, 1062.9, 1075.0, 1087.0, 1098.7, 1110.1, 1120.9, 1131.3,
         1141.1, 1150.2, 1158.9, 1167.0, 1174.6, 1181.7, 1188.4, 1194.6,
         1200.5, 1211.2};
-    static double temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
+    static real_t temp[31] = {175., 200., 225., 250., 275., 300., 325., 350., 
         375., 400., 450., 500., 550., 600., 650., 700., 750., 800., 850., 
         900., 950., 1000., 1050., 1100., 1150., 1200., 1250., 1300., 1350., 
         1400., 1500.};
-    double cp;
+    real_t cp;
 
     interp1(temp, cpval, 31, &T, &cp, 1, 0);
 
@@ -82,18 +83,18 @@ double cpair(double T) {
 
 
 // Area-Mach function from 1-D mass conservation equations
-double areaMachFunc(double M, double g) {
-    return pow(((g+1.)/2.),((g+1.)/(2.*(g-1.))))*M/pow((1.+(g-1.)*pow(M,2)/2.),
+real_t areaMachFunc(real_t M, real_t g) {
+    return rt_pow(((g+1.)/2.),((g+1.)/(2.*(g-1.))))*M/rt_pow((1.+(g-1.)*rt_pow(M,2)/2.),
         ((g+1.)/(2.*(g-1.))));
 }
 
 
 // Governing equation of motion for quasi-1D flow
-double dM2dx(double M2, double g, double A, double dAdx, double D, double Cf, 
-    double Ts, double dTsdx) {
+real_t dM2dx(real_t M2, real_t g, real_t A, real_t dAdx, real_t D, real_t Cf, 
+    real_t Ts, real_t dTsdx) {
     double delta = 1e-6; // to keep denominator from becoming zero
-    double denom;
-    if( fabs(1-M2) <= delta ) { // it is unclear whether this actually helps
+    real_t denom;
+    if( fabs(RPART(1-M2)) <= delta ) { // it is unclear whether this actually helps
         denom = delta;
     } else {
         denom = 1. - M2;
@@ -105,16 +106,16 @@ double dM2dx(double M2, double g, double A, double dAdx, double D, double Cf,
 
 // Evaluate governing equation of motion at xeval & M2 for quasi-1D flow 
 // assuming linear interpolation for xgeo, rgeo, x, Cf, Ts, dTs, nb
-double evaldM2dx(double xeval, double M2, double* xgeo, double* rgeo, int ngeo, 
-    double g, double* x, double* Cf, double* Ts, double* dTs, int nb) {
+real_t evaldM2dx(real_t xeval, real_t M2, real_t* xgeo, real_t* rgeo, int ngeo, 
+    real_t g, real_t* x, real_t* Cf, real_t* Ts, real_t* dTs, int nb) {
     
-    double r, drdx;
-    double a, da, d;
-    double c, t, dt;
+    real_t r, drdx;
+    real_t a, da, d;
+    real_t c, t, dt;
     
     interp1(xgeo, rgeo, ngeo, &xeval, &r, 1, 1);
     interp1grad(xgeo, rgeo, ngeo, &xeval, &drdx, 1, 1);
-    a = PI*pow(r,2);
+    a = PI*rt_pow(r,2);
     da = 2*PI*r*drdx;
     d = 2*r;
 
@@ -127,27 +128,27 @@ double evaldM2dx(double xeval, double M2, double* xgeo, double* rgeo, int ngeo,
 
 
 // Find apparent throat of nozzle
-double findApparentThroat(double xstart, double h0, double M2, 
-    double* xgeo, double* rgeo, int ngeo, double g, 
-    double* x, double* Cf, double* Ts, double* dTs, int nb) {
+real_t findApparentThroat(real_t xstart, double h0, real_t M2, 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, 
+    real_t* x, real_t* Cf, real_t* Ts, real_t* dTs, int nb) {
 
     // Initialize variables
-    //double frac = 0.2; // fraction of nozzle length to search around min area point
-    //double length = xgeo[ngeo-1]-xgeo[0]; // nozzle length
-    //double h0 = 1e-3; // initial step size
-    //double M2 = pow(1.0001,2);
-    double xt; // throat location
+    //real_t frac = 0.2; // fraction of nozzle length to search around min area point
+    //real_t length = xgeo[ngeo-1]-xgeo[0]; // nozzle length
+    //real_t h0 = 1e-3; // initial step size
+    //real_t M2 = rt_pow(1.0001,2);
+    real_t xt; // throat location
     double h;
 
     // Determine approximate throat location by minimum area point
-    double x1, f1, x2, f2, xstop;
+    real_t x1, f1, x2, f2, xstop;
     x2 = xstart;
     //x2 = findPiecwiseLinearMinimumLocation(xgeo, rgeo, ngeo);
     f2 = evaldM2dx(x2, M2, xgeo, rgeo, ngeo, g, x, Cf, Ts, dTs, nb);
     xt = x2;
 
     // Next, search around min area throat location for true apparent throat
-    if( f2 < 0 ) {
+    if( RPART(f2) < 0 ) {
         h = h0;
         //xstop = x2 + frac*length;
         xstop = xgeo[ngeo-1];
@@ -163,33 +164,33 @@ double findApparentThroat(double xstart, double h0, double M2,
         f2 = evaldM2dx(x2, M2, xgeo, rgeo, ngeo, g, x, Cf, Ts, dTs, nb);
         //printf("%f, %f\n",x1,x2);
         //printf("%f, %f\n",f1,f2);
-        if( f1*f2 <= 0 ) {
+        if( RPART(f1)*RPART(f2) <= 0 ) {
             break; // bracketing is successful
         }
-        if( h > 0 && x2 > xstop ) {
+        if( h > 0 && RPART(x2) > RPART(xstop) ) {
             printf("Apparent throat set to nozzle exit.\n");
             //return xt;
             return xgeo[ngeo-1];
-        } else if( h < 0 && x2 < xstop ) {
+        } else if( h < 0 && RPART(x2) < RPART(xstop) ) {
             printf("Bracketing for apparent throat failed (leftward search).\n");
             return xt;
         }
     }
 
     // Perform bisection until location of apparent throat is accurate to eps
-    double x3, f3;
+    real_t x3, f3;
     double abserr = 1.;
     double eps = 1e-10;
     while(abserr > eps) {
         x3 = (x1 + x2)/2.;
         f3 = evaldM2dx(x3, M2, xgeo, rgeo, ngeo, g, x, Cf, Ts, dTs, nb);
-        if(f1*f3 <= 0) { // throat b/w points 1 and 3
+        if(RPART(f1)*RPART(f3) <= 0) { // throat b/w points 1 and 3
             x2 = x3;
         } else { // throat b/w points 3 and 2
             x1 = x3;
             f1 = f3;
         }
-        abserr = fabs(x1-x2);
+        abserr = fabs(RPART(x1-x2));
     }
 
     xt = x3;
@@ -221,21 +222,21 @@ is himag, minimum allowable size is hminmag, and max allowable size is hmaxmag.
 Integer ns gives the maximum length of the vectors where ODE integration data 
 is saved. singularitydy is the value of Mach at which to start integrating
 around the singularity M=1. */
-int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
-    double* xwalltemp, double* walltemp, int nwalltemp,
-    double* xlayer1, double* tlayer1, int nlayer1, double k1,
-    double* xlayer2, double* tlayer2, int nlayer2, double k2,
-    double* xlayer3, double* tlayer3, int nlayer3, double k3,
-    double* xlayer4, double* tlayer4, int nlayer4, double k4,
-    double* xlayer5, double* tlayer5, int nlayer5, double k5,
-    double tsi, double dtsi, double psi, double cfi,
-    double missionmach, double g, double gasconstant,
-    double hinf, double tenv, double cenv, double penv,
+int analyzeNozzle(real_t* xgeo, real_t* rgeo, int ngeo, int nbreaks,
+    real_t* xwalltemp, real_t* walltemp, int nwalltemp,
+    real_t* xlayer1, real_t* tlayer1, int nlayer1, real_t k1,
+    real_t* xlayer2, real_t* tlayer2, int nlayer2, real_t k2,
+    real_t* xlayer3, real_t* tlayer3, int nlayer3, real_t k3,
+    real_t* xlayer4, real_t* tlayer4, int nlayer4, real_t k4,
+    real_t* xlayer5, real_t* tlayer5, int nlayer5, real_t k5,
+    real_t tsi, real_t dtsi, real_t psi, real_t cfi,
+    real_t missionmach, real_t g, real_t gasconstant,
+    real_t hinf, real_t tenv, real_t cenv, real_t penv,
     double eps1, int maxiter, int maxstep,
     double eps2, double ns, double himag, double hminmag, double hmaxmag, 
     double singularitydy,
-    double* x, double* temp, double* p, double *rho, double* u, double* mach,
-    double* tempinside, double* tempoutside, double* netthrust) 
+    real_t* x, real_t* temp, real_t* p, real_t *rho, real_t* u, real_t* mach,
+    real_t* tempinside, real_t* tempoutside, real_t* netthrust) 
 
     {
 
@@ -245,21 +246,21 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
     printf("Beginning low-fi nozzle analysis.\n");
 
     // Initial parameters
-    double xi = xgeo[0]; // inlet location
-    double xe = xgeo[ngeo-1]; // outlet location
-    double ri = rgeo[0]; // inlet radius
-    double xt; // apparent throat location
+    real_t xi = xgeo[0]; // inlet location
+    real_t xe = xgeo[ngeo-1]; // outlet location
+    real_t ri = rgeo[0]; // inlet radius
+    real_t xt; // apparent throat location
 
     // Declare Gauss-Seidel fluid-thermal iteration properties
     double err;
 
     // Define ODE integration properties
-    double dxsave = (xgeo[ngeo-1]-xgeo[0])/((double)ns);
+    real_t dxsave = (xgeo[ngeo-1]-xgeo[0])/ns;
 
     // Initialize loop variables
-    double *r, *ts, *dts, *cf;
-    double *ps, *re, *hf;
-    double *xmach, *machtmp;
+    real_t *r, *ts, *dts, *cf;
+    real_t *ps, *re, *hf;
+    real_t *xmach, *machtmp;
     r = allocateDoubleVector(nbreaks);
     ts = allocateDoubleVector(nbreaks);
     dts = allocateDoubleVector(nbreaks);
@@ -267,13 +268,13 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
     ps = allocateDoubleVector(nbreaks);
     re = allocateDoubleVector(nbreaks);
     hf = allocateDoubleVector(nbreaks);
-    double *rwallprime = allocateDoubleVector(nbreaks);
-    double *ro = allocateDoubleVector(nbreaks);
-    double *rtotalprime = allocateDoubleVector(nbreaks);
-    double *tsintegrand = allocateDoubleVector(nbreaks);
-    double *tsintegral = allocateDoubleVector(nbreaks);
-    double qwflux;
-    double tprimeratio, reprimeratio, cfincomp;
+    real_t *rwallprime = allocateDoubleVector(nbreaks);
+    real_t *ro = allocateDoubleVector(nbreaks);
+    real_t *rtotalprime = allocateDoubleVector(nbreaks);
+    real_t *tsintegrand = allocateDoubleVector(nbreaks);
+    real_t *tsintegral = allocateDoubleVector(nbreaks);
+    real_t qwflux;
+    real_t tprimeratio, reprimeratio, cfincomp;
 
     for (int i = 0; i < nbreaks; i++) {
         x[i] = xi + (xe-xi)*((double)i)/((double)(nbreaks-1));
@@ -282,37 +283,37 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
         cf[i] = cfi;
     }
     interp1(xgeo, rgeo, ngeo, x, r, nbreaks, 0);
-    double tempold = ts[nbreaks-1];
+    real_t tempold = ts[nbreaks-1];
 
     // Calculate wall thermal resistance & estimate outer wall radius
-    double rotemp, ritemp, ttemp;
+    real_t rotemp, ritemp, ttemp;
     for(int i = 0; i < nbreaks; i++) { // at each x station
         rwallprime[i] = 0.;
         // thermal layer
         interp1(xlayer1, tlayer1, nlayer1, &x[i], &ttemp, 1, 0);
         ritemp = r[i];
         rotemp = ritemp + ttemp;
-        rwallprime[i] += log(rotemp/ritemp)/(2.*PI*k1);
+        rwallprime[i] += rt_log(rotemp/ritemp)/(2.*PI*k1);
         // air gap
         interp1(xlayer2, tlayer2, nlayer2, &x[i], &ttemp, 1, 0);
         ritemp = rotemp;
         rotemp = ritemp + ttemp;
-        rwallprime[i] += log(rotemp/ritemp)/(2.*PI*k2);
+        rwallprime[i] += rt_log(rotemp/ritemp)/(2.*PI*k2);
         // inner load layer
         interp1(xlayer3, tlayer3, nlayer3, &x[i], &ttemp, 1, 0);
         ritemp = rotemp;
         rotemp = ritemp + ttemp;
-        rwallprime[i] += log(rotemp/ritemp)/(2.*PI*k3); 
+        rwallprime[i] += rt_log(rotemp/ritemp)/(2.*PI*k3); 
         // middle load layer
         interp1(xlayer4, tlayer4, nlayer4, &x[i], &ttemp, 1, 0);
         ritemp = rotemp;
         rotemp = ritemp + ttemp;
-        rwallprime[i] += log(rotemp/ritemp)/(2.*PI*k4); 
+        rwallprime[i] += rt_log(rotemp/ritemp)/(2.*PI*k4); 
         // outer load layer
         interp1(xlayer5, tlayer5, nlayer5, &x[i], &ttemp, 1, 0);
         ritemp = rotemp;
         rotemp = ritemp + ttemp;
-        rwallprime[i] += log(rotemp/ritemp)/(2.*PI*k5);
+        rwallprime[i] += rt_log(rotemp/ritemp)/(2.*PI*k5);
         // assign outer wall radius
         ro[i] = rotemp;
     }
@@ -330,13 +331,14 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
     }
 
     // Begin Gauss-Seidel iterations for aero-thermal analysis
-    double yi, xs, xf, xtguess, hi, hmin, hmax;
-    double xterm;
+    real_t yi, xs, xf, xtguess;
+    double hi, hmin, hmax;
+    real_t xterm;
     int ns1, nm;
-    double *xsave1 = NULL;
-    double *xsave2 = NULL;
-    double *ysave1 = NULL;
-    double *ysave2 = NULL;
+    real_t *xsave1 = NULL;
+    real_t *xsave2 = NULL;
+    real_t *ysave1 = NULL;
+    real_t *ysave2 = NULL;
     int nsave1, nsave2; 
     int counter;
     int maxattempts = 5;
@@ -350,17 +352,17 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
 
         // Run integration until correct apparent throat is found and 
         // integration succeeds
-        while( xterm < xe - 1e-6 ) {
+        while( RPART(xterm) < RPART(xe) - 1e-6 ) {
 
             nsave1 = 0;
             nsave2 = 0;
 
-            xt = findApparentThroat(xtguess, fabs(himag), pow(1+singularitydy,2), 
+            xt = findApparentThroat(xtguess, fabs(himag), rt_pow(1+singularitydy,2), 
             xgeo, rgeo, ngeo, g, x, cf, ts, dts, nbreaks);
             //printf("\nLocation of minimum is: %f\n", xt);
 
             if( counter > 0 ) {
-                printf("Attempting integration again from new apparent throat x = %0.6f\n",xt);            
+                printf("Attempting integration again from new apparent throat x = %0.6f\n",RPART(xt));            
             }
 
             // Allocate arrays for storing x and y data
@@ -370,7 +372,7 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
                 free(xsave2);
                 free(ysave2);
             }
-            ns1 = (int)((xt/(xe-xi))*(double)ns);
+            ns1 = (int)RPART((xt/(xe-xi))*ns);
             xsave1 = allocateDoubleVector(ns1+2);
             ysave1 = allocateDoubleVector(ns1+2);
             xsave2 = allocateDoubleVector(ns-ns1+2);
@@ -378,7 +380,7 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
 
             // Integrate for M^2 backward from throat to inlet
             // Assume subsonic flow in this region for now
-            yi = pow(1.-singularitydy,2);
+            yi = rt_pow(1.-singularitydy,2);
             xs = xt;
             xf = xi;
             hi = -himag;
@@ -390,13 +392,13 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
 
             // Integrate for M^2 forward from throat to exit
             // Assume supersonic flow for now
-            if( xt >= xe ) {
+            if( RPART(xt) >= RPART(xe) ) {
                 xsave2[0] = xe;
                 ysave2[0] = 1.;
                 nsave2 = 1;
                 //printf("skipping RHS integration\n");
             } else {
-                yi = pow(1.+singularitydy,2);
+                yi = rt_pow(1.+singularitydy,2);
                 xs = xt;
                 xf = xe;
                 hi = himag;
@@ -425,13 +427,13 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
         xmach = allocateDoubleVector(nm);
         machtmp = allocateDoubleVector(nm);
         for(int j=0; j<nsave1-1; j++) {
-            machtmp[j] = sqrt(ysave1[nsave1-j-1]);
+            machtmp[j] = rt_sqrt(ysave1[nsave1-j-1]);
             xmach[j] = xsave1[nsave1-j-1];
         }
-        machtmp[nsave1-1] = sqrt( (ysave1[0] + ysave2[0])/2. );
+        machtmp[nsave1-1] = rt_sqrt( (ysave1[0] + ysave2[0])/2. );
         xmach[nsave1-1] = (xsave1[0] + xsave2[0])/2.;
         for(int j=1; j<nsave2; j++) {
-            machtmp[nsave1-1+j] = sqrt(ysave2[j]);
+            machtmp[nsave1-1+j] = rt_sqrt(ysave2[j]);
             xmach[nsave1-1+j] = xsave2[j];
         }
 
@@ -452,17 +454,17 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
         // Update nozzle fluid variables
         for(int j=0; j<nbreaks; j++) {
 
-            temp[j] = ts[j]/(1. + (g-1.)*pow(mach[j],2)/2.);
-            ps[j] = psi*(pow(ri,2)/pow(r[j],2))*(areaMachFunc(mach[0],g)/
-                areaMachFunc(mach[j],g))*sqrt(ts[j]/tsi);
-            p[j] = ps[j]/pow( 1. + (g-1.)*pow(mach[j],2)/2., (g/(g-1.)) );
+            temp[j] = ts[j]/(1. + (g-1.)*rt_pow(mach[j],2)/2.);
+            ps[j] = psi*(rt_pow(ri,2)/rt_pow(r[j],2))*(areaMachFunc(mach[0],g)/
+                areaMachFunc(mach[j],g))*rt_sqrt(ts[j]/tsi);
+            p[j] = ps[j]/rt_pow( 1. + (g-1.)*rt_pow(mach[j],2)/2., (g/(g-1.)) );
             rho[j] = p[j]/(gasconstant*temp[j]);
-            u[j] = mach[j]*sqrt(g*gasconstant*temp[j]);
+            u[j] = mach[j]*rt_sqrt(g*gasconstant*temp[j]);
             re[j] = rho[j]*u[j]*2.*r[j]/dynamicViscosity(temp[j]);
 
             // Heat transfer coefficient from fluid to interior nozzle wall,
             // estimated using Chilton-Colburn analogy
-            hf[j] = pow(prair(temp[j]),-2./3.)*rho[j]*cpair(temp[j])*
+            hf[j] = rt_pow(prair(temp[j]),-2./3.)*rho[j]*cpair(temp[j])*
                 u[j]*cf[j]/2.;
 
             // Total thermal resistance
@@ -470,7 +472,7 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
                 1./(hinf*PI*2.*ro[j]);
 
             // Integrand for integral used in calculation of stagnation temp
-            tsintegrand[j] = 1./(rtotalprime[j]*rho[j]*u[j]*PI*pow(r[j],2)*
+            tsintegrand[j] = 1./(rtotalprime[j]*rho[j]*u[j]*PI*rt_pow(r[j],2)*
                 cpair(temp[j]));
             
         }
@@ -495,9 +497,9 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
             for(int j = 0; j<nbreaks; j++) {
     
                 // Estimate stagnation temperature and its derivative
-                ts[j] = tenv*(1. - exp(-tsintegral[j])) + tsi*exp(-tsintegral[j]);
+                ts[j] = tenv*(1. - rt_exp(-tsintegral[j])) + tsi*rt_exp(-tsintegral[j]);
                 dts[j] = (tenv - ts[j])/(rtotalprime[j]*rho[j]*u[j]*PI*
-                    pow(r[j],2)*cpair(temp[j]));
+                    rt_pow(r[j],2)*cpair(temp[j]));
     
                 // Calculate heat flux 
                 qwflux = (ts[j] - tenv)/rtotalprime[j]/(PI*2.*r[j]);
@@ -510,14 +512,14 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
 
         // Update friction coefficient
         for(int j = 0; j<nbreaks; j++) {
-            tprimeratio = 1. + 0.035*pow(mach[j],2) + 0.45*(tempinside[j]/temp[j] - 1.);
-            reprimeratio = 1./(tprimeratio*pow(tprimeratio,1.5)*
+            tprimeratio = 1. + 0.035*rt_pow(mach[j],2) + 0.45*(tempinside[j]/temp[j] - 1.);
+            reprimeratio = 1./(tprimeratio*rt_pow(tprimeratio,1.5)*
                 (1. + 110.4/temp[j])/(tprimeratio + 110.4/temp[j]));
-            cfincomp = 0.074/pow(re[j],0.2);
-            cf[j] = cfincomp/tprimeratio/pow(reprimeratio,0.2);           
+            cfincomp = 0.074/rt_pow(re[j],0.2);
+            cf[j] = cfincomp/tprimeratio/rt_pow(reprimeratio,0.2);           
         }
 
-        err = fabs(temp[nbreaks-1] - tempold)/temp[nbreaks-1];
+        err = fabs(RPART(temp[nbreaks-1] - tempold))/RPART(temp[nbreaks-1]);
         printf("Error in exit temperature: %0.16f\n", err);
         if( err < eps1 ) {
             printf("Converged.\n");
@@ -528,13 +530,13 @@ int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
     }
 
     // Estimate nozzle thrust
-    double drdxexit;
+    real_t drdxexit;
     interp1grad(xgeo, rgeo, ngeo, &x[nbreaks-1], &drdxexit, 1, 1);
-    double mdot = rho[0]*u[0]*PI*pow(r[0],2);
-    double exitangle = atan(drdxexit);
-    double divfactor = (1. + cos(exitangle))/2.;
+    real_t mdot = rho[0]*u[0]*PI*rt_pow(r[0],2);
+    real_t exitangle = rt_atan(drdxexit);
+    real_t divfactor = (1. + rt_cos(exitangle))/2.;
     *netthrust = divfactor*mdot*(u[nbreaks-1] - missionmach*
-        cenv) + (p[nbreaks-1] - penv)*PI*pow(r[nbreaks-1],2);
+        cenv) + (p[nbreaks-1] - penv)*PI*rt_pow(r[nbreaks-1],2);
 
     // Free memory
     free(r);
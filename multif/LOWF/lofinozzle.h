@@ -1,37 +1,39 @@
-double *allocateDoubleVector(int n);
+#include "../meshutils/realtype.h"
 
-double dynamicViscosity(double T);
+real_t *allocateDoubleVector(int n);
 
-double prair(double T);
+real_t dynamicViscosity(real_t T);
 
-double kair(double T);
+real_t prair(real_t T);
 
-double cpair(double T);
+real_t kair(real_t T);
 
-double areaMachFunc(double M, double g);
+real_t cpair(real_t T);
 
-double dM2dx(double M2, double g, double A, double dAdx, double D, double Cf, 
-    double Ts, double dTsdx);
+real_t areaMachFunc(real_t M, real_t g);
 
-double evaldM2dx(double xeval, double M2, double* xgeo, double* rgeo, int ngeo, 
-        double g, double* x, double* Cf, double* Ts, double* dTs, int nb);
+real_t dM2dx(real_t M2, real_t g, real_t A, real_t dAdx, real_t D, real_t Cf, 
+    real_t Ts, real_t dTsdx);
 
-double findApparentThroat(double xstart, double h0, double M2, 
-    double* xgeo, double* rgeo, int ngeo, double g, 
-    double* x, double* Cf, double* Ts, double* dTs, int nb);
+real_t evaldM2dx(real_t xeval, real_t M2, real_t* xgeo, real_t* rgeo, int ngeo, 
+        real_t g, real_t* x, real_t* Cf, real_t* Ts, real_t* dTs, int nb);
 
-int analyzeNozzle(double* xgeo, double* rgeo, int ngeo, int nbreaks,
-    double* xwalltemp, double* walltemp, int nwalltemp, 
-    double* xlayer1, double* tlayer1, int nlayer1, double k1,
-    double* xlayer2, double* tlayer2, int nlayer2, double k2,
-    double* xlayer3, double* tlayer3, int nlayer3, double k3,
-    double* xlayer4, double* tlayer4, int nlayer4, double k4,
-    double* xlayer5, double* tlayer5, int nlayer5, double k5,
-    double tsi, double dtsi, double psi, double cfi,
-    double missionmach, double g, double gasconstant,
-    double hinf, double tenv, double cenv, double penv,
+real_t findApparentThroat(real_t xstart, double h0, real_t M2, 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, 
+    real_t* x, real_t* Cf, real_t* Ts, real_t* dTs, int nb);
+
+int analyzeNozzle(real_t* xgeo, real_t* rgeo, int ngeo, int nbreaks,
+    real_t* xwalltemp, real_t* walltemp, int nwalltemp, 
+    real_t* xlayer1, real_t* tlayer1, int nlayer1, real_t k1,
+    real_t* xlayer2, real_t* tlayer2, int nlayer2, real_t k2,
+    real_t* xlayer3, real_t* tlayer3, int nlayer3, real_t k3,
+    real_t* xlayer4, real_t* tlayer4, int nlayer4, real_t k4,
+    real_t* xlayer5, real_t* tlayer5, int nlayer5, real_t k5,
+    real_t tsi, real_t dtsi, real_t psi, real_t cfi,
+    real_t missionmach, real_t g, real_t gasconstant,
+    real_t hinf, real_t tenv, real_t cenv, real_t penv,
     double eps1, int maxiter, int maxstep, 
     double eps2, double ns, double himag, double hminmag, double hmaxmag, 
     double singularitydy,
-    double* x, double* temp, double* p, double* rho, double* u, double* mach,
-    double* tempinside, double* tempoutside, double* netthrust);
\ No newline at end of file
+    real_t* x, real_t* temp, real_t* p, real_t* rho, real_t* u, real_t* mach,
+    real_t* tempinside, real_t* tempoutside, real_t* netthrust);
\ No newline at end of file
@@ -1,22 +1,23 @@
 #include <stdio.h>
 #include <math.h>
+#include "odeint.h"
 
-static double dmaxarg1, dmaxarg2;
-#define DMAX(a,b) (dmaxarg1=a,dmaxarg2=b, dmaxarg1 > dmaxarg2 ? dmaxarg1 : dmaxarg2)
-static double dminarg1, dminarg2;
-#define DMIN(a,b) (dminarg1=a,dminarg2=b, dminarg1 < dminarg2 ? dminarg1 : dminarg2)
+static real_t dmaxarg1, dmaxarg2;
+#define DMAX(a,b) (dmaxarg1=a,dmaxarg2=b, RPART(dmaxarg1) > RPART(dmaxarg2) ? dmaxarg1 : dmaxarg2)
+static real_t dminarg1, dminarg2;
+#define DMIN(a,b) (dminarg1=a,dminarg2=b, RPART(dminarg1) < RPART(dminarg2) ? dminarg1 : dminarg2)
 
 /* Takes a Cash-Karp Runge-Kutta step starting at x and given function value y,
 derivative dydx, and stepsize h. The function fcn and associated arguments are 
 used to provide values of dydx at the various steps required by the Cash-Karp
 scheme. Finally, the function value y at x+h is provided in yout, and an
 estimate of the error in y at x+h is provided in yerr. */
-void rkckstep(double* x, double* y, double dydx, double h, double *yout, 
-    double *yerr, 
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int),
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double*cf,
-    double* ts, double* dts, int nb) {
+void rkckstep(real_t* x, real_t* y, real_t dydx, real_t h, real_t *yout, 
+    real_t *yerr, 
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int),
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t*cf,
+    real_t* ts, real_t* dts, int nb) {
 
     static double a2 = 0.2, a3 = 0.3, a4 = 0.6, a5 = 1., a6 = 0.875, 
     b21 = 0.2, b31 = 3./40., b41 = 0.3, b51 = -11./54., b61 = 1631./55296.,
@@ -27,7 +28,7 @@ void rkckstep(double* x, double* y, double dydx, double h, double *yout,
     dc5 = -277./14336.;
     double dc1 = c1 - 2825./27648., dc3 = c3 - 18575./48384.,
     dc4 = c4 - 13525./55296., dc6 = c6 - 0.25;
-    double k1, k2, k3, k4, k5, k6, ytemp;
+    real_t k1, k2, k3, k4, k5, k6, ytemp;
     
     k1 = h*dydx;
 
@@ -60,38 +61,39 @@ Provides an estimate of next stepsize in hnext. The function fcn and associated
 arguments are used to provide values of dydx at various values of x. x is 
 updated with the new location post-step, and y is updated with the new function
 value post-step. */
-void rkstepper(double* x, double* y, double dydx, 
-    double htry, double hmin, double hmax, double* hnext,
+void rkstepper(real_t* x, real_t* y, real_t dydx, 
+    real_t htry, double hmin, double hmax, real_t* hnext,
     double eps, 
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int), 
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double* cf,
-    double* ts, double* dts, int nb ) {
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int), 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t* cf,
+    real_t* ts, real_t* dts, int nb ) {
 
     // Prepare stepping
-    double yout, yerr;
-    double h = htry;
-    double yerratio, h2, hnext2;
+    real_t yout, yerr;
+    real_t h = htry;
+    real_t h2, hnext2;
+    double yerratio;
     while(1) {
 
         // Take a step
         rkckstep(x, y, dydx, h, &yout, &yerr, fcn, xgeo, rgeo, ngeo, g, xn, cf, 
             ts, dts, nb);
 
-        yerratio = fabs(yerr)/eps;
+        yerratio = fabs(RPART(yerr))/eps;
         //printf("yerratio: %f\n",yerratio);
 
         if( yerratio < 1.0 ) { break; } // tolerance met
 
         h2 = 0.9*h*pow(yerratio,-0.25); // try this smaller step
-        h  = ( h >= 0. ? DMAX(h2,0.1*h) : DMIN(h2,0.1*h) ); // factor of 10 only
+        h  = ( RPART(h) >= 0. ? DMAX(h2,0.1*h) : DMIN(h2,0.1*h) ); // factor of 10 only
 
-        if( fabs(h) < fabs(hmin) ) { 
+        if( fabs(RPART(h)) < fabs(hmin) ) { 
             printf("Minimum step size reached.\n"); 
             break;
         }
 
-        if( *x + h == *x ) {
+        if( RPART(*x + h) == RPART(*x) ) {
             printf("Underflow error due to step size.\n");
             break;
         }
@@ -101,9 +103,9 @@ void rkstepper(double* x, double* y, double dydx,
     // Update step size for next iteration
     if( yerratio > 1.89e-4 ) {
         hnext2 = 0.9*h*pow(yerratio,-0.2);
-        *hnext = ( fabs(hnext2) > fabs(hmax) ? hmax : hnext2 );
+        *hnext = ( fabs(RPART(hnext2)) > fabs(hmax) ? hmax : hnext2 );
     } else {
-        *hnext = ( fabs(5.*h) > fabs(hmax) ? hmax : 5.*h ); // maximum factor of 5 increase or hmax
+        *hnext = ( fabs(RPART(5.*h)) > fabs(hmax) ? hmax : 5.*h ); // maximum factor of 5 increase or hmax
     }
 
     // Update x location
@@ -122,21 +124,21 @@ tolerance on error. Function fcn and associated arguments provides derivative
 dydx. xsave is a 1-D array large enough (of size ns) to hold values of x 
 approximately spaced by dxsave from xi to xe. ysave is a 1-D array of the same
 size which saves values of y corresponding to the values in xsave. */
-double odeint(double xi, double xe, double yi, 
+real_t odeint(real_t xi, real_t xe, real_t yi, 
     int maxstep, double hi, double hmin, double hmax, double eps,
-    double* xsave, double* ysave, double dxsave, int ns, int* nsave,
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int), 
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double* cf,
-    double* ts, double* dts, int nb ) {
+    real_t* xsave, real_t* ysave, real_t dxsave, int ns, int* nsave,
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int), 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t* cf,
+    real_t* ts, real_t* dts, int nb ) {
 
     //printf("Beginning RK4 ODE solver.\n"); 
-    double x, y, dydx, h, hnext;
+    real_t x, y, dydx, h, hnext;
     int count = -1;
     y = yi;
     x = xi;
     h = hi;
-    double xprev = x + dxsave*2.;
+    real_t xprev = x + dxsave*2.;
     for(int i = 0; i < maxstep; i++) {
 
         // Derivative can be obtained here if scaling is desired
@@ -144,7 +146,7 @@ double odeint(double xi, double xe, double yi,
         //printf("\n%i %0.6f %0.6f %f\n",i,x,y,dydx);
 
         // Store intermediate results
-        if( fabs(x - xprev) > fabs(dxsave) && count < ns-1 ) {
+        if( fabs(RPART(x - xprev)) > fabs(RPART(dxsave)) && count < ns-1 ) {
             xsave[++count] = x;
             ysave[count] = y;
             *nsave = count+1;
@@ -152,7 +154,7 @@ double odeint(double xi, double xe, double yi,
         }
 
         // Ensure step size does not overshoot
-        if( (x+h-xe)*(x+h-xi) > 0.0 ) {
+        if( RPART(x+h-xe)*RPART(x+h-xi) > 0.0 ) {
             h = xe - x;
         }
 
@@ -161,13 +163,13 @@ double odeint(double xi, double xe, double yi,
             ngeo, g, xn, cf, ts, dts, nb);
 
         // Terminate if stepsize is too small
-        if( fabs(hnext) < fabs(hmin) ) {
-            printf("Step size too small. Terminating odeint at x=%0.8f.\n",x);
+        if( fabs(RPART(hnext)) < fabs(hmin) ) {
+            printf("Step size too small. Terminating odeint at x=%0.8f.\n",RPART(x));
             return x;
         }
 
         // Check that xe has been reached
-        if( (x-xe)*(xe-xi) >= 0. ) {
+        if( RPART(x-xe)*RPART(xe-xi) >= 0. ) {
             // Save data at last point
             xsave[++count] = x;
             ysave[count] = y;
@@ -1,25 +1,26 @@
 #include <stdio.h>
+#include "../meshutils/realtype.h"
 
-void rkckstep(double* x, double* y, double dydx, double h, double *yout, 
-    double *yerr, 
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int),
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double*cf,
-    double* ts, double* dts, int nb);
+void rkckstep(real_t* x, real_t* y, real_t dydx, real_t h, real_t *yout, 
+    real_t *yerr, 
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int),
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t*cf,
+    real_t* ts, real_t* dts, int nb);
 
-void rkstepper(double* x, double* y, double dydx, 
-    double htry, double hmin, double hmax, double* hnext,
+void rkstepper(real_t* x, real_t* y, real_t dydx, 
+    real_t htry, double hmin, double hmax, real_t* hnext,
     double eps, 
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int), 
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double* cf,
-    double* ts, double* dts, int nb );
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int), 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t* cf,
+    real_t* ts, real_t* dts, int nb );
 
-double odeint(double xi, double xe, double yi, 
+real_t odeint(real_t xi, real_t xe, real_t yi, 
     int maxstep, double hi, double hmin, double hmax, double eps,
-    double* xsave, double* ysave, double dxsave, int ns, int* nsave,
-    double(*fcn)(double, double, double*, double*, int, double,
-    double*, double*, double*, double*, int), 
-    double* xgeo, double* rgeo, int ngeo, double g, double* xn, double* cf,
-    double* ts, double* dts, int nb );
+    real_t* xsave, real_t* ysave, real_t dxsave, int ns, int* nsave,
+    real_t(*fcn)(real_t, real_t, real_t*, real_t*, int, real_t,
+    real_t*, real_t*, real_t*, real_t*, int), 
+    real_t* xgeo, real_t* rgeo, int ngeo, real_t g, real_t* xn, real_t* cf,
+    real_t* ts, real_t* dts, int nb );
 
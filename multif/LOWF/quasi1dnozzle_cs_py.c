@@ -0,0 +1,171 @@
+#include "Python.h"
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <errno.h>
+
+#include "lofinozzle.h"
+
+/* Complex-step build of the quasi-1D nozzle analysis (compiled with
+-DCOMPLEX_STEP). Inputs may be given as complex numbers; the imaginary parts
+carry the perturbation direction. All outputs are returned as complex numbers,
+the derivative along that direction being Im(output)/h. */
+
+static real_t *allocateComplexVectorFromPyList(PyObject *pylist, int *n) {
+
+    real_t *vector = NULL;
+    Py_complex c;
+
+    if( PyList_Check(pylist) ) {
+        *n = PyList_Size(pylist);
+        if( *n < 1 ) { // i.e. if Python list is empty
+            return vector;
+        } else {
+            vector = malloc((*n+1)*sizeof(real_t));
+            if( vector == NULL ) {
+                printf("malloc failed");
+                perror("malloc failed");
+            }
+            for(int i = 0; i<*n; i++) {
+                c = PyComplex_AsCComplex(PyList_GetItem(pylist,i));
+                vector[i] = c.real + I*c.imag;
+            }
+        }
+    }
+
+    return vector;
+}
+
+
+static void appendComplex(PyObject *pylist, real_t value) {
+    PyObject *oo = PyComplex_FromDoubles(RPART(value), IPART(value));
+    PyList_Append(pylist, oo);
+    Py_DECREF(oo);
+}
+
+
+/* pyparams = [k1, k2, k3, k4, k5, tsi, dtsi, psi, cfi, missionmach, g,
+gasconstant, hinf, tenv, cenv, penv], see analyzeNozzle for their meaning. */
+int analyze_cs(PyObject *pyxgeo, PyObject *pyrgeo, int nbreaks, 
+    PyObject *pyxwalltemp, PyObject *pywalltemp,
+    PyObject *pyxlayer1, PyObject *pytlayer1, 
+    PyObject *pyxlayer2, PyObject *pytlayer2, 
+    PyObject *pyxlayer3, PyObject *pytlayer3, 
+    PyObject *pyxlayer4, PyObject *pytlayer4, 
+    PyObject *pyxlayer5, PyObject *pytlayer5, 
+    PyObject *pyparams, double eps1, int maxiter, int maxstep,
+    double eps2, int ns, double himag, double hminmag, double hmaxmag, 
+    double singularitydy,
+    PyObject *pyx, PyObject *pytemp, PyObject *pyp, PyObject *pyrho, PyObject *pyu, 
+    PyObject *pymach, PyObject *pytempinside, PyObject *pytempoutside,
+    PyObject *pynetthrust) {
+
+    int ngeo = 0;
+    int nwalltemp = 0;
+    int nlayer1 = 0;
+    int nlayer2 = 0;
+    int nlayer3 = 0;
+    int nlayer4 = 0;
+    int nlayer5 = 0;
+    int nparams = 0;
+    
+    // Check the scalar parameters before allocating anything
+    if( PyList_Check(pyparams) )
+        nparams = PyList_Size(pyparams);
+    if( nparams != 16 ) {
+        printf("analyze_cs: 16 scalar parameters expected, %d given.\n", nparams);
+        return 1;
+    }
+    
+    // Inner wall geometry
+    real_t *xgeo = allocateComplexVectorFromPyList(pyxgeo, &ngeo);
+    real_t *rgeo = allocateComplexVectorFromPyList(pyrgeo, &ngeo);
+
+    // Wall temperature (if specified)
+    real_t *xwalltemp = allocateComplexVectorFromPyList(pyxwalltemp, &nwalltemp);
+    real_t *walltemp = allocateComplexVectorFromPyList(pywalltemp, &nwalltemp);
+
+    // Wall layers
+    real_t *xlayer1 = allocateComplexVectorFromPyList(pyxlayer1, &nlayer1);
+    real_t *tlayer1 = allocateComplexVectorFromPyList(pytlayer1, &nlayer1);
+    real_t *xlayer2 = allocateComplexVectorFromPyList(pyxlayer2, &nlayer2);
+    real_t *tlayer2 = allocateComplexVectorFromPyList(pytlayer2, &nlayer2);
+    real_t *xlayer3 = allocateComplexVectorFromPyList(pyxlayer3, &nlayer3);
+    real_t *tlayer3 = allocateComplexVectorFromPyList(pytlayer3, &nlayer3);
+    real_t *xlayer4 = allocateComplexVectorFromPyList(pyxlayer4, &nlayer4);
+    real_t *tlayer4 = allocateComplexVectorFromPyList(pytlayer4, &nlayer4);
+    real_t *xlayer5 = allocateComplexVectorFromPyList(pyxlayer5, &nlayer5);
+    real_t *tlayer5 = allocateComplexVectorFromPyList(pytlayer5, &nlayer5);
+
+    // Scalar parameters
+    real_t *params = allocateComplexVectorFromPyList(pyparams, &nparams);
+
+    // Allocate outputs
+    real_t *x = allocateDoubleVector(nbreaks);
+    real_t *temp = allocateDoubleVector(nbreaks);
+    real_t *p = allocateDoubleVector(nbreaks);
+    real_t *rho = allocateDoubleVector(nbreaks);
+    real_t *u = allocateDoubleVector(nbreaks);
+    real_t *mach = allocateDoubleVector(nbreaks);
+    real_t *tempinside = allocateDoubleVector(nbreaks);
+    real_t *tempoutside = allocateDoubleVector(nbreaks);
+    real_t *netthrust = allocateDoubleVector(1);
+
+    // Analyze nozzle
+    analyzeNozzle(xgeo, rgeo, ngeo, nbreaks,
+        xwalltemp, walltemp, nwalltemp,
+        xlayer1, tlayer1, nlayer1, params[0],
+        xlayer2, tlayer2, nlayer2, params[1],
+        xlayer3, tlayer3, nlayer3, params[2],
+        xlayer4, tlayer4, nlayer4, params[3],
+        xlayer5, tlayer5, nlayer5, params[4],
+        params[5], params[6], params[7], params[8],
+        params[9], params[10], params[11],
+        params[12], params[13], params[14], params[15],
+        eps1, maxiter, maxstep, 
+        eps2, ns, himag, hminmag, hmaxmag, singularitydy,
+        x, temp, p, rho, u, mach, tempinside, tempoutside, netthrust);
+
+    // Return data to Python
+    for(int i = 0; i < nbreaks; i++) {
+        appendComplex(pyx, x[i]);
+        appendComplex(pytemp, temp[i]);
+        appendComplex(pyp, p[i]);
+        appendComplex(pyrho, rho[i]);
+        appendComplex(pyu, u[i]);
+        appendComplex(pymach, mach[i]);
+        appendComplex(pytempinside, tempinside[i]);
+        appendComplex(pytempoutside, tempoutside[i]);
+    }
+    appendComplex(pynetthrust, netthrust[0]);
+    
+    free(xgeo);
+    free(rgeo);
+    if(xwalltemp)
+        free(xwalltemp);
+    if(walltemp)
+        free(walltemp);
+    free(xlayer1);
+    free(tlayer1);
+    free(xlayer2);
+    free(tlayer2);
+    free(xlayer3);
+    free(tlayer3);
+    free(xlayer4);
+    free(tlayer4);
+    free(xlayer5);
+    free(tlayer5);
+    free(params);
+
+    free(x);
+    free(temp);
+    free(p);
+    free(rho);
+    free(u);
+    free(mach);
+    free(tempinside);
+    free(tempoutside);
+    free(netthrust);
+
+    return 0;
+}
@@ -0,0 +1,13 @@
+int analyze_cs(PyObject *pyxgeo, PyObject *pyrgeo, int nbreaks, 
+    PyObject *pyxwalltemp, PyObject *pywalltemp, 
+    PyObject *pyxlayer1, PyObject *pytlayer1, 
+    PyObject *pyxlayer2, PyObject *pytlayer2, 
+    PyObject *pyxlayer3, PyObject *pytlayer3, 
+    PyObject *pyxlayer4, PyObject *pytlayer4, 
+    PyObject *pyxlayer5, PyObject *pytlayer5, 
+    PyObject *pyparams, double eps1, int maxiter, int maxstep,
+    double eps2, int ns, double himag, double hminmag, double hmaxmag, 
+    double singularitydy,
+    PyObject *pyx, PyObject *pytemp, PyObject *pyp, PyObject *pyrho, PyObject *pyu, 
+    PyObject *pymach, PyObject *pytempinside, PyObject *pytempoutside,
+    PyObject *pynetthrust);
@@ -0,0 +1,9 @@
+%module quasi1dnozzle_cs
+%{
+    #define SWIG_FILE_WITH_INIT
+    #include "Python.h"
+    #include "lofinozzle.h"
+    #include "quasi1dnozzle_cs_py.h"
+%}
+
+%include "quasi1dnozzle_cs_py.h"
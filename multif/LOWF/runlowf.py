@@ -5,9 +5,7 @@ Rick Fenrich 9/24/17
 """
 
 import numpy as np
-import scipy.optimize
-import scipy.integrate
-import sys, os
+import sys, os, copy
 
 import quasi1dnozzle
 
@@ -21,12 +19,37 @@ except ImportError as e:
     print e
     print
 
-try:
-	from matplotlib import pyplot as plt
-except ImportError as e:
-    print 'Error importing matplotlib in runlowf.py.'
-    print e
-    print
+# Arguments of quasi1dnozzle.analyze, in order (outputs excluded)
+Q1D_ARGS = ['xgeo', 'rgeo', 'nbreaks', 'xwalltemp', 'walltemp',
+            'xlayer1', 'tlayer1', 'k1', 'xlayer2', 'tlayer2', 'k2',
+            'xlayer3', 'tlayer3', 'k3', 'xlayer4', 'tlayer4', 'k4',
+            'xlayer5', 'tlayer5', 'k5', 'tsi', 'dtsi', 'psi', 'cfi',
+            'missionmach', 'g', 'gasconstant', 'hinf', 'tenv', 'cenv', 'penv',
+            'eps1', 'maxiter', 'maxstep', 'eps2', 'ns', 'himag', 'hminmag',
+            'hmaxmag', 'singularitydy']
+
+# Inputs of the quasi-1D solver which depend on the design variables: lists of
+# values, and scalar parameters (in the order expected by analyze_cs)
+Q1D_LISTS = ['xgeo', 'rgeo', 'xwalltemp', 'walltemp', 'xlayer1', 'tlayer1',
+             'xlayer2', 'tlayer2', 'xlayer3', 'tlayer3', 'xlayer4', 'tlayer4',
+             'xlayer5', 'tlayer5']
+Q1D_PARAMS = ['k1', 'k2', 'k3', 'k4', 'k5', 'tsi', 'dtsi', 'psi', 'cfi',
+              'missionmach', 'g', 'gasconstant', 'hinf', 'tenv', 'cenv', 'penv']
+
+# Responses whose gradients can be obtained by complex step through the
+# quasi-1D solver (other responses rely on AERO-S and are finite differenced)
+CS_RESPONSES = ['THRUST', 'WALL_TEMPERATURE', 'WALL_PRESSURE', 'PRESSURE',
+                'VELOCITY']
+
+# Complex step. No difference is taken, so it is chosen small enough not to
+# affect the real part of the solution.
+CS_STEP = 1e-100
+
+# Relative step for the sensitivities of the solver inputs (wall geometry and
+# layers, inlet and environment conditions) w.r.t. the design variables. These
+# are linear or smooth functions of the design variables and cheap to evaluate,
+# so central differences are accurate without step size tuning.
+CS_INPUT_STEP = 1e-6
 
 #==============================================================================
 # Sutherland's Law of dynamic viscosity of air
@@ -57,6 +80,7 @@ def massFlowRate(fluid,Pstag,Area,Tstag,M):
 # exit, nozzle geometry, and pressure ratio between reservoir and atmosphere
 #==============================================================================
 def nozzleState(nozzle,pressureRatio,PsT,TsT,PsE,TsE):
+    import scipy.optimize
     gam = nozzle.fluid.gam
     Athroat = nozzle.wall.geometry.area(nozzle.wall.geometry.xThroat)
     Aexit = nozzle.wall.geometry.area(nozzle.wall.geometry.length)
@@ -369,6 +393,7 @@ def integrateODEwithEvents(ode,dt,tfinal,ycrit,direction):
 # Integrate subsonic flow through an axial nozzle geometry
 #==============================================================================
 def integrateSubsonic(nozzle,tol,params,xThroat,nPartitions):
+    import scipy.integrate
     
     # Use inlet Mach number provided by user, if available
     if( hasattr(nozzle.inlet, "mach") ):
@@ -455,6 +480,7 @@ def integrateShock(nozzle,tol,params,xThroat,nPartitions):
 # Integrate supersonic flow through an axial nozzle geometry
 #==============================================================================
 def integrateSupersonic(nozzle,tol,params,xThroat,nPartitions):
+    import scipy.integrate
         
     # If nozzle converges only, assume choked flow at the exit    
     if( nozzle.wall.geometry.length - xThroat < 1e-12 ):
@@ -546,6 +572,7 @@ def integrateSupersonic(nozzle,tol,params,xThroat,nPartitions):
 # results for a vector of size n    
 #==============================================================================
 def integrateTrapezoidal(y,x):
+        import scipy.integrate
         integrand = np.empty(x.size+1)
         dx = np.empty(x.size+1)
         
@@ -887,22 +914,10 @@ def Quasi1D_old(nozzle,output='verbose'):
 
 
 #==============================================================================
-# Perform quasi-1D area-averaged Navier-Stokes analysis of axisymmetric nozzle.
-#% Solve for flow along length of non-ideal nozzle given geometry, inlet
-#% stagnation temperature and pressure, and freestream temperature and
-#% pressure. Iterate for Cf and stagnation temperature. An ODE for M^2 is 
-#% solved given A, Cf, and Tstag. Pstag is found from mass conservation. T 
-#% and P are found from def'n of stag. temp. Density rho is found from ideal 
-#% gas law. 
-#%
-#% Returns M, density, pressure P, temperature T, stagnation 
-#% temp. Tstag, stagnation pressure Pstag, velocity U, Re, internal heat
-#% transfer coefficient hf, friction coefficient Cf, interior wall temp. Tw,
-#% exterior wall temp. Text.
+# Assemble inputs of the quasi-1D nozzle solver (see lofinozzle.c). Returns a
+# dictionary keyed by the argument names of quasi1dnozzle.analyze
 #==============================================================================
-def Quasi1D(nozzle,output='verbose'):
-    
-    # Initialize inputs for nozzle analysis
+def Quasi1DInputs(nozzle):
 
     # Discretization
     nbreaks = 1000 # save data for nbreaks along length of nozzle
@@ -1018,6 +1033,41 @@ def Quasi1D(nozzle,output='verbose'):
     hmaxmag = 5e-3 # largest allowable step
     singularitydy = 1e-3 # increment above/below M=1 to start integration
 
+    return {'xgeo': xgeo, 'rgeo': rgeo, 'nbreaks': nbreaks,
+            'xwalltemp': xwalltemp, 'walltemp': walltemp,
+            'xlayer1': xlayer1, 'tlayer1': tlayer1, 'k1': k1,
+            'xlayer2': xlayer2, 'tlayer2': tlayer2, 'k2': k2,
+            'xlayer3': xlayer3, 'tlayer3': tlayer3, 'k3': k3,
+            'xlayer4': xlayer4, 'tlayer4': tlayer4, 'k4': k4,
+            'xlayer5': xlayer5, 'tlayer5': tlayer5, 'k5': k5,
+            'tsi': tsi, 'dtsi': dtsi, 'psi': psi, 'cfi': cfi,
+            'missionmach': missionmach, 'g': g, 'gasconstant': gasconstant,
+            'hinf': hinf, 'tenv': tenv, 'cenv': cenv, 'penv': penv,
+            'eps1': eps1, 'maxiter': maxiter, 'maxstep': maxstep,
+            'eps2': eps2, 'ns': ns, 'himag': himag, 'hminmag': hminmag,
+            'hmaxmag': hmaxmag, 'singularitydy': singularitydy}
+
+
+#==============================================================================
+# Perform quasi-1D area-averaged Navier-Stokes analysis of axisymmetric nozzle.
+#% Solve for flow along length of non-ideal nozzle given geometry, inlet
+#% stagnation temperature and pressure, and freestream temperature and
+#% pressure. Iterate for Cf and stagnation temperature. An ODE for M^2 is 
+#% solved given A, Cf, and Tstag. Pstag is found from mass conservation. T 
+#% and P are found from def'n of stag. temp. Density rho is found from ideal 
+#% gas law. 
+#%
+#% Returns M, density, pressure P, temperature T, stagnation 
+#% temp. Tstag, stagnation pressure Pstag, velocity U, Re, internal heat
+#% transfer coefficient hf, friction coefficient Cf, interior wall temp. Tw,
+#% exterior wall temp. Text.
+#==============================================================================
+def Quasi1D(nozzle,output='verbose'):
+
+    # Initialize inputs for nozzle analysis
+    inp = Quasi1DInputs(nozzle)
+    g = inp['g']
+
     # Outputs
     x = [] # x-coordinate along nozzle axis
     temp = [] # temperature
@@ -1030,13 +1080,8 @@ def Quasi1D(nozzle,output='verbose'):
     netthrust = [] # net thrust
 
     # Run thermo-fluid analysis
-    quasi1dnozzle.analyze(xgeo, rgeo, nbreaks, xwalltemp, walltemp, 
-        xlayer1, tlayer1, k1, xlayer2, 
-        tlayer2, k2, xlayer3, tlayer3, k3, xlayer4, tlayer4, k4, xlayer5,
-        tlayer5, k5, tsi, dtsi, psi, cfi, missionmach, g, gasconstant, hinf,
-        tenv, cenv, penv, eps1, maxiter, maxstep, eps2, ns, himag, hminmag, hmaxmag, 
-        singularitydy,
-        x, temp, p, rho, u, mach, tempinside, tempoutside, netthrust)
+    quasi1dnozzle.analyze(*([inp[k] for k in Q1D_ARGS] + 
+        [x, temp, p, rho, u, mach, tempinside, tempoutside, netthrust]))
 
     # Convert data to Numpy array
     x = np.array(x)
@@ -1065,6 +1110,141 @@ def Quasi1D(nozzle,output='verbose'):
     return netthrust, x, tempinside, ps, p, u
 
 
+#==============================================================================
+# Linear interpolation of complex data f(x) at real locations xq. Same as
+# np.interp (constant extrapolation), with breakpoints x ordered by real part.
+#==============================================================================
+def interpComplex(xq, x, f):
+
+    xq = np.asarray(xq, dtype=float)
+    i = np.clip(np.searchsorted(x.real, xq, side='right') - 1, 0, x.size-2)
+    t = (xq - x[i])/(x[i+1] - x[i])
+    t = np.where(t.real < 0., 0., t)
+    t = np.where(t.real > 1., 1., t)
+
+    return f[i] + t*(f[i+1] - f[i])
+
+
+#==============================================================================
+# Complex-step gradients of the quasi-1D responses (CS_RESPONSES) w.r.t. the
+# design variables in nozzle.derivativesDV. The quasi-1D solver built with
+# -DCOMPLEX_STEP (_quasi1dnozzle_cs) is run once per design variable, its
+# inputs being perturbed by i*CS_STEP along their sensitivity to that variable.
+# Gradients are appended to nozzle.gradients[k] as calcGradientsFD does.
+#==============================================================================
+def Quasi1DGradientsCS(nozzle, responses, output='verbose'):
+
+    try:
+        import quasi1dnozzle_cs
+    except ImportError:
+        sys.stderr.write('  ## ERROR : The complex-step build of the quasi-1D '
+            'solver (_quasi1dnozzle_cs) is not available. Please rebuild '
+            'MULTI-F.\n')
+        sys.exit(1)
+
+    inp = Quasi1DInputs(nozzle)
+    derivativesDV = [i-1 for i in nozzle.derivativesDV]
+
+    for dv in derivativesDV:
+
+        if output == 'verbose':
+            sys.stdout.write('Complex-step derivatives w.r.t. design '
+                'variable %i\n' % (dv+1))
+
+        # Sensitivity of solver inputs by central difference
+        step = CS_INPUT_STEP*max(1., abs(nozzle.dvList[dv]))
+        inpDV = []
+        for sign in [1., -1.]:
+            nozzleDV = copy.deepcopy(nozzle)
+            nozzleDV.dvList[dv] += sign*step
+            nozzleDV.UpdateDV(output='quiet')
+            nozzleDV.SetupWall(output='quiet')
+            inpDV.append(Quasi1DInputs(nozzleDV))
+
+        # Perturb inputs in the imaginary direction
+        inpCS = {}
+        for k in Q1D_LISTS + Q1D_PARAMS:
+            dk = (np.array(inpDV[0][k], dtype=float) - 
+                  np.array(inpDV[1][k], dtype=float))/(2.*step)
+            inpCS[k] = np.array(inp[k], dtype=float) + 1j*CS_STEP*dk
+        params = list(np.array([inpCS[k] for k in Q1D_PARAMS]))
+
+        # Run complex thermo-fluid analysis
+        x, temp, p, rho, u, mach = [], [], [], [], [], []
+        tempinside, tempoutside, netthrust = [], [], []
+        quasi1dnozzle_cs.analyze_cs(list(inpCS['xgeo']), list(inpCS['rgeo']),
+            inp['nbreaks'], list(inpCS['xwalltemp']), list(inpCS['walltemp']),
+            list(inpCS['xlayer1']), list(inpCS['tlayer1']),
+            list(inpCS['xlayer2']), list(inpCS['tlayer2']),
+            list(inpCS['xlayer3']), list(inpCS['tlayer3']),
+            list(inpCS['xlayer4']), list(inpCS['tlayer4']),
+            list(inpCS['xlayer5']), list(inpCS['tlayer5']), params,
+            inp['eps1'], inp['maxiter'], inp['maxstep'], inp['eps2'],
+            inp['ns'], inp['himag'], inp['hminmag'], inp['hmaxmag'],
+            inp['singularitydy'],
+            x, temp, p, rho, u, mach, tempinside, tempoutside, netthrust)
+
+        x = np.array(x)
+        p = np.array(p)
+        u = np.array(u)
+        mach = np.array(mach)
+        tempinside = np.array(tempinside)
+        g = inpCS['g']
+        ps = p*(1+(g-1)*mach**2/2.)**(g/(g-1.)) # stagnation pressure
+
+        # Derivatives of responses
+        for k in responses:
+            if k == 'THRUST':
+                localGrad = netthrust[0].imag/CS_STEP
+            elif k == 'WALL_TEMPERATURE':
+                localGrad = interpComplex(nozzle.outputLocations[k], x, 
+                    tempinside).imag/CS_STEP
+            elif k == 'WALL_PRESSURE':
+                localGrad = interpComplex(nozzle.outputLocations[k], x, 
+                    ps).imag/CS_STEP
+            elif k == 'PRESSURE':
+                localGrad = interpComplex(nozzle.outputLocations[k][:,0], x, 
+                    p).imag/CS_STEP
+            else: # k == 'VELOCITY'
+                nr, nc = nozzle.outputLocations[k].shape
+                localGrad = np.zeros((nr,3))
+                localGrad[:,0] = interpComplex(nozzle.outputLocations[k][:,0],
+                    x, u).imag/CS_STEP
+            nozzle.gradients[k].append(localGrad)
+
+    return nozzle.gradients
+
+
+#==============================================================================
+# Gradients with the COMPLEX_STEP method: quasi-1D responses are obtained by
+# complex step, the others (AERO-S responses, mass) by finite differences.
+#==============================================================================
+def calcGradientsCS(nozzle, output='verbose'):
+
+    csResponses = [k for k in CS_RESPONSES if k in nozzle.gradients and 
+                   nozzle.gradients[k] is not None]
+    fdResponses = [k for k in nozzle.gradients if 
+                   nozzle.gradients[k] is not None and k not in csResponses]
+
+    if fdResponses:
+        if not hasattr(nozzle, 'fd_step_size'):
+            sys.stderr.write('  ## ERROR : FD_STEP_SIZE is required for the '
+                'finite difference gradients of %s.\n\n' % 
+                ', '.join(fdResponses))
+            sys.exit(1)
+        saveGradients = dict((k, nozzle.gradients[k]) for k in csResponses)
+        for k in csResponses:
+            nozzle.gradients[k] = None # not finite differenced
+        multif.gradients.calcGradientsFD(nozzle, nozzle.fd_step_size, 
+            output=output)
+        nozzle.gradients.update(saveGradients)
+
+    if csResponses:
+        Quasi1DGradientsCS(nozzle, csResponses, output)
+
+    return nozzle.gradients
+
+
     
 def Run(nozzle, **kwargs):
         
@@ -1175,7 +1355,8 @@ def Run(nozzle, **kwargs):
         if skipAero:
             sys.stdout.write("WARNING: Skipping low-fidelity aero analysis.\n")
         else:
-            thrust, x, walltemp, wallpress, press, velocity = Quasi1D(nozzle, output)
+            with nozzle.profiler.Stage('cfd'):
+                thrust, x, walltemp, wallpress, press, velocity = Quasi1D(nozzle, output)
         
         # Assign function values        
         if 'THRUST' in nozzle.responses:
@@ -1201,7 +1382,8 @@ def Run(nozzle, **kwargs):
 
     # Obtain mass (volume is currently not accepted as a nozzle response)
     if 'MASS' in nozzle.responses or 'MASS_WALL_ONLY' in nozzle.responses:
-        total_mass, wall_mass = getMass(nozzle, output)
+        with nozzle.profiler.Stage('mass'):
+            total_mass, wall_mass = getMass(nozzle, output)
         if 'MASS' in nozzle.responses:
             nozzle.responses['MASS'] = total_mass;
         if 'MASS_WALL_ONLY' in nozzle.responses:
@@ -1212,17 +1394,20 @@ def Run(nozzle, **kwargs):
     
         if ( output == 'verbose' ):
             sys.stdout.write('Running gradient analysis\n');
-    
-        if ( nozzle.gradientsMethod == 'ADJOINT' ):
-            sys.stderr.write('\n ## ERROR : Adjoint gradients for low-fidelity '
-                'thrust calculation are not available.\n');
-            sys.exit(1);
-        elif ( nozzle.gradientsMethod == 'FINITE_DIFF' ):
-            multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,output);           
-        else:
-            sys.stderr.write('  ## ERROR : Unknown gradients computation '
-                'method.\n');
-            sys.exit(1);
+        
+        with nozzle.profiler.Stage('gradients'):
+            if ( nozzle.gradientsMethod == 'ADJOINT' ):
+                sys.stderr.write('\n ## ERROR : Adjoint gradients for low-fidelity '
+                    'thrust calculation are not available.\n');
+                sys.exit(1);
+            elif ( nozzle.gradientsMethod == 'FINITE_DIFF' ):
+                multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,output=output);           
+            elif ( nozzle.gradientsMethod == 'COMPLEX_STEP' ):
+                calcGradientsCS(nozzle,output=output);
+            else:
+                sys.stderr.write('  ## ERROR : Unknown gradients computation '
+                    'method.\n');
+                sys.exit(1);
             
         # Write separate gradients file
         # gradFile = open(nozzle.gradientsFile,'w');
@@ -1232,9 +1417,12 @@ def Run(nozzle, **kwargs):
     
     # Write data
     if writeToFile:
-        if nozzle.outputFormat == 'PLAIN':
-            nozzle.WriteOutputFunctions_Plain();
-        else:
-            nozzle.WriteOutputFunctions_Dakota();
+        with nozzle.profiler.Stage('io'):
+            if nozzle.outputFormat == 'PLAIN':
+                nozzle.WriteOutputFunctions_Plain();
+            else:
+                nozzle.WriteOutputFunctions_Dakota();
+        if nozzle.profileFile is not None:
+            nozzle.profiler.Write(nozzle.profileFile);
         
     return 0;
@@ -1,7 +1,8 @@
 import sys
+import hashlib
+from itertools import islice
+
 import numpy as np
-from scipy.spatial import ConvexHull
-from scipy.interpolate import griddata
 
 # Kreselmeier-Steinhauser function
 def ksFunction(x,p):
@@ -11,35 +12,135 @@ def ksFunction(x,p):
 # Modified P-norm function
 def pnFunction(x,p):
     return ((1./len(x))*np.sum(np.power(x,p)))**(1./p)
+
+
+#==============================================================================
+# AERO-S output files (STRESS.*, STRAIN*.*, TEMP.*) of an evaluation. Each file
+# is parsed once, by chunks of lines, and only its last column (values) and,
+# if requested, its columns 1-3 (node coordinates) are kept, so that the text
+# of large files is never held in memory. The arrays are shared by all the
+# responses of the evaluation.
+#==============================================================================
+class AerosFiles:
+
+    def __init__(self, coords=False, chunk=1000000):
+
+        self.coords = coords; # keep node coordinates (pointwise responses)
+        self.chunk  = chunk;  # number of lines parsed at once
+
+        self.data = {}; # filename: (values, coordinates), None if missing
+        self.meshes = {}; # (shape, digest of coordinates): ConvexHullMesh
+
+    def Load(self, filename):
+        # (values, coordinates) of a file, None if it cannot be opened
+
+        if filename in self.data and (self.data[filename] is None or         \
+          not self.coords or self.data[filename][1] is not None):
+            return self.data[filename];
+
+        try:
+            self.data[filename] = readAerosFile(filename, self.coords, self.chunk);
+        except IOError:
+            self.data[filename] = None;
+
+        return self.data[filename];
+
+    def Values(self, filename):
+        data = self.Load(filename);
+        if data is None:
+            sys.stdout.write('WARNING: could not open %s\n' % filename);
+            return None;
+        return data[0];
+
+    def Coords(self, filename):
+        if not self.coords:
+            self.coords = True;
+        data = self.Load(filename);
+        if data is None:
+            return None;
+        return data[1];
+
+    def Mesh(self, filename):
+        # ConvexHullMesh of the nodes of a file, shared by the files with the
+        # same nodes
+        coord = self.Coords(filename);
+        if coord is None:
+            return None;
+        key = (coord.shape, hashlib.sha1(coord.tostring()).hexdigest());
+        if key not in self.meshes:
+            self.meshes[key] = ConvexHullMesh(coord);
+        return self.meshes[key];
+
+
+def readAerosFile(filename, coords=False, chunk=1000000):
+
+    # Values (last column) and, if coords, node coordinates (columns 1-3) of
+    # an AERO-S output file: 3 header lines, then one line per node
     
-    
-def assignTotalStress(k, filename, output='verbose'):
- 
-    # KS and PN params for stresses
-    ks_param = 50.;
-    pn_param = 10.;
-    
-    # Load data
-    try:
-        data = np.loadtxt(filename,dtype=float,skiprows=3); # stresses in 4th column (0-indexed)
-    except IOError:
-        sys.stdout.write('WARNING: could not open %s\n' % filename);
-        return 0;
-        
-    stress = data[:,-1];
-    
-    # Agglomerate stresses and assign
+    values = [];
+    xyz = [];
+    ncol = None;
+
+    f = open(filename,'r');
+    for i in range(3):
+        f.readline();
+
+    while True:
+        lines = list(islice(f, chunk));
+        if len(lines) == 0:
+            break;
+        if ncol is None:
+            ncol = len(lines[0].split());
+        arr = np.fromstring(''.join(lines), dtype=float, sep=' ');
+        if ncol == 0 or arr.size != len(lines)*ncol:
+            arr = np.loadtxt(lines, dtype=float, ndmin=2); # blank lines etc.
+        arr = arr.reshape(-1, ncol);
+        values.append(arr[:,-1].copy());
+        if coords:
+            xyz.append(arr[:,1:4].copy());
+
+    f.close();
+
+    values = np.concatenate(values) if len(values) > 0 else np.zeros(0);
+    if not coords:
+        return values, None;
+    xyz = np.vstack(xyz) if len(xyz) > 0 else np.zeros((0,3));
+    return values, xyz;
+
+
+def aggregate(k, x, scale=None, ks_param=50., pn_param=10.):
+
+    # MAX, KS or PN aggregate of x, as given in the QoI name k. x is divided
+    # by scale (default: its mean) for the KS and PN functions, and the
+    # aggregate is multiplied back by it
+
     if 'MAX' in k:
-        response = np.max(stress);
-    elif 'KS' in k:
-        stemp = np.mean(stress);
-        response = ksFunction(stress/stemp,ks_param)*stemp;                   
+        return np.max(x);
+
+    if scale is None:
+        scale = np.mean(x);
+
+    if 'KS' in k:
+        return ksFunction(x/scale,ks_param)*scale;
     elif 'PN' in k:
-        stemp = np.mean(stress);
-        response = pnFunction(stress/stemp,pn_param)*stemp;               
+        return pnFunction(x/scale,pn_param)*scale;
     else:
         sys.stderr.write('  ## ERROR : MAX, KS, or PN must be in QoI name: %s' % k);
         sys.exit(1);
+    
+    
+def assignTotalStress(k, filename, output='verbose', files=None):
+
+    if files is None:
+        files = AerosFiles();
+    
+    # Load data (stresses in last column)
+    stress = files.Values(filename);
+    if stress is None:
+        return 0;
+    
+    # Agglomerate stresses and assign
+    response = aggregate(k, stress);
         
     if output == 'verbose':
         sys.stdout.write('%s assigned from Aero-S file %s\n' % (k,filename));
@@ -47,11 +148,14 @@ def assignTotalStress(k, filename, output='verbose'):
     return response;
     
     
-def assignFailureCriteria(nozzle, k, filesuffix, material, output='verbose'):
+def assignFailureCriteria(nozzle, k, filesuffix, material, output='verbose', files=None):
         
     # KS and PN params for failure criteria
     ks_param = 50.;
     pn_param = 10.;
+
+    if files is None:
+        files = AerosFiles();
     
     # Assign failure criteria
     if not hasattr(material,'failureType'):
@@ -63,68 +167,42 @@ def assignFailureCriteria(nozzle, k, filesuffix, material, output='verbose'):
     
         # Von Mises is read in through the STRESS files
         filename = ['STRESS.' + str(filesuffix)];
-        try: 
-            data = np.loadtxt(filename[0],dtype=float,skiprows=3); # stresses in 4th column (0-indexed)
-        except IOError:
-            sys.stdout.write('WARNING: could not open %s\n' % filename[0]);
+        failureMeasure = files.Values(filename[0]);
+        if failureMeasure is None:
             return 0;
             
-        failureMeasure = data[:,-1];        
         failureLimit = material.yieldStress; 
                        
     elif material.failureType == 'PRINCIPLE_FAILURE_STRAIN':
                 
         filename = ['STRAINP1.' + str(filesuffix), 'STRAINP3.' + str(filesuffix)];
         
-        try:
-            data = np.loadtxt(filename[0],dtype=float,skiprows=3); # strains in 4th column (0-indexed)
-        except IOError:
-            sys.stdout.write('WARNING: could not open %s\n' % filename[0]);
-            return 0;        
-        strainp1 = data[:,-1];   
-
-        try:
-            data = np.loadtxt(filename[1],dtype=float,skiprows=3); # strains in 4th column (0-indexed)
-        except IOError:
-            sys.stdout.write('WARNING: could not open %s\n' % filename[1]);
-            return 0;        
-        strainp3 = data[:,-1]; 
+        strainp1 = files.Values(filename[0]);
+        if strainp1 is None:
+            return 0;
+        strainp3 = files.Values(filename[1]);
+        if strainp3 is None:
+            return 0;
           
         # Assign failure criterion
-        failureMeasure = np.max(np.vstack((strainp1,strainp3)),axis=0);
+        failureMeasure = np.maximum(strainp1,strainp3);
         failureLimit = material.getFailureLimit();
         
     elif material.failureType == 'LOCAL_FAILURE_STRAIN':
 
         filename = ['STRAINXX.' + str(filesuffix), 'STRAINYY.' + str(filesuffix)];
         
-        try:
-            data = np.loadtxt(filename[0],dtype=float,skiprows=3); # strains in 4th column (0-indexed)
-        except IOError:
-            sys.stdout.write('WARNING: could not open %s\n' % filename[0]);
-            return 0;        
-        strainxx = data[:,-1];
-        
-        try:
-            data = np.loadtxt(filename[1],dtype=float,skiprows=3); # strains in 4th column (0-indexed)
-        except IOError:
-            sys.stdout.write('WARNING: could not open %s\n' % filename[1]);
-            return 0;            
-        strainyy = data[:,-1];
+        strainxx = files.Values(filename[0]);
+        if strainxx is None:
+            return 0;
+        strainyy = files.Values(filename[1]);
+        if strainyy is None:
+            return 0;
         
-        # Assign failure criterion
+        # Assign failure criterion (tension or compression failure strain)
         failureStrain = material.getFailureLimit();
-        failxx = np.empty((strainxx.size));
-        failyy = np.empty((strainyy.size));
-        for i in range(len(failxx)):
-            if strainxx[i] >= 0.:
-                failxx[i] = failureStrain[0];
-            else:
-                failxx[i] = failureStrain[1];
-            if strainyy[i] >= 0.:
-                failyy[i] = failureStrain[2];
-            else:
-                failyy[i] = failureStrain[3];
+        failxx = np.where(strainxx >= 0., failureStrain[0], failureStrain[1]);
+        failyy = np.where(strainyy >= 0., failureStrain[2], failureStrain[3]);
                 
         failureMeasure = np.vstack((strainxx,strainyy));
         failureLimit = np.vstack((failxx,failyy));
@@ -151,12 +229,14 @@ def assignFailureCriteria(nozzle, k, filesuffix, material, output='verbose'):
             failureRatio = np.array([failureRatio]);
             n, m = failureRatio.shape;
             
-        # Interpolate Radial Data on Convex Hull
+        # Interpolate Radial Data on Convex Hull (nodes of the last file)
+        coord = files.Coords(filename[-1]);
+        mesh = files.Mesh(filename[-1]) if nozzle.dim != '3D' else None;
         interpLoc = nozzle.outputLocations[k];
         response = [];
         for i in range(n):
             response.append(list(interpolateRadialDataOnConvexHull(nozzle, \
-                       interpLoc, data[:,1:4],failureRatio[i,:].T)));
+                       interpLoc, coord,failureRatio[i,:].T,mesh=mesh)));
     
     if output == 'verbose':
         for f in filename:
@@ -165,32 +245,20 @@ def assignFailureCriteria(nozzle, k, filesuffix, material, output='verbose'):
     return response;
     
     
-def assignTemperature(k, filesuffix, output='verbose'):
-        
-    # KS and PN params for failure criteria
-    ks_param = 50.;
-    pn_param = 10.;
+def assignTemperature(k, filesuffix, output='verbose', files=None):
+
+    if files is None:
+        files = AerosFiles();
     
     filename = 'TEMP.' + str(filesuffix);
     
-    try:
-        data = np.loadtxt(filename,dtype=float,skiprows=3); # temps in 4th column (0-indexed)
-    except IOError:
-        sys.stdout.write('WARNING: could not open %s\n' % filename);
+    # Load data (temperatures in last column)
+    temp = files.Values(filename);
+    if temp is None:
         return 0;
             
     # Agglomerate temperatures and assign
-    if 'MAX' in k:
-        response = np.max(data[:,-1]);
-    elif 'KS' in k:
-        stemp = np.mean(data[:,-1]);
-        response = ksFunction(data[:,-1]/stemp,ks_param)*stemp;                   
-    elif 'PN' in k:
-        stemp = np.mean(data[:,-1]);
-        response = pnFunction(data[:,-1]/stemp,pn_param)*stemp;            
-    else:
-        sys.stderr.write('  ## ERROR : MAX, KS, or PN must be in QoI name: %s' % k);
-        sys.exit(1);
+    response = aggregate(k, temp);
     
     if output == 'verbose':
         sys.stdout.write('%s assigned from Aero-S file %s\n' % (k,filename));
@@ -198,11 +266,14 @@ def assignTemperature(k, filesuffix, output='verbose'):
     return response;
 
 
-def assignTempRatio(nozzle, k, filesuffix, material, output='verbose'):
+def assignTempRatio(nozzle, k, filesuffix, material, output='verbose', files=None):
         
     # KS and PN params for failure criteria
     ks_param = 50.;
     pn_param = 10.;
+
+    if files is None:
+        files = AerosFiles();
     
     # Assign failure criteria
     if not hasattr(material,'Tmax'):    
@@ -211,29 +282,28 @@ def assignTempRatio(nozzle, k, filesuffix, material, output='verbose'):
         
     filename = 'TEMP.' + str(filesuffix);
     
-    try:
-        data = np.loadtxt(filename,dtype=float,skiprows=3); # temps in 4th column (0-indexed)
-    except IOError:
-        sys.stdout.write('WARNING: could not open %s\n' % filename);
+    temp = files.Values(filename);
+    if temp is None:
         return 0;
     
     # Agglomerate temperatures and assign
     if 'MAX' in k:
-        response = np.max(data[:,-1])/material.Tmax;
+        response = np.max(temp)/material.Tmax;
     elif 'KS' in k:
-        response = ksFunction(data[:,-1]/material.Tmax,ks_param);                   
+        response = ksFunction(temp/material.Tmax,ks_param);                   
     elif 'PN' in k:
-        response = pnFunction(data[:,-1]/material.Tmax,pn_param);            
+        response = pnFunction(temp/material.Tmax,pn_param);            
     else: # pointwise temperature ratios must be desired
         
         # Prepare failure ratio for each node
-        tempRatio = data[:,-1]/material.Tmax; # n x m
+        tempRatio = temp/material.Tmax; # n x m
         
         # Interpolate Radial Data on Convex Hull
         interpLoc = nozzle.outputLocations[k];
+        mesh = files.Mesh(filename) if nozzle.dim != '3D' else None;
         response = [];
         response.append(list(interpolateRadialDataOnConvexHull(nozzle, \
-                         interpLoc, data[:,1:4],tempRatio[:].T)));
+                         interpLoc, files.Coords(filename),tempRatio[:].T,mesh=mesh)));
     
     if output == 'verbose':
         sys.stdout.write('%s assigned from Aero-S file %s\n' % (k,filename));
@@ -249,8 +319,8 @@ def assignTempRatio(nozzle, k, filesuffix, material, output='verbose'):
 # depicting direction of ray in y-z plane as elevated from the x-y plane. Data
 # is a Numpy array of m x 3 for m nodes containing x, y, and z-coordinates of 
 # each node. data is an m x 1 array containing corresponding values for each 
-# node.
-def interpolateRadialDataOnConvexHull(nozzle, interpLoc, coord, data, output='verbose'):
+# node. mesh is the ConvexHullMesh of coord, if already built.
+def interpolateRadialDataOnConvexHull(nozzle, interpLoc, coord, data, output='verbose', mesh=None):
  
     # Determine ray information for intersection with convex hull
     if( nozzle.dim == '3D' ): # reference from centerline
@@ -266,24 +336,58 @@ def interpolateRadialDataOnConvexHull(nozzle, interpLoc, coord, data, output='ve
         rayDirections = np.vstack((np.zeros(n,),y,z));
         rayOrigins = np.vstack((x,np.zeros(n,),np.zeros(n,)));
     
-    # Build convex hull of data
-    hull = ConvexHull(coord); # convex hull of all nodes in 3D
-    eq = hull.equations.T; # transpose of hull equations
-    V, b = eq[:-1], eq[-1]; # normal vectors & offsets for hyperplanes
-
-    # Calculate intersection of ray with convex hull
-    denominator = np.dot(rayDirections.T,V);
-    # XXX DO SOMETHING HERE TO GET RID OF DIVIDE BY ZERO ERROR
-    alpha = (-b - np.dot(rayOrigins.T,V))/np.dot(rayDirections.T,V);
-    #intersections = np.min(alpha[alpha>=0])*rayDirections + rayOrigins;
-    # Subtract a small number here to ensure point is inside convex hull within
-    # rounding errors
-    intersections = (np.min(alpha[alpha>=0])-1e-14)*rayDirections + rayOrigins;
+    if mesh is None:
+        mesh = ConvexHullMesh(coord);
+    
+    # Intersection of each ray with convex hull
+    intersections = mesh.Intersect(rayOrigins, rayDirections);
     
     # Now do interpolation for intersection points that have been found
-    val = griddata(coord,data,intersections.T,method='linear');
+    val = mesh.Interpolate(data, intersections.T);
     
     return val;
+
+
+#==============================================================================
+# Convex hull and Delaunay triangulation of the nodes of a structural mesh,
+# built once and shared by all the pointwise responses interpolated on it
+#==============================================================================
+class ConvexHullMesh:
+
+    def __init__(self, coord):
+
+        from scipy.spatial import ConvexHull, Delaunay
+
+        hull = ConvexHull(coord); # convex hull of all nodes in 3D
+        eq = hull.equations.T; # transpose of hull equations
+        self.V, self.b = eq[:-1], eq[-1]; # normal vectors & offsets for hyperplanes
+
+        self.tri = Delaunay(coord); # same triangulation as griddata
+
+    def Intersect(self, rayOrigins, rayDirections):
+
+        # 3 x n intersections of n rays (3 x n origins inside the hull and
+        # directions) with the convex hull: closest hyperplane in front of
+        # each ray
+
+        denominator = np.dot(rayDirections.T,self.V); # n x number of facets
+        numerator = -self.b - np.dot(rayOrigins.T,self.V);
+        with np.errstate(divide='ignore', invalid='ignore'):
+            alpha = numerator/denominator;
+        alpha[~(denominator > 0) | ~(alpha >= 0)] = np.inf;
+        alpha = np.min(alpha,axis=1);
+
+        # Subtract a small number here to ensure point is inside convex hull
+        # within rounding errors
+        return (alpha-1e-14)*rayDirections + rayOrigins;
+
+    def Interpolate(self, data, points):
+
+        # Linear interpolation of nodal data at points (NaN outside the hull)
+
+        from scipy.interpolate import LinearNDInterpolator
+
+        return LinearNDInterpolator(self.tri,data)(points);
    
     
 def PostProcess ( nozzle, output='verbose' ):
@@ -301,6 +405,15 @@ def PostProcess ( nozzle, output='verbose' ):
     # --- Determine labeling of files
     aerosSuffix = [0, -1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12];
     multifPrefix = nozzle.prefixLabels;   
+    
+    # --- AERO-S files, parsed once for all responses. Node coordinates are
+    #     only kept for pointwise responses
+    pointwise = False;
+    for k in nozzle.responses:
+        if ('FAILURE_CRITERIA' in k or 'TEMP_RATIO' in k) and                 \
+          not ('MAX' in k or 'KS' in k or 'PN' in k):
+            pointwise = True;
+    files = AerosFiles(coords=pointwise);
         
     # --- Assign results as necessary
     for k in nozzle.responses:
@@ -314,7 +427,7 @@ def PostProcess ( nozzle, output='verbose' ):
                     # Provide corresponding aeros filename to function to calculate total stress 
                     # in this component
                     filename = 'STRESS.' + str(aerosSuffix[multifPrefix.index(prefix)]);
-                    nozzle.responses[k] = assignTotalStress(k,filename,output);
+                    nozzle.responses[k] = assignTotalStress(k,filename,output,files);
                     assigned = 1;
                     break; # Go to next k in nozzle.responses
             
@@ -323,7 +436,7 @@ def PostProcess ( nozzle, output='verbose' ):
                 for prefix in multifPrefix:
                     specificLabel = prefix + '_' + k;
                     filename = 'STRESS.' + str(aerosSuffix[multifPrefix.index(prefix)]);
-                    nozzle.responses[k].append(assignTotalStress(k,filename,output));
+                    nozzle.responses[k].append(assignTotalStress(k,filename,output,files));
         
         # Assign failure criteria results
         elif 'FAILURE_CRITERIA' in k:
@@ -334,7 +447,7 @@ def PostProcess ( nozzle, output='verbose' ):
                     # Provide corresponding aeros filename to function to calculate failure crit.
                     # in this component
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k] = assignFailureCriteria(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output);
+                    nozzle.responses[k] = assignFailureCriteria(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output,files);
                     assigned = 1;
                     break; # Go to next k in nozzle.responses
             
@@ -342,7 +455,7 @@ def PostProcess ( nozzle, output='verbose' ):
             if assigned == 0:
                 for prefix in multifPrefix:
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k].append(assignFailureCriteria(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output));
+                    nozzle.responses[k].append(assignFailureCriteria(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output,files));
         
         # Assign mechanical stress results
         elif 'MECHANICAL_STRESS' in k:
@@ -377,7 +490,7 @@ def PostProcess ( nozzle, output='verbose' ):
                     # Provide corresponding aeros filename to function to calculate temp ratio
                     # in this component
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k] = assignTemperature(k,filesuffix,output);
+                    nozzle.responses[k] = assignTemperature(k,filesuffix,output,files);
                     assigned = 1;
                     break; # Go to next k in nozzle.responses
             
@@ -385,7 +498,7 @@ def PostProcess ( nozzle, output='verbose' ):
             if assigned == 0:
                 for prefix in multifPrefix[0:4]: # Only first four components have temperatures output
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k].append(assignTemperature(k,filesuffix,output));
+                    nozzle.responses[k].append(assignTemperature(k,filesuffix,output,files));
             
         # Assign temperature ratio results
         elif 'TEMP_RATIO' in k:
@@ -396,7 +509,7 @@ def PostProcess ( nozzle, output='verbose' ):
                     # Provide corresponding aeros filename to function to calculate temp ratio
                     # in this component
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k] = assignTempRatio(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output);
+                    nozzle.responses[k] = assignTempRatio(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output,files);
                     assigned = 1;
                     break; # Go to next k in nozzle.responses
             
@@ -405,7 +518,7 @@ def PostProcess ( nozzle, output='verbose' ):
                 filenames = []
                 for prefix in multifPrefix[0:4]: # Only first four components have temperatures output
                     filesuffix = aerosSuffix[multifPrefix.index(prefix)];
-                    nozzle.responses[k].append(nozzle,assignTempRatio(k,filesuffix,mat[multifPrefix.index(prefix)],output));
+                    nozzle.responses[k].append(assignTempRatio(nozzle,k,filesuffix,mat[multifPrefix.index(prefix)],output,files));
             
     # END for k in nozzle.responses
     
@@ -5,13 +5,16 @@ from .. import SU2
 from runSU2 import CheckSU2Convergence
 
 import numpy as np
-from scipy.interpolate import interp1d 
 
 from .. import _meshutils_module
-from multif import _mshint_module
 
 def PostProcess ( nozzle, output ):
     
+    # --- Solution interpolations use the cores allocated to the analysis
+    
+    from multif import interpolation
+    interpolation.setNumThreads(nozzle.cpusPerTask);
+    
     # --- Check residual convergence
     
     from multif import MEDIUMF
@@ -63,6 +66,7 @@ def PostProcess ( nozzle, output ):
         
     if 'WALL_PRESSURE' in nozzle.responses:
 
+        from scipy.interpolate import interp1d
         func = interp1d(SolExtract_w[:,0],  Pres, kind='linear');        
         nozzle.responses['WALL_PRESSURE'] = np.squeeze(func(nozzle.outputLocations['WALL_PRESSURE']));
 
@@ -164,6 +168,8 @@ def Get_Thrust_File(nozzle):
 
 def ComputeThrust_2 ( options, SolExtract, Size, Header )    :
 
+    from scipy.interpolate import interp1d
+
     # T = 2PI * Int_{0}^{R} (rho U ( U - U0) + P - Po ) r dr
 
     NbrVer = Size[0];
@@ -456,6 +462,8 @@ def ComputeThrust ( nozzle, SolExtract, Size, Header )    :
 
 def ExtractExitRANS (exit_name, mesh_name, sol_name)    :
     
+    from multif.interpolation import getInterpolator
+    
     exitNam = "exit.mesh";
     
     # --- Interpolate solution
@@ -467,8 +475,8 @@ def ExtractExitRANS (exit_name, mesh_name, sol_name)    :
     Sol  = [];
     Header = [];
     
-    out = _mshint_module.py_Interpolation (exitNam,mesh_name, sol_name,\
-        info, Crd, Tri, Tet, Sol, Header);
+    itp = getInterpolator(mesh_name, sol_name);
+    out = itp.interpolate(exitNam, info, Crd, Tri, Tet, Sol, Header);
     
     # --- Extract CFD solution at the inner wall    
     
@@ -547,83 +555,26 @@ def ExtractSolutionAtWall (nozzle):
 
 def WriteGMFMesh2D(MshNam, Ver, Tri):
     
-    f = open(MshNam, 'wb');
+    # Binary if MshNam is a .meshb (see multif.gmf)
     
-    NbrVer = len(Ver);
-    NbrTri = len(Tri);
+    from multif import gmf
     
-    f.write("MeshVersionFormatted\n2\nDimension\n2\n\n");
-
-
-    #--- Write vertices
-    f.write("Vertices\n%d\n" % NbrVer);
-    for i in range(0,NbrVer):
-        f.write("%lf %lf %d\n" % (Ver[i][0],Ver[i][1],0));
-        
-    #--- Write triangles
-    f.write("\n\nTriangles\n%d\n" % NbrTri);
-    for i in range(0,NbrTri):
-        f.write("%d %d %d 1\n" % (Tri[i][0],Tri[i][1], Tri[i][2]));
-        
-    f.write("\nEnd\n");
+    Tri = [[t[0],t[1],t[2],1] for t in Tri];
     
-    if f :
-        f.close();
+    gmf.WriteMesh(MshNam, 2, Ver, VerRef=[0]*len(Ver), Tri=Tri);
 
 
 def ExtractSolutionAtXY (x, y, tagField):
     
-    Ver = [];
-    Tri = [];
-    
-    # --- Create structured mesh
-    
-    x, id_x = np.unique(x.round(decimals=4),return_inverse=True);
-    y, id_y = np.unique(y.round(decimals=4),return_inverse=True);
-    
-    Ni = len(x);
-    Nj = len(y);
-    
-    if Ni == 1:
-        x = np.append(x, x[0]+0.1);
-        Ni=Ni+1;
-        
-    if Nj == 1:
-        y = np.append(y, y[0]+0.1);
-        Nj=Nj+1;
-        
-    NbrVer = Ni*Nj;
-    
-    for i in range(0,Ni):
-        for j in range(0,Nj):
-            Ver.append([x[i],y[j],0.0]);
+    from multif.interpolation import getInterpolator
     
-    NbrTri = 0;
+    # --- Interpolate at the (rounded) requested locations. The background
+    #     mesh and solution are kept in memory between calls
     
-    for i in range(2,Ni+1):
-        for j in range(2,Nj+1):
-            ind = (i-2)*Nj+j-1;
+    crd = zip(x.round(decimals=4), y.round(decimals=4));
     
-            Tri.append([ind, ind+Nj, ind+Nj+1]);
-            Tri.append([ind, ind+1+Nj, ind+1,1]);
-
-    WriteGMFMesh2D('nozzle_extract.mesh', Ver, Tri);
-    
-    info = [];
-    Crd  = [];
-    Tri  = [];
-    Tet  = [];
-    Sol  = [];
-    Header = [];
-    
-    out = _mshint_module.py_Interpolation ("nozzle_extract.mesh", "nozzle.su2", "nozzle.dat",\
-        info, Crd, Tri, Tet, Sol, Header);
-    
-    dim    = info[0];
-    NbrVer = info[1]; 
-    NbrTri = info[2];
-    NbrTet = info[3];
-    SolSiz = info[4];
+    itp = getInterpolator("nozzle.su2", "nozzle.dat");
+    Sol, Header = itp.interpolatePoints(crd);
     
     NbrFld = len(tagField);
     iFldTab = [];
@@ -646,22 +597,13 @@ def ExtractSolutionAtXY (x, y, tagField):
         
     OutSol = [];
     
-    for i in range(len(id_x)):
-        
-        ii = id_x[i]+1;
-        jj = id_y[i]+1;
-        
-        iVer = (ii-1)*Nj+jj;
-        
-        idx  = (iVer-1)*dim;
-        idxs = (iVer-1)*SolSiz;
-        
+    for i in range(len(Sol)):
         
         solTab = [];
         
         for iTab in range(NbrFld):
             iFld = iFldTab[iTab];
-            solTab.append(Sol[idxs+iFld+1]);
+            solTab.append(Sol[i][iFld]);
         
         OutSol.append(solTab);
         
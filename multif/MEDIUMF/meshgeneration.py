@@ -8,9 +8,6 @@ import numpy as np
 
 import multif
 
-from scipy import interpolate as itp
-from scipy.interpolate import splev, splrep
-
 from .. import SU2
 from .. import nozzle as noz
 
@@ -24,6 +24,8 @@ def Run( nozzle, **kwargs ):
     postpro = 0;
     skipAero = 0;
     skipAeroPostPro = 0;
+    skipThermal = 0;
+    runFrom = None; # evaluation directory, if run in a temporary one
     
     if 'output' in kwargs:
         output = kwargs['output'];
@@ -40,6 +42,9 @@ def Run( nozzle, **kwargs ):
     if 'skipAeroPostPro' in kwargs and kwargs['skipAeroPostPro'] == 1:
         skipAeroPostPro = 1;
 
+    if 'skipThermal' in kwargs and kwargs['skipThermal'] == 1:
+        skipThermal = 1;
+
     # # Obtain mass and volume
     # if 'MASS' in nozzle.responses or 'VOLUME' in nozzle.responses:
     #     volume, mass = nozzlemod.geometry.calcVolumeAndMass(nozzle)
@@ -109,29 +114,35 @@ def Run( nozzle, **kwargs ):
                 # Run aero analysis (and thrust adjoint if necessary)  
     	        #CheckOptions (nozzle);
                 curDir = os.path.dirname(os.path.realpath(__file__));	
-                if nozzle.runDir != '':
-    	            os.chdir(nozzle.runDir);
+                if nozzle.tempRunDir:
+                    runFrom = os.getcwd();
+                    nozzle.runDir = nozzle.retention.Temporary(runFrom);
+                    os.chdir(nozzle.runDir);
                 if skipAero:
                     sys.stdout.write("WARNING: Skipping medium-fidelity aero analysis.\n")
                 else:	
-                    gradCalc = runSU2 (nozzle);
+                    with nozzle.profiler.Stage('cfd'):
+                        gradCalc = runSU2 (nozzle);
 	        
 	        # Run thermal/structural analyses
             if nozzle.thermalFlag == 1 or nozzle.structuralFlag == 1:
-                multif.MEDIUMF.runAEROS(nozzle, output);  
+                multif.MEDIUMF.runAEROS(nozzle, output, skipThermal=skipThermal);  
         
         # Assign aero QoI if required
         if nozzle.aeroFlag == 1 and skipAeroPostPro != 1:
-            SU2postprocessing.PostProcess(nozzle, output);
+            with nozzle.profiler.Stage('cfd_postpro'):
+                SU2postprocessing.PostProcess(nozzle, output);
         
         # Assign thermal/structural QoI if required
         if nozzle.thermalFlag == 1 or nozzle.structuralFlag == 1:
-            AEROSpostprocessing.PostProcess(nozzle, output);             
+            with nozzle.profiler.Stage('structural'):
+                AEROSpostprocessing.PostProcess(nozzle, output);             
         
         
     # Obtain mass (volume is currently not accepted as a nozzle response)
     if 'MASS' in nozzle.responses or 'MASS_WALL_ONLY' in nozzle.responses:
-        total_mass, wall_mass = getMass(nozzle, output)
+        with nozzle.profiler.Stage('mass'):
+            total_mass, wall_mass = getMass(nozzle, output)
         if 'MASS' in nozzle.responses:
             nozzle.responses['MASS'] = total_mass;
         if 'MASS_WALL_ONLY' in nozzle.responses:
@@ -139,8 +150,9 @@ def Run( nozzle, **kwargs ):
        
     # Calculate gradients if necessary
     if nozzle.gradientsFlag == 1 and runAeroThermalStructuralGradients:
-
-        if ( nozzle.gradientsMethod == 'ADJOINT' ):
+        
+        with nozzle.profiler.Stage('gradients'):
+            if ( nozzle.gradientsMethod == 'ADJOINT' ):
 
 #                # Convergence study using B-spline coefs show finite difference mass gradients
 #                # converge. Most accurate gradients use absolute step size 1e-8. RWF 5/10/17
@@ -148,51 +160,51 @@ def Run( nozzle, **kwargs ):
 #                nozzle.mass_grad = nozzlemod.geometry.calcMassGradientsFD(nozzle,1e-8);
 #                sys.stdout.write("Done mass gradients.\n");				
 
-            if gradCalc == 0: # i.e. failed adjoint calculation, use finite differences
-                # Rerun center point with same number of cores as differences.
-                # This is to avoid a bug where SU2 converges differently when
-                # run on different number of processors.
-                multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,rerun_center=1,output=output);
-            else:
-                # Check for other required gradients
-                otherRequiredGradients = 0;
-                for k in nozzle.gradients:
-                    #if k not in ['MASS','VOLUME','MASS_WALL_ONLY','THRUST']:
-                    if k not in ['THRUST']:
-                        otherRequiredGradients = 1;
-                        sys.stderr.write(' ## WARNING: QoI gradients desired using ADJOINT '
-                            'method which do not have an associated adjoint calculation.\n'
-                            ' Namely: %s. The current implementation requires finite '
-                            'differencing across the aero analysis, so this method is '
-                            'equivalent in computational cost to choosing the FINITE_DIFF'
-                            ' method\n' % k);
-                # Do finite difference for other QoI if there are any, but use
-                # adjoint gradients for thrust
-                if otherRequiredGradients:
-                    saveThrustGradients = nozzle.gradients['THRUST'];
-                    saveThrustResponse = nozzle.responses['THRUST'];
-                    nozzle.gradients.pop('THRUST',None);
-                    nozzle.responses.pop('THRUST',None); # avoid calculating thrust
-                    thrustIndex = nozzle.outputTags.index('THRUST');
-                    nozzle.outputTags.remove('THRUST'); # temporarily remove THRUST
+                if gradCalc == 0: # i.e. failed adjoint calculation, use finite differences
                     # Rerun center point with same number of cores as differences.
                     # This is to avoid a bug where SU2 converges differently when
                     # run on different number of processors.
                     multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,rerun_center=1,output=output);
-                    nozzle.gradients['THRUST'] = saveThrustGradients;
-                    nozzle.responses['THRUST'] = saveThrustResponse;
-                    nozzle.outputTags.insert(thrustIndex,'THRUST');
+                else:
+                    # Check for other required gradients
+                    otherRequiredGradients = 0;
+                    for k in nozzle.gradients:
+                        #if k not in ['MASS','VOLUME','MASS_WALL_ONLY','THRUST']:
+                        if k not in ['THRUST']:
+                            otherRequiredGradients = 1;
+                            sys.stderr.write(' ## WARNING: QoI gradients desired using ADJOINT '
+                                'method which do not have an associated adjoint calculation.\n'
+                                ' Namely: %s. The current implementation requires finite '
+                                'differencing across the aero analysis, so this method is '
+                                'equivalent in computational cost to choosing the FINITE_DIFF'
+                                ' method\n' % k);
+                    # Do finite difference for other QoI if there are any, but use
+                    # adjoint gradients for thrust
+                    if otherRequiredGradients:
+                        saveThrustGradients = nozzle.gradients['THRUST'];
+                        saveThrustResponse = nozzle.responses['THRUST'];
+                        nozzle.gradients.pop('THRUST',None);
+                        nozzle.responses.pop('THRUST',None); # avoid calculating thrust
+                        thrustIndex = nozzle.outputTags.index('THRUST');
+                        nozzle.outputTags.remove('THRUST'); # temporarily remove THRUST
+                        # Rerun center point with same number of cores as differences.
+                        # This is to avoid a bug where SU2 converges differently when
+                        # run on different number of processors.
+                        multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,rerun_center=1,output=output);
+                        nozzle.gradients['THRUST'] = saveThrustGradients;
+                        nozzle.responses['THRUST'] = saveThrustResponse;
+                        nozzle.outputTags.insert(thrustIndex,'THRUST');
                     
-        elif ( nozzle.gradientsMethod == 'FINITE_DIFF' ):
-            # Rerun center point with same number of cores as differences.
-            # This is to avoid a bug where SU2 converges differently when
-            # run on different number of processors.            
-            multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,rerun_center=1,output=output);  
+            elif ( nozzle.gradientsMethod == 'FINITE_DIFF' ):
+                # Rerun center point with same number of cores as differences.
+                # This is to avoid a bug where SU2 converges differently when
+                # run on different number of processors.            
+                multif.gradients.calcGradientsFD(nozzle,nozzle.fd_step_size,rerun_center=1,output=output);  
                         
-        else:
-            sys.stderr.write('  ## ERROR : Unknown gradients computation '
-                'method.\n');
-            sys.exit(1);
+            else:
+                sys.stderr.write('  ## ERROR : Unknown gradients computation '
+                    'method.\n');
+                sys.exit(1);
             
         # Write separate gradients file
         # gradFile = open(nozzle.gradientsFile,'w');
@@ -205,9 +217,20 @@ def Run( nozzle, **kwargs ):
         
         #tag_out, val_out, gra_out, gratag_out = nozzle.GetOutputFunctions();
                 
-        if nozzle.outputFormat == 'PLAIN':
-            nozzle.WriteOutputFunctions_Plain();
-        else:
-            nozzle.WriteOutputFunctions_Dakota();
+        with nozzle.profiler.Stage('io'):
+            if nozzle.outputFormat == 'PLAIN':
+                nozzle.WriteOutputFunctions_Plain();
+            else:
+                nozzle.WriteOutputFunctions_Dakota();
+        if nozzle.profileFile is not None:
+            nozzle.profiler.Write(nozzle.profileFile);
         
+    # Leave the temporary run directory, retaining its files
+    if runFrom is not None:
+        os.chdir(runFrom);
+        nozzle.retention.Leave(nozzle.runDir, runFrom,
+            keep=[getattr(nozzle, 'inputDVfilename', None), nozzle.outputFile,
+                  nozzle.profileFile]);
+        nozzle.runDir = '';
+    
     return 0;
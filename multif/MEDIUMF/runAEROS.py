@@ -6,7 +6,6 @@ import textwrap
 import multif
 import ctypes
 import numpy as np
-from .. import _nozzle_module
 
 from AEROSpostprocessing import *
 from SU2postprocessing import ExtractSolutionAtWall
@@ -38,7 +37,11 @@ def getMass ( nozzle, output='verbose' ):
     return total_mass, wall_mass
 
 
-def runAEROS ( nozzle, output='verbose', run_analysis=1, mesh_params=None ):      
+def writeAerosInputs ( nozzle, output='verbose', run_analysis=1, mesh_params=None ):
+    
+    # AERO-S mesh and input files
+    
+    from .. import _nozzle_module
     
     # --- Set important flags
     
@@ -60,11 +63,6 @@ def runAEROS ( nozzle, output='verbose', run_analysis=1, mesh_params=None ):
     #     1: both thermal and structural analyses
     thermalFlag = 1 if nozzle.thermalFlag == 1 else 0;
 
-    # Determine whether to perform structural analysis:
-    #     0: no
-    #     1: yes
-    structuralFlag = 1 if nozzle.structuralFlag == 1 else 0;
-
     # Determine whether thermal model needs to be built so mass can be
     # calculated. A thermal analysis is not necessarily run unless needed.
     if 'MASS' in nozzle.responses or 'MASS_WALL_ONLY' in nozzle.responses:
@@ -549,6 +547,8 @@ def runAEROS ( nozzle, output='verbose', run_analysis=1, mesh_params=None ):
         MshNam_cfd = "nozzle.su2";
         SolNam_cfd = "nozzle.dat";
 
+        from multif import interpolation
+        interpolation.setNumThreads(nozzle.cpusPerTask);
         Crd, Tri, Pres, Temp = multif.HIGHF.hf_FluidStructureInterpolation(MshNam_str, MshNam_cfd, SolNam_cfd);
         sys.stdout.flush();
 
@@ -592,17 +592,38 @@ def runAEROS ( nozzle, output='verbose', run_analysis=1, mesh_params=None ):
         f1.close();
         os.rename("PRESSURES.txt.3d", "PRESSURES.txt");
 
+    return 0;
+
+
+def runAEROS ( nozzle, output='verbose', run_analysis=1, mesh_params=None, skipThermal=0 ):      
+    
+    from .. import _nozzle_module
+    
+    with nozzle.profiler.Stage('meshing'):
+        writeAerosInputs(nozzle, output, run_analysis, mesh_params);
+    
+    # Thermal and/or structural analyses (see writeAerosInputs)
+    thermalFlag = 1 if nozzle.thermalFlag == 1 else 0;
+    structuralFlag = 1 if nozzle.structuralFlag == 1 else 0;
+    
     # --- Execute analyses
     if run_analysis == 1:
         if thermalFlag > 0:
-            # Thermal analysis
-            os.system("aeros nozzle.aeroh");
-            # Convert temp. output from thermal analysis to input for structural analysis
-            _nozzle_module.convert();
+            # Thermal analysis (its output TEMP.0 and TEMP.2 are reused from
+            # the center point of a structural-only finite difference step)
+            with nozzle.profiler.Stage('thermal'):
+                if skipThermal == 1:
+                    sys.stdout.write("WARNING: Skipping thermal analysis.\n");
+                else:
+                    os.system("aeros nozzle.aeroh");
+                # Convert temp. output from thermal analysis to input for structural analysis
+                _nozzle_module.convert();
             # Structural analysis of CMC layer
-            os.system("aeros nozzle.aeros.cmc");
+            with nozzle.profiler.Stage('structural'):
+                os.system("aeros nozzle.aeros.cmc");
         if structuralFlag > 0:
             # Structural analysis of load layers + baffles and stringers
-            os.system("aeros nozzle.aeros");
+            with nozzle.profiler.Stage('structural'):
+                os.system("aeros nozzle.aeros");
 
     return 0;
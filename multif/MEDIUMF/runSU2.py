@@ -358,6 +358,11 @@ def checkResidual(config=[]):
 
 def runSU2 ( nozzle ):
     
+    # --- The mesh and solution files are rewritten: drop the cached
+    #     interpolators of previous runs
+    from multif.interpolation import clearInterpolators
+    clearInterpolators();
+    
     # --- Setup solver options
     solver_options = Solver_Options();
     
@@ -466,14 +471,15 @@ def runSU2 ( nozzle ):
 
     solver_options.Dimension = '2D';
     
-    if ( nozzle.meshDeformationFlag ):
-        GenerateNozzleMesh_Deform(nozzle);
-    else:
-        GenerateNozzleMesh(nozzle);
+    with nozzle.profiler.Stage('meshing'):
+        if ( nozzle.meshDeformationFlag ):
+            GenerateNozzleMesh_Deform(nozzle);
+        else:
+            GenerateNozzleMesh(nozzle);
         
-    if nozzle.method == "RANS":
-        GenerateNozzleExitMesh(nozzle);
-        solver_options.NbrIte=max(solver_options.NbrIte,5000);
+        if nozzle.method == "RANS":
+            GenerateNozzleExitMesh(nozzle);
+            solver_options.NbrIte=max(solver_options.NbrIte,5000);
     
     config = SetupConfig(solver_options);
     
@@ -1418,6 +1424,25 @@ def Compute_Thrust_Gradients_FD (nozzle):
         config_DOT = setupConfig_DOT (solver_options);
         info = SU2.run.DOT(config_DOT);
     
+    # --- Concurrent, warm-started perturbed cases
+    
+    if nozzle.cfd.fd_concurrent_cases > 1:
+        
+        config_CFD = SetupConfig(solver_options);
+        
+        config_CFD.OBJECTIVE_FUNCTION= 'THRUST_NOZZLE'
+        config_CFD.MARKER_THRUST= '( 9 ) '
+        config_CFD.THRUST_FILENAME= 'thrust_fd.dat';
+        
+        thrust = Run_Thrust_FD_Cases(nozzle, config_DEF, config_CFD, nbr_dv, 'thrust_fd.dat');
+        
+        for idv in range(nbr_dv):
+            if thrust[idv] is None:
+                return thrust_grad;
+            thrust_grad[idv] = thrust[idv]-thrust_nodef;
+        
+        return thrust_grad;
+    
     for idv in range(nbr_dv):
     
         # --- Call def
@@ -1467,6 +1492,124 @@ def Compute_Thrust_Gradients_FD (nozzle):
     return thrust_grad;
 
 
+def Run_Thrust_FD_Case (case):
+    # --- Run SU2_DEF then SU2_CFD in the directory of a perturbed case
+    #     (one process per case: SU2.run writes its config files in the
+    #     working directory)
+    
+    dirNam, su2_run = case;
+    
+    os.chdir(dirNam);
+    
+    try:
+        config_DEF = SU2.io.Config('config_DEF_fd.cfg');
+        config_DEF.SU2_RUN = su2_run;
+        SU2.run.DEF(config_DEF);
+        
+        config_CFD = SU2.io.Config('config_CFD_fd.cfg');
+        config_CFD.SU2_RUN = su2_run;
+        SU2.run.CFD(config_CFD);
+    except (Exception, SystemExit) as e:
+        return str(e);
+    
+    return '';
+
+
+def Run_Thrust_FD_Cases (nozzle, config_DEF, config_CFD, nbr_dv, thrust_filename):
+    # --- Run the SU2_DEF + SU2_CFD pair of each wall DV in its own directory
+    #     fd_<idv>, nozzle.cfd.fd_concurrent_cases pairs at a time sharing the
+    #     requested cores. Each perturbed CFD restarts from the baseline
+    #     solution and stops when the thrust has converged (Cauchy criterion,
+    #     relative tolerance nozzle.cfd.fd_thrust_tol).
+    #     Returns the thrust of each case (None if it failed)
+    
+    import multiprocessing
+    
+    ncases = max(1, min(nbr_dv, nozzle.cfd.fd_concurrent_cases));
+    nproc  = max(1, (nozzle.nTasks*nozzle.cpusPerTask)/ncases);
+    
+    su2_run = config_CFD.get('SU2_RUN', '');
+    
+    restart = os.path.abspath(nozzle.cfd.restart_name);
+    warm = os.path.exists(restart);
+    
+    if not warm:
+        sys.stdout.write("  ## WARNING : baseline solution %s not found. The perturbed cases are not warm-started.\n" % restart);
+    
+    sys.stdout.write("  -- Info : %d FD cases, %d at a time on %d cores each.\n" % (nbr_dv, ncases, nproc));
+    
+    cases = [];
+    
+    for idv in range(nbr_dv):
+        
+        motion_filename = os.path.abspath("wall_%d.dat" % idv);
+        
+        if not os.path.exists(motion_filename):
+            sys.stderr.write("  ## ERROR FD gradients: %s not found.\n" % motion_filename);
+            return [None]*nbr_dv;
+        
+        dirNam = os.path.abspath("fd_%d" % idv);
+        if not os.path.isdir(dirNam):
+            os.makedirs(dirNam);
+        
+        if os.path.exists(os.path.join(dirNam, thrust_filename)):
+            os.remove(os.path.join(dirNam, thrust_filename));
+        
+        # --- Deformation
+        
+        konfig = copy.deepcopy(config_DEF);
+        konfig.pop('SU2_RUN', None);
+        
+        konfig.MESH_FILENAME     = os.path.abspath(config_DEF.MESH_FILENAME);
+        konfig.MOTION_FILENAME   = motion_filename;
+        konfig.MESH_OUT_FILENAME = "nozzle_%d.su2" % idv;
+        konfig.NUMBER_PART       = min(int(config_DEF.NUMBER_PART), nproc);
+        
+        konfig.dump(os.path.join(dirNam, 'config_DEF_fd.cfg'));
+        
+        # --- CFD, restarted from the baseline solution
+        
+        konfig = copy.deepcopy(config_CFD);
+        konfig.pop('SU2_RUN', None);
+        
+        konfig.MESH_FILENAME         = "nozzle_%d.su2" % idv;
+        konfig.RESTART_FLOW_FILENAME = "nozzle_%d.dat" % idv;
+        konfig.NUMBER_PART           = nproc;
+        
+        if warm:
+            konfig.RESTART_SOL            = 'YES';
+            konfig.SOLUTION_FLOW_FILENAME = restart;
+        
+        konfig.CONV_CRITERIA    = 'CAUCHY';
+        konfig.CAUCHY_FUNC_FLOW = 'THRUST_NOZZLE';
+        konfig.CAUCHY_ELEMS     = 100;
+        konfig.CAUCHY_EPS       = nozzle.cfd.fd_thrust_tol;
+        
+        konfig.dump(os.path.join(dirNam, 'config_CFD_fd.cfg'));
+        
+        cases.append((dirNam, su2_run));
+    
+    pool = multiprocessing.Pool(ncases);
+    messages = pool.map(Run_Thrust_FD_Case, cases);
+    pool.close();
+    pool.join();
+    
+    thrust = [];
+    
+    for idv in range(nbr_dv):
+        
+        filNam = os.path.join(cases[idv][0], thrust_filename);
+        
+        if messages[idv] != '' or not os.path.exists(filNam):
+            sys.stderr.write("  ## ERROR Compute_Thrust_Gradients_FD : case %d failed.\n%s\n" % (idv, messages[idv]));
+            thrust.append(None);
+            continue;
+        
+        thrust.append(float(np.loadtxt(filNam)));
+    
+    return thrust;
+
+
 def Read_Gradients_AD (nozzle):
 
     nbr_dv = max(nozzle.wall.dv)+1;
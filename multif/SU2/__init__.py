@@ -5,13 +5,17 @@ class EvaluationFailure(RuntimeError):
 class DivergenceFailure(EvaluationFailure):
     pass
 
-import run
 import io
-import mesh
-import eval
-import opt
 import util
-import amginria
+
+# Solver interfaces, optimization and mesh adaptation tools are only imported
+# when first used
+from ..lazy import LazyModule
+run      = LazyModule('multif.SU2.run')
+mesh     = LazyModule('multif.SU2.mesh')
+eval     = LazyModule('multif.SU2.eval')
+opt      = LazyModule('multif.SU2.opt')
+amginria = LazyModule('multif.SU2.amginria')
 
 try:
     import readline
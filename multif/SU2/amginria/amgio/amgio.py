@@ -107,6 +107,10 @@ py_ConvertInriatoSU2 = _amgio.py_ConvertInriatoSU2
 def py_SplitSolution(SolNam, dim, prefix, adap_sensor):
     return _amgio.py_SplitSolution(SolNam, dim, prefix, adap_sensor)
 py_SplitSolution = _amgio.py_SplitSolution
+
+def py_ConvertSU2SolutiontoInria(SolNam, dim, prefix, adap_sensor):
+    return _amgio.py_ConvertSU2SolutiontoInria(SolNam, dim, prefix, adap_sensor)
+py_ConvertSU2SolutiontoInria = _amgio.py_ConvertSU2SolutiontoInria
 # This file is compatible with both classic and new-style classes.
 
 
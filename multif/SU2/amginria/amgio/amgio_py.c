@@ -61,4 +61,37 @@ int py_SplitSolution(char *SolNam, int dim, char *prefix, char *adap_sensor)
 	Msh->Dim = dim;
 	SplitSolution(Msh, prefix, adap_sensor);
 	
-}
\ No newline at end of file
+}
+
+
+/* Convert a SU2 solution to <prefix>.solb and write the adaptation sensor
+   (<prefix>_sensor.solb), reading the SU2 solution file once. The mesh is
+   not needed: the vertex order is the one of the SU2 mesh. */
+int py_ConvertSU2SolutiontoInria(char *SolNam, int dim, char *prefix, char *adap_sensor)
+{
+	
+	char OutSol[1024];
+	int SizMsh[GmfMaxSizMsh+1];
+	memset(SizMsh,0,sizeof(int)*(GmfMaxSizMsh+1));
+	
+	Mesh *Msh = AllocMesh(SizMsh);
+	
+	Msh->NbrVer = GetSU2SolSize(SolNam);
+	
+	if ( !LoadSU2Solution(SolNam, Msh) ) {
+		FreeMesh(Msh);
+		return 0;
+	}
+	
+	Msh->Dim = dim;
+	
+	sprintf(OutSol, "%s.solb", prefix);
+	if ( ! WriteGMFSolutionItf(OutSol, Msh) ) {
+		printf("  ## ERROR : Output of solution failed.\n");
+		FreeMesh(Msh);
+		return 0;
+	}
+	
+	return SplitSolution(Msh, prefix, adap_sensor);
+	
+}
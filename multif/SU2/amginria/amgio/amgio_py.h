@@ -1,4 +1,5 @@
 
 int py_ConvertSU2toInria( char *MshNam, char *SolNam, char *OutNam ) ;
 int py_ConvertInriatoSU2( char *MshNam, char *SolNam, char *OutNam ) ;
-int py_SplitSolution(char *SolNam, int dim, char *prefix, char *adap_sensor);
\ No newline at end of file
+int py_SplitSolution(char *SolNam, int dim, char *prefix, char *adap_sensor);
+int py_ConvertSU2SolutiontoInria(char *SolNam, int dim, char *prefix, char *adap_sensor);
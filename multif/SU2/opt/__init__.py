@@ -1,4 +1,4 @@
 # SU2/opt/__init__.py
 
-from project import Project
+from project import Project, load_project, compact_project
 from scipy_tools import scipy_slsqp as SLSQP
\ No newline at end of file
@@ -34,6 +34,7 @@
 # -------------------------------------------------------------------
 
 import os, sys, shutil, copy, glob, time
+import cPickle as pickle
 import numpy as np
 from .. import io   as su2io
 from .. import eval as su2eval
@@ -58,9 +59,17 @@ class Project(object):
         
         Runs multiple design classes, avoiding redundancy
         Looks for closest design on restart
-        Currently only based on DV_VALUE_NEW
+        Currently only based on DV_VALUE_NEW, with a hashed table of
+        the design vectors for the existing designs
         Exposes all methods of SU2.eval.design
         
+        The project is saved in project.pkl at start, and each updated
+        design is appended to project_log.pkl. Use load_project() to
+        load the project with its log, and compact_project() (or
+        Project.save()) to write the whole project and empty the log.
+        The SU2.opt drivers save the project when the optimization
+        finishes.
+        
         Attributes:
              config  - base config
              state   - base state
@@ -95,6 +104,10 @@ class Project(object):
     _design_folder = 'DESIGNS/DSN_*'
     _design_number = '%03d'
     
+    # design log, and design vector index (rebuilt when needed)
+    log_filename = 'project_log.pkl'
+    _dv_index = None
+    
     
     def __init__( self, config, state=None , 
                   designs=None, folder='.' ,
@@ -131,6 +144,7 @@ class Project(object):
         # output filenames
         self.filename = 'project.pkl' 
         self.results_filename = 'results.pkl' 
+        self.log_filename = 'project_log.pkl'
         
         # initialize folder with files
         pull,link = state.pullnlink(config)
@@ -148,6 +162,8 @@ class Project(object):
             
             # save project
             su2io.save_data(self.filename,self)
+            if os.path.exists(self.log_filename):
+                os.remove(self.log_filename)
             
         return
     
@@ -160,8 +176,6 @@ class Project(object):
         state  = self.state            # project state
         folder = self.folder           # project folder
         
-        filename = self.filename
-        
         # check folder
         assert os.path.exists(folder) , 'cannot find project folder %s' % folder        
         
@@ -190,8 +204,8 @@ class Project(object):
                 # plot results
                 self.plot_results()
 
-                # save data
-                su2io.save_data(filename,self)
+                # log design
+                self.append_log(design)
                 
             #: if updated
             
@@ -298,13 +312,24 @@ class Project(object):
         if not designs: 
             return [] , inf
         
-        diffs = []
-        for this_design in designs:
-            this_config = this_design.config
-            distance = config.dist(this_config,keys_check)
-            diffs.append(distance) 
-                        
-        #: for each design 
+        self.index_designs()
+        
+        # existing design
+        key = dv_key(config)
+        if self._dv_index.has_key(key):
+            return designs[self._dv_index[key]] , 0.0
+        
+        # distances to the design vectors
+        dv_array = self._dv_array
+        if dv_array is not None and dv_array.shape[1] == len(key):
+            diffs = np.sqrt( np.sum( (dv_array-np.array(key))**2 , 1 ) )
+        else:
+            diffs = []
+            for this_design in designs:
+                this_config = this_design.config
+                distance = config.dist(this_config,keys_check)
+                diffs.append(distance) 
+            #: for each design 
         
         # pick closest design
         i_min = np.argmin(diffs)
@@ -313,6 +338,36 @@ class Project(object):
         
         return closest, delta 
     
+    def index_designs(self):
+        """ updates the hashed table of the design vectors (DV_VALUE_NEW)
+            of the designs, and the array of these vectors
+        """
+        
+        if self._dv_index is None or self._dv_count > len(self.designs):
+            self._dv_index = {}
+            self._dv_keys  = []
+            self._dv_count = 0
+            self._dv_array = None
+        
+        if self._dv_count == len(self.designs):
+            return
+        
+        for i_dsn in range(self._dv_count,len(self.designs)):
+            key = dv_key(self.designs[i_dsn].config)
+            # keep the first design, as closest_design()
+            self._dv_index.setdefault(key,i_dsn)
+            self._dv_keys.append(key)
+        self._dv_count = len(self.designs)
+        
+        # array of design vectors, if they all have the same length
+        n_dv = len(self._dv_keys[0])
+        if all( [ len(k) == n_dv for k in self._dv_keys ] ):
+            self._dv_array = np.array(self._dv_keys).reshape(-1,n_dv)
+        else:
+            self._dv_array = None
+        
+        return
+    
     def init_design(self,config,closest=None):
         """ starts a new design
             works in project folder
@@ -448,9 +503,10 @@ class Project(object):
             for i_dsn,design in enumerate(designs):
                 design_filename = os.path.join(design.folder,design.filename)
                 self.designs[i_dsn] = su2io.load_data(design_filename)
+            self._dv_index = None
             
             self.compile_results()
-            su2io.save_data(self.filename,self)
+            self.compact()
             
         return
     
@@ -469,12 +525,127 @@ class Project(object):
         su2util.write_plot('history_project.dat',output_format,results_plot)
         
         
+    def append_log(self,design):
+        """ Project.append_log(design)
+            appends a design to the project log instead of saving the
+            whole project (in the project folder)
+        """
+        
+        for i_dsn,this_design in enumerate(self.designs):
+            if this_design is design: break
+        else:
+            raise Exception , 'design not found in project'
+        
+        with su2io.filelock(self.log_filename):
+            log_file = open(self.log_filename,'ab')
+            pickle.dump( (i_dsn,design) , log_file , pickle.HIGHEST_PROTOCOL )
+            log_file.close()
+        
+        return
+    
+    def replay_log(self):
+        """ n = Project.replay_log()
+            updates the designs with the project log, if any
+            (in the project folder), returns the number of log entries
+        """
+        
+        if not os.path.exists(self.log_filename):
+            return 0
+        
+        n_log = 0
+        
+        with su2io.filelock(self.log_filename):
+            log_file = open(self.log_filename,'rb')
+            while True:
+                try:
+                    i_dsn,design = pickle.load(log_file)
+                except (EOFError, pickle.UnpicklingError):
+                    # end of log, or entry interrupted while written
+                    break
+                if i_dsn < len(self.designs):
+                    self.designs[i_dsn] = design
+                elif i_dsn == len(self.designs):
+                    self.designs.append(design)
+                n_log += 1
+            log_file.close()
+        
+        self._dv_index = None
+        
+        return n_log
+    
+    def compact(self):
+        """ Project.compact()
+            saves the whole project and empties the project log
+            (in the project folder)
+        """
+        su2io.save_data(self.filename,self)
+        with su2io.filelock(self.log_filename):
+            if os.path.exists(self.log_filename):
+                os.remove(self.log_filename)
+        
     def save(self):
         with su2io.redirect_folder(self.folder):
-            su2io.save_data(self.filename,self)
+            self.compact()
         
     def __repr__(self):
         return '<Project> with %i <Design>' % len(self.designs)
     def __str__(self):
         output = self.__repr__()
         return output    
+
+
+# -------------------------------------------------------------------
+#  Project Log
+# -------------------------------------------------------------------
+
+def dv_key(config):
+    """ hashable design vector (DV_VALUE_NEW) of a config """
+    return tuple( [ float(v) for v in config.get('DV_VALUE_NEW',[]) ] )
+
+def load_project(filename='project.pkl'):
+    """ project = SU2.opt.load_project(filename='project.pkl')
+        loads a project and updates it with the log of the designs
+        evaluated since it was saved
+    """
+    
+    project = su2io.load_data(filename)
+    
+    folder = os.path.dirname(os.path.abspath(filename))
+    with su2io.redirect_folder(folder):
+        project.replay_log()
+        
+    return project
+
+def compact_project(filename='project.pkl'):
+    """ SU2.opt.compact_project(filename='project.pkl')
+        writes the project with its log in filename
+        and empties the log
+    """
+    
+    project = load_project(filename)
+    
+    folder = os.path.dirname(os.path.abspath(filename))
+    with su2io.redirect_folder(folder):
+        project.compact()
+        
+    return project
+
+
+# -------------------------------------------------------------------
+#  Compaction Command
+# -------------------------------------------------------------------
+
+if __name__ == '__main__':
+    
+    from optparse import OptionParser
+    
+    parser = OptionParser(usage='python -m multif.SU2.opt.project [-f FILE] compact')
+    parser.add_option("-f", "--file", dest="filename", default='project.pkl',
+                      help="project file", metavar="FILE")
+    (options, args) = parser.parse_args()
+    
+    if args != ['compact']:
+        parser.error('unknown command')
+    
+    project = compact_project(options.filename)
+    print '%s compacted: %s' % (options.filename,project)
@@ -117,20 +117,24 @@ def scipy_slsqp(project,x0=None,xb=None,its=100,accu=1e-10,grads=True):
     sys.stdout.write('Lower and upper bound for each independent variable: ' + str(xb) + '\n\n')
 
     # Run Optimizer
-    outputs = fmin_slsqp( x0             = x0             ,
-                          func           = func           , 
-                          f_eqcons       = f_eqcons       , 
-                          f_ieqcons      = f_ieqcons      ,
-                          fprime         = fprime         ,
-                          fprime_eqcons  = fprime_eqcons  , 
-                          fprime_ieqcons = fprime_ieqcons , 
-                          args           = (project,)     , 
-                          bounds         = xb             ,
-                          iter           = its            ,
-                          iprint         = 2              ,
-                          full_output    = True           ,
-                          acc            = accu           ,
-                          epsilon        = eps            )
+    try:
+        outputs = fmin_slsqp( x0             = x0             ,
+                              func           = func           , 
+                              f_eqcons       = f_eqcons       , 
+                              f_ieqcons      = f_ieqcons      ,
+                              fprime         = fprime         ,
+                              fprime_eqcons  = fprime_eqcons  , 
+                              fprime_ieqcons = fprime_ieqcons , 
+                              args           = (project,)     , 
+                              bounds         = xb             ,
+                              iter           = its            ,
+                              iprint         = 2              ,
+                              full_output    = True           ,
+                              acc            = accu           ,
+                              epsilon        = eps            )
+    finally:
+        # write the designs of the log to the project file
+        project.save()
     
     # Done
     return outputs
@@ -31,6 +31,8 @@
 
 import os, sys, numpy, time, shutil, glob, traceback
 
+from project import load_project
+
 # human readable time stamper
 pretty_time = lambda: time.asctime( time.localtime(time.time()))
 
@@ -65,8 +67,8 @@ def server( config_filename   , design_filename   ,
     # check for existing project file
     if os.path.exists(project_filename):
         
-        # load project 
-        The_Project = libSU2.load_data(project_filename)
+        # load project, with the designs of its log
+        The_Project = load_project(project_filename)
         The_Project.folder_self = os.getcwd()        
         
     # or start new project
@@ -182,18 +182,21 @@ def amg ( config , kind='' ):
             print "Global iter %d : Size %d, sub_ite %d" % (global_iter, mesh_size, iSub)
             
             #--- Convert current mesh/solution to inria format
+            #    The mesh is only converted once: the adapted mesh of the
+            #    previous iteration is kept in binary format (current.meshb)
             
-            amgio.py_ConvertSU2toInria(current_mesh, current_solution, "current")
+            if not os.path.exists(config_amg['mesh_in']):
+                amgio.py_ConvertSU2toInria(current_mesh, "", "current")
+            
+            #--- Get solution and sensor
+            
+            amgio.py_ConvertSU2SolutiontoInria(current_solution, dim, "current", adap_sensor);
             
             if not os.path.exists("current.solb"):
                 raise RuntimeError , "\n##ERROR : Can't find solution.\n"
             if not os.path.exists("current.meshb"):
                 raise RuntimeError , "\n##ERROR : Can't find mesh.\n"
             
-            #--- Get sensor
-            
-            amgio.py_SplitSolution(current_solution, dim, "current", adap_sensor);
-            
             if not os.path.exists("current_sensor.solb"):
                 raise RuntimeError , "\n##ERROR : Can't find adap sensor.\n"
                         
@@ -267,12 +270,17 @@ def amg ( config , kind='' ):
             sys.stdout = sav_stdout;
             sys.stderr = sav_stderr;
             
-            to_remove = ["current.itp.solb", config_amg['mesh_in'], config_amg['mesh_out'], config_amg['sol_in'],config_amg['itp_sol_in']];
+            to_remove = ["current.itp.solb", config_amg['sol_in'],config_amg['itp_sol_in']];
             for fil in to_remove:
                 if os.path.exists(fil) : os.remove(fil);
             
+            # The adapted mesh is the input mesh of the next iteration
+            shutil.move(config_amg['mesh_out'], config_amg['mesh_in']);
+            
             global_iter += 1;
     
+    if os.path.exists(config_amg['mesh_in']) : os.remove(config_amg['mesh_in']);
+    
     os.rename(current_solution,os.path.join(cwd,config.RESTART_FLOW_FILENAME));
     os.rename(current_mesh,os.path.join(cwd,config.MESH_OUT_FILENAME));
     
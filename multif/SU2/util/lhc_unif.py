@@ -1,63 +1,183 @@
 import numpy as np
 
-def lhc_unif(XB,NS,XI=None,maxits=10):
-    ''' XS = lhc_unif(XB,NS,XI=None,maxits=10):
-        
+def lhc_unif(XB,NS,XI=None,maxits=10,chunk=None):
+    ''' XS = lhc_unif(XB,NS,XI=None,maxits=10,chunk=None):
+
         Latin Hypercube Sampling with uniform density
         Iterates to maximize minimum L2 distance
         Accepts an array of points to respect while sampling
-        
+
+        The minimum distance is increased by element exchange: the
+        coordinates of the closest new point and of a random new point
+        are swapped in a random dimension (which keeps the Latin hypercube),
+        and the swap is kept if it increases the minimum distance. Only the
+        nearest neighbor distances of the new points are stored and updated
+        after each swap, so that memory is linear in the number of points.
+
         Inputs:
             XB          - ndim x 2 array of [lower,upper] bounds
             NS          - number of new points to sample
             XI = None   - ni x ndim array of initial points to respect
-            maxits = 10 - maximum number of iterations
-        
+            maxits = 10 - maximum number of iterations, of NS exchanges
+                          each (stops at the first iteration without
+                          improvement)
+            chunk = None - number of points per block in the initial
+                          nearest neighbor search (default: blocks of
+                          about 64 MB of distances)
+
         Outputs:
-            XS - ns x ndim array of sampled points
+            XS - (ni+ns) x ndim array of initial and sampled points
     '''
-    
+
     # dimension
     XB = np.atleast_2d(XB)
     ND = XB.shape[0]
-    
+
     # initial points to respect
     if XI is None:
         XI = np.empty([0,ND])
     else:
         XI = np.atleast_2d(XI)
-       
-    # output points
-    XO = []
-    
-    # initialize
-    mindiff = 0;
-    
+    NI = XI.shape[0]
+
+    # samples
+    S = np.zeros([NS,ND])
+
+    # populate samples
+    for i_d in range(ND):
+        S[:,i_d] = ( np.random.random([1,NS]) + np.random.permutation(NS) ) / NS
+    XS = S*(XB[:,1]-XB[:,0]) + XB[:,0]
+
+    # add initial points
+    XX = np.vstack([ XI , XS ])
+
+    if NS < 1 or NI+NS < 2:
+        return XX
+
+    # nearest neighbor of each new point
+    dmin, imin = nearest_dist(XX,NI,chunk)
+
+    if NS < 2:
+        return XX
+
+    # squared norms of the points, for the distance updates
+    X2 = np.sum(XX**2,1)
+
     # maximize minimum distance
     for it in range(maxits):
-        
-        # samples
-        S = np.zeros([NS,ND])
-        
-        # populate samples
-        for i_d in range(ND):
-            S[:,i_d] = ( np.random.random([1,NS]) + np.random.permutation(NS) ) / NS
-        XS = S*(XB[:,1]-XB[:,0]) + XB[:,0]        
-        
-        # add initial points
-        XX = np.vstack([ XI , XS ])
-        
-        # calc distances
-        vecdiff = vec_dist(XX)[0]
-        
-        # update
-        if vecdiff > mindiff:
-            mindiff = vecdiff
-            XO = XX
-        
+
+        improved = False
+
+        for ie in range(NS):
+
+            # closest new point, and random new point and dimension
+            i = NI + np.argmin(dmin)
+            j = NI + np.random.randint(NS-1)
+            if j >= i:
+                j = j + 1
+            k = np.random.randint(ND)
+
+            if exchange(XX,X2,NI,dmin,imin,i,j,k):
+                improved = True
+
+        if not improved:
+            break
+
     #: for iterate
-    
-    return XO
+
+    return XX
+
+def nearest_dist(X,NI=0,chunk=None):
+    ''' distance from each point X[NI:] to its nearest neighbor in X,
+        computed by blocks of chunk points (bounded memory)
+        returns the distances and the indices of the nearest neighbors
+    '''
+
+    nK,nD = X.shape
+
+    if chunk is None:
+        chunk = max(1, 2**23//nK)
+
+    X2 = np.sum(X**2,1)
+
+    imin = np.zeros([nK-NI],dtype=int)
+
+    for i0 in range(NI,nK,chunk):
+        i1 = min(i0+chunk,nK)
+
+        # squared distances of the block to all points
+        d2 = X2[i0:i1,None] + X2[None,:] - 2.*np.dot(X[i0:i1],X.T)
+        d2[np.arange(i1-i0),np.arange(i0,i1)] = np.inf
+
+        imin[i0-NI:i1-NI] = np.argmin(d2,1)
+
+    # exact distances to the nearest neighbors
+    dmin = np.sqrt( np.sum( (X[NI:]-X[imin])**2 , 1 ) )
+
+    return dmin, imin
+
+def row_dist(X,X2,l):
+    ''' distances from X[l] to all points X (X2: squared norms of X),
+        with an infinite distance to itself
+    '''
+
+    d = np.sqrt( np.maximum( X2 + X2[l] - 2.*np.dot(X,X[l]) , 0. ) )
+    d[l] = np.inf
+
+    return d
+
+def exchange(X,X2,NI,dmin,imin,i,j,k):
+    ''' swaps X[i,k] and X[j,k] if it increases the minimum of the nearest
+        neighbor distances dmin of the points X[NI:] (nearest neighbors
+        imin), and updates dmin and imin (X2: squared norms of X)
+        returns True if the swap was kept
+    '''
+
+    def swap():
+        X[i,k], X[j,k] = X[j,k], X[i,k]
+        X2[i] = np.dot(X[i],X[i])
+        X2[j] = np.dot(X[j],X[j])
+
+    swap()
+
+    # distances of the moved points to all points
+    di = row_dist(X,X2,i)
+    dj = row_dist(X,X2,j)
+
+    # other points may only get closer to i or j
+    dnew = dmin.copy()
+    inew = imin.copy()
+
+    closer = di[NI:] < dnew
+    dnew[closer] = di[NI:][closer]
+    inew[closer] = i
+    closer = dj[NI:] < dnew
+    dnew[closer] = dj[NI:][closer]
+    inew[closer] = j
+
+    # the moved points, and the points whose nearest neighbor was moved
+    moved = np.logical_or(imin == i, imin == j)
+    moved[i-NI] = moved[j-NI] = True
+
+    for l in NI + np.nonzero(moved)[0]:
+        if l == i:
+            d = di
+        elif l == j:
+            d = dj
+        else:
+            d = row_dist(X,X2,l)
+        inew[l-NI] = np.argmin(d)
+        dnew[l-NI] = d[inew[l-NI]]
+
+    if dnew.min() > dmin.min():
+        dmin[:] = dnew
+        imin[:] = inew
+        return True
+
+    # revert
+    swap()
+
+    return False
 
 def vec_dist(X,P=None):
     ''' calculates distance between points in matrix X 
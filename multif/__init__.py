@@ -1,11 +1,15 @@
 import nozzle
 import SU2
-import MEDIUMF
-import LOWF
-import HIGHF
-import gradients
-import samples
-import visu
-
-
 
+# Fidelity-specific subpackages, gradients, sampling and plotting tools are
+# only imported when first used (see lazy.py)
+from lazy import LazyModule
+MEDIUMF   = LazyModule('multif.MEDIUMF')
+LOWF      = LazyModule('multif.LOWF')
+HIGHF     = LazyModule('multif.HIGHF')
+gradients = LazyModule('multif.gradients')
+samples   = LazyModule('multif.samples')
+samplestore = LazyModule('multif.samplestore')
+profiler  = LazyModule('multif.profiler')
+scratch   = LazyModule('multif.scratch')
+visu      = LazyModule('multif.visu')
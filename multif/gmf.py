@@ -0,0 +1,177 @@
+"""
+Output of meshes and solutions in the GMF (Inria) format.
+
+The format is chosen from the file extension, as in libmesh6: .meshb/.solb
+files are binary, .mesh/.sol files are ASCII. Intermediate files are written
+in binary by default; set BINARY to False (GMF_FORMAT= ASCII in the nozzle
+configuration file) to get readable ASCII files for debugging.
+
+Binary files are written with version 2 of the format (double precision
+reals, 32-bit integers and positions), as the files written by meshutils.
+"""
+
+import struct
+
+import numpy as np
+
+BINARY = True;
+
+# Keyword codes (see libmesh6.h)
+GmfDimension     = 3;
+GmfVertices      = 4;
+GmfEdges         = 5;
+GmfTriangles     = 6;
+GmfTetrahedra    = 8;
+GmfEnd           = 54;
+GmfSolAtVertices = 62;
+GmfSca           = 1;
+
+def meshName(basename):
+    # File name of an intermediate mesh
+    return basename + ('.meshb' if BINARY else '.mesh');
+
+def solName(basename):
+    # File name of an intermediate solution
+    return basename + ('.solb' if BINARY else '.sol');
+
+def isBinary(filename):
+    return filename.endswith('.meshb') or filename.endswith('.solb');
+
+
+#==============================================================================
+# Binary output
+#==============================================================================
+
+class _BinaryWriter:
+
+    def __init__(self, filename, dim):
+        self.hdl = open(filename, 'wb');
+        self.nextPos = 0;
+        self.hdl.write(struct.pack('<ii', 1, 2));
+        self.keyword(GmfDimension);
+        self.hdl.write(struct.pack('<i', dim));
+
+    def keyword(self, code, header=()):
+        # Store the position of this keyword in the previous one
+        pos = self.hdl.tell();
+        if self.nextPos:
+            self.hdl.seek(self.nextPos);
+            self.hdl.write(struct.pack('<i', pos));
+            self.hdl.seek(pos);
+        self.hdl.write(struct.pack('<i', code));
+        self.nextPos = self.hdl.tell();
+        self.hdl.write(struct.pack('<i', 0));
+        for i in header:
+            self.hdl.write(struct.pack('<i', i));
+
+    def close(self):
+        self.keyword(GmfEnd);
+        self.hdl.close();
+
+
+def _records(crd, ref):
+    # One record per line: coordinates (float64) followed by a ref (int32)
+    crd = np.asarray(crd, dtype=float);
+    NbrLin, dim = crd.shape;
+    rec = np.empty(NbrLin, dtype=[('c', '<f8', (dim,)), ('r', '<i4')]);
+    rec['c'] = crd;
+    rec['r'] = ref;
+    return rec;
+
+
+def _writeBinaryMesh(filename, dim, Ver, VerRef, elements):
+
+    out = _BinaryWriter(filename, dim);
+
+    out.keyword(GmfVertices, (len(Ver),));
+    _records(Ver, VerRef).tofile(out.hdl);
+
+    for code, Elt in elements:
+        if len(Elt) == 0:
+            continue;
+        out.keyword(code, (len(Elt),));
+        np.asarray(Elt, dtype='<i4').tofile(out.hdl);
+
+    out.close();
+
+
+#==============================================================================
+# ASCII output
+#==============================================================================
+
+_KEYWORDS = {GmfEdges: 'Edges', GmfTriangles: 'Triangles',
+             GmfTetrahedra: 'Tetrahedra'};
+
+def _writeAsciiMesh(filename, dim, Ver, VerRef, elements):
+
+    hdl = open(filename, 'w');
+
+    hdl.write("MeshVersionFormatted\n2\nDimension\n%d\n" % dim);
+
+    hdl.write("\nVertices\n%d\n" % len(Ver));
+    fmt = ' '.join(['%.17g']*dim) + ' %d\n';
+    for i in range(len(Ver)):
+        hdl.write(fmt % (tuple(Ver[i][:dim]) + (VerRef[i],)));
+
+    for code, Elt in elements:
+        if len(Elt) == 0:
+            continue;
+        hdl.write("\n%s\n%d\n" % (_KEYWORDS[code], len(Elt)));
+        for e in Elt:
+            hdl.write(' '.join(['%d' % v for v in e]) + '\n');
+
+    hdl.write("\nEnd\n");
+    hdl.close();
+
+
+#==============================================================================
+# Interface
+#==============================================================================
+
+def WriteMesh(filename, dim, Ver, VerRef=None, Edg=[], Tri=[], Tet=[]):
+    # Ver : NbrVer x dim coordinates (extra columns are ignored)
+    # VerRef : vertex references (default 1)
+    # Edg, Tri, Tet : element vertices (1-based) followed by the element ref
+
+    Ver = np.asarray(Ver, dtype=float)[:,:dim];
+    if VerRef is None:
+        VerRef = np.ones(len(Ver), dtype=int);
+
+    elements = [];
+    for code, Elt, siz in ((GmfEdges, Edg, 3), (GmfTriangles, Tri, 4),
+                           (GmfTetrahedra, Tet, 5)):
+        Elt = np.asarray(Elt, dtype=int);
+        if len(Elt) > 0 and Elt.shape[1] != siz:
+            raise ValueError('%s: elements must have %d columns (vertices '
+                'and ref)' % (_KEYWORDS[code], siz));
+        elements.append((code, Elt));
+
+    if isBinary(filename):
+        _writeBinaryMesh(filename, dim, Ver, VerRef, elements);
+    else:
+        _writeAsciiMesh(filename, dim, Ver, VerRef, elements);
+
+
+def WriteSolution(filename, dim, Sol):
+    # Sol : NbrVer x NbrFld scalar fields at vertices
+
+    Sol = np.asarray(Sol, dtype=float);
+    if Sol.ndim == 1:
+        Sol = Sol.reshape(-1,1);
+    NbrVer, NbrFld = Sol.shape;
+
+    if isBinary(filename):
+        out = _BinaryWriter(filename, dim);
+        out.keyword(GmfSolAtVertices, (NbrVer, NbrFld) + (GmfSca,)*NbrFld);
+        Sol.astype('<f8').tofile(out.hdl);
+        out.close();
+    else:
+        hdl = open(filename, 'w');
+        hdl.write("MeshVersionFormatted\n2\nDimension\n%d\n" % dim);
+        hdl.write("\nSolAtVertices\n%d\n%d %s\n\n" % (NbrVer, NbrFld,
+            ' '.join(['%d' % GmfSca]*NbrFld)));
+        fmt = ' '.join(['%.17g']*NbrFld) + '\n';
+        for i in range(NbrVer):
+            hdl.write(fmt % tuple(Sol[i]));
+        hdl.write("\nEnd\n");
+        hdl.close();
@@ -2,19 +2,31 @@ import sys, os, copy
 import numpy as np
 import multiprocessing
 
-import LOWF
-import MEDIUMF
-import HIGHF
+from . import LOWF, MEDIUMF, HIGHF
+from . import profiler
 
-def init(lock):
+# Analysis stages, ordered from most upstream to most downstream. A finite
+# difference evaluation reruns the most upstream stage affected by its design
+# variable and everything downstream of it; results of stages upstream of it
+# are reused from the center point.
+#   AERO:       aero analysis (CFD or quasi-1D) and all downstream analyses
+#   THERMAL:    thermal and structural analyses, aero solution is reused
+#   STRUCTURAL: structural analysis, aero and thermal solutions are reused
+#   MASS:       mass computation only, no analysis is run
+STAGES = ['AERO', 'THERMAL', 'STRUCTURAL', 'MASS'];
 
-    global LOCK;
-    LOCK = lock;
+# Responses which do not require any analysis to be run
+MASS_RESPONSES = ['MASS', 'MASS_WALL_ONLY', 'VOLUME'];
 
-    return
+# Files of the center point aero analysis reused by downstream evaluations
+AERO_FILES = ['nozzle.dat', 'nozzle.su2'];
+
+# Files of the center point thermal analysis (AERO-S temperatures on the
+# structural and CMC meshes) reused by structural-only evaluations
+THERMAL_FILES = ['TEMP.2', 'TEMP.0'];
 
 # Wrapping function for independent nozzle analysis in separate directory
-def nozzleAnalysis(homedir, index, nozzle, skipAero=0, output='verbose'):
+def nozzleAnalysis(homedir, index, nozzle, skipAero=0, skipThermal=0, output='verbose'):
     
     skipAeroPostPro = 0;
     if skipAero == 1:
@@ -23,14 +35,13 @@ def nozzleAnalysis(homedir, index, nozzle, skipAero=0, output='verbose'):
     if output == 'verbose':
         sys.stdout.write('Entered separate nozzle analysis for index %i\n' % index);
 
-    # Create and enter new directory
+    # Create new directory, and enter it or its scratch directory
     dirname = os.path.join(homedir,'EVAL_' + str(index));
-    if not os.path.exists(dirname):
-        os.makedirs(dirname);
-    os.chdir(dirname);
+    workdir = nozzle.retention.Enter(dirname);
+    os.chdir(workdir);
     
     if output == 'verbose':
-        sys.stdout.write('Directory %s created and entered\n' % dirname);    
+        sys.stdout.write('Directory %s created and entered\n' % workdir);    
 
     # Write input file corresponding to this analysis for debugging
     if nozzle.inputDVformat == 'DAKOTA':
@@ -39,41 +50,160 @@ def nozzleAnalysis(homedir, index, nozzle, skipAero=0, output='verbose'):
     else: # should be 'PLAIN'
         np.savetxt(nozzle.inputDVfilename,nozzle.dvList,fmt='%0.16f');
 
-    # Link necessary files if aero analysis is to be skipped
-    
-    if skipAero == 1:
-        LOCK.acquire() # Only one process should link these files at a time
-        if os.path.exists(os.path.join(homedir,'nozzle.dat')):
-            if os.path.exists('nozzle.dat'):
-                os.remove('nozzle.dat');
-            os.link(os.path.join(homedir,'nozzle.dat'),'nozzle.dat');
-        if os.path.exists(os.path.join(homedir,'nozzle.su2')):
-            if os.path.exists('nozzle.su2'):
-                os.remove('nozzle.su2');
-            os.link(os.path.join(homedir,'nozzle.su2'),'nozzle.su2');
-        LOCK.release() # Release the lock so others can access these files
+    # Files required when aero (or thermal) analysis is skipped have been
+    # linked by linkCenterFiles() before the evaluation was dispatched
     
-    # Run model analysis    
-    if nozzle.dim == '1D':
-        LOWF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero);
-    elif nozzle.dim == '2D':
-        MEDIUMF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero, skipAeroPostPro=skipAeroPostPro);
-    else: # nozzle.dim == '3D'
-        HIGHF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero, skipAeroPostPro=skipAeroPostPro);
+    # Run model analysis (all the files of a failed analysis are retained)
+    try:
+        if nozzle.dim == '1D':
+            LOWF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero);
+        elif nozzle.dim == '2D':
+            MEDIUMF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero, skipAeroPostPro=skipAeroPostPro, skipThermal=skipThermal);
+        else: # nozzle.dim == '3D'
+            HIGHF.Run(nozzle, output=output, writeToFile=1, skipAero=skipAero, skipAeroPostPro=skipAeroPostPro, skipThermal=skipThermal);
+    except:
+        os.chdir(homedir);
+        nozzle.retention.Leave(workdir, dirname, failed=True);
+        raise;
                     
     if output == 'verbose':
-        sys.stdout.write('Nozzle analysis completed in directory %s\n' % dirname);    
+        sys.stdout.write('Nozzle analysis completed in directory %s\n' % workdir);    
     
-    # Exit directory
+    # Exit directory, and retain its files according to the retention policy
     os.chdir(homedir);
+    nozzle.retention.Leave(workdir, dirname,
+        keep=[nozzle.inputDVfilename, nozzle.outputFile, nozzle.profileFile]);
     
     # Return nozzle    
     return nozzle;  
 
 
+# Link center point analysis files (AERO_FILES, and THERMAL_FILES) into
+# evaluation directory so the aero (and thermal) analysis can be skipped. Done
+# by the parent process before dispatching the evaluations, so no locking
+# between workers is required.
+def linkCenterFiles(homedir, index, filenames=AERO_FILES):
+
+    dirname = os.path.join(homedir,'EVAL_' + str(index));
+    if not os.path.exists(dirname):
+        os.makedirs(dirname);
+
+    for filename in filenames:
+        src = os.path.join(homedir,filename);
+        dst = os.path.join(dirname,filename);
+        if os.path.exists(src):
+            if os.path.exists(dst):
+                os.remove(dst);
+            os.link(src,dst);
+
+    return;
+
+
+# Return the most upstream analysis stage affected by the 0-indexed design
+# variable iDV, based on nozzle.DV_Effect
+def dvStage(nozzle, iDV):
+
+    # Design variable tag which iDV belongs to
+    iTag = [j for j in range(len(nozzle.DV_Effect)) if iDV >= nozzle.DV_Head[j]][-1];
+    effect = nozzle.DV_Effect[iTag];
+    tag = nozzle.DV_Tags[iTag];
+
+    if effect in [1, 5, 6]: # aero analysis affected
+        return 'AERO';
+    elif effect in [2, 4]: # thermal analysis affected
+        return 'THERMAL';
+    elif 'BAFFLES' in tag or 'STRINGERS' in tag:
+        # Structural analysis only, but the baffles and stringers are meshed
+        # with the nodes the thermal solution is written on
+        return 'THERMAL';
+    else: # effect == 3, structural material properties
+        return 'STRUCTURAL';
+
+
+# Group finite difference evaluations by the analysis stage they must rerun.
+# Returns a dict mapping each stage in STAGES to a list of indices into
+# derivativesDV.
+def planGradientsFD(nozzle, derivativesDV, output='verbose'):
+
+    # If only mass gradients are requested no analysis needs to be run
+    requested = [k for k in nozzle.gradients if nozzle.gradients[k] is not None];
+    massOnly = len([k for k in requested if k not in MASS_RESPONSES]) == 0;
+
+    plan = dict([(stage, []) for stage in STAGES]);
+    for i in range(len(derivativesDV)):
+        if massOnly:
+            stage = 'MASS';
+        elif nozzle.dim == '1D':
+            # Low-fidelity thermal and structural analyses are run within the
+            # quasi-1D aero analysis, so the whole chain is always rerun
+            stage = 'AERO';
+        else:
+            stage = dvStage(nozzle, derivativesDV[i]);
+        plan[stage].append(i);
+
+    if output == 'verbose':
+        sys.stdout.write('Finite difference gradient plan:\n');
+        for stage in STAGES:
+            sys.stdout.write('  %-10s : %i evaluations\n' % (stage, len(plan[stage])));
+
+    return plan;
+
+
+# Run the nozzle evaluations with the given indices, using up to 'processes'
+# concurrent processes. Returns a dict mapping index to evaluated nozzle.
+def runEvaluations(homedir, indices, nozzleEval, skipAeroList, skipThermalList, processes, output='verbose'):
+
+    results = dict();
+
+    if len(indices) == 0:
+        return results;
+
+    # Run evaluations in serial
+    if processes <= 1 or len(indices) == 1:
+
+        for i in indices:
+            nozzleAnalysis(homedir, i, nozzleEval[i], skipAero=skipAeroList[i],
+                           skipThermal=skipThermalList[i], output=output);
+            results[i] = nozzleEval[i];
+
+    # Run evaluations in parallel
+    else:
+
+        processes = min(processes, len(indices));
+
+        # Start Python's multiprocessing pool
+        if output == 'verbose':
+            sys.stdout.write('Starting multiprocessing pool with %i '
+              'processes\n' % processes);
+        pool = multiprocessing.Pool(processes=processes);
+
+        mEval = dict();
+        for i in indices:
+            if output == 'verbose':
+                sys.stdout.write('Adding analysis %i to the pool\n' % i);
+            mEval[i] = pool.apply_async(nozzleAnalysis, (homedir, i, nozzleEval[i], skipAeroList[i], skipThermalList[i], output));
+
+        pool.close();
+        pool.join();
+
+        # Obtain results of calculations: each entry contains a nozzle class
+        # instance with analysis responses
+        for i in indices:
+            results[i] = mEval[i].get();
+
+    return results;
+
+
 # Calculate and return forward finite difference gradients of nozzle QOI
 # If rerun_center = 1 then the center point used for finite difference will
 # be recalculated along with all the points corresponding to f.d. steps
+#
+# Evaluations are grouped by the analysis stage their design variable affects
+# (see planGradientsFD). Evaluations which reuse the center point aero
+# solution only run serial thermal/structural analyses, so they are scheduled
+# one per core, whereas evaluations rerunning the aero analysis use
+# nozzle.cpusPerTask cores each. Structural-only evaluations also reuse the
+# center point thermal solution.
 def calcGradientsFD(nozzle, fd_step, rerun_center=0, output='verbose'):
     
     # Check that there are enough finite difference steps if a different step
@@ -89,27 +219,32 @@ def calcGradientsFD(nozzle, fd_step, rerun_center=0, output='verbose'):
     # Gradients w.r.t. to all variables may not be required:
     # 0-index which design variables should have derivatives taken w.r.t. them
     derivativesDV = [i-1 for i in nozzle.derivativesDV];
+
+    # Group evaluations by the analysis stage they must rerun
+    plan = planGradientsFD(nozzle, derivativesDV, output=output);
     
-    # Make local list of design variable 0-indexed indices
-    dvList = []
-    for i in derivativesDV:
-        dvList.append(nozzle.dvList[i])
-    
+    # Only responses whose gradients are requested need to be evaluated
+    requested = [k for k in nozzle.gradients if nozzle.gradients[k] is not None];
+
     # Setup each nozzle instance required for evaluation
     nozzleEval = [];
     skipAeroList = [];
+    skipThermalList = [];
     for i in range(len(derivativesDV)):
 
-        # Determine whether aero analysis is required for this DV
-        iDV_Head = [j for j in range(len(nozzle.DV_Head)) if i >= nozzle.DV_Head[j]][0]
-        #tagtmp = nozzle.DV_Tags[iDV_Head]
-        if nozzle.DV_Effect[iDV_Head] in [2, 3, 4]: # no need for aero analysis
+        # Determine whether aero and thermal analyses are required for this DV
+        if nozzle.dim != '1D' and i not in plan['AERO']:
             skipAeroList.append(1);
         else:
             skipAeroList.append(0);
+        if nozzle.dim != '1D' and i in plan['STRUCTURAL']:
+            skipThermalList.append(1);
+        else:
+            skipThermalList.append(0);
 
         # Copy and setup nozzle
         nozzleEval.append(copy.deepcopy(nozzle));
+        nozzleEval[i].profiler = profiler.Profiler(); # own stages, not the center's
         if isinstance(fd_step,list):
             nozzleEval[i].dvList[derivativesDV[i]] += fd_step[derivativesDV[i]];
         else:
@@ -119,13 +254,22 @@ def calcGradientsFD(nozzle, fd_step, rerun_center=0, output='verbose'):
         nozzleEval[i].output_gradients = 0; # do not request gradients
         for k in nozzleEval[i].gradients:
             nozzleEval[i].gradients[k] = None; # do not request gradients
-        for j in range(len(nozzleEval[i].outputCode)):
-            if nozzleEval[i].outputCode <= 1:
-                nozzleEval[i].outputCode[j] = 0; # no need to get any value
-            else:
-                nozzleEval[i].outputCode[j] = 1; # get value only
+
+        # Drop responses whose gradients are not requested
+        for k in nozzleEval[i].responses.keys():
+            if k not in requested:
+                nozzleEval[i].responses.pop(k);
+        outputCode = [];
+        for j in range(len(nozzleEval[i].outputTags)):
+            if nozzleEval[i].outputTags[j] in requested:
+                outputCode.append(1); # get value only
+        nozzleEval[i].outputTags = [k for k in nozzleEval[i].outputTags if k in requested];
+        nozzleEval[i].outputCode = outputCode;
+
         nozzleEval[i].nTasks = 1; # run 1 task (this is it)
-        # nozzleEval[i].cpusPerTask remains the same
+        if skipAeroList[i] == 1:
+            nozzleEval[i].cpusPerTask = 1; # serial AERO-S analyses only
+        # otherwise nozzleEval[i].cpusPerTask remains the same
 
     # Set up additional nozzle evaluation for centerpoint if desired
     if( rerun_center and sum(skipAeroList) > 0 ):
@@ -145,138 +289,42 @@ def calcGradientsFD(nozzle, fd_step, rerun_center=0, output='verbose'):
         sys.stderr.write("WARNING: Rerun center is not happening since it is no"
                          " longer applicable.\n")
         rerun_center = 0;
-        # skipAeroList.append(0); #rerun aero analysis if QoI are effected by it
-        # nozzleEval.append(copy.deepcopy(nozzle));
-        # # Design variables and wall do not change
-        # nozzleEval[-1].output_gradients = 0; # do not request gradients
-        # for k in nozzleEval[-1].gradients:
-        #     nozzleEval[-1].gradients[k] = None; # do not request gradients
-        # for j in range(len(nozzleEval[-1].outputCode)):
-        #     nozzleEval[-1].outputCode[j] = 1; # get value only
 
     # Home directory where all subfolders are stored
     homedir = os.getcwd();
 
-    # Lock to prevent race condition when input files are linked at same time
-    lock = multiprocessing.Lock()
-                    
-    # Run gradient evaluations in serial
-    if nozzle.nTasks <= 1:
-
-        # Initialize global LOCK
-        init(lock);
-    
-        # For each design variable
-        saveResponse = [];
-        for i in range(len(nozzleEval)):
-
-            # # Create and enter new directory
-            # dirname = 'EVAL_' + str(i);
-            # if not os.path.exists(dirname):
-            #     os.makedirs(dirname);
-            # os.chdir(dirname);
-            
-            # if output == 'verbose':
-            #     sys.stdout.write('Directory %s created and entered\n' % dirname);    
-            
-            # # Write input file corresponding to this analysis for debugging
-            # if nozzleEval[i].inputDVformat == 'DAKOTA':
-            #     sys.stdout.write('Note: PLAIN input format is used for writing of design variable input file\n');
-            #     np.savetxt(nozzleEval[i].inputDVfilename,nozzleEval[i].dvList,fmt='%0.16f');
-            # else: # should be 'PLAIN'
-            #     np.savetxt(nozzleEval[i].inputDVfilename,nozzleEval[i].dvList,fmt='%0.16f');
-
-            # # Run model analysis
-            # if nozzle.dim == '1D':
-            #     LOWF.Run(nozzleEval[i], output=output, writeToFile=1);
-            # elif nozzle.dim == '2D':
-            #     MEDIUMF.Run(nozzleEval[i], output=output, writeToFile=1);
-            # else: # nozzle.dim == '3D'
-            #     HIGHF.Run(nozzleEval[i], output=output, writeToFile=1);
-
-            # if output == 'verbose':
-            #     sys.stdout.write('Nozzle analysis completed in directory %s\n' % dirname);    
-            
-            # # Exit directory
-            # os.chdir('..');
-            nozzleAnalysis(homedir, i, nozzleEval[i], skipAero=skipAeroList[i], output='verbose')
-
-            # Save reponses for assembly of gradients afterwards
-            saveResponse.append(nozzleEval[i].responses)         
+    # Link center point aero (and thermal) solution for evaluations which
+    # reuse it
+    for i in range(len(derivativesDV)):
+        if skipThermalList[i] == 1:
+            linkCenterFiles(homedir, i, AERO_FILES + THERMAL_FILES);
+        elif skipAeroList[i] == 1:
+            linkCenterFiles(homedir, i);
 
-        # Calculate gradients here
-        for k in nozzle.gradients:
+    # Total number of cores available for gradient evaluations
+    ncores = max(1, nozzle.nTasks*nozzle.cpusPerTask);
 
-            # Only calculate gradients that are requested, and avoid calculating 
-            # mass gradient since it has already been calculated
-            # if nozzle.gradients[k] is not None and k not in ['MASS'] and \
-            #     k not in ['MASS_WALL_ONLY']:
-            if nozzle.gradients[k] is not None:
+    # Evaluations rerunning the aero analysis: nTasks at a time
+    rEval = runEvaluations(homedir, plan['AERO'], nozzleEval, skipAeroList,
+                           skipThermalList, nozzle.nTasks, output=output);
 
-                if rerun_center == 0:
-                    nozzleResponse = nozzle.responses[k];
-                else:
-                    nozzleResponse = nozzleEval[-1].responses[k];
-
-                for i in range(len(derivativesDV)):
-                    if isinstance(fd_step,list):
-                        localGrad = (nozzleEval[i].responses[k] - nozzleResponse)/fd_step[derivativesDV[i]];
-                    else:
-                        localGrad = (nozzleEval[i].responses[k] - nozzleResponse)/fd_step;
-                    nozzle.gradients[k].append(localGrad);
-    
-    # Run gradient evaluations in parallel            
-    else:
-        
-        # Start Python's multiprocessing pool
-        if output == 'verbose':
-            sys.stdout.write('Starting multiprocessing pool with %i '
-              'processes\n' % nozzle.nTasks);
-        pool = multiprocessing.Pool(initializer=init, initargs=(lock,), processes=nozzle.nTasks);
-        
-        # Setup list to hold results for nozzle evaluation
-        mEval = [];
-        rEval = [];
-        for i in range(len(nozzleEval)):
-            mEval.append(-1);
-            rEval.append(-1);
-        
-        for i in range(len(nozzleEval)):
-            if output == 'verbose':
-                sys.stdout.write('Adding analysis %i to the pool\n' % i);
-            mEval[i] = pool.apply_async(nozzleAnalysis, (homedir, i, nozzleEval[i], skipAeroList[i], output))
+    # Downstream-only evaluations: one per core
+    downstream = sorted(plan['THERMAL'] + plan['STRUCTURAL'] + plan['MASS']);
+    rEval.update(runEvaluations(homedir, downstream, nozzleEval, skipAeroList,
+                                skipThermalList, ncores, output=output));
             
-        pool.close();
-        pool.join();
-        
-        # Obtain results of calculations
-        for i in range(len(mEval)):
-            # each entry in rEval contains a nozzle class instance 
-            # with analysis responses
-            rEval[i] = mEval[i].get();
-            
-        # Calculate gradients here
-        for i in range(len(derivativesDV)):
+    # Calculate gradients here
+    for i in range(len(derivativesDV)):
 
-            for k in nozzle.gradients:
+        for k in nozzle.gradients:
 
-                if rerun_center == 0:
-                    nozzleResponse = nozzle.responses[k];
+            # Only calculate gradients that are requested
+            if nozzle.gradients[k] is not None:
+                nozzleResponse = nozzle.responses[k];
+                if isinstance(fd_step,list):
+                    localGrad = (rEval[i].responses[k] - nozzleResponse)/fd_step[derivativesDV[i]];
                 else:
-                    nozzleResponse = rEval[-1].responses[k];
-
-                # Only calculate gradients that are requested, and avoid calculating 
-                # mass gradient since it has already been calculated
-                # if nozzle.gradients[k] is not None and k not in ['MASS'] and  \
-                #   k not in ['MASS_WALL_ONLY']:
-                if nozzle.gradients[k] is not None:
-                    if isinstance(fd_step,list):
-                        localGrad = (rEval[i].responses[k] - nozzleResponse)/fd_step[derivativesDV[i]];
-                    else:
-                        localGrad = (rEval[i].responses[k] - nozzleResponse)/fd_step;                    
-                    nozzle.gradients[k].append(localGrad);
+                    localGrad = (rEval[i].responses[k] - nozzleResponse)/fd_step;                    
+                nozzle.gradients[k].append(localGrad);
     	
     return nozzle.gradients
-    
-
-
@@ -0,0 +1,165 @@
+"""
+Interpolation of a CFD solution on other meshes or point sets.
+
+A SolutionInterpolator loads a background mesh and solution once through
+_mshint_module, and keeps the scaled mesh, its adjacencies and its bucket
+structure in memory. Any number of target meshes or point sets can then be
+interpolated, and other solution files defined on the same mesh can be loaded
+without rebuilding the search structures.
+
+getInterpolator() returns a cached interpolator, so that the successive
+post-processing steps working on the same (large) CFD mesh only load it once.
+A new solution file on a cached mesh is loaded in place; the cache entry is
+rebuilt when the mesh file changes on disk. The CFD runs, which rewrite these
+files under the same names, empty the cache with clearInterpolators(). Meshes built in memory
+(meshdata.MeshData) are passed to SolutionInterpolator directly, without
+writing them to a file first.
+
+The target vertices are interpolated by setNumThreads() threads (OpenMP
+build of _mshint_module); the result does not depend on the thread count.
+"""
+
+import os, sys
+
+class SolutionInterpolator:
+
+    def __init__(self, mesh_name=None, sol_name=None, nthreads=None, data=None):
+        # Background mesh and solution read from files, or given in memory
+        # as a meshdata.MeshData (data). nthreads defaults to the value set
+        # by setNumThreads()
+
+        from multif import _mshint_module
+
+        self.mesh_name = mesh_name;
+        self.sol_name  = sol_name;
+
+        if data is not None:
+            Ver, Tri, Tet, Edg, Sol = data.lists();
+            self._itp = _mshint_module.py_InterpolatorSetupData(data.dim,
+                Ver, Tri, Tet, Sol);
+            source = "the mesh in memory";
+        else:
+            self._itp = _mshint_module.py_InterpolatorSetup(mesh_name, sol_name);
+            source = "%s and %s" % (mesh_name, sol_name);
+
+        if self._itp is None:
+            sys.stderr.write("  ## ERROR : unable to set up interpolation "
+                "from %s.\n" % source);
+            sys.exit(1);
+
+        self.setThreads(_numThreads if nthreads is None else nthreads);
+
+    def setThreads(self, nthreads):
+
+        from multif import _mshint_module
+
+        self.nthreads = max(1, int(nthreads));
+        _mshint_module.py_InterpolatorSetThreads(self._itp, self.nthreads);
+
+    def loadSolution(self, sol_name):
+        # Replace the background solution (same background mesh)
+
+        from multif import _mshint_module
+
+        if _mshint_module.py_InterpolatorLoadSolution(self._itp, sol_name):
+            sys.stderr.write("  ## ERROR : unable to load solution %s.\n" % sol_name);
+            sys.exit(1);
+
+        self.sol_name = sol_name;
+
+    def interpolate(self, mesh_name, info, Crd, Tri, Tet, Sol, Header):
+        # Same outputs as _mshint_module.py_Interpolation. The interpolated
+        # solution is also written next to the target mesh (.solb)
+
+        from multif import _mshint_module
+
+        return _mshint_module.py_InterpolatorInterpolate(self._itp, mesh_name,
+            info, Crd, Tri, Tet, Sol, Header);
+
+    def interpolatePoints(self, crd):
+        # crd: list of (x,y) or (x,y,z) points
+        # Returns the list of solution vectors at these points, and the
+        # solution field names (empty for GMF solutions)
+
+        from multif import _mshint_module
+
+        pyCrd = [];
+        for p in crd:
+            pyCrd.extend([float(p[0]), float(p[1]),
+                float(p[2]) if len(p) > 2 else 0.0]);
+
+        pySol    = [];
+        pyHeader = [];
+
+        if _mshint_module.py_InterpolatorPoints(self._itp, pyCrd, pySol, pyHeader):
+            sys.stderr.write("  ## ERROR : interpolation at points failed.\n");
+            sys.exit(1);
+
+        NbrPts = len(crd);
+        SolSiz = len(pySol)/NbrPts if NbrPts > 0 else 0;
+        Sol = [pySol[i*SolSiz:(i+1)*SolSiz] for i in range(NbrPts)];
+
+        return Sol, pyHeader;
+
+    def free(self):
+        if self._itp is not None:
+            from multif import _mshint_module
+            _mshint_module.py_InterpolatorFree(self._itp);
+            self._itp = None;
+
+    def __del__(self):
+        try:
+            self.free();
+        except Exception:
+            pass;
+
+
+#==============================================================================
+# Cache of interpolators, keyed by the background mesh and solution files
+#==============================================================================
+
+MAX_INTERPOLATORS = 2;
+
+_interpolators = [];
+_numThreads    = 1;
+
+def setNumThreads(nthreads):
+    # Number of threads used by the cached interpolators
+    global _numThreads;
+    _numThreads = max(1, int(nthreads));
+    for entry in _interpolators:
+        entry[2].setThreads(_numThreads);
+
+def _fileKey(filename):
+    # The inode and change time also catch files replaced or rewritten in
+    # place with the same size within the mtime resolution
+    st = os.stat(filename);
+    return (os.path.abspath(filename), st.st_ino, st.st_mtime, st.st_ctime,
+        st.st_size);
+
+def getInterpolator(mesh_name, sol_name):
+
+    mshKey = _fileKey(mesh_name);
+    solKey = _fileKey(sol_name);
+
+    # Same mesh and solution, or same mesh only: reload the solution
+    for i in range(len(_interpolators)):
+        if _interpolators[i][0] == mshKey:
+            entry = _interpolators.pop(i);
+            if entry[1] != solKey:
+                entry[2].loadSolution(sol_name);
+                entry[1] = solKey;
+            _interpolators.append(entry);
+            return entry[2];
+
+    itp = SolutionInterpolator(mesh_name, sol_name, _numThreads);
+
+    _interpolators.append([mshKey, solKey, itp]);
+    while len(_interpolators) > MAX_INTERPOLATORS:
+        _interpolators.pop(0)[2].free();
+
+    return itp;
+
+def clearInterpolators():
+    while len(_interpolators) > 0:
+        _interpolators.pop()[2].free();
@@ -0,0 +1,43 @@
+"""
+Deferred loading of subpackages and modules.
+
+A LazyModule stands in for a module attribute of a package (e.g. multif.HIGHF)
+until one of its attributes is first accessed. At that point the real module
+is imported, replaces the placeholder in its parent package, and the access is
+forwarded to it. This keeps `import multif` cheap when only part of the code
+(e.g. the low-fidelity model) is needed for a given evaluation.
+"""
+
+import sys
+import importlib
+import types
+
+class LazyModule(types.ModuleType):
+
+    def __init__(self, name):
+        types.ModuleType.__init__(self, name);
+
+    def _load(self):
+
+        module = importlib.import_module(self.__name__);
+
+        # Replace placeholder in parent package so later lookups are direct
+        parentName, _, attrName = self.__name__.rpartition('.');
+        parent = sys.modules.get(parentName);
+        if parent is not None and parent.__dict__.get(attrName) is self:
+            setattr(parent, attrName, module);
+
+        # Keep references held by modules that bound the placeholder working
+        self.__dict__.update(module.__dict__);
+
+        return module;
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name);
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value);
+
+    def __repr__(self):
+        return "<lazy module '%s'>" % self.__name__;
+
@@ -0,0 +1,75 @@
+"""
+Meshes and vertex solutions kept in memory.
+
+A MeshData holds a mesh (vertices, and edges, triangles and tetrahedra
+followed by their reference) and the solution fields at its vertices as numpy
+arrays. It is built directly from the flat lists returned by
+_meshutils_module, and passed as such to _mshint_module (see
+interpolation.SolutionInterpolator), so that meshes exchanged between the
+post-processing steps do not go through intermediate files. write() is only
+needed when an external tool reads the mesh.
+
+Vertex indices are 1-based, as in the GMF files and the C modules.
+"""
+
+import numpy as np
+
+from multif import gmf
+
+class MeshData:
+
+    def __init__(self, dim, Ver, Edg=None, Tri=None, Tet=None, Sol=None, SolTag=None):
+        # Ver : NbrVer x 3 coordinates (z = 0 in 2D)
+        # Edg, Tri, Tet : element vertices followed by the element ref
+        # Sol : NbrVer x SolSiz scalar fields at vertices
+
+        self.dim = dim;
+        self.Ver = np.asarray(Ver, dtype=float).reshape(-1,3);
+        self.Edg = _elements(Edg, 3);
+        self.Tri = _elements(Tri, 4);
+        self.Tet = _elements(Tet, 5);
+
+        if Sol is None:
+            self.Sol = np.zeros((len(self.Ver),0));
+        else:
+            self.Sol = np.asarray(Sol, dtype=float).reshape(len(self.Ver),-1);
+
+        self.SolTag = list(SolTag) if SolTag is not None else [];
+
+    def lists(self):
+        # Flat python lists in the layout of the _meshutils_module and
+        # _mshint_module functions: Ver, Tri, Tet, Edg, Sol
+        return (self.Ver.ravel().tolist(), self.Tri.ravel().tolist(),
+            self.Tet.ravel().tolist(), self.Edg.ravel().tolist(),
+            self.Sol.ravel().tolist());
+
+    def write(self, basename):
+        # Write basename.meshb/.mesh (and .solb/.sol if there is a solution)
+        # according to gmf.BINARY, and return the mesh file name
+        mesh_name = gmf.meshName(basename);
+        gmf.WriteMesh(mesh_name, self.dim, self.Ver, Edg=self.Edg,
+            Tri=self.Tri, Tet=self.Tet);
+        if self.Sol.shape[1] > 0:
+            gmf.WriteSolution(gmf.solName(basename), self.dim, self.Sol);
+        return mesh_name;
+
+
+def _elements(Elt, siz):
+    if Elt is None:
+        return np.zeros((0,siz), dtype=int);
+    return np.asarray(Elt).astype(int).reshape(-1,siz);
+
+
+def ExtractSurfacePatches(MshNam, SolNam, Ref):
+    # Surface triangles of refs Ref (and the solution at their vertices)
+    # of a 3D mesh, as returned by _meshutils_module.py_ExtractSurfacePatches
+
+    from multif import _meshutils_module
+
+    pyVer = [];
+    pyTri = [];
+    pySol = [];
+
+    _meshutils_module.py_ExtractSurfacePatches(MshNam, SolNam, pyVer, pyTri, pySol, Ref);
+
+    return MeshData(3, pyVer, Tri=pyTri, Sol=pySol);
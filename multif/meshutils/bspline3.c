@@ -165,12 +165,12 @@ void bSplineGeo3(double *knots, double *coefs, double *x, double *y,
 	
 			printf("x (%lf) not within range specified by coefs vector (max = %lf)\n", x[ii], coefs[c-1]);
       //std::cout << "x (" << x[ii] << ") not within range specified by coefs vector"<< std::endl;
-      return;
+      continue;
     }
     if(x[ii] < coefs[0] - 1e-5) {
 			printf("x (%le) not within range specified by knots vector (min %le)\n", x[ii], coefs[0]);
       //std::cout <<  "x (" << x[ii] << ") not within range specified by knots vector" << std::endl;
-      return;
+      continue;
     }
 
     // Determine lower and upper bounds on u
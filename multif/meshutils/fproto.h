@@ -17,6 +17,10 @@ Victorien Menier Feb 2016
 //--- projection.c
 int NozzleWallProjection (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, int refUp, int refDown, char *OutNam);
 int ProjectToDV(double *Crd, CadNozzle *Noz, double *BasParam, int Patch);
+int ProjectToDV_Eval(double *Crd, CadNozzle *Noz, double *BasParam, int Patch, double x, double zcenter, double r1, double r2);
+int NozzleWallProjection_Batch (Mesh *Msh, int *Tag, int *VerPrj, int NbrVer, double *CrdPrj, CadNozzle *CadNoz, double *BasParam, int refUp, int refDown);
+int NozzleWallProjection_DV_Batch (Mesh *Msh, int *Tag, int *VerPrj, int NbrVer, double *CrdPrj, CadNozzle *CadNoz, CadNozzle *CadNoz_bas, int refUp, int refDown);
+int NozzleWallProjection_Threads (Options *mshopt, Mesh *Msh, int *Tag, int *VerPrj, int NbrVerPrj, double *CrdPrj, CadNozzle *CadNoz, CadNozzle *CadNoz_bas, double *BasParam, int refUp, int refDown);
 int NozzleWallProjection_DV (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, CadNozzle * CadNoz_bas, int refUp, int refDown, char *OutNam, int verbose);
 
 
@@ -95,6 +99,7 @@ void WriteGMSHMesh(char *nam, Mesh *Msh);
 //--- utils.c
 int  Str2Lower(char *buff);
 void StrRemoveChars (char* str, char c);
+double GetWallTime (void);
 
 //--- nozzle.c
 int          FreeCadBspline (CadBspline *Bsp);
@@ -111,6 +116,7 @@ double 		 fr1_bas (double x,  double *BasParam);
 double 		 fr2_bas (double x,  double *BasParam);
 int        WriteCadBspline(char *BasNam, CadBspline *Bsp, int verbose);
 int        Evaluate_Nozzle ( CadNozzle *Noz, double *x, double *r1, double *r2, double *zcenter );
+int        Evaluate_Nozzle_Batch ( CadNozzle *Noz, double *x, double *r1, double *r2, double *zcenter, int NbrPts );
 
 //--- Bspline
 
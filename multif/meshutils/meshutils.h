@@ -6,6 +6,11 @@
 #include <math.h>
 #include <ctype.h>
 #include <setjmp.h>
+#include <time.h>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 #define max(a,b) (a>=b?a:b)
 #define min(a,b) (a<=b?a:b)
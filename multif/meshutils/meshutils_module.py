@@ -96,12 +96,12 @@ except __builtin__.Exception:
     _newclass = 0
 
 
-def py_ProjectNozzleWall3D(MshNam, pyRefUp, pyRefDown, pyKnots_center, pyCoefs_center, pyKnots_r1, pyCoefs_r1, pyKnots_r2, pyCoefs_r2, OutNam):
-    return _meshutils_module.py_ProjectNozzleWall3D(MshNam, pyRefUp, pyRefDown, pyKnots_center, pyCoefs_center, pyKnots_r1, pyCoefs_r1, pyKnots_r2, pyCoefs_r2, OutNam)
+def py_ProjectNozzleWall3D(MshNam, pyRefUp, pyRefDown, pyKnots_center, pyCoefs_center, pyKnots_r1, pyCoefs_r1, pyKnots_r2, pyCoefs_r2, OutNam, NbrThr):
+    return _meshutils_module.py_ProjectNozzleWall3D(MshNam, pyRefUp, pyRefDown, pyKnots_center, pyCoefs_center, pyKnots_r1, pyCoefs_r1, pyKnots_r2, pyCoefs_r2, OutNam, NbrThr)
 py_ProjectNozzleWall3D = _meshutils_module.py_ProjectNozzleWall3D
 
-def py_ProjectNozzleWall3D_DV(MshNam, pyRefUp, pyRefDown, pyKnots_center_from, pyCoefs_center_from, pyKnots_r1_from, pyCoefs_r1_from, pyKnots_r2_from, pyCoefs_r2_from, pyKnots_center_to, pyCoefs_center_to, pyKnots_r1_to, pyCoefs_r1_to, pyKnots_r2_to, pyCoefs_r2_to, OutNam):
-    return _meshutils_module.py_ProjectNozzleWall3D_DV(MshNam, pyRefUp, pyRefDown, pyKnots_center_from, pyCoefs_center_from, pyKnots_r1_from, pyCoefs_r1_from, pyKnots_r2_from, pyCoefs_r2_from, pyKnots_center_to, pyCoefs_center_to, pyKnots_r1_to, pyCoefs_r1_to, pyKnots_r2_to, pyCoefs_r2_to, OutNam)
+def py_ProjectNozzleWall3D_DV(MshNam, pyRefUp, pyRefDown, pyKnots_center_from, pyCoefs_center_from, pyKnots_r1_from, pyCoefs_r1_from, pyKnots_r2_from, pyCoefs_r2_from, pyKnots_center_to, pyCoefs_center_to, pyKnots_r1_to, pyCoefs_r1_to, pyKnots_r2_to, pyCoefs_r2_to, OutNam, NbrThr):
+    return _meshutils_module.py_ProjectNozzleWall3D_DV(MshNam, pyRefUp, pyRefDown, pyKnots_center_from, pyCoefs_center_from, pyKnots_r1_from, pyCoefs_r1_from, pyKnots_r2_from, pyCoefs_r2_from, pyKnots_center_to, pyCoefs_center_to, pyKnots_r1_to, pyCoefs_r1_to, pyKnots_r2_to, pyCoefs_r2_to, OutNam, NbrThr)
 py_ProjectNozzleWall3D_DV = _meshutils_module.py_ProjectNozzleWall3D_DV
 
 def py_ConvertGMFToSU2(MshNam, SolNam, OutNam):
@@ -7,7 +7,7 @@ int py_ProjectNozzleWall3D( char *MshNam,
  PyObject *pyKnots_center, PyObject *pyCoefs_center,
  PyObject *pyKnots_r1, PyObject *pyCoefs_r1,
  PyObject *pyKnots_r2, PyObject *pyCoefs_r2, 
- char *OutNam ) 
+ char *OutNam, int NbrThr ) 
 {
 	
 	int i;
@@ -159,6 +159,8 @@ int py_ProjectNozzleWall3D( char *MshNam,
 	strcpy(mshopt->InpNam,MshNam);
 	strcpy(mshopt->SolNam,"");
 	
+	mshopt->NbrThr = NbrThr;
+	
 	if ( !CheckOptions(mshopt) ) {
 		return 0;
 	}
@@ -221,7 +223,7 @@ int py_ProjectNozzleWall3D_DV( char *MshNam,
  PyObject *pyKnots_center_to, PyObject *pyCoefs_center_to,
  PyObject *pyKnots_r1_to, PyObject *pyCoefs_r1_to,
  PyObject *pyKnots_r2_to, PyObject *pyCoefs_r2_to, 
- char *OutNam ) 
+ char *OutNam, int NbrThr ) 
 {
 	
 	int verbose = 0;
@@ -476,6 +478,8 @@ int py_ProjectNozzleWall3D_DV( char *MshNam,
 	strcpy(mshopt->InpNam,MshNam);
 	strcpy(mshopt->SolNam,"");
 	
+	mshopt->NbrThr = NbrThr;
+	
 	if ( !CheckOptions(mshopt) ) {
 		return 0;
 	}
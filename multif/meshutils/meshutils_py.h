@@ -6,7 +6,7 @@ int py_ProjectNozzleWall3D( char *MshNam,
  PyObject *pyKnots_center, PyObject *pyCoefs_center,
  PyObject *pyKnots_r1, PyObject *pyCoefs_r1,
  PyObject *pyKnots_r2, PyObject *pyCoefs_r2, 
- char *OutNam );
+ char *OutNam, int NbrThr );
  
  int py_ProjectNozzleWall3D_DV( char *MshNam,  
   PyObject *pyRefUp,  PyObject *pyRefDown,
@@ -16,7 +16,7 @@ int py_ProjectNozzleWall3D( char *MshNam,
   PyObject *pyKnots_center_to, PyObject *pyCoefs_center_to,
   PyObject *pyKnots_r1_to, PyObject *pyCoefs_r1_to,
   PyObject *pyKnots_r2_to, PyObject *pyCoefs_r2_to, 
-  char *OutNam ) ;
+  char *OutNam, int NbrThr ) ;
 
 //void py_NozzleWallProjection (char *MshNam, char *SolNam, PyObject *pyMeshMotion,  PyObject *pyDV);
 
@@ -42,6 +42,30 @@ int Evaluate_Nozzle ( CadNozzle *Noz, double *x, double *r1, double *r2, double
 	
 }
 
+//--- Evaluate the 3 b-splines of the nozzle at NbrPts abscissas at once
+//--- (the knot abscissas are then computed once per b-spline, not once per point)
+int Evaluate_Nozzle_Batch ( CadNozzle *Noz, double *x, double *r1, double *r2, double *zcenter, int NbrPts )
+{
+	
+	if ( NbrPts <= 0 )
+		return 1;
+	
+	double *dydx = (double*) malloc(sizeof(double)*NbrPts);
+	
+	CadBspline * Bsp_center = Noz->Bsp_center;
+	CadBspline * Bsp_r1     = Noz->Bsp_r1;
+	CadBspline * Bsp_r2     = Noz->Bsp_r2;
+	
+	bSplineGeo3 (Bsp_center->Knots, Bsp_center->Coefs, x, zcenter, dydx, NbrPts, Bsp_center->NbrKnots, Bsp_center->NbrCoefs/2);
+	bSplineGeo3 (Bsp_r1->Knots, Bsp_r1->Coefs, x, r1, dydx, NbrPts, Bsp_r1->NbrKnots, Bsp_r1->NbrCoefs/2);
+	bSplineGeo3 (Bsp_r2->Knots, Bsp_r2->Coefs, x, r2, dydx, NbrPts, Bsp_r2->NbrKnots, Bsp_r2->NbrCoefs/2);
+	
+	free(dydx);
+	
+	return 1;
+	
+}
+
 
 
 CadNozzle * AllocCadNozzle (int * SizCad)
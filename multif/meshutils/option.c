@@ -16,6 +16,8 @@ Options* AllocOptions()
 	
 	mshopt->clean = 0;
 	
+	mshopt->NbrThr = 1;
+	
 	strcpy(mshopt->InpNam, "");
 	strcpy(mshopt->OutNam, "");
 	strcpy(mshopt->BasNam, "");
@@ -23,6 +23,8 @@ typedef struct T_Options
 	
 	double Box[6];
 	
+	int NbrThr; // number of threads used by the multi-threaded kernels
+	
 } Options;
 
 Options* AllocOptions(void);
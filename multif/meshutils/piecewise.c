@@ -1,13 +1,15 @@
+#include "piecewise.h"
+
 // Find x at which piecewise linear function obtains a minimum. If multiple
 // minima are found, the last one is returned.
-double findPiecwiseLinearMinimumLocation(double *xgeo, double *rgeo, int ngeo)
+real_t findPiecwiseLinearMinimumLocation(real_t *xgeo, real_t *rgeo, int ngeo)
 {
-  double xloc, rmin;
+  real_t xloc, rmin;
   xloc = xgeo[0];
   rmin = rgeo[0];
   for (int i = 1; i < ngeo; i++)
   {
-    if (rgeo[i] <= rmin)
+    if (RPART(rgeo[i]) <= RPART(rmin))
     {
       xloc = xgeo[i];
       rmin = rgeo[i];
@@ -19,7 +21,7 @@ double findPiecwiseLinearMinimumLocation(double *xgeo, double *rgeo, int ngeo)
 /* Linear interpolation with linear extrapolation for value(s) y at x using 
 arrays (xn, yn). xn, yn = [0 ... nn-1] and x, y = [0 ... nx-1]. Monotonically
 increasing x is assumed. Use js to jumpstart interpolation at index js. */
-void interp1(double *xn, double *yn, int nn, double *x, double *y, int nx, int js)
+void interp1(real_t *xn, real_t *yn, int nn, real_t *x, real_t *y, int nx, int js)
 {
 
   int iL = 0;      // index for node on left
@@ -30,7 +32,7 @@ void interp1(double *xn, double *yn, int nn, double *x, double *y, int nx, int j
   {
 
     // Determine which two values x[i] is between
-    if (x[i] < xn[0])
+    if (RPART(x[i]) < RPART(xn[0]))
     {
       iL = -1;
       iR = 0;
@@ -41,7 +43,7 @@ void interp1(double *xn, double *yn, int nn, double *x, double *y, int nx, int j
       iR = nn;
       for (int j = jStart; j < nn; j++)
       {
-        if (x[i] < xn[j])
+        if (RPART(x[i]) < RPART(xn[j]))
         {
           iL = j - 1;
           iR = j;
@@ -73,7 +75,7 @@ void interp1(double *xn, double *yn, int nn, double *x, double *y, int nx, int j
 /* Gradient estimation for linearly interpolated function dydx at x using 
 arrays (xn, yn). xn, yn = [0 ... nn-1] and x, y = [0 ... nx-1]. Monotonically 
 increasing x is assumed. Use js to jumpstart interpolation at index js. */
-void interp1grad(double *xn, double *yn, int nn, double *x, double *dydx, int nx, int js)
+void interp1grad(real_t *xn, real_t *yn, int nn, real_t *x, real_t *dydx, int nx, int js)
 {
 
   int iL = 0;      // index for node on left
@@ -84,7 +86,7 @@ void interp1grad(double *xn, double *yn, int nn, double *x, double *dydx, int nx
   {
 
     // Determine which two values x[i] is between
-    if (x[i] < xn[0])
+    if (RPART(x[i]) < RPART(xn[0]))
     {
       iL = -1;
       iR = 0;
@@ -95,7 +97,7 @@ void interp1grad(double *xn, double *yn, int nn, double *x, double *dydx, int nx
       iR = nn;
       for (int j = jStart; j < nn; j++)
       {
-        if (x[i] < xn[j])
+        if (RPART(x[i]) < RPART(xn[j]))
         {
           iL = j - 1;
           iR = j;
@@ -126,13 +128,13 @@ void interp1grad(double *xn, double *yn, int nn, double *x, double *dydx, int nx
 /* Cumulative trapezoidal integration of y over x using n steps. Return result 
 in yint. An average slope is used to calculate y values at midpoints between
 x values. Linear extrapolation is used at the ends of the interval. */
-void cumtrapint(double *x, double *y, double *yint, int n) {
+void cumtrapint(real_t *x, real_t *y, real_t *yint, int n) {
 
-  double dxleft, dxright, dx;
-  double dyleft, dyright;
-  double x1, x2, y1, y2;
-  double mleft, mright, m;
-  double ycum = 0.;
+  real_t dxleft, dxright, dx;
+  real_t dyleft, dyright;
+  real_t x1, x2, y1, y2;
+  real_t mleft, mright, m;
+  real_t ycum = 0.;
 
   for(int i = 0; i < n; i++) {
 
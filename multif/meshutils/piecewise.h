@@ -1,7 +1,9 @@
-double findPiecwiseLinearMinimumLocation(double* xgeo, double* rgeo, int ngeo);
+#include "realtype.h"
 
-void interp1(double *xn, double *yn, int nn, double *x, double *y, int nx, int js);
+real_t findPiecwiseLinearMinimumLocation(real_t* xgeo, real_t* rgeo, int ngeo);
 
-void interp1grad(double *xn, double *yn, int nn, double *x, double *dydx, int nx, int js);
+void interp1(real_t *xn, real_t *yn, int nn, real_t *x, real_t *y, int nx, int js);
 
-void cumtrapint(double *x, double *y, double *yint, int n);
\ No newline at end of file
+void interp1grad(real_t *xn, real_t *yn, int nn, real_t *x, real_t *dydx, int nx, int js);
+
+void cumtrapint(real_t *x, real_t *y, real_t *yint, int n);
@@ -760,9 +760,6 @@ int ProjectNozzleWall_Down (double *CrdOld, double *CrdNew, double *BasParam)
 int ProjectToDV(double *Crd, CadNozzle *Noz, double *BasParam, int Patch) 
 {
 	
-	int j=0;
-	double  CrdNew[3] = {0.0,0.0,0.0}, alp=0.0, theta=0.0, zcut=0.0, thetaBas=0.0, ycut=0.0;
-	
 	CadBspline * Bsp_center = Noz->Bsp_center;
 	CadBspline * Bsp_r1     = Noz->Bsp_r1;
 	CadBspline * Bsp_r2     = Noz->Bsp_r2;
@@ -782,6 +779,16 @@ int ProjectToDV(double *Crd, CadNozzle *Noz, double *BasParam, int Patch)
 	
 	//printf("x %lf ycenter %lf r1 %lf r2 %lf\n", x, zcenter, r1, r2);
 	
+	return ProjectToDV_Eval(Crd, Noz, BasParam, Patch, x, zcenter, r1, r2);
+	
+}
+
+//--- Same as ProjectToDV, the nozzle being already evaluated at x = Coefs[0]+Crd[0]*len
+int ProjectToDV_Eval(double *Crd, CadNozzle *Noz, double *BasParam, int Patch, double x, double zcenter, double r1, double r2) 
+{
+	
+	double  CrdNew[3] = {0.0,0.0,0.0}, alp=0.0, theta=0.0, zcut=0.0;
+	
 	//--- Theta correction
 	double thetaMaxBas, thetaMaxDV;
 	
@@ -800,9 +807,9 @@ int ProjectToDV(double *Crd, CadNozzle *Noz, double *BasParam, int Patch)
 	theta = acos(Crd[2]);
 	theta *= thetaMaxDV/thetaMaxBas;
 	
-	printf("CMP : acos %lf sin %lf sin(acos) %lf\n", acos(Crd[2]), Crd[1], sin(acos(Crd[2])));
-	printf(" sin(theta) %lf, cos(theta) %lf, Crd[1] %lf, Crd[2] %lf",  sin(theta), cos(theta), Crd[1], Crd[2]);
-	printf("thetaMaxDV %lf, thetaMaxBas %lf\n", thetaMaxDV, thetaMaxBas);
+	//printf("CMP : acos %lf sin %lf sin(acos) %lf\n", acos(Crd[2]), Crd[1], sin(acos(Crd[2])));
+	//printf(" sin(theta) %lf, cos(theta) %lf, Crd[1] %lf, Crd[2] %lf",  sin(theta), cos(theta), Crd[1], Crd[2]);
+	//printf("thetaMaxDV %lf, thetaMaxBas %lf\n", thetaMaxDV, thetaMaxBas);
 	
 	//printf("thetaMaxBas %lf thetaMaxDV %lf\n", thetaMaxBas, thetaMaxDV);
 	//CrdNew[0] = x;
@@ -907,17 +914,219 @@ int ProjectToDV_DV(double *Crd, CadNozzle *Noz, CadNozzle *Noz_bas, int Patch)
 
 
 
+//--- Number of wall vertices projected per batch: the nozzle b-splines are
+//--- evaluated once per batch, and batches are distributed among threads
+#define PRJBATCHSIZ 512
+
+//--- Project a batch of NbrVer wall vertices (VerPrj) on the nozzle CadNoz.
+//--- The projected coordinates are stored in CrdPrj[3*k..3*k+2].
+//--- Returns the number of vertices that could not be projected.
+int NozzleWallProjection_Batch (Mesh *Msh, int *Tag, int *VerPrj, int NbrVer, double *CrdPrj, CadNozzle *CadNoz, double *BasParam, int refUp, int refDown)
+{
+	
+	int k, iVer, NbrErr=0;
+	double *Crd=NULL;
+	
+	double *Buf = (double*) calloc(4*NbrVer, sizeof(double));
+	double *x = Buf, *zcenter = &Buf[NbrVer], *r1 = &Buf[2*NbrVer], *r2 = &Buf[3*NbrVer];
+	int *Patch = (int*) malloc(sizeof(int)*NbrVer);
+	
+	CadBspline * Bsp_center = CadNoz->Bsp_center;
+	double len = Bsp_center->Coefs[Bsp_center->NbrCoefs/2-1];
+	
+	//--- Project on the baseline nozzle
+	
+	for (k=0; k<NbrVer; k++) {
+		
+		iVer = VerPrj[k];
+		Crd  = &CrdPrj[3*k];
+		
+		Crd[0] = Msh->Ver[iVer][0];
+		Crd[1] = Msh->Ver[iVer][1];
+		Crd[2] = Msh->Ver[iVer][2];
+		
+		Patch[k] = -1;
+		
+		if ( Tag[iVer] == refUp ) {
+			ProjectNozzleWall_Up (Msh->Ver[iVer], Crd, BasParam);
+			Patch[k] = NOZZLEUP;
+		}
+		else if ( Tag[iVer] == refDown ) {
+			ProjectNozzleWall_Down_Save (Msh->Ver[iVer], Crd, BasParam);
+			Patch[k] = NOZZLEDOWN;
+		}
+		
+		if ( Patch[k] == -1 )
+			NbrErr++;
+		
+		x[k] = Bsp_center->Coefs[0]+Crd[0]*len;
+		
+	}
+	
+	//--- Evaluate the DV nozzle for the whole batch, and map the vertices
+	
+	Evaluate_Nozzle_Batch (CadNoz, x, r1, r2, zcenter, NbrVer);
+	
+	for (k=0; k<NbrVer; k++) {
+		ProjectToDV_Eval(&CrdPrj[3*k], CadNoz, BasParam, Patch[k], x[k], zcenter[k], r1[k], r2[k]);
+	}
+	
+	free(Buf);
+	free(Patch);
+	
+	return NbrErr;
+	
+}
+
+
+//--- Same as NozzleWallProjection_Batch, going from nozzle CadNoz_bas to nozzle CadNoz.
+//--- Batched version of ProjectNozzleWall_Up_DV+ProjectToDV_DV (upper wall)
+//--- and ProjectNozzleWall_Down_DV_3 (lower wall).
+int NozzleWallProjection_DV_Batch (Mesh *Msh, int *Tag, int *VerPrj, int NbrVer, double *CrdPrj, CadNozzle *CadNoz, CadNozzle *CadNoz_bas, int refUp, int refDown)
+{
+	
+	int k, iVer, NbrErr=0;
+	double *CrdOld=NULL, *Crd=NULL;
+	double alp, rbas, cosTheta, theta, thetaCut, zcut;
+	
+	double *Buf = (double*) calloc(9*NbrVer, sizeof(double));
+	double *x_bas = Buf, *r1_bas = &Buf[NbrVer], *r2_bas = &Buf[2*NbrVer], *zbas = &Buf[3*NbrVer];
+	double *x = &Buf[4*NbrVer], *r1 = &Buf[5*NbrVer], *r2 = &Buf[6*NbrVer], *zcen = &Buf[7*NbrVer];
+	double *t = &Buf[8*NbrVer];
+	
+	double xin_bas  = CadNoz_bas->Bsp_center->Coefs[0];
+	double xout_bas = CadNoz_bas->Bsp_center->Coefs[CadNoz_bas->Bsp_center->NbrCoefs/2-1];
+	
+	double xin  = CadNoz->Bsp_center->Coefs[0];
+	double xout = CadNoz->Bsp_center->Coefs[CadNoz->Bsp_center->NbrCoefs/2-1];
+	
+	//--- Evaluate the baseline nozzle
+	
+	for (k=0; k<NbrVer; k++) {
+		
+		x_bas[k] = Msh->Ver[VerPrj[k]][0];
+		
+		if ( x_bas[k] < xin_bas-1e-6 || x_bas[k] > xout_bas+1e-6  ) {
+			NbrErr++;
+			x_bas[k] = max(xin_bas, min(xout_bas, x_bas[k]));
+		}
+		
+	}
+	
+	Evaluate_Nozzle_Batch (CadNoz_bas, x_bas, r1_bas, r2_bas, zbas, NbrVer);
+	
+	//--- Parametrize the vertices on the baseline nozzle
+	
+	for (k=0; k<NbrVer; k++) {
+		
+		iVer   = VerPrj[k];
+		CrdOld = Msh->Ver[iVer];
+		
+		alp = (x_bas[k]-xin_bas)/(xout_bas-xin_bas);
+		
+		if ( Tag[iVer] == refUp ) {
+			rbas  = CrdOld[1]*CrdOld[1]/(r1_bas[k]*r1_bas[k]);
+			rbas += (CrdOld[2]-zbas[k])*(CrdOld[2]-zbas[k])/(r2_bas[k]*r2_bas[k]);
+			rbas = sqrt(rbas);
+			cosTheta = (CrdOld[2]-zbas[k])/r2_bas[k]/rbas;
+			t[k] = acos(max(-1.0,min(1.0, cosTheta)));
+			x[k] = xin+alp*xout;
+		}
+		else if ( Tag[iVer] == refDown ) {
+			t[k] = PI_NUMBER-asin(CrdOld[1]/r1_bas[k]);
+			x[k] = xin + alp*(xout-xin);
+		}
+		else {
+			NbrErr++;
+			x[k] = xin;
+		}
+		
+	}
+	
+	//--- Evaluate the DV nozzle
+	
+	Evaluate_Nozzle_Batch (CadNoz, x, r1, r2, zcen, NbrVer);
+	
+	for (k=0; k<NbrVer; k++) {
+		
+		iVer = VerPrj[k];
+		Crd  = &CrdPrj[3*k];
+		
+		alp = (x_bas[k]-xin_bas)/(xout_bas-xin_bas);
+		
+		Crd[0] = x[k];
+		Crd[1] = r1[k]*sin(t[k]);
+		
+		if ( Tag[iVer] == refUp ) {
+			Crd[2] = zcen[k]+r2[k]*cos(t[k]);
+		}
+		else {
+			thetaCut = alp*CadNoz->ThetaCutOut + (1.0-alp)*CadNoz->ThetaCutIn;
+			zcut     = zcen[k]+r2[k]*cos(thetaCut);
+			Crd[2]   = (1.0-alp)*(zcen[k]+r2[k]*cos(t[k])) + alp*zcut;
+		}
+		
+	}
+	
+	free(Buf);
+	
+	return NbrErr;
+	
+}
+
+
+//--- Project the NbrVerPrj tagged vertices of Msh, in batches distributed among
+//--- mshopt->NbrThr threads. The projected vertex ids are returned in VerPrj (in
+//--- increasing order) and their coordinates in CrdPrj.
+//--- CadNoz_bas == NULL: project from the analytic baseline (BasParam),
+//--- otherwise from nozzle CadNoz_bas.
+//--- Returns the number of vertices that could not be projected.
+int NozzleWallProjection_Threads (Options *mshopt, Mesh *Msh, int *Tag, int *VerPrj, int NbrVerPrj, double *CrdPrj, CadNozzle *CadNoz, CadNozzle *CadNoz_bas, double *BasParam, int refUp, int refDown)
+{
+	
+	int iVer, iBat, k=0, NbrErr=0, NbrThr=1;
+	int NbrBat = (NbrVerPrj+PRJBATCHSIZ-1)/PRJBATCHSIZ;
+	
+	double t0 = GetWallTime();
+	
+#ifdef _OPENMP
+	NbrThr = max(1, mshopt->NbrThr);
+#endif
+	
+	for (iVer=1; iVer<=Msh->NbrVer; iVer++) {
+		if ( Tag[iVer] > 0 )
+			VerPrj[k++] = iVer;
+	}
+	
+	#pragma omp parallel for schedule(dynamic) num_threads(NbrThr) reduction(+:NbrErr)
+	for (iBat=0; iBat<NbrBat; iBat++) {
+		
+		int iBeg = iBat*PRJBATCHSIZ;
+		int NbrVerBat = min(PRJBATCHSIZ, NbrVerPrj-iBeg);
+		
+		if ( CadNoz_bas )
+			NbrErr += NozzleWallProjection_DV_Batch (Msh, Tag, &VerPrj[iBeg], NbrVerBat, &CrdPrj[3*iBeg], CadNoz, CadNoz_bas, refUp, refDown);
+		else
+			NbrErr += NozzleWallProjection_Batch (Msh, Tag, &VerPrj[iBeg], NbrVerBat, &CrdPrj[3*iBeg], CadNoz, BasParam, refUp, refDown);
+		
+	}
+	
+	printf("%%%% Projected %d wall vertices in %.3lf s (%d thread(s)).\n", NbrVerPrj, GetWallTime()-t0, NbrThr);
+	
+	return NbrErr;
+	
+}
+
+
 int NozzleWallProjection (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, int refUp, int refDown, char *OutNam)
 {
 		
 	//---
 	
-	int WrtMsh = 1, patch=-1, WrtFullMsh=1;
+	int WrtMsh = 1, WrtFullMsh=1;
 		
 	int iTri, ref=0, i, j, iVer, vid=-1, is[3];
 	
-	double CrdNew[3];
-	
 	int NbrVerPrj=0 , NbrTriPrj=0;
 	
 	int *Tag = (int*) malloc(sizeof(int)*(Msh->NbrVer+1));
@@ -1008,35 +1217,24 @@ int NozzleWallProjection (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, int re
 	}
 	
 	//--- Project points
+	
+	int NbrErr=0;
+	double *CrdNew=NULL;
+	
+	int    *VerPrj = (int*) malloc(sizeof(int)*(NbrVerPrj+1));
+	double *CrdPrj = (double*) malloc(sizeof(double)*3*(NbrVerPrj+1));
+	
+	NbrErr = NozzleWallProjection_Threads (mshopt, Msh, Tag, VerPrj, NbrVerPrj, CrdPrj, CadNoz, NULL, BasParam, refUp, refDown);
+	
+	if ( NbrErr > 0 ) {
+		printf("  ## ERROR : Wrong nozzle CAD patch.\n");
+		exit(1);
+	}
+	
+	for (i=0; i<NbrVerPrj; i++) {
 		
-	for (iVer=1; iVer<=Msh->NbrVer; iVer++) {
-		
-		if ( Tag[iVer] <= 0 )
-			continue;
-		
-		CrdNew[0] = Msh->Ver[iVer][0];
-		CrdNew[1] = Msh->Ver[iVer][1];
-		CrdNew[2] = Msh->Ver[iVer][2];
-		
-		patch = -1;
-		
-		if ( Tag[iVer] == refUp ) {
-			ProjectNozzleWall_Up (Msh->Ver[iVer], CrdNew, BasParam);			
-			patch = NOZZLEUP;
-		}
-		else if ( Tag[iVer] == refDown ) {
-			
-			//---
-			ProjectNozzleWall_Down_Save (Msh->Ver[iVer], CrdNew, BasParam);
-			patch = NOZZLEDOWN;
-		}
-		
-		if ( patch == -1 ) {
-			printf("  ## ERROR : Wrong nozzle CAD patch.\n");
-			exit(1);
-		}
-		
-		ProjectToDV(CrdNew, CadNoz, BasParam, patch);
+		iVer   = VerPrj[i];
+		CrdNew = &CrdPrj[3*i];
 		
 		if ( WrtMsh == 1 ) {
 			MshViz->NbrVer++;
@@ -1054,6 +1252,9 @@ int NozzleWallProjection (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, int re
 		
 	}
 	
+	free(VerPrj);
+	free(CrdPrj);
+	
 	//--- Write visu mesh
 	
 	if ( WrtMsh == 1 ) {
@@ -1146,12 +1347,10 @@ int NozzleWallProjection_DV (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, Cad
 	
 	//---
 	
-	int WrtMsh = 1, patch=-1;
+	int WrtMsh = 1;
 		
 	int iTri, ref=0, i, j, iVer, vid=-1, is[3];
 	
-	double CrdNew[3];
-	
 	int NbrVerPrj=0 , NbrTriPrj=0;
 	
 	int *Tag = (int*) malloc(sizeof(int)*(Msh->NbrVer+1));
@@ -1223,60 +1422,26 @@ int NozzleWallProjection_DV (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, Cad
 	}
 	
 	//--- Project points
+	
+	int NbrErr=0;
+	double *CrdNew=NULL;
+	
+	int    *VerPrj = (int*) malloc(sizeof(int)*(NbrVerPrj+1));
+	double *CrdPrj = (double*) malloc(sizeof(double)*3*(NbrVerPrj+1));
+	
+	NbrErr = NozzleWallProjection_Threads (mshopt, Msh, Tag, VerPrj, NbrVerPrj, CrdPrj, CadNoz, CadNoz_bas, NULL, refUp, refDown);
+	
+	if ( NbrErr > 0 ) {
+		if ( verbose > 0 )
+			printf("  ## ERROR : %d wall vertices out of range or with a wrong nozzle CAD patch.\n", NbrErr);
+		exit(1);
+	}
+	
+	for (i=0; i<NbrVerPrj; i++) {
 		
-	for (iVer=1; iVer<=Msh->NbrVer; iVer++) {
-		
-		if ( Tag[iVer] <= 0 )
-			continue;
-		
-		CrdNew[0] = Msh->Ver[iVer][0];
-		CrdNew[1] = Msh->Ver[iVer][1];
-		CrdNew[2] = Msh->Ver[iVer][2];
-		
-		patch = -1;
-		
-		//if ( Tag[iVer] == refUp ) {
-		//	//---
-		//	ProjectNozzleWall_Up_DV (Msh->Ver[iVer], CrdNew, CadNoz_bas);			
-		//	patch = NOZZLEUP;
-		//}
-		//else if ( Tag[iVer] == refDown ) {			
-		//	//---
-		//	ProjectNozzleWall_Down_DV (Msh->Ver[iVer], CrdNew, CadNoz_bas);
-		//	patch = NOZZLEDOWN;
-		//}
-		//
-		//if ( patch == -1 ) {
-		//	if ( verbose > 0 )
-		//		printf("  ## ERROR : Wrong nozzle CAD patch.\n");
-		//	exit(1);
-		//}
-		//
-		//ProjectToDV_DV(CrdNew, CadNoz, CadNoz_bas, patch);
-
-		if ( Tag[iVer] == refUp ) {
-			//---
-			ProjectNozzleWall_Up_DV (Msh->Ver[iVer], CrdNew, CadNoz_bas);	
-			ProjectToDV_DV(CrdNew, CadNoz, CadNoz_bas, patch);		
-			patch = NOZZLEUP;
-		}
-		else if ( Tag[iVer] == refDown ) {			
-			//---
-			ProjectNozzleWall_Down_DV_3 (Msh->Ver[iVer], CrdNew, CadNoz, CadNoz_bas);
-			patch = NOZZLEDOWN;
-		}
-		
-		if ( patch == -1 ) {
-			if ( verbose > 0 )
-				printf("  ## ERROR : Wrong nozzle CAD patch.\n");
-			exit(1);
-		}
+		iVer   = VerPrj[i];
+		CrdNew = &CrdPrj[3*i];
 		
-
-		//CrdNew[0] = Msh->Ver[iVer][0];
-		//CrdNew[1] = Msh->Ver[iVer][1];
-		//CrdNew[2] = Msh->Ver[iVer][2];
-		//	
 		if ( WrtMsh == 1 ) {
 			MshViz->NbrVer++;
 			AddVertex(MshViz, MshViz->NbrVer, CrdNew);
@@ -1287,6 +1452,9 @@ int NozzleWallProjection_DV (Options *mshopt, Mesh *Msh, CadNozzle * CadNoz, Cad
 		
 	}
 	
+	free(VerPrj);
+	free(CrdPrj);
+	
 	//--- Write visu mesh
 	
 	if ( WrtMsh == 1 ) {
@@ -0,0 +1,45 @@
+/* Floating point type of the piecewise linear utilities and of the low-fidelity
+nozzle solver. By default real_t is double. When compiled with -DCOMPLEX_STEP
+the same sources are built in complex arithmetic, so that derivatives can be
+obtained with the complex-step method: df/dx = Im(f(x + ih))/h. Comparisons
+and branches are always made on the real part (RPART) so that the complex build
+follows the same path as the real one. */
+
+#ifndef REALTYPE_H
+#define REALTYPE_H
+
+#ifdef COMPLEX_STEP
+
+#include <complex.h>
+
+typedef double complex real_t;
+
+#define RPART(a)   creal(a)
+#define IPART(a)   cimag(a)
+#define rt_pow     cpow
+#define rt_sqrt    csqrt
+#define rt_log     clog
+#define rt_exp     cexp
+#define rt_cos     ccos
+#define rt_atan    catan
+#define rt_fabs(a) (creal(a) < 0. ? -(a) : (a))
+
+#else
+
+#include <math.h>
+
+typedef double real_t;
+
+#define RPART(a)   (a)
+#define IPART(a)   (0.)
+#define rt_pow     pow
+#define rt_sqrt    sqrt
+#define rt_log     log
+#define rt_exp     exp
+#define rt_cos     cos
+#define rt_atan    atan
+#define rt_fabs    fabs
+
+#endif
+
+#endif
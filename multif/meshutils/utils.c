@@ -21,3 +21,13 @@ void StrRemoveChars (char* s, char ch) {
 	}
 	*p = 0;
 }
+
+//--- Returns wall clock time in seconds (CPU time when built without OpenMP)
+double GetWallTime (void)
+{
+#ifdef _OPENMP
+	return omp_get_wtime();
+#else
+	return (double)clock()/CLOCKS_PER_SEC;
+#endif
+}
@@ -81,9 +81,9 @@ int buckin_3d(pMesh mesh,pBucket bucket,double *c) {
   siz = bucket->size;
   dd  = siz / (double)PRECI;
 	
-  ii = I_MAX(0,(int)(dd * c[0])-1);
-  jj = I_MAX(0,(int)(dd * c[1])-1);
-  kk = I_MAX(0,(int)(dd * c[2])-1);
+  ii = I_MIN(siz-1,I_MAX(0,(int)(dd * c[0])-1));
+  jj = I_MIN(siz-1,I_MAX(0,(int)(dd * c[1])-1));
+  kk = I_MIN(siz-1,I_MAX(0,(int)(dd * c[2])-1));
   ic = (kk*siz + jj)*siz + ii;
 
   /* check current cell */
@@ -149,8 +149,8 @@ int buckin_2d(pMesh mesh,pBucket bucket,double *c) {
   siz = bucket->size;
   dd  = siz / (double)PRECI;
 
-  ii = I_MAX(0,(int)(dd * c[0])-1);
-  jj = I_MAX(0,(int)(dd * c[1])-1);
+  ii = I_MIN(siz-1,I_MAX(0,(int)(dd * c[0])-1));
+  jj = I_MIN(siz-1,I_MAX(0,(int)(dd * c[1])-1));
   ic = jj*siz + ii;
 
   /* check current cell */
@@ -205,3 +205,98 @@ int buckin_2d(pMesh mesh,pBucket bucket,double *c) {
 
   return(0);
 }
+
+
+/* return closest vertex of p on mesh (as closept_3d), visiting the bucket
+   cells by increasing distance to p. Every vertex in a cell at index
+   distance d+1 or more is at least d/dd away from p. */
+int closept_bucket_3d(pMesh mesh,pBucket bucket,double *c) {
+  pPoint    pp1;
+  double    dm,dd,d2,ux,uy,uz;
+  int       i,j,k,ii,jj,kk,d,ic,ip,ip1,siz;
+  int       imin,imax,jmin,jmax,kmin,kmax;
+
+  siz = bucket->size;
+  dd  = siz / (double)PRECI;
+
+  ii = I_MIN(siz-1,I_MAX(0,(int)(dd * c[0])-1));
+  jj = I_MIN(siz-1,I_MAX(0,(int)(dd * c[1])-1));
+  kk = I_MIN(siz-1,I_MAX(0,(int)(dd * c[2])-1));
+
+  ip = 0;
+  dm = 1.e30;
+  for (d=0; d<siz; d++) {
+    if ( ip && dm < ((d-1)/dd)*((d-1)/dd) )  break;
+
+    imin = I_MAX(0,ii-d);
+    imax = I_MIN(ii+d,siz-1);
+    jmin = I_MAX(0,jj-d);
+    jmax = I_MIN(jj+d,siz-1);
+    kmin = I_MAX(0,kk-d);
+    kmax = I_MIN(kk+d,siz-1);
+
+    /* cells on the boundary of the (2d+1)^3 block only */
+    for (k=kmin; k<=kmax; k++)
+      for (j=jmin; j<=jmax; j++)
+        for (i=imin; i<=imax; i++) {
+          if ( abs(i-ii) < d && abs(j-jj) < d && abs(k-kk) < d )  continue;
+          ic  = (k*siz + j)*siz + i;
+          for (ip1=bucket->head[ic]; ip1; ip1=bucket->link[ip1]) {
+            pp1 = &mesh->point[ip1];
+            ux  = pp1->c[0] - c[0];
+            uy  = pp1->c[1] - c[1];
+            uz  = pp1->c[2] - c[2];
+            d2  = ux*ux + uy*uy + uz*uz;
+            if ( d2 < dm || (d2 == dm && ip1 < ip) ) {
+              ip = ip1;
+              dm = d2;
+            }
+          }
+        }
+  }
+
+  return(ip);
+}
+
+
+int closept_bucket_2d(pMesh mesh,pBucket bucket,double *c) {
+  pPoint    pp1;
+  double    dm,dd,d2,ux,uy;
+  int       i,j,ii,jj,d,ic,ip,ip1,siz;
+  int       imin,imax,jmin,jmax;
+
+  siz = bucket->size;
+  dd  = siz / (double)PRECI;
+
+  ii = I_MIN(siz-1,I_MAX(0,(int)(dd * c[0])-1));
+  jj = I_MIN(siz-1,I_MAX(0,(int)(dd * c[1])-1));
+
+  ip = 0;
+  dm = 1.e30;
+  for (d=0; d<siz; d++) {
+    if ( ip && dm < ((d-1)/dd)*((d-1)/dd) )  break;
+
+    imin = I_MAX(0,ii-d);
+    imax = I_MIN(ii+d,siz-1);
+    jmin = I_MAX(0,jj-d);
+    jmax = I_MIN(jj+d,siz-1);
+
+    for (j=jmin; j<=jmax; j++)
+      for (i=imin; i<=imax; i++) {
+        if ( abs(i-ii) < d && abs(j-jj) < d )  continue;
+        ic = j*siz + i;
+        for (ip1=bucket->head[ic]; ip1; ip1=bucket->link[ip1]) {
+          pp1 = &mesh->point[ip1];
+          ux  = pp1->c[0] - c[0];
+          uy  = pp1->c[1] - c[1];
+          d2  = ux*ux + uy*uy;
+          if ( d2 < dm || (d2 == dm && ip1 < ip) ) {
+            ip = ip1;
+            dm = d2;
+          }
+        }
+      }
+  }
+
+  return(ip);
+}
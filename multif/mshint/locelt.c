@@ -67,8 +67,9 @@ static int inTetra(pMesh mesh,int nsdep,double *p,double *cb) {
 }
 
 
-/* find tetra containg p, starting nsdep */
-int locelt_3d(pMesh mesh,int nsdep,double *p,double *cb) {
+/* find tetra containg p, starting nsdep. The visited tetras are marked in
+   loc, so that several threads can search the same mesh */
+int locelt_3d(pMesh mesh,pLocate loc,int nsdep,double *p,double *cb) {
   pTetra   pt;
   pPoint   p0,p1,p2,p3;
   double   bx,by,bz,cx,cy,cz,dx,dy,dz,vx,vy,vz,apx,apy,apz;
@@ -77,14 +78,14 @@ int locelt_3d(pMesh mesh,int nsdep,double *p,double *cb) {
 
   it    = 0;
   nsfin = nsdep;
-	base  = ++mesh->mark;
+	base  = ++loc->base;
 
   do {
     if ( !nsfin )  break;
     pt = &mesh->tetra[nsfin];
     if ( !pt->v[0] )  return(0);
-		if ( pt->mark == base )  break;
-    pt->mark = base;
+		if ( loc->mark[nsfin] == base )  break;
+    loc->mark[nsfin] = base;
 
     iadr = 4*(nsfin-1)+1;
     adj  = &mesh->adja[iadr];
@@ -157,10 +158,9 @@ int locelt_3d(pMesh mesh,int nsdep,double *p,double *cb) {
   while ( ++it <= mesh->ne );
 
   /* exhaustive search */
-  base = ++mesh->mark;
+  base = ++loc->base;
   for (nsfin=1; nsfin<=mesh->ne; nsfin++) {
-    pt = &mesh->tetra[nsfin];
-    if ( pt->mark != base && inTetra(mesh,nsfin,p,cb) )
+    if ( loc->mark[nsfin] != base && inTetra(mesh,nsfin,p,cb) )
 			return(nsfin);
   }
 
@@ -220,7 +220,8 @@ static int inTria(pMesh mesh,int nsdep,double *p,double *cb) {
 }
 
 
-int locelt_2d(pMesh mesh,int nsdep,double *p,double *cb) {
+/* find triangle containing p, starting nsdep (see locelt_3d) */
+int locelt_2d(pMesh mesh,pLocate loc,int nsdep,double *p,double *cb) {
   pTria     pt;
   pPoint    p0,p1,p2;
   double    ax,ay,bx,by,cx,cy;
@@ -229,15 +230,15 @@ int locelt_2d(pMesh mesh,int nsdep,double *p,double *cb) {
 
   it    = 0;
   nsfin = nsdep;
-	base  = ++mesh->mark;
+	base  = ++loc->base;
 
   do {
     if ( !nsfin )  break;
     pt = &mesh->tria[nsfin];
     if ( !pt->v[0] )  return(0);
-    if ( pt->mark == base )  break;
+    if ( loc->mark[nsfin] == base )  break;
 
-    pt->mark = base;
+    loc->mark[nsfin] = base;
     iadr = 3*(nsfin-1)+1;
     adja = &mesh->adja[iadr];
 
@@ -295,10 +296,9 @@ int locelt_2d(pMesh mesh,int nsdep,double *p,double *cb) {
   while ( ++it <= mesh->nt );
 
   /* exhaustive search */
-  base = ++mesh->mark;
+  base = ++loc->base;
   for (nsfin=1; nsfin<=mesh->nt; nsfin++) {
-    pt = &mesh->tria[nsfin];
-    if ( pt->mark != base && inTria(mesh,nsfin,p,cb) )
+    if ( loc->mark[nsfin] != base && inTria(mesh,nsfin,p,cb) )
       return(nsfin);
   }
 
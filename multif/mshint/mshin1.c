@@ -1,17 +1,11 @@
 #include "mshint.h"
 
-#define BUCKSIZ    32
-
 extern Param par;
 
 
 int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2) {
   pBucket  bucket;
-  pPoint   ppt;
-  pTria    pt;
-  pTetra   ptt;
-  double   cb[4],*sp,*sa,*se;
-  int      k,iadr,iel,ret,fail;
+  int      ret;
 
   /* interpolation */
 	if ( mesh1->dim == 2 )
@@ -21,40 +15,112 @@ int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2) {
 		
   if ( !bucket )  return(0);
 
+  ret = mshin1_bucket(mesh1,sol1,bucket,mesh2,sol2,1);
+
+  free(bucket->head);
+  free(bucket->link);
+  free(bucket);
+  return(ret);
+}
+
+
+/* allocate nthr element location states on mesh */
+static pLocate newLocate(pMesh mesh,int nthr) {
+  pLocate  loc;
+  int      i,nel;
+
+  nel = mesh->dim == 2 ? mesh->nt : mesh->ne;
+  loc = (pLocate)calloc(nthr,sizeof(Locate));
+  assert(loc);
+  for (i=0; i<nthr; i++) {
+    loc[i].mark = (int*)calloc(nel+1,sizeof(int));
+    assert(loc[i].mark);
+  }
+  return(loc);
+}
+
+
+static void freeLocate(pLocate loc,int nthr) {
+  int      i;
+
+  for (i=0; i<nthr; i++)
+    free(loc[i].mark);
+  free(loc);
+}
+
+
+/* interpolate sol1 at vertex k of mesh2 */
+static int intpt1(pMesh mesh1,pSol sol1,pBucket bucket,pLocate loc,pMesh mesh2,pSol sol2,int k) {
+  pPoint   ppt;
+  double   cb[4],*sp,*sa;
+  int      iadr,iel,ret;
+
+  ppt  = &mesh2->point[k];
+  if ( mesh1->dim == 2 ){
+    iel  = buckin_2d(mesh1,bucket,ppt->c);
+    iel  = locelt_2d(mesh1,loc,iel,ppt->c,cb);
+  }
+  else {
+    iel  = buckin_3d(mesh1,bucket,ppt->c);
+    iel  = locelt_3d(mesh1,loc,iel,ppt->c,cb);
+  }
+  iadr = (k-1)*sol2->size[0] + 1;
+  sp   = &sol2->valp1[iadr];
+  if ( iel ) {
+    if ( mesh1->dim == 2 )
+      ret = intpp1_2d(sol1,mesh1->tria[iel].v,sp,k,cb);
+    else
+      ret = intpp1_3d(sol1,mesh1->tetra[iel].v,sp,k,cb);
+    return(ret);
+  }
+  else {
+    if ( mesh1->dim == 2 )
+      iel = closept_bucket_2d(mesh1,bucket,ppt->c);
+    else
+      iel = closept_bucket_3d(mesh1,bucket,ppt->c);
+    if ( iel ) {
+      iadr = (iel-1)*sol1->size[0] + 1;
+      sa   = &sol1->valp1[iadr];
+      memcpy(sp,sa,sol2->size[0]*sizeof(double));
+      return(1);
+    }
+  }
+  return(0);
+}
+
+
+/* interpolate sol1 on mesh2, using the bucket structure of mesh1.
+   Target vertices are processed by nthr threads; each vertex is located
+   from its own bucket seed, so the result does not depend on nthr */
+int mshin1_bucket(pMesh mesh1,pSol sol1,pBucket bucket,pMesh mesh2,pSol sol2,int nthr) {
+  pLocate  loc;
+  pTria    pt;
+  pTetra   ptt;
+  double   cb[4],*se;
+  int      k,iadr,iel,ret,fail;
+
+#ifndef _OPENMP
+  nthr = 1;
+#endif
+  nthr = I_MAX(1,nthr);
+  loc  = newLocate(mesh1,nthr);
+
   fail = 0;
   if ( sol1->np ) {
     if ( par.imprim )  fprintf(stdout,"  %%%% Nodal interpolation (%d)\n",mesh2->np);
+#ifdef _OPENMP
+    #pragma omp parallel for schedule(dynamic,LOCCHUNK) num_threads(nthr) reduction(+:fail)
+#endif
     for (k=1; k<=mesh2->np; k++) {
-      ppt  = &mesh2->point[k];
-			if ( mesh1->dim == 2 ){
-      	iel  = buckin_2d(mesh1,bucket,ppt->c);
-				iel  = locelt_2d(mesh1,iel,ppt->c,cb);
-			}
-			else {
-				iel  = buckin_3d(mesh1,bucket,ppt->c);
-				iel  = locelt_3d(mesh1,iel,ppt->c,cb);
-      }
-      iadr = (k-1)*sol2->size[0] + 1;
-      sp   = &sol2->valp1[iadr];
-      if ( iel ) {
-        if ( mesh1->dim == 2 )
-          ret = intpp1_2d(sol1,mesh1->tria[iel].v,sp,k,cb);
-        else
-          ret = intpp1_3d(sol1,mesh1->tetra[iel].v,sp,k,cb);
-        if ( !ret )  fail++;
-      }
-      else {
-        iel = closept_3d(mesh1,ppt->c);
-        if ( iel ) {
-          iadr = (iel-1)*sol1->size[0] + 1;
-          sa   = &sol1->valp1[iadr];
-          memcpy(sp,sa,sol2->size[0]*sizeof(double));
-        }
-        else  fail++;
-      }
+#ifdef _OPENMP
+      if ( !intpt1(mesh1,sol1,bucket,&loc[omp_get_thread_num()],mesh2,sol2,k) )  fail++;
+#else
+      if ( !intpt1(mesh1,sol1,bucket,&loc[0],mesh2,sol2,k) )  fail++;
+#endif
     }
   }
 
+  /* element interpolation: serial (boulep_2d/3d use the mesh marks) */
   if ( sol1->ne ) {
     if ( par.imprim )  fprintf(stdout,"  %%%% Element interpolation (%d)\n",sol2->ne);
 
@@ -64,11 +130,11 @@ int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2) {
 
 				if ( mesh1->dim == 2 ){
 	        iel = buckin_2d(mesh1,bucket,pt->g);
-	        iel = locelt_2d(mesh1,iel,pt->g,cb);
+	        iel = locelt_2d(mesh1,&loc[0],iel,pt->g,cb);
 				}
 				else {
 	        iel = buckin_3d(mesh1,bucket,pt->g);
-	        iel = locelt_3d(mesh1,iel,pt->g,cb);
+	        iel = locelt_3d(mesh1,&loc[0],iel,pt->g,cb);
 				}
         iadr = (k-1)*sol2->size[1] + 1;
         se   = &sol2->valp0[iadr];
@@ -91,11 +157,11 @@ int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2) {
 
 				if ( mesh1->dim == 2 ){
 	        iel = buckin_2d(mesh1,bucket,ptt->g);
-	        iel = locelt_2d(mesh1,iel,ptt->g,cb);
+	        iel = locelt_2d(mesh1,&loc[0],iel,ptt->g,cb);
 				}
 				else {
 	        iel = buckin_3d(mesh1,bucket,ptt->g);
-	        iel = locelt_3d(mesh1,iel,ptt->g,cb);
+	        iel = locelt_3d(mesh1,&loc[0],iel,ptt->g,cb);
 				}
         iadr = (k-1)*sol2->size[1] + 1;
         se   = &sol2->valp0[iadr];
@@ -115,8 +181,6 @@ int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2) {
   }
   if ( fail )  fprintf(stdout,"  ## WARNING: %d nodes failed. Wrong solution.\n",fail);
 
-  free(bucket->head);
-  free(bucket->link);
-  free(bucket);
+  freeLocate(loc,nthr);
   return(1);
 }
@@ -10,6 +10,10 @@
 #include <signal.h>
 #include <ctype.h>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #include "chrono.h"
 #include "libmesh6.h"
 
@@ -30,6 +34,8 @@
 #define EPST    -1.e-2
 #define EPSR     1.e+2
 #define PRECI    1.0
+#define BUCKSIZ  32
+#define LOCCHUNK 256
 
 
 typedef struct {
@@ -85,6 +91,22 @@ typedef struct {
 } Bucket;
 typedef Bucket * pBucket;
 
+/* element location state, one per thread */
+typedef struct {
+  int     *mark,base;
+} Locate;
+typedef Locate * pLocate;
+
+/* background mesh and solution kept in memory to interpolate several targets */
+typedef struct S_Interp {
+  Mesh     mesh;
+  Sol      sol;
+  pBucket  bucket;
+  int      NbrThr,NbrTag;
+  char     SolTag[100][256];
+} Interp;
+typedef Interp * pInterp;
+
 typedef struct {
   double   dt,ray;
   char     imprim,ddebug,option; 
@@ -96,7 +118,9 @@ int loadMesh(pMesh mesh,char *filename);
 int loadSol(pSol sol,char *filename);
 int saveSol(pSol sol,char *filename);
 int mshin1(pMesh mesh1,pSol sol1,pMesh mesh2,pSol sol2);
+int mshin1_bucket(pMesh mesh1,pSol sol1,pBucket bucket,pMesh mesh2,pSol sol2,int nthr);
 int scaleMesh(pMesh mesh,pSol sol);
+int scaleSol(pMesh mesh,pSol sol);
 int unscaleMesh(pMesh mesh,pSol sol);
 
 
@@ -111,10 +135,12 @@ int     intpp0_3d(pMesh ,pSol ,double *,int ,double *,double );
 int     intpp0_2d(pMesh ,pSol ,double *,int ,double *,double );
 int     intpp1_2d(pSol ,int *,double *,int ,double *);
 int     intpp1_3d(pSol ,int *,double *,int ,double *);
-int     locelt_2d(pMesh ,int ,double *,double *);
-int     locelt_3d(pMesh ,int ,double *,double *);
+int     locelt_2d(pMesh ,pLocate ,int ,double *,double *);
+int     locelt_3d(pMesh ,pLocate ,int ,double *,double *);
 int     closept_2d(pMesh ,double *);
 int     closept_3d(pMesh ,double *);
+int     closept_bucket_2d(pMesh ,pBucket ,double *);
+int     closept_bucket_3d(pMesh ,pBucket ,double *);
 int     hashelt_3d(pMesh );
 int     hashelt_2d(pMesh );
 int     boulep_2d(pMesh ,int ,int ,int *);
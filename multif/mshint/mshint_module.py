@@ -99,6 +99,34 @@ except __builtin__.Exception:
 def py_Interpolation(MshNam, BakMshNam, BakSolNam, pyInfo, pyCrd, pyTri, pyTet, pySol, pyHeader):
     return _mshint_module.py_Interpolation(MshNam, BakMshNam, BakSolNam, pyInfo, pyCrd, pyTri, pyTet, pySol, pyHeader)
 py_Interpolation = _mshint_module.py_Interpolation
+
+def py_InterpolatorSetup(BakMshNam, BakSolNam):
+    return _mshint_module.py_InterpolatorSetup(BakMshNam, BakSolNam)
+py_InterpolatorSetup = _mshint_module.py_InterpolatorSetup
+
+def py_InterpolatorSetupData(dim, pyVer, pyTri, pyTet, pySol):
+    return _mshint_module.py_InterpolatorSetupData(dim, pyVer, pyTri, pyTet, pySol)
+py_InterpolatorSetupData = _mshint_module.py_InterpolatorSetupData
+
+def py_InterpolatorSetThreads(itp, NbrThr):
+    return _mshint_module.py_InterpolatorSetThreads(itp, NbrThr)
+py_InterpolatorSetThreads = _mshint_module.py_InterpolatorSetThreads
+
+def py_InterpolatorLoadSolution(itp, BakSolNam):
+    return _mshint_module.py_InterpolatorLoadSolution(itp, BakSolNam)
+py_InterpolatorLoadSolution = _mshint_module.py_InterpolatorLoadSolution
+
+def py_InterpolatorInterpolate(itp, MshNam, pyInfo, pyCrd, pyTri, pyTet, pySol, pyHeader):
+    return _mshint_module.py_InterpolatorInterpolate(itp, MshNam, pyInfo, pyCrd, pyTri, pyTet, pySol, pyHeader)
+py_InterpolatorInterpolate = _mshint_module.py_InterpolatorInterpolate
+
+def py_InterpolatorPoints(itp, pyCrd, pySol, pyHeader):
+    return _mshint_module.py_InterpolatorPoints(itp, pyCrd, pySol, pyHeader)
+py_InterpolatorPoints = _mshint_module.py_InterpolatorPoints
+
+def py_InterpolatorFree(itp):
+    return _mshint_module.py_InterpolatorFree(itp)
+py_InterpolatorFree = _mshint_module.py_InterpolatorFree
 # This file is compatible with both classic and new-style classes.
 
 
@@ -1,5 +1,6 @@
 #include "mshint.h"
 #include "Python.h"
+#include "mshint_py.h"
 #include "compil.date"
 
 Param    par_py;
@@ -76,6 +77,7 @@ int copyMesh(Mesh *mesh, VMesh *VMesh) {
 		
 		if ( mesh->dim == 2 ) {
 			for (k=1; k<=mesh->nt; k++) {
+			  pt1 = &mesh->tria[k];
 			  for (i=0; i<3; i++) {    
     	    ppt = &mesh->point[pt1->v[i]];
 			  	pt1->g[0] += ppt->c[0];
@@ -177,7 +179,7 @@ int copySol(Sol *sol, VMesh *Msh) {
   assert(sol->valp1);
 	
 	int ia;
-  for (k=1; k<sol->np; k++) {
+  for (k=1; k<=sol->np; k++) {
 		ia = (k-1)*sol->size[0] + 1;
 		for (i=0; i<sol->size[0]; i++)
       sol->valp1[ia+i] = Msh->Sol[(k)*sol->size[0]+i];
@@ -274,85 +276,378 @@ int returnValuesToPython(Mesh *mesh, Sol *sol, PyObject *pyInfo, PyObject *pyCrd
 
 
 
-int py_Interpolation( char *MshNam, char *BakMshNam, char *BakSolNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader)
+/* load target mesh */
+static int loadTarget(char *MshNam, pMesh mesh2)
 {
-	Mesh       mesh1,mesh2;
-	Sol        sol1,sol2;
-	int        i;
-	char       stim[16];
-	
 	VMesh *Msh = NULL;
-	VMesh *MshBak = NULL;
-	int ier, FilTyp;
+	int FilTyp;
 	
-	fprintf(stdout,"  -- MSHINT Python module\n");
-  
-	tminit(par_py.ctim,TIMEMAX);
-	chrono(ON,&par_py.ctim[0]);
-  
-	/* default values */
-	memset(&mesh1,0,sizeof(Mesh));
-	memset(&sol1,0,sizeof(Sol));
-	memset(&mesh2,0,sizeof(Mesh));
-	memset(&sol2,0,sizeof(Sol));
-	par_py.imprim = -99;
-	par_py.ddebug = 0;
-	par_py.option = 1;
-	par_py.ray    = 1.2;
-  
-	parsarPy( MshNam, BakMshNam, BakSolNam, &mesh1, &sol1, &mesh2, &sol2);
+	mesh2->name = MshNam;
+	
+	FilTyp = GetInputFileType(MshNam);
+	if ( FilTyp == FILE_GMF ) {
+		if ( !loadMesh(mesh2,mesh2->name) ) return(0);
+	}
+	else if ( FilTyp == FILE_SU2 ) {
+		Msh = SetupMeshAndSolution (MshNam, "");
+		if ( !copyMesh(mesh2, Msh) )  return(0);
+		if ( Msh )
+	 		FreeMesh(Msh);
+	}
+	else {
+		printf("  ## ERROR loadTarget : Unknown mesh format.\n");
+		return(0);
+	}
 	
-	// --- Source (back) mesh 
+	return(1);
+}
+
+
+/* load background solution (valp1 of itp->sol must be free) */
+static int loadBackSol(pInterp itp, char *BakMshNam, char *BakSolNam)
+{
+	VMesh *MshBak = NULL;
+	int SizMsh[GmfMaxSizMsh+1];
+	int i, FilTyp;
+	
+	itp->sol.name = BakSolNam;
+	itp->NbrTag = 0;
 	
 	FilTyp = GetInputFileType(BakMshNam);
 	if ( FilTyp == FILE_GMF ) {
-  	if ( !loadMesh(&mesh1,mesh1.name) )  return(1);
-		if ( !loadSol(&sol1,sol1.name) )     return(1);
+		if ( !loadSol(&itp->sol,itp->sol.name) )  return(0);
 	}
 	else if ( FilTyp == FILE_SU2 ) {
-
-		MshBak = SetupMeshAndSolution (BakMshNam, BakSolNam);
 		
-		if ( !MshBak->Sol ) return(1);	
-		if ( !copyMesh(&mesh1, MshBak) ) return(1);		
-		if ( !copySol(&sol1, MshBak) ) return(1);
+		//--- Only the vertex number is needed to read the solution
+		memset(SizMsh, 0, sizeof(SizMsh));
+		SizMsh[GmfDimension] = itp->mesh.dim;
+		MshBak = AllocMesh(SizMsh);
+		MshBak->NbrVer = itp->mesh.np;
 		
-		for (i=0; i<MshBak->SolSiz; i++){
-			PyList_Append(pyHeader, PyString_FromString(MshBak->SolTag[i]));
+		if ( !LoadSU2Solution(BakSolNam, MshBak) || !copySol(&itp->sol, MshBak) ) {
+			FreeMesh(MshBak);
+			return(0);
 		}
 		
-		if ( MshBak )
-	 		FreeMesh(MshBak);
+		itp->NbrTag = MshBak->SolSiz;
+		for (i=0; i<MshBak->SolSiz; i++)
+			strcpy(itp->SolTag[i], MshBak->SolTag[i]);
+		
+		FreeMesh(MshBak);
+	}
+	else {
+		printf("  ## ERROR loadBackSol : Unknown mesh format.\n");
+		return(0);
 	}
 	
+	return(scaleSol(&itp->mesh,&itp->sol));
+}
+
+
+/* Fill a mesh and its solution from flat python lists (see py_InterpolatorSetupData) */
+static VMesh *listToMesh(int dim, PyObject *pyVer, PyObject *pyTri, PyObject *pyTet, PyObject *pySol)
+{
+	VMesh *Msh = NULL;
+	int SizMsh[GmfMaxSizMsh+1];
+	int i, j, k, is[5], NbrVer, NbrTri, NbrTet, NbrSol;
+	double crd[3];
+	
+	if ( !PyList_Check(pyVer) || !PyList_Check(pyTri) || !PyList_Check(pyTet) || !PyList_Check(pySol) ) {
+		printf("  ## ERROR listToMesh : Lists expected.\n");
+		return(NULL);
+	}
 	
-	// --- Target mesh
+	NbrVer = PyList_Size(pyVer)/3;
+	NbrTri = PyList_Size(pyTri)/4;
+	NbrTet = PyList_Size(pyTet)/5;
+	NbrSol = PyList_Size(pySol);
 	
-	FilTyp = GetInputFileType(MshNam);
+	if ( NbrVer == 0 || NbrSol == 0 || NbrSol%NbrVer != 0 ) {
+		printf("  ## ERROR listToMesh : The solution size does not match the number of vertices.\n");
+		return(NULL);
+	}
+	
+	memset(SizMsh, 0, sizeof(SizMsh));
+	SizMsh[GmfDimension]  = dim;
+	SizMsh[GmfVertices]   = NbrVer;
+	SizMsh[GmfTriangles]  = NbrTri;
+	SizMsh[GmfTetrahedra] = NbrTet;
+	Msh = AllocMesh(SizMsh);
+	
+	//--- Vertices (always 3 coordinates in the list)
+	
+	crd[2] = 0.0;
+	for (k=1; k<=NbrVer; k++) {
+		for (j=0; j<3; j++)
+			crd[j] = PyFloat_AsDouble(PyList_GetItem(pyVer,3*(k-1)+j));
+		AddVertex(Msh,k,crd);
+	}
+	Msh->NbrVer = NbrVer;
+	
+	//--- Elements (vertices followed by the ref)
+	
+	for (k=1; k<=NbrTri; k++) {
+		for (j=0; j<4; j++)
+			is[j] = (int) PyInt_AsLong(PyList_GetItem(pyTri,4*(k-1)+j));
+		AddTriangle(Msh,k,is,is[3]);
+	}
+	Msh->NbrTri = NbrTri;
+	
+	for (k=1; k<=NbrTet; k++) {
+		for (j=0; j<5; j++)
+			is[j] = (int) PyInt_AsLong(PyList_GetItem(pyTet,5*(k-1)+j));
+		AddTetrahedron(Msh,k,is,is[4]);
+	}
+	Msh->NbrTet = NbrTet;
+	
+	if ( PyErr_Occurred() ) {
+		printf("  ## ERROR listToMesh : Wrong type in the mesh lists.\n");
+		PyErr_Clear();
+		FreeMesh(Msh);
+		return(NULL);
+	}
+	
+	//--- Scalar solution fields (1-based as in the mesh)
+	
+	Msh->SolSiz = NbrSol/NbrVer;
+	Msh->NbrFld = Msh->SolSiz;
+	Msh->FldTab = (int*) malloc(sizeof(int)*Msh->SolSiz);
+	for (i=0; i<Msh->NbrFld; i++)
+		Msh->FldTab[i] = GmfSca;
+	
+	Msh->Sol = (double*) malloc(sizeof(double)*(NbrVer+1)*Msh->SolSiz);
+	for (i=0; i<Msh->SolSiz; i++)
+		Msh->Sol[i] = 0.0;
+	for (i=0; i<NbrSol; i++)
+		Msh->Sol[Msh->SolSiz+i] = PyFloat_AsDouble(PyList_GetItem(pySol,i));
+	
+	if ( PyErr_Occurred() ) {
+		printf("  ## ERROR listToMesh : Wrong type in the solution list.\n");
+		PyErr_Clear();
+		FreeMesh(Msh);
+		return(NULL);
+	}
+	
+	return(Msh);
+}
+
+
+/* Build the adjacencies and the bucket structure of the (scaled) background mesh */
+static int setupSearch(pInterp itp)
+{
+	if ( itp->mesh.dim == 2 ) {
+		if ( !hashelt_2d(&itp->mesh) )  return(0);
+		itp->bucket = newBucket_2d(&itp->mesh,BUCKSIZ);
+	}
+	else {
+		if ( !hashelt_3d(&itp->mesh) )  return(0);
+		itp->bucket = newBucket_3d(&itp->mesh,BUCKSIZ);
+	}
+	return(1);
+}
+
+
+/* free a mesh loaded by loadMesh/copyMesh */
+static void freeMshint(pMesh mesh)
+{
+	if ( mesh->point )  free(mesh->point);
+	if ( mesh->adja )   free(mesh->adja);
+	if ( mesh->tetra )  free(mesh->tetra);
+	if ( mesh->tria )   free(mesh->tria);
+	memset(mesh,0,sizeof(Mesh));
+}
+
+
+/* Setup an interpolator on the background mesh BakMshNam and solution BakSolNam.
+   The scaled mesh, its adjacencies and its bucket structure are kept in memory
+   until py_InterpolatorFree is called, so that several target meshes or point
+   sets can be interpolated without reloading the background mesh. */
+pInterp py_InterpolatorSetup( char *BakMshNam, char *BakSolNam )
+{
+	pInterp itp = NULL;
+	VMesh *MshBak = NULL;
+	int FilTyp;
+	char stim[16];
+	
+	tminit(par_py.ctim,TIMEMAX);
+	chrono(ON,&par_py.ctim[0]);
+	
+	itp = (pInterp)calloc(1,sizeof(Interp));
+	assert(itp);
+	
+	itp->mesh.name = BakMshNam;
+	itp->NbrThr    = 1;
+	
+	FilTyp = GetInputFileType(BakMshNam);
 	if ( FilTyp == FILE_GMF ) {
-		if ( !loadMesh(&mesh2,mesh2.name) ) return(1);
+		if ( !loadMesh(&itp->mesh,itp->mesh.name) ) {
+			py_InterpolatorFree(itp);
+			return(NULL);
+		}
 	}
 	else if ( FilTyp == FILE_SU2 ) {
-		Msh    = SetupMeshAndSolution (MshNam, "");
-		if ( !copyMesh(&mesh2, Msh) )  return(1);
-		if ( Msh )
-	 		FreeMesh(Msh);
+		MshBak = SetupMeshAndSolution (BakMshNam, "");
+		if ( !MshBak || !copyMesh(&itp->mesh, MshBak) ) {
+			FreeMesh(MshBak);
+			py_InterpolatorFree(itp);
+			return(NULL);
+		}
+		FreeMesh(MshBak);
+	}
+	else {
+		printf("  ## ERROR py_InterpolatorSetup : Unknown mesh format.\n");
+		py_InterpolatorFree(itp);
+		return(NULL);
+	}
+	
+	//--- Scale with the bounding box of the background mesh only: target
+	//--- points outside of it are clamped to the boundary buckets
+	
+	if ( !scaleMesh(&itp->mesh,0) || !loadBackSol(itp, BakMshNam, BakSolNam) ) {
+		py_InterpolatorFree(itp);
+		return(NULL);
+	}
+	
+	if ( !setupSearch(itp) ) {
+		py_InterpolatorFree(itp);
+		return(NULL);
 	}
 	
+	chrono(OFF,&par_py.ctim[0]);
+	printim(par_py.ctim[0].gdif,stim);
+	fprintf(stdout,"  -- BACKGROUND MESH SETUP COMPLETED.     %s\n",stim);
+	
+	return(itp);
+}
+
+
+/* Setup an interpolator on a background mesh and solution given as flat python
+   lists, e.g. as returned by the meshutils module (no intermediate files):
+   pyVer: 3 coordinates per vertex, pyTri: 3 vertices + ref per triangle,
+   pyTet: 4 vertices + ref per tetrahedron, pySol: SolSiz values per vertex.
+   Vertex indices are 1-based. */
+pInterp py_InterpolatorSetupData( int dim, PyObject *pyVer, PyObject *pyTri, PyObject *pyTet, PyObject *pySol )
+{
+	pInterp itp = NULL;
+	VMesh *MshBak = NULL;
+	char stim[16];
+	
+	tminit(par_py.ctim,TIMEMAX);
+	chrono(ON,&par_py.ctim[0]);
+	
+	MshBak = listToMesh(dim, pyVer, pyTri, pyTet, pySol);
+	if ( !MshBak )
+		return(NULL);
+	
+	itp = (pInterp)calloc(1,sizeof(Interp));
+	assert(itp);
+	
+	itp->mesh.name = NULL;
+	itp->sol.name  = "";
+	itp->NbrThr    = 1;
+	
+	if ( !copyMesh(&itp->mesh, MshBak) || !scaleMesh(&itp->mesh,0)
+	  || copySol(&itp->sol, MshBak) != 1 || !scaleSol(&itp->mesh,&itp->sol)
+	  || !setupSearch(itp) ) {
+		FreeMesh(MshBak);
+		py_InterpolatorFree(itp);
+		return(NULL);
+	}
+	
+	FreeMesh(MshBak);
+	
+	chrono(OFF,&par_py.ctim[0]);
+	printim(par_py.ctim[0].gdif,stim);
+	fprintf(stdout,"  -- BACKGROUND MESH SETUP COMPLETED.     %s\n",stim);
+	
+	return(itp);
+}
+
+
+/* Replace the background solution of itp by BakSolNam (same background mesh) */
+int py_InterpolatorLoadSolution( pInterp itp, char *BakSolNam )
+{
+	if ( !itp )  return(1);
+	
+	if ( itp->sol.valp1 )  free(itp->sol.valp1);
+	if ( itp->sol.valp0 )  free(itp->sol.valp0);
+	memset(&itp->sol,0,sizeof(Sol));
+	
+	if ( !itp->mesh.name ) {
+		printf("  ## ERROR py_InterpolatorLoadSolution : The background mesh was not read from a file.\n");
+		return(1);
+	}
+	
+	if ( !loadBackSol(itp, itp->mesh.name, BakSolNam) )  return(1);
+	
+	return(0);
+}
+
+
+/* Set the number of threads used to interpolate the target vertices */
+int py_InterpolatorSetThreads( pInterp itp, int NbrThr )
+{
+	if ( !itp )  return(1);
+	
+#ifdef _OPENMP
+	itp->NbrThr = I_MAX(1,NbrThr);
+#else
+	if ( NbrThr > 1 )
+		printf("  ## WARNING py_InterpolatorSetThreads : mshint was built without OpenMP, 1 thread used.\n");
+	itp->NbrThr = 1;
+#endif
+	
+	return(0);
+}
+
+
+/* Interpolate the background solution of itp on mesh MshNam (as py_Interpolation) */
+int py_InterpolatorInterpolate( pInterp itp, char *MshNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader)
+{
+	Mesh       mesh2;
+	Sol        sol2;
+	int        i, ier = 1;
+	char       stim[16];
+	char      *ptr;
+	pSol       sol1;
+	
+	if ( !itp )  return(1);
+	
+	sol1 = &itp->sol;
+	
+	chrono(ON,&par_py.ctim[1]);
+	
+	memset(&mesh2,0,sizeof(Mesh));
+	memset(&sol2,0,sizeof(Sol));
+	
+	for (i=0; i<itp->NbrTag; i++){
+		PyList_Append(pyHeader, PyString_FromString(itp->SolTag[i]));
+	}
+	
+	if ( !loadTarget(MshNam, &mesh2) )  goto cleanup;
+	
+	sol2.name = (char *)calloc(128,sizeof(char));
+	assert(sol2.name);
+	strcpy(sol2.name,MshNam);
+	ptr = strstr(sol2.name,".mesh");
+	if ( ptr )  *ptr = '\0';
+	ptr = strstr(sol2.name,".su2");
+	if ( ptr )  *ptr = '\0';
+	
 	sol2.dim  = mesh2.dim;
-  if ( sol1.np )
+  if ( sol1->np )
     sol2.np = mesh2.np;
-  if ( sol1.ne ) {
+  if ( sol1->ne ) {
 		sol2.ne = mesh2.dim == 2 ? mesh2.nt : mesh2.ne;
 	}
-  sol2.ver  = sol1.ver;
-  sol2.iter = sol1.iter;
-  sol2.time = sol1.time;
-  memcpy(sol2.type,sol1.type,2*sizeof(int));
-  memcpy(sol2.size,sol1.size,2*sizeof(int));
-  memcpy(&sol2.typtab[0],&sol1.typtab[0],sol1.type[0]*sizeof(int));
-  memcpy(&sol2.typtab[1],&sol1.typtab[1],sol1.type[1]*sizeof(int));
-  
+  sol2.ver  = sol1->ver;
+  sol2.iter = sol1->iter;
+  sol2.time = sol1->time;
+  memcpy(sol2.type,sol1->type,2*sizeof(int));
+  memcpy(sol2.size,sol1->size,2*sizeof(int));
+  memcpy(&sol2.typtab[0],&sol1->typtab[0],sol1->type[0]*sizeof(int));
+  memcpy(&sol2.typtab[1],&sol1->typtab[1],sol1->type[1]*sizeof(int));
 	
 	if ( sol2.np ) {
 	  sol2.valp1 = (double*)calloc(sol2.np+1,sol2.size[0]*sizeof(double));
@@ -362,79 +657,148 @@ int py_Interpolation( char *MshNam, char *BakMshNam, char *BakSolNam, PyObject *
 	  sol2.valp0 = (double*)calloc(sol2.ne+1,sol2.size[1]*sizeof(double));
 	  assert(sol2.valp0);
 	}
-	chrono(OFF,&par_py.ctim[1]);
-	//if ( par_py.imprim )  stats(&mesh1,&sol1,&mesh2,&sol2);
-	printim(par_py.ctim[1].gdif,stim);
-	fprintf(stdout,"  -- DATA READING COMPLETED.     %s\n",stim);
-    
-	//if ( !saveSol(&sol1,"test") )   return(1);
-	
-	/* analysis */
-	chrono(ON,&par_py.ctim[2]);
-	if ( par_py.imprim )   fprintf(stdout,"\n  -- PHASE 1 : ANALYSIS\n");
-	for (i=0; i<mesh1.dim; i++) {
-	  mesh1.info.min[i] = I_MIN(mesh1.info.min[i],mesh2.info.min[i]);
-	  mesh1.info.max[i] = I_MAX(mesh1.info.max[i],mesh2.info.max[i]);
-	}
-	mesh1.info.delta = I_MAX(mesh1.info.delta,mesh2.info.delta);
-	memcpy(&mesh2.info,&mesh1.info,sizeof(Info));
-	if ( !scaleMesh(&mesh1,&sol1) )  return(1);
-	if ( !scaleMesh(&mesh2,0) )      return(1);
-	if ( mesh1.dim == 2 ) {
-		if ( !hashelt_2d(&mesh1) )          return(1);
-	}
-	else {
-		if ( !hashelt_3d(&mesh1) )          return(1);
-	}
-	chrono(OFF,&par_py.ctim[2]);
-	printim(par_py.ctim[2].gdif,stim);
-	if ( par_py.imprim )
-	  fprintf(stdout,"  -- PHASE 1 COMPLETED.     %s\n",stim);
-  
-	/* interpolation */
-	if ( par_py.imprim )   fprintf(stdout,"\n  -- PHASE 2 : INTERPOLATION\n");
-	chrono(ON,&par_py.ctim[3]);
-	if ( !mshin1(&mesh1,&sol1,&mesh2,&sol2) )  return(1);
-	chrono(OFF,&par_py.ctim[3]);
-	printim(par_py.ctim[3].gdif,stim);
-	if ( par_py.imprim )
-	  fprintf(stdout,"  -- PHASE 2 COMPLETED.     %s sec.\n",stim);
-  
-	if ( !unscaleMesh(&mesh2,&sol2) )  return(1);
 	
-	if ( !saveSol(&sol2,sol2.name) )   return(1);
+	/* interpolation */
+	memcpy(&mesh2.info,&itp->mesh.info,sizeof(Info));
+	if ( !scaleMesh(&mesh2,0) )  goto cleanup;
+	if ( !mshin1_bucket(&itp->mesh,sol1,itp->bucket,&mesh2,&sol2,itp->NbrThr) )  goto cleanup;
+	if ( !unscaleMesh(&mesh2,&sol2) )  goto cleanup;
 	
+	chrono(OFF,&par_py.ctim[1]);
+	printim(par_py.ctim[1].gdif,stim);
+	fprintf(stdout,"  -- INTERPOLATION COMPLETED.     %s (%d thread(s))\n",stim,itp->NbrThr);
 	
+	if ( !saveSol(&sol2,sol2.name) )  goto cleanup;
 	
-  
 	/*
 		Return values to python
 	*/
 	
 	returnValuesToPython(&mesh2, &sol2, pyInfo, pyCrd, pyTri, pyTet, pySol);
 	
-
+	ier = 0;
+	
 	/*
 		Free memory
 	*/
+	
+cleanup:
+	freeMshint(&mesh2);
+	if ( sol2.valp1 )
+	  free(sol2.valp1);
+	if ( sol2.valp0 )
+		free(sol2.valp0);
+	if ( sol2.name )
+		free(sol2.name);
+	
+	return(ier);
+}
 
-	free(mesh1.point);
-	free(mesh1.adja);
-	free(mesh2.point);
-	free(mesh2.adja);
-	if ( mesh1.dim == 3 ) {
-	  free(mesh1.tetra);
-	  free(mesh2.tetra);
+
+/* Interpolate the background solution of itp at the points pyCrd (x0,y0,z0,x1,...; z
+   is ignored in 2D). The values are appended to pySol, point after point. */
+int py_InterpolatorPoints( pInterp itp, PyObject *pyCrd, PyObject *pySol, PyObject *pyHeader)
+{
+	Mesh       mesh2;
+	Sol        sol2;
+	pPoint     ppt;
+	int        i, j, k, NbrPts, ier = 1;
+	
+	if ( !itp || !PyList_Check(pyCrd) )  return(1);
+	
+	if ( itp->sol.np == 0 ) {
+		printf("  ## ERROR py_InterpolatorPoints : No vertex solution.\n");
+		return(1);
 	}
-	else {
-	  free(mesh1.tria);
-	  free(mesh2.tria);
+	
+	for (i=0; i<itp->NbrTag; i++){
+		PyList_Append(pyHeader, PyString_FromString(itp->SolTag[i]));
 	}
-	if ( sol2.np )
-	  free(sol2.valp1);
-	if ( sol2.ne )
-		free(sol2.valp0);
-  
-	return(0);
+	
+	NbrPts = PyList_Size(pyCrd)/3;
+	
+	memset(&mesh2,0,sizeof(Mesh));
+	memset(&sol2,0,sizeof(Sol));
+	
+	mesh2.dim = itp->mesh.dim;
+	mesh2.np  = NbrPts;
+	mesh2.point = (pPoint)calloc(mesh2.np+1,sizeof(Point));
+	assert(mesh2.point);
+	
+	for (k=1; k<=NbrPts; k++) {
+		ppt = &mesh2.point[k];
+		for (j=0; j<mesh2.dim; j++)
+			ppt->c[j] = PyFloat_AsDouble(PyList_GetItem(pyCrd,3*(k-1)+j));
+	}
+	
+	sol2.dim = mesh2.dim;
+	sol2.np  = NbrPts;
+	sol2.ver = itp->sol.ver;
+	memcpy(sol2.type,itp->sol.type,2*sizeof(int));
+	memcpy(sol2.size,itp->sol.size,2*sizeof(int));
+	memcpy(&sol2.typtab[0],&itp->sol.typtab[0],itp->sol.type[0]*sizeof(int));
+	sol2.valp1 = (double*)calloc(sol2.np+1,sol2.size[0]*sizeof(double));
+	assert(sol2.valp1);
+	
+	memcpy(&mesh2.info,&itp->mesh.info,sizeof(Info));
+	if ( !scaleMesh(&mesh2,0) )  goto cleanup;
+	if ( !mshin1_bucket(&itp->mesh,&itp->sol,itp->bucket,&mesh2,&sol2,itp->NbrThr) )  goto cleanup;
+	if ( !unscaleMesh(&mesh2,&sol2) )  goto cleanup;
+	
+	for (k=1; k<=NbrPts; k++) {
+		for (i=0; i<sol2.size[0]; i++)
+			PyList_Append(pySol, PyFloat_FromDouble(sol2.valp1[(k-1)*sol2.size[0]+1+i]));
+	}
+	
+	ier = 0;
+	
+cleanup:
+	free(mesh2.point);
+	free(sol2.valp1);
+	
+	return(ier);
+}
+
+
+/* Free an interpolator created by py_InterpolatorSetup */
+void py_InterpolatorFree( pInterp itp )
+{
+	if ( !itp )  return;
+	
+	freeMshint(&itp->mesh);
+	
+	if ( itp->sol.valp1 )  free(itp->sol.valp1);
+	if ( itp->sol.valp0 )  free(itp->sol.valp0);
+	
+	if ( itp->bucket ) {
+		free(itp->bucket->head);
+		free(itp->bucket->link);
+		free(itp->bucket);
+	}
+	
+	free(itp);
+}
+
+
+int py_Interpolation( char *MshNam, char *BakMshNam, char *BakSolNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader)
+{
+	pInterp itp = NULL;
+	int     ier;
+	
+	fprintf(stdout,"  -- MSHINT Python module\n");
+	
+	par_py.imprim = -99;
+	par_py.ddebug = 0;
+	par_py.option = 1;
+	par_py.ray    = 1.2;
+	
+	itp = py_InterpolatorSetup(BakMshNam, BakSolNam);
+	if ( !itp )  return(1);
+	
+	ier = py_InterpolatorInterpolate(itp, MshNam, pyInfo, pyCrd, pyTri, pyTet, pySol, pyHeader);
+	
+	py_InterpolatorFree(itp);
+	
+	return(ier);
 	
 }
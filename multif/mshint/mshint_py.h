@@ -1 +1,9 @@
-int py_Interpolation( char *MshNam, char *BakMshNam, char *BakSolNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader) ;
\ No newline at end of file
+int py_Interpolation( char *MshNam, char *BakMshNam, char *BakSolNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader) ;
+
+struct S_Interp *py_InterpolatorSetup( char *BakMshNam, char *BakSolNam );
+struct S_Interp *py_InterpolatorSetupData( int dim, PyObject *pyVer, PyObject *pyTri, PyObject *pyTet, PyObject *pySol );
+int py_InterpolatorSetThreads( struct S_Interp *itp, int NbrThr );
+int py_InterpolatorLoadSolution( struct S_Interp *itp, char *BakSolNam );
+int py_InterpolatorInterpolate( struct S_Interp *itp, char *MshNam, PyObject *pyInfo, PyObject *pyCrd, PyObject *pyTri, PyObject *pyTet, PyObject *pySol, PyObject *pyHeader);
+int py_InterpolatorPoints( struct S_Interp *itp, PyObject *pyCrd, PyObject *pySol, PyObject *pyHeader);
+void py_InterpolatorFree( struct S_Interp *itp );
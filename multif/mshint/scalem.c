@@ -55,9 +55,19 @@ int scaleMesh(pMesh mesh,pSol sol) {
 		}
 	}
 	 
-  /* normalize metric */
   if ( !sol )  return(1);
 
+  return(scaleSol(mesh,sol));
+}
+
+
+/* normalize solution, mesh->info being set */
+int scaleSol(pMesh mesh,pSol sol) {
+  double    dd,d2;
+  int       i,j,k,kk,iadr;
+
+  /* normalize metric */
+  dd = (double)PRECI / mesh->info.delta;
   d2 = 1.0 / (dd*dd);
   for (k=1; k<=sol->np; k++) {
     iadr = (k-1) * sol->size[0] + 1;
@@ -7,7 +7,7 @@ R. Fenrich & V. Menier, July 2016
 
 """ 
 
-import os, sys, tempfile
+import os, sys
 import textwrap
 import copy
 
@@ -504,6 +504,27 @@ class Nozzle:
             sys.stderr.write("\n ## ERROR: Fidelity level %d not defined.\n" % flevel);
             sys.exit(0);			
 
+        # A surrogate level is set up as its base level, and evaluated
+        # through multif.surrogate before running it
+        nozzle.surrogate = None;
+
+        kwd = "DEF_%s" % fidelity_tags[flevel];
+        if kwd in config and config[kwd].strip('()').split(",")[0] == 'SURROGATE':
+            cfgLvl = config[kwd].strip('()').split(",");
+            if len(cfgLvl) < 4 or cfgLvl[1] not in fidelity_tags:
+                sys.stderr.write("\n ## ERROR : Surrogate fidelity level %s " \
+                  "must be defined as (SURROGATE, <base tag>, <records file>," \
+                  " <trust radius>[, <max error>])\n\n" % fidelity_tags[flevel]);
+                sys.exit(0);
+            from multif import surrogate
+            if len(cfgLvl) > 4:
+                nozzle.surrogate = surrogate.Surrogate(cfgLvl[1], cfgLvl[2],   \
+                  float(cfgLvl[3]), float(cfgLvl[4]));
+            else:
+                nozzle.surrogate = surrogate.Surrogate(cfgLvl[1], cfgLvl[2],   \
+                  float(cfgLvl[3]));
+            flevel = fidelity_tags.index(cfgLvl[1]);
+
         if output == 'verbose':
             sys.stdout.write('\n%d fidelity level(s) defined using %s ' \
               'parameterization. Summary :\n' % (NbrFidLev, nozzle.param));
@@ -678,6 +699,19 @@ class Nozzle:
                             nozzle.cfd.su2_max_iterations = 1200;
                         else:
                             nozzle.cfd.su2_max_iterations = 5000;
+
+                    # --- Finite difference thrust gradients: number of
+                    #     perturbed cases run at the same time (warm-started,
+                    #     stopped on thrust convergence), 1 to run them in turn
+                    if 'SU2_FD_CONCURRENT_CASES' in config:
+                        nozzle.cfd.fd_concurrent_cases = int(config['SU2_FD_CONCURRENT_CASES']);
+                    else:
+                        nozzle.cfd.fd_concurrent_cases = 1;
+
+                    if 'SU2_FD_THRUST_TOLERANCE' in config:
+                        nozzle.cfd.fd_thrust_tol = float(config['SU2_FD_THRUST_TOLERANCE']);
+                    else:
+                        nozzle.cfd.fd_thrust_tol = 1e-6;
                 
                 # Set thermostructural parameters if necessary
                 
@@ -769,11 +803,20 @@ class Nozzle:
                         nozzle.linearStructuralAnalysisFlag = 1;
                         nozzle.thermostructuralFidelityLevel = 0.5;
                             
+            elif method == 'SURROGATE':
+
+                if i == flevel or len(cfgLvl) < 4:
+                    sys.stderr.write("\n ## ERROR : Wrong base level for "   \
+                      "surrogate fidelity level %d (tagged %s)\n\n" % (i,tag));
+                    sys.exit(0);
+                description += "Surrogate of fidelity level %s, records in " \
+                  "%s, trust radius %s" % (cfgLvl[1], cfgLvl[2], cfgLvl[3]);
+
             else :
                 sys.stderr.write("\n ## ERROR : Unknown governing method "    \
                   "(%s) for fidelity level %s.\n\n" % (method, tag));
                 sys.stderr.write("  Note: it must be either NONIDEALNOZZLE,"  \
-                  "EULER, or RANS\n");
+                  "EULER, RANS, or SURROGATE\n");
                 sys.exit(0);
 
             if output == 'verbose':
@@ -3547,8 +3590,21 @@ class Nozzle:
                             sys.stdout.write('Even though ADJOINT gradients have been specified, '
                               'specifying FD_STEP_SIZE is a good idea too.');
 
+                    elif config['GRADIENTS_COMPUTATION_METHOD'] == 'COMPLEX_STEP':
+                        nozzle.gradientsMethod = 'COMPLEX_STEP';
+                        
+                        # Responses not computed by the quasi-1D solver (e.g. 
+                        # AERO-S responses, mass) need finite differencing
+                        if 'FD_STEP_SIZE' in config: # absolute forward finite difference step size
+                            nozzle.fd_step_size = config['FD_STEP_SIZE'].strip('()');
+                            if ',' in nozzle.fd_step_size: # Different step size for all vars
+                                nozzle.fd_step_size = nozzle.fd_step_size.split(',');
+                                nozzle.fd_step_size = [float(i) for i in nozzle.fd_step_size];
+                            else: # Single step size for all variables
+                                nozzle.fd_step_size = float(nozzle.fd_step_size); 
+
                     else:
-                        sys.stderr.write("  ## ERROR : Invalid entry for GRADIENTS_COMPUTATION_METHOD option (expected: ADJOINT or FINITE_DIFF)\n");
+                        sys.stderr.write("  ## ERROR : Invalid entry for GRADIENTS_COMPUTATION_METHOD option (expected: ADJOINT, FINITE_DIFF or COMPLEX_STEP)\n");
                         sys.exit(1);
 
                 # Initialize function values and gradients 
@@ -4260,6 +4316,22 @@ def NozzleSetup( config, flevel, output='verbose'):
     
     nozzle = multif.nozzle.nozzle.Nozzle();
 
+    # --- Per-stage timing and resource usage (see profiler.py)
+    nozzle.profiler = multif.profiler.Profiler();
+    with nozzle.profiler.Stage('setup'):
+        _SetupNozzle(nozzle, config, flevel, output);
+
+    # --- Computer inner wall's B-spline and thermal and load layer thicknesses
+    #     B-spline coefs, and thickness node arrays may have been updated by
+    #     the design variables input file; update exterior geometry & baffles   
+    with nozzle.profiler.Stage('geometry'):
+        nozzle.SetupWall(output);
+
+    return nozzle;
+
+
+def _SetupNozzle( nozzle, config, flevel, output='verbose'):
+
     # --- Begin setup of CFD structure for CFD related information
     nozzle.cfd = CFD();
     nozzle.cfd.mesh_name = 'nozzle.su2';
@@ -4269,10 +4341,22 @@ def NozzleSetup( config, flevel, output='verbose'):
     
     # --- General nozzle information
     
+    # Scratch directory and retention policy of evaluation directories
+    nozzle.retention = multif.scratch.RetentionSetup(config);
+    
+    # Profile of the evaluation written next to the output functions
+    nozzle.profileFile = None;
+    if 'PROFILE' in config and config['PROFILE'] == 'YES':
+        nozzle.profileFile = 'profile.dat';
+        if 'PROFILE_NAME' in config:
+            nozzle.profileFile = config['PROFILE_NAME'];
+    
+    # Analyses run in a temporary directory, created for each run (see
+    # multif.scratch)
+    nozzle.runDir = '';
+    nozzle.tempRunDir = False;
     if 'TEMP_RUN_DIR' in config and config['TEMP_RUN_DIR'] == 'YES':
-        nozzle.runDir = tempfile.mkdtemp();    
-    else:
-        nozzle.runDir = '';
+        nozzle.tempRunDir = True;
 
 	# --- Mesh generation method
 	if 'MESH_GENERATION_METHOD' in config : 
@@ -4298,6 +4382,18 @@ def NozzleSetup( config, flevel, output='verbose'):
     else:
         nozzle.cfd.su2_output_format = 'TECPLOT';
         
+    # --- Format of intermediate GMF meshes and solutions (ASCII for debugging)
+    
+    if 'GMF_FORMAT' in config:
+        from multif import gmf
+        if config['GMF_FORMAT'] == 'BINARY':
+            gmf.BINARY = True;
+        elif config['GMF_FORMAT'] == 'ASCII':
+            gmf.BINARY = False;
+        else:
+            sys.stderr.write("  ## ERROR : Invalid option for GMF_FORMAT (BINARY or ASCII)\n");
+            sys.exit(1);
+        
     # --- Setup outputs
 	
     nozzle.responses = {}
@@ -4352,11 +4448,4 @@ def NozzleSetup( config, flevel, output='verbose'):
         nozzle.ParseDV(config,output);
 
         # Update DV using values provided in input DV file
-        nozzle.UpdateDV(output);
-
-    # --- Computer inner wall's B-spline and thermal and load layer thicknesses
-    #     B-spline coefs, and thickness node arrays may have been updated by
-    #     the design variables input file; update exterior geometry & baffles   
-    nozzle.SetupWall(output);
-
-    return nozzle;
\ No newline at end of file
+        nozzle.UpdateDV(output);
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Per-stage timing and resource usage of a nozzle evaluation.
+
+Every nozzle has a Profiler (nozzle.profiler) which records, for each named
+stage of the evaluation (setup, geometry, meshing, cfd, cfd_postpro, thermal,
+structural, mass, gradients, io):
+  - the wall time and CPU time (this process and its finished child processes:
+    gmsh, SU2, AERO-S), exclusive of the stages nested in it, so that the
+    stages add up to the evaluation time
+  - the peak resident set size reached during the stage (MB, exclusive of the
+    stages nested in it): the high-water mark of this process, reset when the
+    stage starts or resumes (/proc/self/clear_refs, Linux; elsewhere the
+    peak of the process so far), or of a child process of the stage if it
+    exceeds all the earlier children
+  - the number of calls
+
+With PROFILE= YES in the configuration file, the stages are written to
+PROFILE_NAME (default: profile.dat) next to the output functions file, and
+to the results store of a sample batch. Report() aggregates the stages of
+several evaluations; run this module on a list of profile files to print it:
+
+    python profiler.py EVAL_*/profile.dat
+"""
+
+import os, sys
+import time
+import resource
+
+STAGES = ['setup', 'geometry', 'meshing', 'cfd', 'cfd_postpro', 'thermal',
+          'structural', 'mass', 'gradients', 'io'];
+
+class Profiler:
+
+    def __init__(self):
+
+        self.stages = {};   # name: [wall, cpu, peak_rss, calls]
+        self.order  = [];
+        self.stack  = [];   # [name, wall, cpu, children_rss] of the running stages
+
+    #==========================================================================
+    # Stages
+    #==========================================================================
+
+    def Start(self, name):
+
+        now = _Clock();
+
+        # Pause the enclosing stage
+        if len(self.stack) > 0:
+            self._Accumulate(self.stack[-1], now);
+
+        self.stack.append([name, now[0], now[1], now[2]]);
+
+        if name not in self.stages:
+            self.stages[name] = [0., 0., 0., 0];
+            self.order.append(name);
+        self.stages[name][3] += 1;
+
+        _ResetPeakRSS();
+
+    def Stop(self, name):
+
+        if len(self.stack) == 0 or self.stack[-1][0] != name:
+            sys.stderr.write('  ## WARNING : profiler stage %s stopped while '
+                'not running\n' % name);
+            return;
+
+        now = _Clock();
+
+        self._Accumulate(self.stack.pop(), now);
+
+        # Resume the enclosing stage
+        if len(self.stack) > 0:
+            self.stack[-1][1:] = now;
+        _ResetPeakRSS();
+
+    def Stage(self, name):
+        # with nozzle.profiler.Stage('cfd'): ...
+        return _Stage(self, name);
+
+    def _Accumulate(self, entry, now):
+        stage = self.stages[entry[0]];
+        stage[0] += now[0] - entry[1];
+        stage[1] += now[1] - entry[2];
+        stage[2] = max(stage[2], _PeakRSS());
+        if now[2] > entry[3]: # a child of the stage set a new maximum
+            stage[2] = max(stage[2], now[2]);
+        entry[1:] = now;
+
+    #==========================================================================
+    # Output
+    #==========================================================================
+
+    def Records(self):
+        # (name, wall, cpu, peak_rss, calls) of each stage, in order of first
+        # call
+        return [tuple([nam] + self.stages[nam]) for nam in self.order];
+
+    def Write(self, filename):
+        WriteRecords(filename, self.Records());
+
+    def Summary(self):
+        return Report([self.Records()]);
+
+
+class _Stage:
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler;
+        self.name = name;
+
+    def __enter__(self):
+        self.profiler.Start(self.name);
+        return self.profiler;
+
+    def __exit__(self, typ, value, traceback):
+        self.profiler.Stop(self.name);
+        return False;
+
+
+def _Clock():
+    # Wall time, CPU time of this process and of its waited-for children, and
+    # peak RSS of the largest of these children (MB, ru_maxrss is in kB on
+    # Linux)
+    t = os.times();
+    return [time.time(), t[0] + t[1] + t[2] + t[3],
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss/1024.];
+
+def _PeakRSS():
+    # Peak RSS of this process since the last _ResetPeakRSS (MB)
+    try:
+        for lin in open('/proc/self/status', 'r'):
+            if lin.startswith('VmHWM:'):
+                return int(lin.split()[1])/1024.;
+    except IOError:
+        pass;
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.;
+
+def _ResetPeakRSS():
+    # Reset the peak RSS of this process to its current RSS (Linux >= 4.0)
+    try:
+        fil = open('/proc/self/clear_refs', 'w');
+        fil.write('5');
+        fil.close();
+    except IOError:
+        pass;
+
+
+#==============================================================================
+# Profile files and reports
+#==============================================================================
+
+def WriteRecords(filename, records):
+
+    fil = open(filename, 'w');
+    fil.write('# stage wall_s cpu_s peak_rss_mb calls\n');
+    for rec in records:
+        fil.write('%s %.6f %.6f %.1f %d\n' % rec);
+    fil.close();
+
+def ReadRecords(filename):
+
+    records = [];
+    for lin in open(filename, 'r'):
+        val = lin.split();
+        if len(val) != 5 or lin.startswith('#'):
+            continue;
+        records.append((val[0], float(val[1]), float(val[2]), float(val[3]),
+            int(val[4])));
+    return records;
+
+def Report(profiles):
+    # Table of the stages of several evaluations (list of Records()): number
+    # of evaluations, mean and max wall time, total wall and CPU time, share of
+    # the total wall time, and max peak RSS
+
+    stages = {};
+    order  = [];
+    for records in profiles:
+        for nam, wall, cpu, rss, calls in records:
+            if nam not in stages:
+                stages[nam] = [];
+                order.append(nam);
+            stages[nam].append((wall, cpu, rss));
+
+    # Known stages first, in evaluation order
+    order = [nam for nam in STAGES if nam in stages]                          \
+      + [nam for nam in order if nam not in STAGES];
+
+    total = sum([sum([s[0] for s in stages[nam]]) for nam in order]);
+
+    lines = [];
+    lines.append('%-14s %6s %11s %11s %12s %12s %6s %10s' % ('stage', 'evals',
+        'mean_wall', 'max_wall', 'total_wall', 'total_cpu', 'wall%', 'peak_mb'));
+    for nam in order:
+        wall = [s[0] for s in stages[nam]];
+        cpu  = [s[1] for s in stages[nam]];
+        rss  = [s[2] for s in stages[nam]];
+        lines.append('%-14s %6d %11.3f %11.3f %12.3f %12.3f %6.1f %10.1f' % (
+            nam, len(wall), sum(wall)/len(wall), max(wall), sum(wall),
+            sum(cpu), 100.*sum(wall)/total if total > 0 else 0., max(rss)));
+    lines.append('%-14s %6d %11s %11s %12.3f' % ('total', len(profiles),
+        '', '', total));
+
+    return '\n'.join(lines) + '\n';
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) < 2:
+        sys.stderr.write('usage: python profiler.py profile_file ...\n');
+        sys.exit(1);
+
+    sys.stdout.write(Report([ReadRecords(f) for f in sys.argv[1:]]));
@@ -25,10 +25,17 @@ class Sample:
         self.nTasks = 1;
         self.cpusPerTask = 1;
         
+        # Results store (see samplestore.py), and removal of the run
+        # directories of the successful runs
+        self.store = None;
+        self.clean = False;
+        
     def RunSample(self):
         
         sys.stdout.write('-- Running sample %d \n' % self.run_id);
         
+        t_start = time.time();
+        
         redirect = True;
         
         run_id = self.run_id;
@@ -51,8 +58,16 @@ class Sample:
         
         if os.path.isdir(dirNam):
             shutil.rmtree(dirNam);
-        os.mkdir(dirNam);
-        os.chdir(dirNam);
+        
+        #--- Run in the run dir, or in its scratch dir (see scratch.py)
+        
+        retention = multif.scratch.RetentionSetup(                            \
+          multif.SU2.io.Config(os.path.join(self.working_rootdir,self.cfg_file)));
+        
+        rundir  = os.path.abspath(dirNam);
+        workdir = retention.Enter(rundir);
+        os.chdir(workdir);
+        keep = [self.cfg_file, self.input_file, self.stdout, self.stderr];
         
         #--- Open log files
         
@@ -116,6 +131,11 @@ class Sample:
                 sys.stdout = sav_stdout;
                 sys.stderr = sav_stderr;
             sys.stderr.write("## Error : Run %d failed.\n" % run_id);
+            self.StoreResults(False, t_start);
+            stdout_hdl.close();
+            stderr_hdl.close();
+            os.chdir(os.path.join(self.working_rootdir, runs_dirNam));
+            retention.Leave(workdir, rundir, failed=True);
             raise;
             return success, val_out;
         
@@ -123,6 +143,22 @@ class Sample:
             sys.stdout = sav_stdout;
             sys.stderr = sav_stderr;
         
+        self.StoreResults(success, t_start, val_out, gra_out, tag_out, nozzle.profiler);
+        
+        #--- Retain the files of the run, or remove the run dir (the results
+        #    are in the store)
+        
+        stdout_hdl.close();
+        stderr_hdl.close();
+        os.chdir(os.path.join(self.working_rootdir, runs_dirNam));
+        
+        if self.clean and self.store is not None:
+            if workdir != rundir:
+                shutil.rmtree(workdir, ignore_errors=True);
+            shutil.rmtree(rundir);
+        else:
+            retention.Leave(workdir, rundir, keep=keep);
+        
         return success, val_out;
 
 
@@ -130,6 +166,8 @@ class Sample:
         
         sys.stdout.write('-- Running sample %d postpro\n' % self.run_id);
         
+        t_start = time.time();
+        
         run_id = self.run_id;
                         
         #--- Go to working dir
@@ -199,18 +237,23 @@ class Sample:
             sys.stdout = sav_stdout;
             sys.stderr = sav_stderr;
             sys.stderr.write("## Error : Run %d failed.\n" % run_id);
+            self.StoreResults(False, t_start);
             raise;
             return success, val_out;
         
         sys.stdout = sav_stdout;
         sys.stderr = sav_stderr;
         
+        self.StoreResults(success, t_start, val_out, gra_out, tag_out, nozzle.profiler);
+        
         return success, val_out;
         
     def RunSampleSkipAero(self):
         
         sys.stdout.write('-- Running sample %d skipaero\n' % self.run_id);
         
+        t_start = time.time();
+        
         run_id = self.run_id;
                         
         #--- Go to working dir
@@ -281,12 +324,15 @@ class Sample:
             sys.stdout = sav_stdout;
             sys.stderr = sav_stderr;
             sys.stderr.write("## Error : Run %d failed.\n" % run_id);
+            self.StoreResults(False, t_start);
             raise;
             return success, val_out;
         
         sys.stdout = sav_stdout;
         sys.stderr = sav_stderr;
         
+        self.StoreResults(success, t_start, val_out, gra_out, tag_out, nozzle.profiler);
+        
         return success, val_out;
  
     
@@ -367,28 +413,66 @@ class Sample:
         #
         return 1;
     
+    def StoreResults(self, success, t_start, val_out=[], gra_out=[], tag_out=None, profiler=None):
+        
+        # --- Append the results (and stage profile) of the run to the store, if any
+        
+        if self.store is None:
+            return;
+        
+        from multif import samplestore
+        
+        if not success:
+            val_out = [];
+            gra_out = [];
+        
+        store = samplestore.SampleStore(self.store);
+        store.Append(self.run_id, success, t_start, time.time(), val_out, gra_out, tag_out);
+        
+        if profiler is not None:
+            store.AppendProfile(self.run_id, profiler.Records());
+    
     def FormatDVFile(self):
         
         run_id = self.run_id;
         
         samples_filename = os.path.join(self.working_rootdir,self.samples_file);
-                
-        try:
-            hdl = np.loadtxt(samples_filename);
-        except:
-            sys.stderr.write("  ## ERROR : Unable to open samples file %s. It might be invalid.\n" % (samples_filename));
-            sys.exit(0);
         
-        if run_id > len(hdl) or run_id < 0:
-            sys.stderr.write("  ## ERROR : Invalid run_id=%d (%d samples in %s)\n" % (run_id, len(hdl), samples_filename));
-            sys.exit(0);
+        if self.store is not None:
+            
+            # --- Read the sample row only (converted samples file)
+            
+            from multif import samplestore
+            
+            store = samplestore.SampleStore(self.store);
+            NbrSmp = store.NbrSamples();
+            
+            if run_id >= NbrSmp or run_id < 0:
+                sys.stderr.write("  ## ERROR : Invalid run_id=%d (%d samples in %s)\n" % (run_id, NbrSmp, samples_filename));
+                sys.exit(0);
+            
+            dv = store.GetDV(run_id);
+            
+        else:
+            
+            try:
+                hdl = np.loadtxt(samples_filename);
+            except:
+                sys.stderr.write("  ## ERROR : Unable to open samples file %s. It might be invalid.\n" % (samples_filename));
+                sys.exit(0);
+            
+            if run_id > len(hdl) or run_id < 0:
+                sys.stderr.write("  ## ERROR : Invalid run_id=%d (%d samples in %s)\n" % (run_id, len(hdl), samples_filename));
+                sys.exit(0);
+            
+            dv = hdl[run_id];
         
         # --- Write 
                 
         try:  
             fil = open(self.input_file, "w");
-            for i in range(len(hdl[run_id])):
-                fil.write("%.16le\n" % hdl[run_id][i]);
+            for i in range(len(dv)):
+                fil.write("%.16le\n" % dv[i]);
             fil.close(); 
         except:
             sys.stderr.write("  ## ERROR : run_id=%d : Unable to write DV file. \n" % (run_id));
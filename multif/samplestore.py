@@ -0,0 +1,222 @@
+"""
+Results store for batches of samples (see runSamples.py).
+
+A store is a directory holding:
+  - samples.npy : the DV rows of the samples file, converted once, so that
+                  each run reads its row by offset (memory map)
+  - records.bin : one binary record per finished run, appended by the
+                  workers under a file lock: run id, status, start and end
+                  times, output values and gradients
+  - index.dat   : "run_id offset" of each record
+  - tags.dat    : names of the output values
+  - profile.dat : "run_id stage wall cpu peak_rss calls" of each stage of the
+                  runs (see profiler.py)
+
+Load() returns the store as columns (one numpy array per field, one row per
+run), and Compact() writes them to results.npz.
+"""
+
+import os, sys
+import fcntl
+import struct
+
+import numpy as np
+
+_HEADER = struct.Struct('<qqddqq'); # run_id, status, t_start, t_end, nval, ngra
+
+class SampleStore:
+
+    def __init__(self, path):
+
+        self.path = path;
+
+        self.samples_name = os.path.join(path, 'samples.npy');
+        self.records_name = os.path.join(path, 'records.bin');
+        self.index_name   = os.path.join(path, 'index.dat');
+        self.tags_name    = os.path.join(path, 'tags.dat');
+        self.profile_name = os.path.join(path, 'profile.dat');
+
+        if not os.path.isdir(path):
+            os.makedirs(path);
+
+    #==========================================================================
+    # Samples
+    #==========================================================================
+
+    def SetSamples(self, samples_filename):
+        # Convert the samples file (one row of DVs per line) unless it was
+        # already converted
+
+        if os.path.isfile(self.samples_name) and                              \
+          os.path.getmtime(self.samples_name) >= os.path.getmtime(samples_filename):
+            return;
+
+        try:
+            hdl = np.atleast_2d(np.loadtxt(samples_filename));
+        except:
+            sys.stderr.write("  ## ERROR : Unable to open samples file %s. It might be invalid.\n" % (samples_filename));
+            sys.exit(0);
+
+        np.save(self.samples_name, hdl);
+
+    def NbrSamples(self):
+        return np.load(self.samples_name, mmap_mode='r').shape[0];
+
+    def GetDV(self, run_id):
+        # DV row of a sample, read by offset
+        return np.array(np.load(self.samples_name, mmap_mode='r')[run_id]);
+
+    #==========================================================================
+    # Records
+    #==========================================================================
+
+    def Append(self, run_id, status, t_start, t_end, val_out=[], gra_out=[], tag_out=None):
+        # Append the record of a run (safe with concurrent workers)
+
+        val = np.asarray(val_out, dtype='<f8').ravel();
+        gra = np.asarray(gra_out, dtype='<f8').ravel();
+
+        rec = _HEADER.pack(run_id, int(status), t_start, t_end, len(val), len(gra)) \
+          + val.tostring() + gra.tostring();
+
+        fil = open(self.records_name, 'ab');
+        fcntl.flock(fil, fcntl.LOCK_EX);
+        try:
+            fil.seek(0, 2);
+            offset = fil.tell();
+            fil.write(rec);
+            fil.flush();
+
+            idx = open(self.index_name, 'a');
+            idx.write("%d %d\n" % (run_id, offset));
+            idx.close();
+
+            if tag_out is not None and len(tag_out) == len(val)               \
+              and not os.path.isfile(self.tags_name):
+                tags = open(self.tags_name, 'w');
+                tags.write('\n'.join(tag_out) + '\n');
+                tags.close();
+        finally:
+            fcntl.flock(fil, fcntl.LOCK_UN);
+            fil.close();
+
+    def Index(self):
+        # Offset of the last record of each run
+        index = {};
+        if os.path.isfile(self.index_name):
+            for lin in open(self.index_name, 'r'):
+                val = lin.split();
+                if len(val) == 2:
+                    index[int(val[0])] = int(val[1]);
+        return index;
+
+    def Read(self, run_id, index=None):
+        # Last record of a run: status, t_start, t_end, values, gradients
+        # (None if the run has no record)
+
+        if index is None:
+            index = self.Index();
+        if run_id not in index:
+            return None;
+
+        fil = open(self.records_name, 'rb');
+        fil.seek(index[run_id]);
+        rid, status, t_start, t_end, nval, ngra = _HEADER.unpack(fil.read(_HEADER.size));
+        val = np.fromfile(fil, dtype='<f8', count=nval);
+        gra = np.fromfile(fil, dtype='<f8', count=ngra);
+        fil.close();
+
+        return status, t_start, t_end, val, gra;
+
+    def Tags(self):
+        if not os.path.isfile(self.tags_name):
+            return [];
+        return [lin.strip() for lin in open(self.tags_name, 'r') if lin.strip()];
+
+    def AppendProfile(self, run_id, records):
+        # Append the stages of a run (profiler.Records()), in a single write
+
+        lin = ''.join(["%d %s %.6f %.6f %.1f %d\n" % ((run_id,) + tuple(rec))
+          for rec in records]);
+
+        fil = open(self.profile_name, 'a');
+        fcntl.flock(fil, fcntl.LOCK_EX);
+        try:
+            fil.write(lin);
+            fil.flush();
+        finally:
+            fcntl.flock(fil, fcntl.LOCK_UN);
+            fil.close();
+
+    def Profiles(self):
+        # Stages of each run (last profile of each run), as profiler.Records()
+
+        profiles = {};
+        if os.path.isfile(self.profile_name):
+            last = {};
+            for lin in open(self.profile_name, 'r'):
+                val = lin.split();
+                if len(val) != 6:
+                    continue;
+                rid = int(val[0]);
+                rec = (val[1], float(val[2]), float(val[3]), float(val[4]), int(val[5]));
+                # A new profile of a run starts with a stage already seen
+                if rid not in profiles or rec[0] in last[rid]:
+                    profiles[rid] = [];
+                    last[rid] = set();
+                profiles[rid].append(rec);
+                last[rid].add(rec[0]);
+
+        return [profiles[r] for r in sorted(profiles.keys())];
+
+    def Load(self):
+        # Columns of the store, one row per run (last record of each run).
+        # Missing values (failed runs) are nan
+
+        # Single pass over the records, the last one of each run is kept
+        last = {};
+        if os.path.isfile(self.records_name):
+            fil = open(self.records_name, 'rb');
+            while True:
+                head = fil.read(_HEADER.size);
+                if len(head) < _HEADER.size:
+                    break;
+                rid, status, t_start, t_end, nval, ngra = _HEADER.unpack(head);
+                val = np.fromfile(fil, dtype='<f8', count=nval);
+                gra = np.fromfile(fil, dtype='<f8', count=ngra);
+                last[rid] = (status, t_start, t_end, val, gra);
+            fil.close();
+
+        run_id = np.array(sorted(last.keys()), dtype=int);
+
+        records = [last[i] for i in run_id];
+
+        nval = max([len(r[3]) for r in records] + [0]);
+        ngra = max([len(r[4]) for r in records] + [0]);
+
+        data = {};
+        data['run_id']  = run_id;
+        data['status']  = np.array([r[0] for r in records], dtype=int);
+        data['t_start'] = np.array([r[1] for r in records]);
+        data['t_end']   = np.array([r[2] for r in records]);
+        data['values']  = np.nan*np.ones((len(records), nval));
+        data['gradients'] = np.nan*np.ones((len(records), ngra));
+        for i in range(len(records)):
+            data['values'][i,:len(records[i][3])] = records[i][3];
+            data['gradients'][i,:len(records[i][4])] = records[i][4];
+
+        if os.path.isfile(self.samples_name) and len(run_id) > 0:
+            samples = np.load(self.samples_name, mmap_mode='r');
+            if run_id.max() < samples.shape[0]:
+                data['dv'] = np.array(samples[run_id]);
+
+        data['tags'] = np.array(self.Tags());
+
+        return data;
+
+    def Compact(self, filename=None):
+        # Write the columns of the store to a single file (results.npz)
+        if filename is None:
+            filename = os.path.join(self.path, 'results.npz');
+        np.savez(filename, **self.Load());
+        return filename;
@@ -0,0 +1,164 @@
+"""
+Evaluation directories in node-local scratch space, and retention policy of
+their files.
+
+An evaluation (finite difference step, sample) runs in a directory created
+under SCRATCH_DIR (e.g. a tmpfs or a local disk; environment variables are
+expanded) instead of its directory on the shared filesystem. When it is
+done, the files retained by RETENTION_POLICY are copied back to its
+directory and the scratch directory is removed:
+  - ALL       : all the files (default)
+  - SMALL     : files of at most RETENTION_MAX_SIZE bytes (default 1 MB):
+                logs, inputs, outputs and histories, but no meshes or
+                solutions
+  - RESPONSES : only the output functions, DV and log files
+All the files of a failed evaluation are retained. Without SCRATCH_DIR, the
+evaluation runs in its directory and the files which are not retained are
+removed in place.
+
+With TEMP_RUN_DIR= YES, the analyses of a model evaluation run in a temporary
+directory (under SCRATCH_DIR if given, else the system temporary directory),
+whose files are retained in the evaluation directory in the same way.
+"""
+
+import os, sys, shutil, tempfile
+
+POLICIES = ['ALL', 'SMALL', 'RESPONSES'];
+
+class Retention:
+
+    def __init__(self, scratchDir='', policy='ALL', maxSize=1048576):
+
+        self.scratchDir = os.path.expandvars(scratchDir);
+        self.policy     = policy;
+        self.maxSize    = maxSize;
+
+    def Enter(self, dirname):
+        # Create the evaluation directory, and return the directory where
+        # the evaluation runs. Files already in the evaluation directory
+        # (e.g. linked aero files) are linked, or copied, into it
+
+        if not os.path.exists(dirname):
+            os.makedirs(dirname);
+
+        if self.scratchDir == '':
+            return dirname;
+
+        if not os.path.isdir(self.scratchDir):
+            os.makedirs(self.scratchDir);
+
+        prefix = os.path.basename(os.path.normpath(dirname)) + '_';
+        workdir = tempfile.mkdtemp(prefix=prefix, dir=self.scratchDir);
+        _linkFiles(dirname, workdir);
+
+        return workdir;
+
+    def Temporary(self, dirname):
+        # New temporary run directory (TEMP_RUN_DIR) of the evaluation run
+        # in dirname, to be left with Leave. As in Enter, the files of the
+        # evaluation directory (e.g. the aero files linked for a finite
+        # difference step which skips the aero analysis) are linked into it
+
+        if self.scratchDir == '':
+            workdir = tempfile.mkdtemp(prefix='run_');
+        else:
+            if not os.path.isdir(self.scratchDir):
+                os.makedirs(self.scratchDir);
+            workdir = tempfile.mkdtemp(prefix='run_', dir=self.scratchDir);
+        _linkFiles(dirname, workdir);
+
+        return workdir;
+
+    def Leave(self, workdir, dirname, failed=False, keep=[]):
+        # Retain the files of the evaluation in its directory (copied back
+        # from scratch, or removed in place), and remove the scratch directory
+
+        if os.path.abspath(workdir) == os.path.abspath(dirname):
+            if not failed and self.policy != 'ALL':
+                self._prune(dirname, keep);
+            return;
+
+        self._copyBack(workdir, dirname, failed, keep);
+        shutil.rmtree(workdir, ignore_errors=True);
+
+    def Retained(self, path, failed=False, keep=[]):
+
+        if failed or self.policy == 'ALL':
+            return True;
+        if os.path.basename(path) in [os.path.basename(k) for k in keep if k]:
+            return True;
+        if self.policy == 'RESPONSES':
+            return False;
+
+        # SMALL
+        return os.path.isfile(path) and os.path.getsize(path) <= self.maxSize;
+
+    def _copyBack(self, src, dst, failed, keep):
+
+        if not os.path.isdir(dst):
+            os.makedirs(dst);
+
+        for name in os.listdir(src):
+            path = os.path.join(src, name);
+            if os.path.isdir(path) and not os.path.islink(path):
+                if failed or self.policy != 'RESPONSES':
+                    self._copyBack(path, os.path.join(dst, name), failed, keep);
+            elif self.Retained(path, failed, keep):
+                target = os.path.join(dst, name);
+                if os.path.lexists(target):
+                    if os.path.exists(target) and os.path.samefile(path, target):
+                        continue; # input linked from the evaluation directory
+                    os.remove(target);
+                shutil.copy2(path, target);
+
+    def _prune(self, dirname, keep):
+
+        for name in os.listdir(dirname):
+            path = os.path.join(dirname, name);
+            if os.path.isdir(path) and not os.path.islink(path):
+                if self.policy == 'RESPONSES':
+                    shutil.rmtree(path, ignore_errors=True);
+                else:
+                    self._prune(path, keep);
+            elif not self.Retained(path, False, keep):
+                os.remove(path);
+
+
+def _linkFiles(srcdir, dstdir):
+    # Link, or copy, the files of srcdir into dstdir
+    for name in os.listdir(srcdir):
+        src = os.path.join(srcdir, name);
+        if os.path.isfile(src):
+            _link(src, os.path.join(dstdir, name));
+
+
+def _link(src, dst):
+    # Hard link, or copy across filesystems
+    if os.path.lexists(dst):
+        os.remove(dst);
+    try:
+        os.link(src, dst);
+    except OSError:
+        shutil.copy2(src, dst);
+
+
+def RetentionSetup(config):
+    # Scratch directory and retention policy of a configuration file
+
+    scratchDir = '';
+    if 'SCRATCH_DIR' in config:
+        scratchDir = config['SCRATCH_DIR'];
+
+    policy = 'ALL';
+    if 'RETENTION_POLICY' in config:
+        policy = config['RETENTION_POLICY'];
+        if policy not in POLICIES:
+            sys.stderr.write("  ## ERROR : Invalid RETENTION_POLICY %s "       \
+              "(ALL, SMALL or RESPONSES)\n" % policy);
+            sys.exit(1);
+
+    maxSize = 1048576;
+    if 'RETENTION_MAX_SIZE' in config:
+        maxSize = int(config['RETENTION_MAX_SIZE']);
+
+    return Retention(scratchDir, policy, maxSize);
@@ -20,7 +20,8 @@ setup(ext_modules=[ \
  				 "./meshutils/meshutils_py.i", \
 			     "./meshutils/projection.c", \
  				 "./meshutils/GMSHio.c"],
-       extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result"]),
+       extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result","-fopenmp"],
+       extra_link_args=["-fopenmp"]),
        
        Extension('_nozzle_module',
        sources = ['./meshutils/nozzle.cpp'],
@@ -46,7 +47,8 @@ setup(ext_modules=[ \
 			    "./mshint/mesh.c" ,\
 			    "./mshint/scalem.c"] , \
 	   extra_compile_args=["-O3","-c","-Wuninitialized","-Wunused",
-	   "-Winline","-Wshadow","-fexpensive-optimizations","-funroll-loops"]),   
+	   "-Winline","-Wshadow","-fexpensive-optimizations","-funroll-loops","-fopenmp"],
+	   extra_link_args=["-fopenmp"]),   
        
        Extension("./SU2/amginria/_amgio",
        sources=[ "./SU2/amginria/amgio/amgio_py.c", \
@@ -66,7 +68,16 @@ setup(ext_modules=[ \
                "./LOWF/odeint.c", \
                "./meshutils/piecewise.c", \
                "./LOWF/quasi1dnozzle_py.i"],
-      extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result"])
+      extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result"]),
+
+	  # Complex-step build of the low-fidelity solver (derivatives)
+	  Extension("LOWF/_quasi1dnozzle_cs",
+      sources=["./LOWF/quasi1dnozzle_cs_py.c", \
+               "./LOWF/lofinozzle.c", \
+               "./LOWF/odeint.c", \
+               "./meshutils/piecewise.c", \
+               "./LOWF/quasi1dnozzle_cs_py.i"],
+      extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result","-DCOMPLEX_STEP"])
     
        ]);
        
@@ -20,7 +20,8 @@ setup(ext_modules=[ \
  				 "./meshutils/meshutils_py.i", \
 			     "./meshutils/projection.c", \
  				 "./meshutils/GMSHio.c"],
-       extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result"])
+       extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result","-fopenmp"],
+       extra_link_args=["-fopenmp"])
 #       Extension('_nozzle_module',
 #       sources = ['./meshutils/nozzle.cpp'],
 ##       include_dirs=['/home/avery/Projects/Gmsh/gmsh-2.13.1-install/include/gmsh'],
@@ -48,7 +49,8 @@ setup(ext_modules=[Extension("_mshint_module",
 			"./mshint/SU2io.c" , \
 			"./mshint/mesh.c" ,\
 			"./mshint/scalem.c"] , \
-			extra_compile_args=["-O3","-c","-Wuninitialized","-Wunused","-Winline","-Wshadow","-fexpensive-optimizations","-funroll-loops"]),
+			extra_compile_args=["-O3","-c","-Wuninitialized","-Wunused","-Winline","-Wshadow","-fexpensive-optimizations","-funroll-loops","-fopenmp"],
+			extra_link_args=["-fopenmp"]),
 		#	extra_compile_args=["-std=c99","-Wno-unused-variable","-Wno-unused-result"])
         
         Extension("./SU2/amginria/_amgio",
@@ -72,7 +74,14 @@ sources=["./LOWF/quasi1dnozzle_py.c", \
          "./LOWF/odeint.c", \
          "./meshutils/piecewise.c", \
          "./LOWF/quasi1dnozzle_py.i"],
-extra_compile_args=["-std=c99", "-Wno-unused-variable","-Wno-unused-result"])
+extra_compile_args=["-std=c99", "-Wno-unused-variable","-Wno-unused-result"]),
+Extension("LOWF/_quasi1dnozzle_cs",
+sources=["./LOWF/quasi1dnozzle_cs_py.c", \
+         "./LOWF/lofinozzle.c", \
+         "./LOWF/odeint.c", \
+         "./meshutils/piecewise.c", \
+         "./LOWF/quasi1dnozzle_cs_py.i"],
+extra_compile_args=["-std=c99", "-Wno-unused-variable","-Wno-unused-result","-DCOMPLEX_STEP"])
 ]);
 
     
@@ -0,0 +1,348 @@
+"""
+Surrogate fidelity level trained on past evaluations of a true model.
+
+A fidelity level defined as
+
+    DEF_<tag>= (SURROGATE, <base tag>, <records file>, <trust radius>[, <max error>])
+
+runs the fidelity level <base tag> through a radial basis function surrogate.
+Every evaluation of the true model at this level appends one line (design
+variables and output function values) to the records file, and the surrogate
+is trained on all the records found in this file.
+
+The design variables are scaled by the range of the records. The surrogate is
+only used when the design lies within <trust radius> (scaled distance) of a
+record, when there are enough records, and when the relative leave-one-out
+error of every response is below <max error> (default 0.05). Otherwise, or
+when gradients are requested, the true model is run and its results are
+added to the records.
+
+The leave-one-out error is computed in closed form (Rippa, 1999) for the
+Gaussian kernel, whose shape parameter is chosen to minimize it.
+
+The trained surrogate is saved next to the records file (<records file>.npz)
+with the size and modification time of the records it was trained on, so that
+the evaluations only train it again when records have been added.
+"""
+
+import os, sys
+import re
+
+import numpy as np
+
+class Surrogate:
+
+    def __init__(self, base, records, radius, maxError=0.05):
+
+        self.base     = base;
+        self.records  = records;
+        self.radius   = radius;
+        self.maxError = maxError;
+
+        self.model = records + '.npz'; # trained surrogate
+
+        self.header = None;
+        self.X = None;
+        self.Y = None;
+
+        self.cvError = None;
+
+    #==========================================================================
+    # Records
+    #==========================================================================
+
+    def Load(self):
+        # Read the records file: a header line with the column names, then
+        # one line per evaluation
+
+        self.header = None;
+        self.X = None;
+        self.Y = None;
+
+        if not os.path.isfile(self.records):
+            return 0;
+
+        fil = open(self.records, 'r');
+        lines = fil.readlines();
+        fil.close();
+
+        if len(lines) < 1 or not lines[0].startswith('#'):
+            return 0;
+
+        self.header = lines[0].strip('#').split();
+        NbrDV = len([nam for nam in self.header if nam.startswith('DV_')]);
+
+        data = [];
+        for lin in lines[1:]:
+            val = lin.split();
+            if len(val) != len(self.header):
+                continue; # incomplete line
+            data.append([float(v) for v in val]);
+
+        if len(data) == 0:
+            return 0;
+
+        data = np.array(data);
+        data = data[np.all(np.isfinite(data),1)];
+
+        self.X = data[:,:NbrDV];
+        self.Y = data[:,NbrDV:];
+
+        return len(data);
+
+    def AddRecord(self, nozzle, output='verbose'):
+        # Append the design variables and output values of the nozzle
+
+        header, x, y = _Evaluation(nozzle);
+
+        if os.path.isfile(self.records) and os.path.getsize(self.records) > 0:
+            fil = open(self.records, 'r');
+            cur = fil.readline().strip('#').split();
+            fil.close();
+            if cur != header:
+                sys.stdout.write('  ## WARNING : the outputs of %s do not match '
+                    'the current outputs. No record added.\n' % self.records);
+                return;
+            lin = '';
+        else:
+            lin = '# ' + ' '.join(header) + '\n';
+
+        lin += ' '.join(['%.16e' % v for v in np.concatenate((x, y))]) + '\n';
+
+        # Single write, so that concurrent evaluations only append full lines
+        fil = open(self.records, 'a');
+        fil.write(lin);
+        fil.close();
+
+        if output == 'verbose':
+            sys.stdout.write('  -- Info : evaluation added to surrogate '
+                'records %s\n' % self.records);
+
+    #==========================================================================
+    # Training and prediction
+    #==========================================================================
+
+    def Train(self):
+        # Gaussian RBF interpolation of the scaled records. The shape
+        # parameter minimizes the leave-one-out error, which is kept as the
+        # relative error of each response (cvError)
+
+        from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+        self.lo  = self.X.min(0);
+        self.scl = self.X.max(0) - self.lo;
+        self.scl[self.scl == 0] = 1.;
+
+        U = (self.X - self.lo)/self.scl;
+        sq = np.sum(U**2, 1);
+        D2 = np.maximum(sq[:,None] + sq[None,:] - 2.*np.dot(U, U.T), 0.);
+
+        self.mean = self.Y.mean(0);
+        F = self.Y - self.mean;
+
+        std = self.Y.std(0);
+        std[std == 0] = 1.;
+
+        I = np.eye(len(U));
+
+        best = None;
+        for eps in np.logspace(-1, 1.5, 15):
+            A = np.exp(-eps**2*D2) + 1e-10*I;
+            try:
+                L = cho_factor(A, lower=True);
+            except np.linalg.LinAlgError:
+                continue;
+            W = cho_solve(L, F);
+            # diag(A^-1) = squared column norms of L^-1
+            Linv = solve_triangular(L[0], I, lower=True);
+            err = np.sqrt(np.mean((W/np.sum(Linv**2, 0)[:,None])**2, 0))/std;
+            if best is None or err.max() < best[1].max():
+                best = (eps, err, W);
+
+        if best is None:
+            return 1;
+
+        self.eps, self.cvError, self.W = best;
+        self.U = U;
+
+        return 0;
+
+    def _RecordsKey(self):
+        st = os.stat(self.records);
+        return np.array([st.st_size, st.st_mtime]);
+
+    def LoadModel(self):
+        # Read the trained surrogate if it was trained on the current
+        # records. Returns the number of records, 0 if it must be trained
+
+        if not os.path.isfile(self.model) or not os.path.isfile(self.records):
+            return 0;
+
+        try:
+            fil = open(self.model, 'rb');
+            try:
+                npz = np.load(fil);
+                if not np.array_equal(npz['key'], self._RecordsKey()):
+                    return 0;
+                self.header  = [str(nam) for nam in npz['header']];
+                self.lo      = npz['lo'];
+                self.scl     = npz['scl'];
+                self.mean    = npz['mean'];
+                self.eps     = float(npz['eps']);
+                self.W       = npz['W'];
+                self.U       = npz['U'];
+                self.cvError = npz['cvError'];
+            finally:
+                fil.close();
+        except (IOError, OSError, KeyError, ValueError):
+            return 0;
+
+        return len(self.U);
+
+    def SaveModel(self, key):
+        # Written to a temporary file then renamed, so that concurrent
+        # evaluations never read a partial model
+
+        tmp = '%s.%d.tmp' % (self.model, os.getpid());
+        fil = open(tmp, 'wb');
+        np.savez(fil, key=key, header=np.array(self.header), lo=self.lo,
+            scl=self.scl, mean=self.mean, eps=self.eps, W=self.W, U=self.U,
+            cvError=self.cvError);
+        fil.close();
+        os.rename(tmp, self.model);
+
+    def Predict(self, x):
+        u = (np.asarray(x, dtype=float) - self.lo)/self.scl;
+        k = np.exp(-self.eps**2*np.sum((self.U - u)**2, 1));
+        return self.mean + np.dot(k, self.W);
+
+    def Distance(self, x):
+        # Scaled distance to the closest record
+        u = (np.asarray(x, dtype=float) - self.lo)/self.scl;
+        return np.sqrt(np.min(np.sum((self.U - u)**2, 1)));
+
+    #==========================================================================
+    # Evaluation
+    #==========================================================================
+
+    def Run(self, nozzle, output='verbose'):
+        # Set the nozzle responses from the surrogate and write the output
+        # functions. Returns 0 on success, 1 if the true model must be run
+
+        if output == 'verbose':
+            sys.stdout.write('\n');
+            string = " Surrogate ";
+            nch = (60-len(string))/2;
+            sys.stdout.write('-' * nch);
+            sys.stdout.write(string);
+            sys.stdout.write('-' * nch);
+            sys.stdout.write('\n\n');
+
+        if nozzle.inputDVformat == 'SAMPLES' or 2 in nozzle.outputCode       \
+          or 3 in nozzle.outputCode:
+            return self._Fallback('gradients or samples requested', output);
+
+        NbrDV = len(nozzle.dvList);
+
+        NbrRec = self.LoadModel();
+        trained = NbrRec > 0;
+        if not trained:
+            key = self._RecordsKey() if os.path.isfile(self.records) else None;
+            NbrRec = self.Load();
+
+        if NbrRec < NbrDV+2:
+            return self._Fallback('%d records available, at least %d needed'  \
+              % (NbrRec, NbrDV+2), output);
+
+        NbrCol = len([nam for nam in self.header if nam.startswith('DV_')]);
+        header = self.header[NbrCol:];
+        if NbrCol != NbrDV or header != _OutputTags(nozzle):
+            return self._Fallback('records of %s do not match the current '   \
+              'design variables and outputs' % self.records, output);
+
+        if not trained:
+            if self.Train():
+                return self._Fallback('training failed', output);
+            try:
+                self.SaveModel(key);
+            except (IOError, OSError):
+                sys.stdout.write('  ## WARNING : could not save the surrogate ' \
+                    'to %s\n' % self.model);
+
+        if output == 'verbose':
+            sys.stdout.write('  -- Info : %d records, leave-one-out relative ' \
+              'errors:\n' % NbrRec);
+            for i in range(len(header)):
+                sys.stdout.write('     %s %.3e\n' % (header[i].ljust(30),     \
+                  self.cvError[i]));
+
+        if self.cvError.max() > self.maxError:
+            return self._Fallback('leave-one-out error %.3e above %.3e'       \
+              % (self.cvError.max(), self.maxError), output);
+
+        dist = self.Distance(nozzle.dvList);
+        if dist > self.radius:
+            return self._Fallback('design outside of the trust region '       \
+              '(distance %.3e, radius %.3e)' % (dist, self.radius), output);
+
+        _SetResponses(nozzle, header, self.Predict(nozzle.dvList));
+
+        if nozzle.outputFormat == 'PLAIN':
+            nozzle.WriteOutputFunctions_Plain();
+        else:
+            nozzle.WriteOutputFunctions_Dakota();
+
+        return 0;
+
+    def _Fallback(self, reason, output):
+        if output == 'verbose':
+            sys.stdout.write('  -- Info : %s. Running fidelity level %s.\n'   \
+              % (reason, self.base));
+        return 1;
+
+
+#==============================================================================
+# Flattened outputs
+#==============================================================================
+
+def _OutputTags(nozzle):
+    tag_out, val_out, gra_out, gratag_out = nozzle.GetOutputFunctions();
+    return list(tag_out);
+
+def _Evaluation(nozzle):
+    # Column names, design variables and output values of an evaluation
+    tag_out, val_out, gra_out, gratag_out = nozzle.GetOutputFunctions();
+    NbrDV = len(nozzle.dvList);
+    header = ['DV_%d' % (i+1) for i in range(NbrDV)] + list(tag_out);
+    return header, np.asarray(nozzle.dvList, dtype=float),                    \
+      np.asarray(val_out, dtype=float);
+
+def _SetResponses(nozzle, header, val):
+    # Inverse of nozzle.GetOutputFunctions: rebuild the responses (scalars,
+    # lists or nested lists) from the flattened tags TAG, TAG_i or TAG_i_j
+
+    for tag in nozzle.outputTags:
+
+        pattern = re.compile('^%s(_(\d+))?(_(\d+))?$' % re.escape(tag));
+
+        res = None;
+        for k in range(len(header)):
+            m = pattern.match(header[k]);
+            if m is None:
+                continue;
+            if m.group(2) is None:
+                res = val[k];
+            elif m.group(4) is None:
+                if res is None:
+                    res = [];
+                res.append(val[k]);
+            else:
+                if res is None:
+                    res = [];
+                i = int(m.group(2));
+                while len(res) <= i:
+                    res.append([]);
+                res[i].append(val[k]);
+
+        if res is not None:
+            nozzle.responses[tag] = res;
@@ -10,13 +10,22 @@ the following sets:
 *Test finite difference gradient capability
 *Test linear and nonlinear FEA for 2D parameterization
 
+Tests run concurrently on the cores of the node (-j CORES), each in its own
+directory local/<test>; a test uses ntasks x cpus_per_task cores. The logs of
+the tests are gathered in regression.out.
+
+With -b REPEAT, tests run serially and each test is run REPEAT times as a performance benchmark: the
+wall time, CPU time, peak memory and stage times and memory are appended to a history
+file and compared with a stored baseline (see Benchmark.py).
+
 Rick Fenrich 9/2/17
 """
 
-import os
+import os, sys
+import multiprocessing
 from optparse import OptionParser
 
-from TestCase import TestCase
+from TestCase import TestCase, run_tests
 
 # =========================================================================== #
 # Setup options etc.
@@ -29,6 +38,29 @@ parser.add_option("-n", "--ntasks", dest="nTasks", default=1,
 parser.add_option("-c", "--cpus-per-task", dest="cpusPerTask",
                     default=1, help="cpus requested per task",
                     metavar="CPUS_PER_TASK")
+parser.add_option("-j", "--cores", dest="cores",
+                    default=multiprocessing.cpu_count(),
+                    help="number of cores used by concurrent tests (1: serial)",
+                    metavar="CORES")
+parser.add_option("-s", "--set", dest="set", default="all",
+                    help="set of tests: all, lofi, medfi, hifi, adjoint, fd or fea",
+                    metavar="SET")
+parser.add_option("-b", "--benchmark", dest="repeat", default=0,
+                    help="benchmark mode: number of runs of each test",
+                    metavar="REPEAT")
+parser.add_option("--history", dest="history", default="benchmark_history.json",
+                    help="benchmark history file (one record per line)",
+                    metavar="FILE")
+parser.add_option("--baseline", dest="baseline", default="benchmark_baseline.json",
+                    help="benchmark baseline file", metavar="FILE")
+parser.add_option("--save-baseline", dest="save_baseline", default=False,
+                    action="store_true", help="save the benchmark as baseline")
+parser.add_option("--tol", dest="tol", default=0.1,
+                    help="relative tolerance of benchmark wall time regressions",
+                    metavar="TOL")
+parser.add_option("--rss-tol", dest="rss_tol", default=0.1,
+                    help="relative tolerance of benchmark memory regressions",
+                    metavar="TOL")
 (options, args)=parser.parse_args();
 
 nTasks = int( options.nTasks )
@@ -37,7 +69,11 @@ cpusPerTask = int( options.cpusPerTask )
 testNum = 1;
 
 # Control which tests are run
-test = {'all': 1, 'lofi': 0, 'medfi': 0, 'hifi': 0, 'adjoint': 0, 'fd': 0, 'fea': 0};
+test = {'all': 0, 'lofi': 0, 'medfi': 0, 'hifi': 0, 'adjoint': 0, 'fd': 0, 'fea': 0};
+if options.set not in test:
+    sys.stderr.write('  ## ERROR : Unknown set of tests %s\n' % options.set);
+    sys.exit(1);
+test[options.set] = 1;
 
 # Set up necessary filepaths
 #rootdir = os.getcwd()
@@ -252,7 +288,48 @@ if( test['all'] or test['hifi'] ):
 
 # Remaining tests get placed below as they come online
 
-pass_list = [ t.run_test() for t in test_list ];
+# =========================================================================== #
+# Benchmark mode
+# =========================================================================== #
+
+repeat = int( options.repeat )
+
+if( repeat > 0 ):
+
+    from Benchmark import Benchmark
+
+    bench = Benchmark(options.history, options.baseline, float(options.tol), float(options.rss_tol));
+
+    records = [ bench.run(t, repeat) for t in test_list ];
+
+    print '\n==================================================\n';
+    print 'Summary of the benchmarks (median of %d runs, commit %s)' % (repeat, bench.session['commit']);
+    print '  %-24s %10s %10s %10s' % ('test', 'wall (s)', 'cpu (s)', 'mem (MB)');
+    nRegressions = 0;
+    for r in records:
+        med = r['median'];
+        failed = [ run['passed'] for run in r['runs'] if run['passed'] != 1 ];
+        print '  %-24s %10.2f %10.2f %10.1f%s' % (r['case'], med['wall'], med['cpu'], med['peak_rss'], '  (%d runs failed or diffed)' % len(failed) if failed else '');
+        messages = bench.compare(r);
+        if messages is None:
+            print '      no baseline';
+        for m in messages or []:
+            print '    * REGRESSION - %s' % m;
+            nRegressions = nRegressions + 1;
+    print '\nHistory appended to %s' % bench.history_file;
+
+    if( options.save_baseline ):
+        bench.save_baseline(records);
+        print 'Baseline saved to %s' % bench.baseline_file;
+
+    sys.exit(1 if nRegressions > 0 else 0);
+
+ncores = int( options.cores )
+
+if( ncores > 1 ):
+    pass_list = run_tests(test_list, ncores, 'regression.out');
+else:
+    pass_list = [ t.run_test() for t in test_list ];
 print '\n==================================================\n';
 print 'Summary of the tests'
 for i, test in enumerate(test_list):
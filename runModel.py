@@ -71,12 +71,20 @@ def main():
     if options.skipaero :
         skipaero = 1;
         
+    # --- Surrogate fidelity level: run the true model only if needed
+    if nozzle.surrogate is not None and not postpro:
+        if nozzle.surrogate.Run(nozzle, output=output) == 0:
+            return;
+
     if nozzle.method == 'NONIDEALNOZZLE' :
         multif.LOWF.Run(nozzle, output=output);
     elif nozzle.dim == '2D':
         multif.MEDIUMF.Run(nozzle, output=output, postpro=postpro);
     elif nozzle.dim == '3D':
         multif.HIGHF.Run(nozzle,output=output, postpro=postpro, skipAero=skipaero);
+
+    if nozzle.surrogate is not None:
+        nozzle.surrogate.AddRecord(nozzle, output=output);
     
     # --- Print warning in case the wrong SU2 version was run
     if nozzle.method != 'NONIDEALNOZZLE' and nozzle.cfd.su2_version != 'OK':
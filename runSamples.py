@@ -81,6 +81,13 @@ def main():
     parser.add_option("-v", "--visu",
                       dest="visu", default=False, action="store_true",
                       help="Run visualization functions only?")
+    
+    parser.add_option("-r", "--store", dest="store", default=None,
+                      help="Results store directory (default: <output>_store)", metavar="STORE")
+    
+    parser.add_option("-c", "--clean",
+                      dest="clean", default=False, action="store_true",
+                      help="Remove the run directories of successful runs?")
                           
     (options, args)=parser.parse_args()
     
@@ -164,6 +171,15 @@ def main():
     
     sys.stdout.write("-- Info : Running samples %d to %d (%d run(s) total).\n\n" % (run_beg, run_end, NbrRun));
     
+    #--- Results store: samples converted once (rows are read by offset),
+    #    and results appended by each run
+    
+    if options.store is None:
+        options.store = "%s_store" % os.path.splitext(options.outfile)[0];
+    
+    store = multif.samplestore.SampleStore(os.path.abspath(options.store));
+    store.SetSamples(options.samples_filename);
+    
     #--- Fill samples data structure    
     
     samples_tab = [];
@@ -182,6 +198,8 @@ def main():
         samples_tab[-1].fidelity        = options.flevel;
         #samples_tab[-1].partitions      = options.partitions;
         samples_tab[-1].cpusPerTask      = options.partitions;
+        samples_tab[-1].store           = store.path;
+        samples_tab[-1].clean           = options.clean;
     
     #--- Create ./runs folder
     
@@ -274,6 +292,20 @@ def main():
             f.write('%0.16f\n' % rEval[i][2][-1]);
         f.close();
         sys.stdout.write("-- %s written with sample data.\n" % options.outfile);
+        
+        # Columns of all the runs of the store
+        filename = store.Compact();
+        sys.stdout.write("-- %s written with the results store.\n" % filename);
+        
+        # Stages of all the runs of the store
+        profiles = store.Profiles();
+        if len(profiles) > 0:
+            report = multif.profiler.Report(profiles);
+            filename = os.path.join(store.path, 'profile_report.txt');
+            f = open(filename,'w');
+            f.write(report);
+            f.close();
+            sys.stdout.write("\n%s\n-- %s written with the stages of %d runs.\n" % (report, filename, len(profiles)));
     
         
         
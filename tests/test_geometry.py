@@ -0,0 +1,75 @@
+"""
+Tests of the piecewise-bilinear layer thickness (multif/nozzle/geometry.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif.nozzle import geometry
+
+def scanHeight(nodes, nx, x, y):
+    # Interpolation of a scalar point by the original scan over all nodes
+    # (PiecewiseBilinear before its vectorization)
+    for i in range(nodes.shape[0]):
+        if( nodes[i,0] >= x and nodes[i,1] >= y ):
+            z22 = nodes[i,2]
+            x2 = nodes[i,0]
+            y2 = nodes[i,1]
+            if( nodes[i,0] == np.min(nodes[i,0]) ):
+                x1 = nodes[0,0]
+                z12 = nodes[i,2]
+            else:
+                x1 = nodes[i-1,0]
+                z12 = nodes[i-1,2]
+            if( nodes[i,1] == np.min(nodes[i,1]) ):
+                y1 = nodes[0,1]
+                z21 = nodes[i,2]
+            else:
+                y1 = nodes[i-nx,1]
+                z21 = nodes[i-nx,2]
+            if( nodes[i,0] == np.min(nodes[i,0]) and \
+                nodes[i,1] == np.min(nodes[i,1])):
+                z11 = nodes[0,2]
+            else:
+                z11 = nodes[i-nx-1,2]
+    return 1./((x2-x1)*(y2-y1))*(z11*(x2-x)*(y2-y) + z21*(x-x1)*(y2-y) + \
+        z12*(x2-x)*(y-y1) + z22*(x-x1)*(y-y1))
+
+class TestPiecewiseBilinear(unittest.TestCase):
+
+    def setUp(self):
+        # Layer thickness on a 7 x 5 grid in (x, angle), as in general-3d.in
+        self.nx = 7;
+        self.ny = 5;
+        xaxis = np.linspace(0., 1., self.nx);
+        yaxis = np.linspace(0., 270., self.ny);
+        X, Y = np.meshgrid(xaxis, yaxis);
+        T = 0.01 + 0.02*np.random.RandomState(0).rand(self.ny, self.nx);
+        self.nodes = np.column_stack((X.ravel(), Y.ravel(), T.ravel()));
+        self.thk = geometry.PiecewiseBilinear(self.nx, self.ny, self.nodes);
+
+        # Points inside the domain and on its edges and corners
+        rs = np.random.RandomState(1);
+        self.x = np.concatenate((rs.rand(50), [0., 1., 0., 1., 0.5, 0.]));
+        self.y = np.concatenate((270.*rs.rand(50), [0., 270., 270., 0., 0., 135.]));
+
+    def test_identical_to_scan(self):
+        ref = [scanHeight(self.nodes, self.nx, x, y) for x, y in zip(self.x, self.y)];
+        for k in range(self.x.size):
+            self.assertEqual(self.thk.height(float(self.x[k]), float(self.y[k])), ref[k]);
+        self.assertEqual(list(self.thk.height(self.x, self.y)), ref);
+
+        ref = [scanHeight(self.nodes, self.nx, 0.3, y) for y in self.y];
+        self.assertEqual(list(self.thk.height(0.3, self.y)), ref);
+
+    def test_out_of_range(self):
+        self.assertRaises(ValueError, self.thk.height, 1.5, 10.);
+        self.assertRaises(ValueError, self.thk.height, self.x, self.y - 1.);
+
+if __name__ == '__main__':
+    unittest.main();
@@ -0,0 +1,108 @@
+"""
+Tests of the finite difference gradients planned by analysis stage
+(multif/gradients.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, shutil, tempfile, unittest
+
+rootdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..');
+sys.path.insert(0, rootdir);
+
+import multif
+from multif import gradients
+
+class CountingModel:
+    # Stands for MEDIUMF: counts the analyses each evaluation runs, and checks
+    # that the center point files of the skipped ones are there
+
+    def __init__(self, test):
+        self.test = test;
+        self.stages = {'cfd': [], 'thermal': [], 'structural': []};
+
+    def Run(self, nozzle, **kwargs):
+        index = int(os.path.basename(os.getcwd()).split('_')[-1]);
+        if kwargs.get('skipAero', 0) == 1:
+            for name in gradients.AERO_FILES:
+                self.test.assertTrue(os.path.isfile(name));
+        else:
+            self.stages['cfd'].append(index);
+        if kwargs.get('skipThermal', 0) == 1:
+            for name in gradients.THERMAL_FILES:
+                self.test.assertTrue(os.path.isfile(name));
+        else:
+            self.stages['thermal'].append(index);
+        self.stages['structural'].append(index);
+        for k in nozzle.responses:
+            nozzle.responses[k] = sum(nozzle.dvList);
+        return 0;
+
+class TestGradientsFD(unittest.TestCase):
+
+    def setUp(self):
+        os.environ.setdefault('SU2_RUN', '');
+        self.cwd = os.getcwd();
+        os.chdir(os.path.join(rootdir, 'example'));
+        try:
+            config = multif.SU2.io.Config('general.cfg');
+            nozzle = multif.nozzle.NozzleSetup(config, 2, 'quiet'); # 2D Euler
+        finally:
+            os.chdir(self.cwd);
+
+        # Gradient of one structural response, center point responses known
+        key = 'LOAD_LAYER_INSIDE_FAILURE_CRITERIA';
+        for k in nozzle.gradients:
+            nozzle.gradients[k] = None;
+        nozzle.gradients[key] = [];
+        nozzle.responses[key] = sum(nozzle.dvList);
+        nozzle.nTasks = 1;
+        nozzle.cpusPerTask = 1;
+        self.nozzle = nozzle;
+        self.key = key;
+
+        # DVs (1-indexed) rerunning: aero (WALL), thermal (AIR_GAP_THICKNESS,
+        # BAFFLES) and structural analyses (CMC_DENSITY, GR-BMI_ELASTIC_MODULUS)
+        head = dict(zip(nozzle.DV_Tags, nozzle.DV_Head));
+        self.dvs = [head['WALL']+1, head['AIR_GAP_THICKNESS']+1,
+                    head['BAFFLES']+1, head['CMC_DENSITY']+1,
+                    head['GR-BMI_ELASTIC_MODULUS']+1];
+        nozzle.derivativesDV = self.dvs;
+
+        self.homedir = tempfile.mkdtemp(prefix='multif_test_');
+        for name in gradients.AERO_FILES + gradients.THERMAL_FILES:
+            f = open(os.path.join(self.homedir, name), 'w');
+            f.close();
+
+        self.model = CountingModel(self);
+        self.MEDIUMF = gradients.MEDIUMF;
+        gradients.MEDIUMF = self.model;
+
+    def tearDown(self):
+        gradients.MEDIUMF = self.MEDIUMF;
+        os.chdir(self.cwd);
+        shutil.rmtree(self.homedir, ignore_errors=True);
+
+    def test_plan(self):
+        plan = gradients.planGradientsFD(self.nozzle,
+            [i-1 for i in self.dvs], output='quiet');
+        self.assertEqual(plan, {'AERO': [0], 'THERMAL': [1, 2],
+                                'STRUCTURAL': [3, 4], 'MASS': []});
+
+    def test_stage_executions(self):
+        os.chdir(self.homedir);
+        grad = gradients.calcGradientsFD(self.nozzle, 1e-2, output='quiet');
+
+        # The structural-only evaluations share the center point thermal
+        # solution, only the aero-affecting one reruns the CFD
+        self.assertEqual(self.model.stages['cfd'], [0]);
+        self.assertEqual(self.model.stages['thermal'], [0, 1, 2]);
+        self.assertEqual(self.model.stages['structural'], [0, 1, 2, 3, 4]);
+
+        self.assertEqual(len(grad[self.key]), 5);
+        for g in grad[self.key]:
+            self.assertAlmostEqual(g, 1., places=2);
+
+if __name__ == '__main__':
+    unittest.main();
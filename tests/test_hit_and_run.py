@@ -0,0 +1,56 @@
+"""
+Tests of the hit and run sampler of linear constraint domains
+(example/domains/linearConstraints.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'example', 'domains'));
+
+from linearConstraints import hitAndRun
+
+class TestHitAndRun(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # z0 in [5,35] (bounds only), z1 in [0,1e-3] and z2 in [0,30] coupled
+        # by z1/1e-3 + z2/30 <= 1.5, z3 fixed (lb == ub), and 0 <= z4 <= 100
+        # given as constraints only
+        cls.A = np.array([[0., 1e3, 1./30, 0.,  0.],
+                          [0., 0.,  0.,    0.,  1.],
+                          [0., 0.,  0.,    0., -1.]]);
+        cls.b = np.array([1.5, 100., 0.]);
+        cls.lb = np.array([5., 0.,   0.,  2., -np.inf]);
+        cls.ub = np.array([35., 1e-3, 30., 2., np.inf]);
+        cls.z0 = np.array([20., 5e-4, 15., 2., 50.]);
+
+        # Settings of samplingDriver.py
+        cls.Z = hitAndRun(10000, cls.A, cls.b, cls.lb, cls.ub, z0=cls.z0,
+                          burn=1000, thin=4, chains=4, seed=0);
+
+    def test_feasible(self):
+        Z = self.Z;
+        self.assertEqual(np.shape(Z), (10000, 5));
+        self.assertTrue(np.all(np.dot(Z, self.A.T) <= self.b + 1e-9));
+        self.assertTrue(np.all(Z[:,:4] >= self.lb[:4] - 1e-12));
+        self.assertTrue(np.all(Z[:,:4] <= self.ub[:4] + 1e-12));
+
+    def test_spread(self):
+        # Marginals of the uniform distribution on the polytope
+        Z = self.Z;
+        self.assertLess(np.min(Z[:,0]), 6.);
+        self.assertGreater(np.max(Z[:,0]), 34.);
+        self.assertAlmostEqual(np.std(Z[:,0])/(30./np.sqrt(12.)), 1., delta=0.05);
+        self.assertAlmostEqual(np.mean(Z[:,2])/(30.*0.3958333/0.875), 1., delta=0.05);
+        self.assertAlmostEqual(np.std(Z[:,4])/(100./np.sqrt(12.)), 1., delta=0.05);
+
+    def test_fixed_variable(self):
+        Z = self.Z;
+        self.assertTrue(np.all(Z[:,3] == 2.));
+
+if __name__ == '__main__':
+    unittest.main();
@@ -0,0 +1,65 @@
+"""
+Tests of the complex-step gradients of the low-fidelity model
+(multif/LOWF/runlowf.py, built with -DCOMPLEX_STEP as _quasi1dnozzle_cs)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, copy, unittest
+
+rootdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..');
+sys.path.insert(0, rootdir);
+
+class TestComplexStep(unittest.TestCase):
+
+    def setUp(self):
+
+        try:
+            import multif.LOWF.quasi1dnozzle_cs
+            from multif.LOWF import runlowf, quasi1dnozzle
+        except ImportError as e:
+            self.skipTest('MULTI-F extensions are not built (%s)' % e);
+        self.runlowf = runlowf;
+        self.quasi1dnozzle = quasi1dnozzle;
+
+        # Low-fidelity nozzle of the general example
+        os.environ.setdefault('SU2_RUN', '');
+        cwd = os.getcwd();
+        os.chdir(os.path.join(rootdir, 'example'));
+        try:
+            config = multif.SU2.io.Config('general.cfg');
+            self.nozzle = multif.nozzle.NozzleSetup(config, 0, 'quiet');
+        finally:
+            os.chdir(cwd);
+
+    def thrust(self, nozzle):
+        inp = self.runlowf.Quasi1DInputs(nozzle);
+        out = [[] for i in range(9)];
+        self.quasi1dnozzle.analyze(*([inp[k] for k in self.runlowf.Q1D_ARGS] + out));
+        return out[8][0];
+
+    def test_geometry_dv(self):
+        # Thrust gradient w.r.t. a wall B-spline coefficient (DV 13): complex
+        # step against central finite differences
+        nozzle = self.nozzle;
+        dv = 12;
+        nozzle.derivativesDV = [dv+1];
+        nozzle.gradients = {'THRUST': []};
+        self.runlowf.Quasi1DGradientsCS(nozzle, ['THRUST'], output='quiet');
+        gradCS = nozzle.gradients['THRUST'][0];
+
+        step = 3e-3;
+        thrust = [];
+        for sign in [1., -1.]:
+            nozzleFD = copy.deepcopy(nozzle);
+            nozzleFD.dvList[dv] += sign*step;
+            nozzleFD.UpdateDV(output='quiet');
+            nozzleFD.SetupWall(output='quiet');
+            thrust.append(self.thrust(nozzleFD));
+        gradFD = (thrust[0] - thrust[1])/(2.*step);
+
+        self.assertAlmostEqual(gradCS/gradFD, 1., delta=0.01);
+
+if __name__ == '__main__':
+    unittest.main();
@@ -0,0 +1,67 @@
+"""
+Tests of the per-stage profiler of nozzle evaluations (multif/profiler.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, subprocess, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif import profiler
+
+MB = 1024*1024;
+
+def allocate(size):
+    # Touch size MB, released on return
+    buf = ' '*(size*MB);
+    return len(buf);
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        if not os.access('/proc/self/clear_refs', os.W_OK):
+            self.skipTest('peak RSS cannot be reset on this system');
+
+    def peaks(self, prof):
+        return dict([(r[0], r[3]) for r in prof.Records()]);
+
+    def test_stage_peak(self):
+        # A stage run after a larger one reports its own peak
+        prof = profiler.Profiler();
+        with prof.Stage('cfd'):
+            allocate(200);
+        with prof.Stage('mass'):
+            allocate(20);
+        peak = self.peaks(prof);
+        self.assertGreater(peak['cfd'], 200.);
+        self.assertGreater(peak['mass'], 20.);
+        self.assertLess(peak['mass'], peak['cfd'] - 100.);
+
+    def test_nested_stages(self):
+        # The peak of the enclosing stage before and after the nested one is
+        # kept, and not attributed to the nested stage
+        prof = profiler.Profiler();
+        with prof.Stage('gradients'):
+            allocate(200);
+            with prof.Stage('io'):
+                pass;
+            allocate(100);
+        peak = self.peaks(prof);
+        self.assertGreater(peak['gradients'], 200.);
+        self.assertLess(peak['io'], peak['gradients'] - 100.);
+
+    def test_child_process(self):
+        # Child processes count in the stage they run in
+        prof = profiler.Profiler();
+        with prof.Stage('structural'):
+            subprocess.call([sys.executable, '-c', "x = ' '*(150*%d)" % MB]);
+        with prof.Stage('io'):
+            pass;
+        peak = self.peaks(prof);
+        self.assertGreater(peak['structural'], 150.);
+        self.assertLess(peak['io'], 100.);
+
+if __name__ == '__main__':
+    unittest.main();
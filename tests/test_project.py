@@ -0,0 +1,96 @@
+"""
+Tests of the design lookup and design log of SU2 optimization projects
+(multif/SU2/opt/project.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, shutil, tempfile, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif.SU2 import io as su2io
+from multif.SU2.opt import project as su2project
+
+class Design:
+    # Stands for SU2.eval.Design: a config, and a value set by its evaluation
+    def __init__(self, dvs, value=None):
+        self.config = su2io.Config();
+        self.config.DV_VALUE_NEW = list(dvs);
+        self.value = value;
+
+def newProject(designs, folder):
+    # Project holding designs, without the SU2 files of a project setup
+    project = su2project.Project.__new__(su2project.Project);
+    project.designs = designs;
+    project.folder = folder;
+    project.filename = 'project.pkl';
+    project.log_filename = 'project_log.pkl';
+    return project;
+
+class TestProject(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix='multif_test_');
+        self.dvs = np.random.RandomState(0).rand(50, 4);
+        designs = [Design(dv) for dv in self.dvs];
+        designs.append(Design(self.dvs[10])); # same design vector as 10
+        self.project = newProject(designs, self.folder);
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True);
+
+    def test_existing_design(self):
+        project = self.project;
+        for i in [0, 10, 49]:
+            closest, delta = project.closest_design(Design(self.dvs[i]).config);
+            self.assertTrue(closest is project.designs[i]);
+            self.assertEqual(delta, 0.0);
+
+    def test_closest_design(self):
+        # Same closest design and distance as Config.dist over all designs
+        project = self.project;
+        queries = np.random.RandomState(1).rand(20, 4);
+        for dv in queries:
+            config = Design(dv).config;
+            closest, delta = project.closest_design(config);
+            dist = [config.dist(d.config, ['DV_VALUE_NEW']) for d in project.designs];
+            self.assertTrue(closest is project.designs[np.argmin(dist)]);
+            self.assertAlmostEqual(delta, np.min(dist), places=12);
+
+        # Designs added after a lookup are indexed
+        project.designs.append(Design(queries[0]));
+        closest, delta = project.closest_design(Design(queries[0]).config);
+        self.assertTrue(closest is project.designs[-1]);
+        self.assertEqual(delta, 0.0);
+
+    def test_design_log(self):
+        # Designs logged since the project was saved are replayed on loading,
+        # and compaction writes them to the project file
+        project = self.project;
+        project.save();
+
+        project.designs[3].value = 3.;
+        project.designs.append(Design([5., 5., 5., 5.], 51.));
+        with su2io.redirect_folder(self.folder):
+            project.append_log(project.designs[3]);
+            project.append_log(project.designs[-1]);
+
+        filename = os.path.join(self.folder, 'project.pkl');
+        self.assertEqual(len(su2io.load_data(filename).designs), 51);
+
+        loaded = su2project.load_project(filename);
+        self.assertEqual(len(loaded.designs), 52);
+        self.assertEqual(loaded.designs[3].value, 3.);
+        self.assertEqual(loaded.designs[-1].value, 51.);
+        closest, delta = loaded.closest_design(Design([5., 5., 5., 5.]).config);
+        self.assertEqual(closest.value, 51.);
+
+        su2project.compact_project(filename);
+        self.assertFalse(os.path.exists(os.path.join(self.folder, 'project_log.pkl')));
+        self.assertEqual(len(su2io.load_data(filename).designs), 52);
+
+if __name__ == '__main__':
+    unittest.main();
@@ -0,0 +1,106 @@
+"""
+Tests of the results store of sample batches (multif/samplestore.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, shutil, tempfile, unittest
+import multiprocessing
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif.samplestore import SampleStore
+from multif.samples import Sample
+
+def appendRun(path, run_id):
+    # Worker of a sample batch
+    store = SampleStore(path);
+    dv = store.GetDV(run_id);
+    store.Append(run_id, 1, 0., 1., val_out=[np.sum(dv), np.pi*run_id],
+        gra_out=dv, tag_out=['SUM', 'PI']);
+
+class TestSampleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.homedir = tempfile.mkdtemp(prefix='multif_test_');
+        self.cwd = os.getcwd();
+        self.path = os.path.join(self.homedir, 'results_store');
+        self.samples = np.random.RandomState(0).rand(20, 3);
+        self.samples_filename = os.path.join(self.homedir, 'samples.dat');
+        np.savetxt(self.samples_filename, self.samples, fmt='%0.16e');
+        self.store = SampleStore(self.path);
+        self.store.SetSamples(self.samples_filename);
+
+    def tearDown(self):
+        os.chdir(self.cwd);
+        shutil.rmtree(self.homedir, ignore_errors=True);
+
+    def test_samples(self):
+        self.assertEqual(self.store.NbrSamples(), 20);
+        for i in [0, 7, 19]:
+            self.assertTrue(np.all(self.store.GetDV(i) == self.samples[i]));
+
+    def test_dv_file(self):
+        # The DV file of a run is the same with and without the store
+        os.chdir(self.homedir);
+        files = [];
+        for store in [None, self.path]:
+            smp = Sample(11);
+            smp.samples_file = 'samples.dat';
+            smp.store = store;
+            smp.FormatDVFile();
+            files.append(open(smp.input_file, 'r').read());
+        self.assertEqual(files[0], files[1]);
+        self.assertTrue(np.all(np.loadtxt(smp.input_file) == self.samples[11]));
+
+    def test_concurrent_workers(self):
+        # Records appended by a pool of workers are all read back exactly
+        pool = multiprocessing.Pool(processes=4);
+        for i in range(20):
+            pool.apply_async(appendRun, (self.path, i));
+        pool.close();
+        pool.join();
+
+        data = self.store.Load();
+        self.assertEqual(list(data['run_id']), range(20));
+        self.assertTrue(np.all(data['status'] == 1));
+        self.assertTrue(np.all(data['dv'] == self.samples));
+        self.assertTrue(np.all(data['values'][:,0] == np.sum(self.samples, axis=1)));
+        self.assertTrue(np.all(data['values'][:,1] == np.pi*np.arange(20)));
+        self.assertTrue(np.all(data['gradients'] == self.samples));
+        self.assertEqual(list(data['tags']), ['SUM', 'PI']);
+
+        status, t_start, t_end, val, gra = self.store.Read(7);
+        self.assertEqual(val[1], np.pi*7);
+
+    def test_rerun_and_failure(self):
+        # The last record of a run is kept, failed runs have nan values
+        self.store.Append(0, 0, 0., 1.);
+        self.store.Append(1, 1, 0., 1., val_out=[1., 2.]);
+        self.store.Append(0, 1, 2., 3., val_out=[3., 4.]);
+        self.store.Append(2, 0, 0., 1.);
+
+        data = self.store.Load();
+        self.assertEqual(list(data['status']), [1, 1, 0]);
+        self.assertEqual(list(data['values'][0]), [3., 4.]);
+        self.assertTrue(np.all(np.isnan(data['values'][2])));
+        self.assertEqual(self.store.Read(0)[1], 2.);
+        self.assertEqual(self.store.Read(5), None);
+
+        results = np.load(self.store.Compact());
+        self.assertTrue(np.all(results['run_id'] == data['run_id']));
+        self.assertTrue(np.all(results['values'][:2] == data['values'][:2]));
+
+    def test_profiles(self):
+        # A rerun starts a new profile of the run
+        self.store.AppendProfile(0, [('setup', 1., 1., 10., 1), ('cfd', 2., 2., 20., 1)]);
+        self.store.AppendProfile(1, [('setup', 1., 1., 10., 1)]);
+        self.store.AppendProfile(0, [('setup', 3., 3., 30., 1)]);
+        profiles = self.store.Profiles();
+        self.assertEqual(profiles, [[('setup', 3., 3., 30., 1)],
+                                    [('setup', 1., 1., 10., 1)]]);
+
+if __name__ == '__main__':
+    unittest.main();
@@ -0,0 +1,67 @@
+"""
+Tests of the evaluation directories and their retention policy
+(multif/scratch.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, shutil, tempfile, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif import gradients
+from multif.scratch import Retention
+
+def write(path, size=10):
+    f = open(path,'w');
+    f.write('x'*size);
+    f.close();
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        self.homedir = tempfile.mkdtemp(prefix='multif_test_');
+        self.scratchDir = os.path.join(self.homedir, 'scratch');
+        self.cwd = os.getcwd();
+
+    def tearDown(self):
+        os.chdir(self.cwd);
+        shutil.rmtree(self.homedir, ignore_errors=True);
+
+    def test_skip_aero_run_dir(self):
+        # A finite difference step which skips the aero analysis finds the
+        # center point aero files in its temporary run directory (TEMP_RUN_DIR)
+        for name in gradients.AERO_FILES:
+            write(os.path.join(self.homedir, name));
+        gradients.linkCenterFiles(self.homedir, 0);
+
+        for scratchDir in ['', self.scratchDir]:
+            retention = Retention(scratchDir, 'SMALL', 100);
+            dirname = os.path.join(self.homedir, 'EVAL_0');
+            workdir = retention.Enter(dirname);
+            runDir = retention.Temporary(workdir);
+            for name in gradients.AERO_FILES:
+                self.assertTrue(os.path.isfile(os.path.join(runDir, name)));
+
+            write(os.path.join(runDir, 'results.out'));
+            write(os.path.join(runDir, 'nozzle.mesh'), 1000);
+            retention.Leave(runDir, workdir, keep=['results.out']);
+            retention.Leave(workdir, dirname, keep=['results.out']);
+
+            self.assertFalse(os.path.exists(runDir));
+            self.assertTrue(os.path.isfile(os.path.join(dirname, 'results.out')));
+            self.assertFalse(os.path.exists(os.path.join(dirname, 'nozzle.mesh')));
+
+    def test_failed_evaluation_keeps_all(self):
+        retention = Retention(self.scratchDir, 'RESPONSES');
+        dirname = os.path.join(self.homedir, 'EVAL_1');
+        workdir = retention.Enter(dirname);
+        self.assertNotEqual(os.path.abspath(workdir), os.path.abspath(dirname));
+        write(os.path.join(workdir, 'nozzle.mesh'), 1000);
+        retention.Leave(workdir, dirname, failed=True);
+        self.assertTrue(os.path.isfile(os.path.join(dirname, 'nozzle.mesh')));
+        self.assertFalse(os.path.exists(workdir));
+
+if __name__ == '__main__':
+    unittest.main();
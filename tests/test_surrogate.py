@@ -0,0 +1,116 @@
+"""
+Tests of the surrogate fidelity level (multif/surrogate.py)
+
+Run from the MULTI-F root directory:
+  python -m unittest discover -s tests
+"""
+
+import os, sys, shutil, tempfile, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'));
+
+from multif import surrogate
+
+def responses(x):
+    return [np.sin(3.*x[0]) + x[1]**2, 1. + x[2]*x[3]];
+
+class Nozzle:
+    # Stands for a nozzle with scalar output functions THRUST and MASS
+
+    def __init__(self, dvList):
+        self.dvList = list(dvList);
+        self.inputDVformat = 'PLAIN';
+        self.outputFormat = 'PLAIN';
+        self.outputTags = ['THRUST', 'MASS'];
+        self.outputCode = [1, 1];
+        self.responses = {'THRUST': None, 'MASS': None};
+        self.written = 0;
+
+    def GetOutputFunctions(self):
+        val = [self.responses[k] for k in self.outputTags];
+        return self.outputTags, val, [], [];
+
+    def WriteOutputFunctions_Plain(self):
+        self.written += 1;
+
+class TestSurrogate(unittest.TestCase):
+
+    def setUp(self):
+        self.homedir = tempfile.mkdtemp(prefix='multif_test_');
+        self.records = os.path.join(self.homedir, 'records.dat');
+
+        # Records of the true model, added as by its evaluations
+        self.X = np.random.RandomState(0).rand(80, 4);
+        sur = surrogate.Surrogate('model1', self.records, 0.5);
+        for x in self.X:
+            nozzle = Nozzle(x);
+            nozzle.responses['THRUST'], nozzle.responses['MASS'] = responses(x);
+            sur.AddRecord(nozzle, output='quiet');
+
+    def tearDown(self):
+        shutil.rmtree(self.homedir, ignore_errors=True);
+
+    def test_leave_one_out(self):
+        # Closed form leave-one-out error of the chosen shape parameter
+        sur = surrogate.Surrogate('model1', self.records, 0.5);
+        self.assertEqual(sur.Load(), 80);
+        self.assertEqual(sur.Train(), 0);
+
+        U = (sur.X - sur.lo)/sur.scl;
+        F = sur.Y - sur.mean;
+        err = [];
+        for i in range(len(U)):
+            j = [k for k in range(len(U)) if k != i];
+            D2 = np.sum((U[j][:,None,:] - U[j][None,:,:])**2, 2);
+            A = np.exp(-sur.eps**2*D2) + 1e-10*np.eye(len(j));
+            k = np.exp(-sur.eps**2*np.sum((U[j] - U[i])**2, 1));
+            err.append(F[i] - np.dot(k, np.linalg.solve(A, F[j])));
+        err = np.sqrt(np.mean(np.array(err)**2, 0))/sur.Y.std(0);
+        for i in range(2):
+            self.assertAlmostEqual(sur.cvError[i]/err[i], 1., delta=1e-4);
+
+        # Interpolation of the records
+        for x in self.X[:5]:
+            self.assertTrue(np.allclose(sur.Predict(x), responses(x), atol=1e-4));
+
+    def test_trained_once(self):
+        # The saved surrogate is reused until a record is added
+        ntrain = [0];
+        train = surrogate.Surrogate.Train;
+        def countingTrain(sur):
+            ntrain[0] += 1;
+            return train(sur);
+
+        surrogate.Surrogate.Train = countingTrain;
+        try:
+            x = self.X[3] + 0.01;
+            for i in range(3):
+                sur = surrogate.Surrogate('model1', self.records, 0.5);
+                nozzle = Nozzle(x);
+                self.assertEqual(sur.Run(nozzle, output='quiet'), 0);
+                self.assertEqual(nozzle.written, 1);
+                self.assertTrue(np.allclose([nozzle.responses['THRUST'],
+                    nozzle.responses['MASS']], responses(x), rtol=1e-2));
+            self.assertEqual(ntrain[0], 1);
+
+            nozzle = Nozzle(x);
+            nozzle.responses['THRUST'], nozzle.responses['MASS'] = responses(x);
+            sur.AddRecord(nozzle, output='quiet');
+            sur = surrogate.Surrogate('model1', self.records, 0.5);
+            self.assertEqual(sur.Run(Nozzle(x), output='quiet'), 0);
+            self.assertEqual(ntrain[0], 2);
+        finally:
+            surrogate.Surrogate.Train = train;
+
+    def test_fallback(self):
+        # The true model is run outside of the trust region, or when
+        # gradients are requested
+        sur = surrogate.Surrogate('model1', self.records, 0.05);
+        self.assertEqual(sur.Run(Nozzle([2., 2., 2., 2.]), output='quiet'), 1);
+        nozzle = Nozzle(self.X[0]);
+        nozzle.outputCode = [3, 1];
+        self.assertEqual(sur.Run(nozzle, output='quiet'), 1);
+
+if __name__ == '__main__':
+    unittest.main();